@@ -3,6 +3,9 @@ import logging
 import os
 import shutil
 import base64
+import threading
+import time
+import weakref
 import redis
 
 from datetime import datetime
@@ -223,11 +226,87 @@ class PersistentConfig(Generic[T]):
         self.config_value = self.value
 
 
+class AppConfigListener:
+    """
+    Background thread applying config changes published through Redis to
+    every AppConfig on the same connection and key prefix.
+    """
+
+    # Seconds between version checks while no invalidation messages arrive
+    SYNC_INTERVAL = 10
+
+    _listeners: dict[tuple[int, str], "AppConfigListener"] = {}
+    _listeners_lock = threading.Lock()
+
+    def __init__(self, redis, redis_key_prefix: str):
+        self._redis = redis
+        self._version_key = f"{redis_key_prefix}:config:__version__"
+        self._channel = f"{redis_key_prefix}:config:__invalidate__"
+        self._configs = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+        threading.Thread(target=self._listen, daemon=True).start()
+
+    @classmethod
+    def register(cls, config: "AppConfig"):
+        key = (id(config._redis), config._redis_key_prefix)
+        with cls._listeners_lock:
+            # Listeners keep their connection, so its id is not reused
+            listener = cls._listeners.get(key)
+            if listener is None:
+                listener = cls(config._redis, config._redis_key_prefix)
+                cls._listeners[key] = listener
+        with listener._lock:
+            listener._configs.add(config)
+
+    def _get_configs(self) -> list["AppConfig"]:
+        with self._lock:
+            return list(self._configs)
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+
+                # Catch up on anything written while (re)connecting
+                for config in self._get_configs():
+                    config._sync()
+
+                while True:
+                    message = pubsub.get_message(timeout=self.SYNC_INTERVAL)
+                    if message and message.get("type") == "message":
+                        for config in self._get_configs():
+                            config._handle_invalidation(message["data"])
+                    elif message is None:
+                        version = int(self._redis.get(self._version_key) or 0)
+                        for config in self._get_configs():
+                            if config._version != version:
+                                config._sync()
+            except Exception as e:
+                log.error(f"Error in config invalidation listener: {e}")
+                time.sleep(1)
+
+
 class AppConfig:
+    """
+    Attribute access to PersistentConfig values.
+
+    Reads are served from a process-local snapshot. With Redis configured,
+    registered keys are loaded from Redis in one round trip on the first read,
+    writes bump a shared version counter and publish an invalidation message,
+    and a listener thread shared by the configs on the same connection applies
+    changes from other instances, re-syncing everything whenever it notices a
+    missed version.
+    """
+
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
 
     _state: dict[str, PersistentConfig]
+    _version: int
+    # Keys registered since the last load from Redis
+    _pending: set[str]
 
     def __init__(
         self,
@@ -236,6 +315,11 @@ class AppConfig:
         redis_cluster: Optional[bool] = False,
         redis_key_prefix: str = "open-webui",
     ):
+        super().__setattr__("_state", {})
+        super().__setattr__("_version", 0)
+        super().__setattr__("_pending", set())
+        super().__setattr__("_pending_lock", threading.Lock())
+
         if redis_url:
             super().__setattr__("_redis_key_prefix", redis_key_prefix)
             super().__setattr__(
@@ -248,40 +332,101 @@ class AppConfig:
                 ),
             )
 
-        super().__setattr__("_state", {})
+            AppConfigListener.register(self)
+
+    def _get_redis_key(self, key: str) -> str:
+        return f"{self._redis_key_prefix}:config:{key}"
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self._redis_key_prefix}:config:__version__"
+
+    @property
+    def _channel(self) -> str:
+        return f"{self._redis_key_prefix}:config:__invalidate__"
+
+    def _apply_redis_value(self, key: str, redis_value: Optional[str]):
+        if redis_value is None or key not in self._state:
+            return
+
+        try:
+            decoded_value = json.loads(redis_value)
+
+            # Update the in-memory value if different
+            if self._state[key].value != decoded_value:
+                self._state[key].value = decoded_value
+                log.info(f"Updated {key} from Redis: {decoded_value}")
+
+        except json.JSONDecodeError:
+            log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+
+    def _load(self, keys: list[str]):
+        # A single round trip, the keys may live on different cluster slots
+        pipe = self._redis.pipeline()
+        for key in keys:
+            pipe.get(self._get_redis_key(key))
+        redis_values = pipe.execute()
+
+        for key, redis_value in zip(keys, redis_values):
+            self._apply_redis_value(key, redis_value)
+
+    def _load_pending(self):
+        with self._pending_lock:
+            keys = list(self._pending)
+            if keys:
+                self._load(keys)
+                self._pending.difference_update(keys)
+
+    def _sync(self):
+        """Reload every registered key from Redis."""
+        # Read the version before the values, so a write racing with the sync
+        # is re-applied from its invalidation message instead of being skipped
+        version = self._redis.get(self._version_key)
+        self._load(list(self._state.keys()))
+
+        super().__setattr__("_version", int(version or 0))
+
+    def _handle_invalidation(self, data: str):
+        message = json.loads(data)
+        key = message.get("key")
+        version = int(message.get("version", 0))
+
+        if version <= self._version:
+            return
+
+        if version == self._version + 1:
+            self._apply_redis_value(key, self._redis.get(self._get_redis_key(key)))
+            super().__setattr__("_version", version)
+        else:
+            # One or more invalidations were missed
+            self._sync()
 
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
             self._state[key] = value
+
+            if self._redis:
+                with self._pending_lock:
+                    self._pending.add(key)
         else:
             self._state[key].value = value
             self._state[key].save()
 
             if self._redis:
-                redis_key = f"{self._redis_key_prefix}:config:{key}"
+                redis_key = self._get_redis_key(key)
                 self._redis.set(redis_key, json.dumps(self._state[key].value))
 
+                version = self._redis.incr(self._version_key)
+                self._redis.publish(
+                    self._channel, json.dumps({"key": key, "version": version})
+                )
+
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available, check for an updated value
-        if self._redis:
-            redis_key = f"{self._redis_key_prefix}:config:{key}"
-            redis_value = self._redis.get(redis_key)
-
-            if redis_value is not None:
-                try:
-                    decoded_value = json.loads(redis_value)
-
-                    # Update the in-memory value if different
-                    if self._state[key].value != decoded_value:
-                        self._state[key].value = decoded_value
-                        log.info(f"Updated {key} from Redis: {decoded_value}")
-
-                except json.JSONDecodeError:
-                    log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
-
+        if self._pending:
+            self._load_pending()
         return self._state[key].value
 
 
@@ -2736,6 +2881,32 @@ ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS = PersistentConfig(
     == "true",
 )
 
+# Keep a persistent BM25 index per collection instead of rebuilding it on every hybrid query
+ENABLE_RAG_BM25_INDEX = (
+    os.environ.get("ENABLE_RAG_BM25_INDEX", "True").lower() == "true"
+)
+RAG_BM25_INDEX_DIR = os.environ.get("RAG_BM25_INDEX_DIR", f"{CACHE_DIR}/bm25")
+
+# Reuse embeddings of chunks that were already embedded with the same engine, model and prefix
+ENABLE_RAG_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE", "True").lower() == "true"
+)
+RAG_EMBEDDING_CACHE_DATABASE_URL = os.environ.get(
+    "RAG_EMBEDDING_CACHE_DATABASE_URL", f"sqlite:///{CACHE_DIR}/embedding_cache.db"
+)
+try:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = int(
+        os.environ.get("RAG_EMBEDDING_CACHE_MAX_ENTRIES", "1000000")
+    )
+except Exception:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = 1000000
+try:
+    RAG_EMBEDDING_CACHE_MAX_SIZE_MB = int(
+        os.environ.get("RAG_EMBEDDING_CACHE_MAX_SIZE_MB", "2048")
+    )
+except Exception:
+    RAG_EMBEDDING_CACHE_MAX_SIZE_MB = 2048
+
 RAG_FULL_CONTEXT = PersistentConfig(
     "RAG_FULL_CONTEXT",
     "rag.full_context",
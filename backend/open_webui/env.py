@@ -341,6 +341,38 @@ if DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None:
     except Exception:
         DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = 0.0
 
+# Seconds between batched writes of the last_active_at of users seen by this
+# worker, 0 writes every update through
+DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = os.environ.get(
+    "DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL", "5"
+)
+try:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = max(
+        float(DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL), 0.0
+    )
+except ValueError:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = 5.0
+
+# Seconds that authenticated users are cached for, 0 disables the cache
+USER_CACHE_TTL = os.environ.get("USER_CACHE_TTL", "30")
+try:
+    USER_CACHE_TTL = max(float(USER_CACHE_TTL), 0.0)
+except ValueError:
+    USER_CACHE_TTL = 30.0
+
+USER_CACHE_MAX_SIZE = os.environ.get("USER_CACHE_MAX_SIZE", "1000")
+try:
+    USER_CACHE_MAX_SIZE = max(int(USER_CACHE_MAX_SIZE), 1)
+except ValueError:
+    USER_CACHE_MAX_SIZE = 1000
+
+# Seconds that the effective permissions of users are cached for, 0 disables the cache
+USER_PERMISSIONS_CACHE_TTL = os.environ.get("USER_PERMISSIONS_CACHE_TTL", "300")
+try:
+    USER_PERMISSIONS_CACHE_TTL = max(float(USER_PERMISSIONS_CACHE_TTL), 0.0)
+except ValueError:
+    USER_PERMISSIONS_CACHE_TTL = 300.0
+
 # When enabled, get_db_context reuses existing sessions; set to False to always create new sessions
 DATABASE_ENABLE_SESSION_SHARING = (
     os.environ.get("DATABASE_ENABLE_SESSION_SHARING", "False").lower() == "true"
@@ -361,6 +393,11 @@ ENABLE_REALTIME_CHAT_SAVE = (
 
 ENABLE_QUERIES_CACHE = os.environ.get("ENABLE_QUERIES_CACHE", "False").lower() == "true"
 
+# Store chat history messages as individual `chat_message` rows instead of inside the `chat.chat` JSON
+ENABLE_CHAT_MESSAGE_TABLE = (
+    os.environ.get("ENABLE_CHAT_MESSAGE_TABLE", "False").lower() == "true"
+)
+
 RAG_SYSTEM_CONTEXT = os.environ.get("RAG_SYSTEM_CONTEXT", "False").lower() == "true"
 
 ####################################
@@ -573,6 +610,14 @@ else:
     except Exception:
         MODELS_CACHE_TTL = 1
 
+# Seconds that an upstream model list is still served after MODELS_CACHE_TTL,
+# while it is fetched again or while the upstream is unreachable
+MODELS_CACHE_STALE_TTL = os.environ.get("MODELS_CACHE_STALE_TTL", "300")
+try:
+    MODELS_CACHE_STALE_TTL = max(float(MODELS_CACHE_STALE_TTL), 0.0)
+except ValueError:
+    MODELS_CACHE_STALE_TTL = 300.0
+
 
 ####################################
 # CHAT
@@ -687,6 +732,24 @@ try:
 except ValueError:
     WEBSOCKET_SERVER_PING_INTERVAL = 25
 
+# Seconds that streamed message events are buffered before being written to the
+# database, 0 writes every event through immediately
+CHAT_MESSAGE_WRITE_BUFFER_INTERVAL = os.environ.get(
+    "CHAT_MESSAGE_WRITE_BUFFER_INTERVAL", "1"
+)
+try:
+    CHAT_MESSAGE_WRITE_BUFFER_INTERVAL = float(CHAT_MESSAGE_WRITE_BUFFER_INTERVAL)
+except ValueError:
+    CHAT_MESSAGE_WRITE_BUFFER_INTERVAL = 1.0
+
+CHAT_MESSAGE_WRITE_BUFFER_MAX_EVENTS = os.environ.get(
+    "CHAT_MESSAGE_WRITE_BUFFER_MAX_EVENTS", "100"
+)
+try:
+    CHAT_MESSAGE_WRITE_BUFFER_MAX_EVENTS = int(CHAT_MESSAGE_WRITE_BUFFER_MAX_EVENTS)
+except ValueError:
+    CHAT_MESSAGE_WRITE_BUFFER_MAX_EVENTS = 100
+
 
 REQUESTS_VERIFY = os.environ.get("REQUESTS_VERIFY", "True").lower() == "true"
 
@@ -738,6 +801,86 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Seconds an unused MCP session stays open for the next chat request, 0 opens a
+# new session for every request
+MCP_SESSION_POOL_IDLE_TIMEOUT = os.environ.get("MCP_SESSION_POOL_IDLE_TIMEOUT", "300")
+try:
+    MCP_SESSION_POOL_IDLE_TIMEOUT = float(MCP_SESSION_POOL_IDLE_TIMEOUT)
+except ValueError:
+    MCP_SESSION_POOL_IDLE_TIMEOUT = 300.0
+
+# Seconds between keep-alive pings of pooled MCP sessions
+MCP_SESSION_POOL_KEEPALIVE_INTERVAL = os.environ.get(
+    "MCP_SESSION_POOL_KEEPALIVE_INTERVAL", "60"
+)
+try:
+    MCP_SESSION_POOL_KEEPALIVE_INTERVAL = float(MCP_SESSION_POOL_KEEPALIVE_INTERVAL)
+except ValueError:
+    MCP_SESSION_POOL_KEEPALIVE_INTERVAL = 60.0
+
+
+####################################
+# WEBHOOKS
+####################################
+
+# Seconds a single webhook delivery may take, defaults to AIOHTTP_CLIENT_TIMEOUT
+WEBHOOK_TIMEOUT = os.environ.get("WEBHOOK_TIMEOUT", "")
+
+if WEBHOOK_TIMEOUT == "":
+    WEBHOOK_TIMEOUT = AIOHTTP_CLIENT_TIMEOUT
+else:
+    try:
+        WEBHOOK_TIMEOUT = float(WEBHOOK_TIMEOUT)
+    except Exception:
+        WEBHOOK_TIMEOUT = AIOHTTP_CLIENT_TIMEOUT
+
+WEBHOOK_MAX_RETRIES = os.environ.get("WEBHOOK_MAX_RETRIES", "2")
+try:
+    WEBHOOK_MAX_RETRIES = max(int(WEBHOOK_MAX_RETRIES), 0)
+except ValueError:
+    WEBHOOK_MAX_RETRIES = 2
+
+# Maximum number of webhook deliveries in flight per worker
+WEBHOOK_MAX_CONCURRENCY = os.environ.get("WEBHOOK_MAX_CONCURRENCY", "20")
+try:
+    WEBHOOK_MAX_CONCURRENCY = max(int(WEBHOOK_MAX_CONCURRENCY), 1)
+except ValueError:
+    WEBHOOK_MAX_CONCURRENCY = 20
+
+# Queue notification webhooks in Redis so any worker can deliver them
+ENABLE_WEBHOOK_QUEUE = os.environ.get("ENABLE_WEBHOOK_QUEUE", "False").lower() == "true"
+
+
+####################################
+# KNOWLEDGE REINDEX
+####################################
+
+# Number of file batches a reindex job embeds at the same time
+KNOWLEDGE_REINDEX_CONCURRENCY = os.environ.get("KNOWLEDGE_REINDEX_CONCURRENCY", "4")
+try:
+    KNOWLEDGE_REINDEX_CONCURRENCY = max(int(KNOWLEDGE_REINDEX_CONCURRENCY), 1)
+except ValueError:
+    KNOWLEDGE_REINDEX_CONCURRENCY = 4
+
+# Number of files whose chunks are embedded and inserted together
+KNOWLEDGE_REINDEX_BATCH_SIZE = os.environ.get("KNOWLEDGE_REINDEX_BATCH_SIZE", "16")
+try:
+    KNOWLEDGE_REINDEX_BATCH_SIZE = max(int(KNOWLEDGE_REINDEX_BATCH_SIZE), 1)
+except ValueError:
+    KNOWLEDGE_REINDEX_BATCH_SIZE = 16
+
+# Seconds between checkpoints of a running reindex job; a job whose last
+# checkpoint is older than three intervals is resumed by another worker
+KNOWLEDGE_REINDEX_CHECKPOINT_INTERVAL = os.environ.get(
+    "KNOWLEDGE_REINDEX_CHECKPOINT_INTERVAL", "10"
+)
+try:
+    KNOWLEDGE_REINDEX_CHECKPOINT_INTERVAL = max(
+        float(KNOWLEDGE_REINDEX_CHECKPOINT_INTERVAL), 1.0
+    )
+except ValueError:
+    KNOWLEDGE_REINDEX_CHECKPOINT_INTERVAL = 10.0
+
 
 ####################################
 # SENTENCE TRANSFORMERS
@@ -33,6 +33,8 @@ from open_webui.models.models import Models
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
+    apply_function_valves,
+    get_user_valves,
 )
 from open_webui.utils.tools import get_tools
 from open_webui.utils.access_control import has_access
@@ -56,23 +58,18 @@ logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
 log = logging.getLogger(__name__)
 
 
-def get_function_module_by_id(request: Request, pipe_id: str):
-    function_module, _, _ = get_function_module_from_cache(request, pipe_id)
-
-    if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-        Valves = function_module.Valves
-        valves = Functions.get_function_valves_by_id(pipe_id)
+def get_function_module_by_id(request: Request, pipe_id: str, version=None):
+    if version is None:
+        version = Functions.get_function_versions_by_ids([pipe_id]).get(pipe_id)
+    function_module, _, _ = get_function_module_from_cache(
+        request, pipe_id, version=version
+    )
 
-        if valves:
-            try:
-                function_module.valves = Valves(
-                    **{k: v for k, v in valves.items() if v is not None}
-                )
-            except Exception as e:
-                log.exception(f"Error loading valves for function {pipe_id}: {e}")
-                raise e
-        else:
-            function_module.valves = Valves()
+    try:
+        apply_function_valves(request, pipe_id, function_module, version=version)
+    except Exception as e:
+        log.exception(f"Error loading valves for function {pipe_id}: {e}")
+        raise e
 
     return function_module
 
@@ -83,7 +80,9 @@ async def get_function_models(request):
 
     for pipe in pipes:
         try:
-            function_module = get_function_module_by_id(request, pipe.id)
+            function_module = get_function_module_by_id(
+                request, pipe.id, version=pipe.updated_at
+            )
 
             has_user_valves = False
             if hasattr(function_module, "UserValves"):
@@ -209,7 +208,7 @@ async def generate_function_chat_completion(
         }
 
         if "__user__" in params and hasattr(function_module, "UserValves"):
-            user_valves = Functions.get_user_valves_by_id_and_user_id(pipe_id, user.id)
+            user_valves = get_user_valves(user, "functions", pipe_id)
             try:
                 params["__user__"]["valves"] = function_module.UserValves(**user_valves)
             except Exception as e:
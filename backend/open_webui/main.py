@@ -62,8 +62,8 @@ from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
 from open_webui.utils.logger import start_logger
 from open_webui.socket.main import (
     MODELS,
+    MESSAGE_WRITE_BUFFER,
     app as socket_app,
-    periodic_usage_pool_cleanup,
     get_event_emitter,
     get_models_in_use,
 )
@@ -108,7 +108,7 @@ from open_webui.internal.db import ScopedSession, engine, get_session
 
 from open_webui.models.functions import Functions
 from open_webui.models.models import Models
-from open_webui.models.users import UserModel, Users
+from open_webui.models.users import LAST_ACTIVE_WRITER, USER_CACHE, UserModel, Users
 from open_webui.models.chats import Chats
 
 from open_webui.config import (
@@ -344,6 +344,7 @@ from open_webui.config import (
     ENABLE_ONEDRIVE_BUSINESS,
     ENABLE_RAG_HYBRID_SEARCH,
     ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS,
+    ENABLE_RAG_BM25_INDEX,
     ENABLE_RAG_LOCAL_WEB_FETCH,
     ENABLE_WEB_LOADER_SSL_VERIFICATION,
     ENABLE_GOOGLE_DRIVE_INTEGRATION,
@@ -458,6 +459,7 @@ from open_webui.env import (
     REDIS_CLUSTER,
     REDIS_KEY_PREFIX,
     REDIS_SENTINEL_HOSTS,
+    ENABLE_WEBHOOK_QUEUE,
     REDIS_SENTINEL_PORT,
     GLOBAL_LOG_LEVEL,
     MAX_BODY_LOG_SIZE,
@@ -506,7 +508,7 @@ from open_webui.utils.chat import (
 )
 from open_webui.utils.embeddings import generate_embeddings
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import PERMISSION_CACHE, has_access
 
 from open_webui.utils.auth import (
     get_license_data,
@@ -527,6 +529,12 @@ from open_webui.utils.oauth import (
 )
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.webhook import WEBHOOK_DISPATCHER
+from open_webui.utils.upstream_cache import MODEL_LIST_CACHE
+from open_webui.utils.mcp.pool import MCP_SESSION_POOL
+from open_webui.retrieval.reindex import KNOWLEDGE_REINDEXER
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.utils.profile_images import migrate_inline_profile_images
 
 from open_webui.tasks import (
     redis_task_command_listener,
@@ -618,11 +626,49 @@ async def lifespan(app: FastAPI):
             redis_task_command_listener(app)
         )
 
+        if ENABLE_WEBHOOK_QUEUE:
+            WEBHOOK_DISPATCHER.start(redis=app.state.redis)
+
+        MODEL_LIST_CACHE.start(redis=app.state.redis)
+
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
         limiter.total_tokens = THREAD_POOL_SIZE
 
-    asyncio.create_task(periodic_usage_pool_cleanup())
+    asyncio.create_task(MESSAGE_WRITE_BUFFER.recover())
+
+    USER_CACHE.connect(
+        redis_url=REDIS_URL,
+        redis_sentinels=get_sentinels_from_env(
+            REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+        ),
+        redis_cluster=REDIS_CLUSTER,
+        redis_key_prefix=REDIS_KEY_PREFIX,
+    )
+    PERMISSION_CACHE.connect(
+        redis_url=REDIS_URL,
+        redis_sentinels=get_sentinels_from_env(
+            REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+        ),
+        redis_cluster=REDIS_CLUSTER,
+        redis_key_prefix=REDIS_KEY_PREFIX,
+    )
+    if ENABLE_RAG_BM25_INDEX:
+        VECTOR_DB_CLIENT.connect(
+            redis_url=REDIS_URL,
+            redis_sentinels=get_sentinels_from_env(
+                REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+            ),
+            redis_cluster=REDIS_CLUSTER,
+            redis_key_prefix=REDIS_KEY_PREFIX,
+        )
+    LAST_ACTIVE_WRITER.start()
+
+    # Move profile images saved inline in user rows to file storage
+    asyncio.create_task(asyncio.to_thread(migrate_inline_profile_images))
+
+    # Resume a knowledge reindex job interrupted by a restart
+    KNOWLEDGE_REINDEXER.schedule(Request({"type": "http", "app": app}))
 
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
@@ -647,6 +693,13 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    await MESSAGE_WRITE_BUFFER.flush_all()
+    await WEBHOOK_DISPATCHER.close()
+    await MCP_SESSION_POOL.close_all()
+    await KNOWLEDGE_REINDEXER.close()
+    await LAST_ACTIVE_WRITER.close()
+    await MODEL_LIST_CACHE.close()
+
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
@@ -845,9 +898,13 @@ app.state.USER_COUNT = None
 
 app.state.TOOLS = {}
 app.state.TOOL_CONTENTS = {}
+app.state.TOOL_VERSIONS = {}
+app.state.TOOL_VALVES = {}
 
 app.state.FUNCTIONS = {}
 app.state.FUNCTION_CONTENTS = {}
+app.state.FUNCTION_VERSIONS = {}
+app.state.FUNCTION_VALVES = {}
 
 ########################################
 #
@@ -1669,8 +1726,10 @@ async def chat_completion(
             ):  # temporary chats are not stored
 
                 # Verify chat ownership
-                chat = Chats.get_chat_by_id_and_user_id(metadata["chat_id"], user.id)
-                if chat is None and user.role != "admin":  # admins can access any chat
+                if (
+                    not Chats.is_chat_owned_by_user(metadata["chat_id"], user.id)
+                    and user.role != "admin"  # admins can access any chat
+                ):
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
                         detail=ERROR_MESSAGES.DEFAULT(),
@@ -1774,7 +1833,7 @@ async def chat_completion(
             try:
                 if mcp_clients := metadata.get("mcp_clients"):
                     for client in reversed(mcp_clients.values()):
-                        await client.disconnect()
+                        await MCP_SESSION_POOL.release(client)
             except Exception as e:
                 log.debug(f"Error cleaning up: {e}")
                 pass
@@ -1858,8 +1917,7 @@ async def list_tasks_endpoint(request: Request, user=Depends(get_verified_user))
 async def list_tasks_by_chat_id_endpoint(
     request: Request, chat_id: str, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id(chat_id)
-    if chat is None or chat.user_id != user.id:
+    if not Chats.is_chat_owned_by_user(chat_id, user.id):
         return {"task_ids": []}
 
     task_ids = await list_task_ids_by_item_id(request.app.state.redis, chat_id)
@@ -2117,7 +2175,7 @@ async def get_current_usage(user=Depends(get_verified_user)):
             )
 
         return {
-            "model_ids": get_models_in_use(),
+            "model_ids": await get_models_in_use(),
             "user_count": Users.get_active_user_count(),
         }
     except HTTPException:
@@ -0,0 +1,56 @@
+"""Add leaderboard, leaderboard_state and tag_embedding tables
+
+Revision ID: 103ece15c321
+Revises: 1349ee585b72
+Create Date: 2026-10-17 14:03:27.519836
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "103ece15c321"
+down_revision: Union[str, None] = "1349ee585b72"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled in from the feedback table on the first read of the leaderboard
+    op.create_table(
+        "leaderboard",
+        sa.Column("model_id", sa.Text(), primary_key=True, unique=True),
+        sa.Column("rating", sa.Float(), nullable=False),
+        sa.Column("won", sa.BigInteger(), nullable=False),
+        sa.Column("lost", sa.BigInteger(), nullable=False),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+    op.create_table(
+        "leaderboard_state",
+        sa.Column("id", sa.Text(), primary_key=True, unique=True),
+        sa.Column("stale", sa.Boolean(), nullable=False),
+        sa.Column("last_created_at", sa.BigInteger(), nullable=True),
+        sa.Column("last_feedback_id", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+    op.create_table(
+        "tag_embedding",
+        sa.Column("model", sa.Text(), nullable=False),
+        sa.Column("tag", sa.Text(), nullable=False),
+        sa.Column("embedding", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("model", "tag", name="pk_model_tag"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("tag_embedding")
+    op.drop_table("leaderboard_state")
+    op.drop_table("leaderboard")
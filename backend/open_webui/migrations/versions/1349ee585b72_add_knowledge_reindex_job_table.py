@@ -0,0 +1,43 @@
+"""Add knowledge_reindex_job table
+
+Revision ID: 1349ee585b72
+Revises: b2e319eee3db
+Create Date: 2026-10-17 10:12:44.218305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1349ee585b72"
+down_revision: Union[str, None] = "b2e319eee3db"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "knowledge_reindex_job",
+        sa.Column("id", sa.Text(), primary_key=True, unique=True),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("total_files", sa.BigInteger(), nullable=False),
+        sa.Column("processed_files", sa.BigInteger(), nullable=False),
+        sa.Column("failed_files", sa.BigInteger(), nullable=False),
+        sa.Column("started_at", sa.BigInteger(), nullable=True),
+        sa.Column("finished_at", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+        # indexes
+        sa.Index("knowledge_reindex_job_status_idx", "status"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("knowledge_reindex_job")
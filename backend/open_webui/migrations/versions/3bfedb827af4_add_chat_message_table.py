@@ -0,0 +1,47 @@
+"""Add chat_message table
+
+Revision ID: 3bfedb827af4
+Revises: c440947495f3
+Create Date: 2026-01-08 10:12:31.207315
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3bfedb827af4"
+down_revision: Union[str, None] = "c440947495f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing chats keep their messages in `chat.chat` and are moved over
+    # lazily on their next write when ENABLE_CHAT_MESSAGE_TABLE is set.
+    op.create_table(
+        "chat_message",
+        sa.Column(
+            "chat_id",
+            sa.Text(),
+            sa.ForeignKey("chat.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column("parent_id", sa.Text(), nullable=True),
+        sa.Column("role", sa.Text(), nullable=True),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+        # indexes
+        sa.Index("chat_message_chat_id_parent_id_idx", "chat_id", "parent_id"),
+    )
+    pass
+
+
+def downgrade() -> None:
+    op.drop_table("chat_message")
+    pass
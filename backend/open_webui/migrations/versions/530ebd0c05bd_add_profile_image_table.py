@@ -0,0 +1,37 @@
+"""Add profile_image table
+
+Revision ID: 530ebd0c05bd
+Revises: 103ece15c321
+Create Date: 2026-10-17 15:21:08.734412
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "530ebd0c05bd"
+down_revision: Union[str, None] = "103ece15c321"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Inline data URI images are moved to file storage on startup, see
+    # utils/profile_images.py, as migrations run before storage is configured
+    op.create_table(
+        "profile_image",
+        sa.Column("hash", sa.String(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("content_type", sa.Text(), nullable=False),
+        sa.Column("path", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("hash", "size", name="pk_hash_size"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("profile_image")
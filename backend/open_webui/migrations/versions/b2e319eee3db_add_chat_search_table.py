@@ -0,0 +1,157 @@
+"""Add chat_search table
+
+Revision ID: b2e319eee3db
+Revises: 3bfedb827af4
+Create Date: 2026-01-12 09:41:27.513204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, column
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2e319eee3db"
+down_revision: Union[str, None] = "3bfedb827af4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS chat_search_fts USING fts5("
+    "content, content='chat_search', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS chat_search_ai AFTER INSERT ON chat_search BEGIN "
+    "INSERT INTO chat_search_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS chat_search_ad AFTER DELETE ON chat_search BEGIN "
+    "INSERT INTO chat_search_fts(chat_search_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS chat_search_au AFTER UPDATE ON chat_search BEGIN "
+    "INSERT INTO chat_search_fts(chat_search_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); "
+    "INSERT INTO chat_search_fts(rowid, content) VALUES (new.id, new.content); END",
+]
+
+
+def get_search_contents(title, chat, messages_map):
+    contents = {"": (title or "").replace("\x00", "").lower()}
+
+    history = (chat or {}).get("history", {}) or {}
+    messages = list({**(history.get("messages", {}) or {}), **messages_map}.values())
+    messages += (chat or {}).get("messages", []) or []
+    for message in messages:
+        if not isinstance(message, dict) or not message.get("id"):
+            continue
+        content = message.get("content")
+        if isinstance(content, str) and message["id"] not in contents:
+            contents[message["id"]] = content.replace("\x00", "").lower()
+    return contents
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    op.create_table(
+        "chat_search",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("chat_id", sa.Text(), nullable=False),
+        sa.Column("message_id", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        # indexes
+        sa.Index("chat_search_user_id_idx", "user_id"),
+        # unique constraints
+        sa.UniqueConstraint(
+            "chat_id", "message_id", name="uq_chat_search_chat_id_message_id"
+        ),
+    )
+
+    if conn.dialect.name == "sqlite":
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+    elif conn.dialect.name == "postgresql":
+        # pg_trgm lets `content LIKE '%...%'` use a GIN index; without it the
+        # search still works as a scan of the plain text column
+        try:
+            with conn.begin_nested():
+                op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                op.execute(
+                    "CREATE INDEX chat_search_content_trgm_idx "
+                    "ON chat_search USING gin (content gin_trgm_ops)"
+                )
+        except Exception as e:
+            print(f"Skipping pg_trgm index on chat_search: {e}")
+
+    # Backfill the index from the existing chats, shared copies are not searched
+    chat = table(
+        "chat",
+        column("id", sa.Text()),
+        column("user_id", sa.Text()),
+        column("title", sa.Text()),
+        column("chat", sa.JSON()),
+    )
+    chat_message = table(
+        "chat_message",
+        column("chat_id", sa.Text()),
+        column("id", sa.Text()),
+        column("data", sa.JSON()),
+    )
+    chat_search = table(
+        "chat_search",
+        column("chat_id", sa.Text()),
+        column("message_id", sa.Text()),
+        column("user_id", sa.Text()),
+        column("content", sa.Text()),
+    )
+
+    last_id = None
+    while True:
+        query = (
+            sa.select(chat.c.id, chat.c.user_id, chat.c.title, chat.c.chat)
+            .where(chat.c.user_id.notlike("shared-%"))
+            .order_by(chat.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(chat.c.id > last_id)
+
+        rows = conn.execute(query).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        messages_maps = {}
+        for message in conn.execute(
+            sa.select(
+                chat_message.c.chat_id, chat_message.c.id, chat_message.c.data
+            ).where(chat_message.c.chat_id.in_([row.id for row in rows]))
+        ):
+            messages_maps.setdefault(message.chat_id, {})[message.id] = (
+                message.data or {}
+            )
+
+        values = [
+            {
+                "chat_id": row.id,
+                "message_id": message_id,
+                "user_id": row.user_id,
+                "content": content,
+            }
+            for row in rows
+            for message_id, content in get_search_contents(
+                row.title, row.chat, messages_maps.get(row.id, {})
+            ).items()
+        ]
+        conn.execute(sa.insert(chat_search), values)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        for trigger in ("chat_search_ai", "chat_search_ad", "chat_search_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS chat_search_fts")
+    op.drop_table("chat_search")
@@ -0,0 +1,32 @@
+"""Add chat created_at id indexes
+
+Revision ID: f2c9a4d18e67
+Revises: 530ebd0c05bd
+Create Date: 2026-10-17 18:02:41.118392
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c9a4d18e67"
+down_revision: Union[str, None] = "530ebd0c05bd"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Chat exports page through chats by (created_at, id)
+    op.create_index("created_at_id_idx", "chat", ["created_at", "id"])
+    op.create_index(
+        "user_id_created_at_id_idx", "chat", ["user_id", "created_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("user_id_created_at_id_idx", table_name="chat")
+    op.drop_index("created_at_id_idx", table_name="chat")
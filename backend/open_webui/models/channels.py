@@ -269,8 +269,9 @@ class ChannelTable:
         users = set(user_ids or [])
         users.add(invited_by)
 
-        for group_id in group_ids or []:
-            users.update(Groups.get_group_user_ids_by_id(group_id))
+        if group_ids:
+            for group_user_ids in Groups.get_group_user_ids_by_ids(group_ids).values():
+                users.update(group_user_ids)
 
         return users
 
@@ -631,6 +632,19 @@ class ChannelTable:
                 for membership in memberships
             ]
 
+    def get_members_by_channel_ids(
+        self, channel_ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, list[ChannelMemberModel]]:
+        with get_db_context(db) as db:
+            members = {}
+            for membership in db.query(ChannelMember).filter(
+                ChannelMember.channel_id.in_(channel_ids)
+            ):
+                members.setdefault(membership.channel_id, []).append(
+                    ChannelMemberModel.model_validate(membership)
+                )
+            return members
+
     def pin_channel(
         self,
         channel_id: str,
@@ -998,6 +1012,20 @@ class ChannelTable:
             )
             return ChannelWebhookModel.model_validate(webhook) if webhook else None
 
+    def get_webhooks_by_ids(
+        self, webhook_ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, ChannelWebhookModel]:
+        if not webhook_ids:
+            return {}
+
+        with get_db_context(db) as db:
+            webhooks = (
+                db.query(ChannelWebhook)
+                .filter(ChannelWebhook.id.in_(webhook_ids))
+                .all()
+            )
+            return {w.id: ChannelWebhookModel.model_validate(w) for w in webhooks}
+
     def get_webhook_by_id_and_token(
         self, webhook_id: str, token: str, db: Optional[Session] = None
     ) -> Optional[ChannelWebhookModel]:
@@ -2,29 +2,32 @@ import logging
 import json
 import time
 import uuid
-from typing import Optional
+from typing import Iterator, Optional
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
+from open_webui.env import ENABLE_CHAT_MESSAGE_TABLE
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
 from open_webui.utils.misc import sanitize_data_for_db, sanitize_text_for_db
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import (
+    DDL,
     BigInteger,
     Boolean,
     Column,
     ForeignKey,
+    Integer,
     String,
     Text,
     JSON,
     Index,
     UniqueConstraint,
+    event,
 )
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
-from sqlalchemy.sql.expression import bindparam
 
 ####################
 # Chat DB Schema
@@ -32,6 +35,9 @@ from sqlalchemy.sql.expression import bindparam
 
 log = logging.getLogger(__name__)
 
+# Set in `chat.chat` when its history messages are stored in the `chat_message` table
+CHAT_MESSAGE_TABLE_KEY = "_chat_message_table"
+
 
 class Chat(Base):
     __tablename__ = "chat"
@@ -63,6 +69,9 @@ class Chat(Base):
         Index("updated_at_user_id_idx", "updated_at", "user_id"),
         # WHERE folder_id = ... AND user_id = ...
         Index("folder_id_user_id_idx", "folder_id", "user_id"),
+        # Keyset pagination of exports, ORDER BY created_at, id
+        Index("created_at_id_idx", "created_at", "id"),
+        Index("user_id_created_at_id_idx", "user_id", "created_at", "id"),
     )
 
 
@@ -85,6 +94,30 @@ class ChatModel(BaseModel):
     folder_id: Optional[str] = None
 
 
+class ChatInfoModel(BaseModel):
+    """A chat without its `chat` JSON, for checks and listings that never read it."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: str
+    title: str
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+    share_id: Optional[str] = None
+    archived: bool = False
+    pinned: Optional[bool] = False
+
+    meta: dict = {}
+    folder_id: Optional[str] = None
+
+
+# Columns selected instead of the whole row when only a ChatInfoModel is needed
+CHAT_INFO_COLUMNS = [getattr(Chat, field) for field in ChatInfoModel.model_fields]
+
+
 class ChatFile(Base):
     __tablename__ = "chat_file"
 
@@ -117,6 +150,108 @@ class ChatFileModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ChatMessage(Base):
+    __tablename__ = "chat_message"
+
+    chat_id = Column(Text, ForeignKey("chat.id", ondelete="CASCADE"), primary_key=True)
+    id = Column(Text, primary_key=True)
+    parent_id = Column(Text, nullable=True)
+    role = Column(Text, nullable=True)
+
+    # Full message object as it appears in `chat.history.messages`
+    data = Column(JSON)
+
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        # WHERE chat_id = ... AND parent_id = ...
+        Index("chat_message_chat_id_parent_id_idx", "chat_id", "parent_id"),
+    )
+
+
+class ChatSearch(Base):
+    """
+    Lowercased title and message contents of a chat, one row per message and a
+    row with an empty `message_id` for the title. Searched through an FTS5
+    trigram table on SQLite and a pg_trgm index on PostgreSQL.
+    """
+
+    __tablename__ = "chat_search"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chat_id = Column(Text, nullable=False)
+    message_id = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+    content = Column(Text, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "chat_id", "message_id", name="uq_chat_search_chat_id_message_id"
+        ),
+        # WHERE user_id = ...
+        Index("chat_search_user_id_idx", "user_id"),
+    )
+
+
+# SQLite: external-content FTS5 table kept in sync with `chat_search` by triggers.
+# The trigram tokenizer answers `LIKE '%...%'` from the index.
+CHAT_SEARCH_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS chat_search_fts USING fts5("
+    "content, content='chat_search', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS chat_search_ai AFTER INSERT ON chat_search BEGIN "
+    "INSERT INTO chat_search_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS chat_search_ad AFTER DELETE ON chat_search BEGIN "
+    "INSERT INTO chat_search_fts(chat_search_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS chat_search_au AFTER UPDATE ON chat_search BEGIN "
+    "INSERT INTO chat_search_fts(chat_search_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); "
+    "INSERT INTO chat_search_fts(rowid, content) VALUES (new.id, new.content); END",
+]
+
+for statement in CHAT_SEARCH_SQLITE_DDL:
+    event.listen(
+        ChatSearch.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+
+
+def get_chat_search_contents(title: Optional[str], chat: dict) -> dict[str, str]:
+    """
+    Return the searchable text of a chat keyed by message id, with the title
+    under an empty key. Both `history.messages` and the flat `messages` list
+    are read.
+    """
+    contents = {"": (title or "").lower()}
+
+    messages = list(
+        ((chat.get("history", {}) or {}).get("messages", {}) or {}).values()
+    )
+    messages += chat.get("messages", []) or []
+    for message in messages:
+        if not isinstance(message, dict) or not message.get("id"):
+            continue
+        content = message.get("content")
+        if isinstance(content, str) and message["id"] not in contents:
+            contents[message["id"]] = sanitize_text_for_db(content).lower()
+    return contents
+
+
+class ChatMessageModel(BaseModel):
+    chat_id: str
+    id: str
+    parent_id: Optional[str] = None
+    role: Optional[str] = None
+    data: dict
+
+    created_at: int
+    updated_at: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 ####################
 # Forms
 ####################
@@ -281,6 +416,189 @@ class ChatTable:
 
         return changed
 
+    def _to_chat_model(
+        self, chat_item, db: Session, messages_map: Optional[dict] = None
+    ) -> ChatModel:
+        """
+        Build a ChatModel from a Chat row. If the chat's history messages live in
+        the `chat_message` table, they are merged back into `history.messages`
+        so callers always see the legacy JSON shape.
+        """
+        chat = chat_item.chat or {}
+        if not chat.get(CHAT_MESSAGE_TABLE_KEY):
+            return ChatModel.model_validate(chat_item)
+
+        if messages_map is None:
+            messages_map = self._get_messages_maps([chat_item.id], db).get(
+                chat_item.id, {}
+            )
+
+        chat = {k: v for k, v in chat.items() if k != CHAT_MESSAGE_TABLE_KEY}
+        history = chat.get("history", {}) or {}
+        chat["history"] = {
+            **history,
+            "messages": {**(history.get("messages", {}) or {}), **messages_map},
+        }
+
+        chat_model = ChatModel.model_validate(chat_item)
+        chat_model.chat = chat
+        return chat_model
+
+    def _to_chat_models(self, chat_items, db: Session) -> list[ChatModel]:
+        chat_items = list(chat_items)
+        messages_maps = self._get_messages_maps(
+            [
+                chat_item.id
+                for chat_item in chat_items
+                if (chat_item.chat or {}).get(CHAT_MESSAGE_TABLE_KEY)
+            ],
+            db,
+        )
+        return [
+            self._to_chat_model(chat_item, db, messages_maps.get(chat_item.id, {}))
+            for chat_item in chat_items
+        ]
+
+    def _get_messages_maps(self, chat_ids: list[str], db: Session) -> dict[str, dict]:
+        if not chat_ids:
+            return {}
+
+        messages_maps = {}
+        for row in (
+            db.query(ChatMessage.chat_id, ChatMessage.id, ChatMessage.data)
+            .filter(ChatMessage.chat_id.in_(chat_ids))
+            .all()
+        ):
+            messages_maps.setdefault(row.chat_id, {})[row.id] = row.data or {}
+        return messages_maps
+
+    def _store_messages(self, id: str, chat: dict, db: Session) -> dict:
+        """
+        Sync `history.messages` of a chat JSON into `chat_message` rows, only
+        writing rows that changed, and return the JSON without the messages.
+        """
+        history = chat.get("history", {}) or {}
+        messages_map = history.get("messages", {}) or {}
+
+        existing_rows = {
+            row.id: row for row in db.query(ChatMessage).filter_by(chat_id=id).all()
+        }
+
+        now = int(time.time())
+        for message_id, message in messages_map.items():
+            row = existing_rows.pop(message_id, None)
+            if row is None:
+                db.add(
+                    ChatMessage(
+                        chat_id=id,
+                        id=message_id,
+                        parent_id=message.get("parentId"),
+                        role=message.get("role"),
+                        data=message,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+            elif row.data != message:
+                row.data = message
+                row.parent_id = message.get("parentId")
+                row.role = message.get("role")
+                row.updated_at = now
+
+        if existing_rows:
+            db.query(ChatMessage).filter(
+                ChatMessage.chat_id == id,
+                ChatMessage.id.in_(list(existing_rows.keys())),
+            ).delete(synchronize_session=False)
+
+        return {
+            **chat,
+            "history": {**history, "messages": {}},
+            CHAT_MESSAGE_TABLE_KEY: True,
+        }
+
+    def _get_message_row(
+        self, chat_item, message_id: str, db: Session
+    ) -> Optional[ChatMessage]:
+        """
+        Return the `chat_message` row for a message, moving the chat's messages
+        out of the JSON first if that has not happened yet.
+        """
+        if not (chat_item.chat or {}).get(CHAT_MESSAGE_TABLE_KEY):
+            chat_item.chat = self._store_messages(
+                chat_item.id, chat_item.chat or {}, db
+            )
+            db.flush()
+
+        return db.get(ChatMessage, (chat_item.id, message_id))
+
+    def _delete_messages_by_chat_ids(self, chat_ids, db: Session) -> None:
+        db.query(ChatMessage).filter(ChatMessage.chat_id.in_(chat_ids)).delete(
+            synchronize_session=False
+        )
+
+    def _update_search_index(
+        self, id: str, user_id: str, title: Optional[str], chat: dict, db: Session
+    ) -> None:
+        """
+        Sync the `chat_search` rows of a chat with its title and messages, only
+        writing rows that changed.
+        """
+        contents = get_chat_search_contents(title, chat)
+        existing_rows = {
+            row.message_id: row
+            for row in db.query(ChatSearch).filter_by(chat_id=id).all()
+        }
+
+        for message_id, content in contents.items():
+            row = existing_rows.pop(message_id, None)
+            if row is None:
+                db.add(
+                    ChatSearch(
+                        chat_id=id,
+                        message_id=message_id,
+                        user_id=user_id,
+                        content=content,
+                    )
+                )
+            elif row.content != content:
+                row.content = content
+
+        if existing_rows:
+            db.query(ChatSearch).filter(
+                ChatSearch.id.in_([row.id for row in existing_rows.values()])
+            ).delete(synchronize_session=False)
+
+    def _update_message_search_index(
+        self, chat_item, message_id: str, message: dict, db: Session
+    ) -> None:
+        content = message.get("content")
+        if not isinstance(content, str):
+            return
+
+        content = content.lower()
+        row = (
+            db.query(ChatSearch)
+            .filter_by(chat_id=chat_item.id, message_id=message_id)
+            .first()
+        )
+        if row is None:
+            db.add(
+                ChatSearch(
+                    chat_id=chat_item.id,
+                    message_id=message_id,
+                    user_id=chat_item.user_id,
+                    content=content,
+                )
+            )
+        elif row.content != content:
+            row.content = content
+
+    def _delete_search_index_by_chat_ids(self, chat_ids, db: Session) -> None:
+        db.query(ChatSearch).filter(ChatSearch.chat_id.in_(chat_ids)).delete(
+            synchronize_session=False
+        )
+
     def insert_new_chat(
         self, user_id: str, form_data: ChatForm, db: Optional[Session] = None
     ) -> Optional[ChatModel]:
@@ -304,9 +622,15 @@ class ChatTable:
 
             chat_item = Chat(**chat.model_dump())
             db.add(chat_item)
+            self._update_search_index(id, user_id, chat.title, chat.chat, db)
+
+            if ENABLE_CHAT_MESSAGE_TABLE:
+                db.flush()
+                chat_item.chat = self._store_messages(id, chat_item.chat, db)
+
             db.commit()
             db.refresh(chat_item)
-            return ChatModel.model_validate(chat_item) if chat_item else None
+            return self._to_chat_model(chat_item, db) if chat_item else None
 
     def _chat_import_form_to_chat_model(
         self, user_id: str, form_data: ChatImportForm
@@ -345,6 +669,7 @@ class ChatTable:
             for form_data in chat_import_forms:
                 chat = self._chat_import_form_to_chat_model(user_id, form_data)
                 chats.append(Chat(**chat.model_dump()))
+                self._update_search_index(chat.id, user_id, chat.title, chat.chat, db)
 
             db.add_all(chats)
             db.commit()
@@ -356,19 +681,25 @@ class ChatTable:
         try:
             with get_db_context(db) as db:
                 chat_item = db.get(Chat, id)
-                chat_item.chat = self._clean_null_bytes(chat)
-                chat_item.title = (
-                    self._clean_null_bytes(chat["title"])
-                    if "title" in chat
-                    else "New Chat"
-                )
+                chat = self._clean_null_bytes(chat)
+                title = chat["title"] if "title" in chat else "New Chat"
+                self._update_search_index(id, chat_item.user_id, title, chat, db)
+
+                if ENABLE_CHAT_MESSAGE_TABLE:
+                    chat = self._store_messages(id, chat, db)
+                elif (chat_item.chat or {}).get(CHAT_MESSAGE_TABLE_KEY):
+                    # The JSON holds the full history again, drop the stale rows
+                    self._delete_messages_by_chat_ids([id], db)
+
+                chat_item.chat = chat
+                chat_item.title = title
 
                 chat_item.updated_at = int(time.time())
 
                 db.commit()
                 db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                return self._to_chat_model(chat_item, db)
         except Exception:
             return None
 
@@ -402,40 +733,79 @@ class ChatTable:
             self.add_chat_tag_by_id_and_user_id_and_tag_name(id, user.id, tag_name)
         return self.get_chat_by_id(id)
 
-    def get_chat_title_by_id(self, id: str) -> Optional[str]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
-
-        return chat.chat.get("title", "New Chat")
+    def get_chat_title_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[str]:
+        with get_db_context(db) as db:
+            # The title column mirrors `chat.title`, "New Chat" if it is not set
+            return db.query(Chat.title).filter_by(id=id).scalar()
 
-    def get_messages_map_by_chat_id(self, id: str) -> Optional[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+    def get_messages_map_by_chat_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[dict]:
+        with get_db_context(db) as db:
+            # Extract only the messages from the chat JSON in the database
+            row = (
+                db.query(
+                    Chat.chat[CHAT_MESSAGE_TABLE_KEY].label("stored"),
+                    Chat.chat[("history", "messages")].label("messages"),
+                )
+                .filter_by(id=id)
+                .first()
+            )
+            if row is None:
+                return None
 
-        return chat.chat.get("history", {}).get("messages", {}) or {}
+            messages_map = row.messages or {}
+            if row.stored:
+                messages_map = {
+                    **messages_map,
+                    **self._get_messages_maps([id], db).get(id, {}),
+                }
+            return messages_map
 
     def get_message_by_id_and_message_id(
-        self, id: str, message_id: str
+        self, id: str, message_id: str, db: Optional[Session] = None
     ) -> Optional[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        with get_db_context(db) as db:
+            chat_item = db.get(Chat, id)
+            if chat_item is None:
+                return None
 
-        return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
+            chat = chat_item.chat or {}
+            if chat.get(CHAT_MESSAGE_TABLE_KEY):
+                row = db.get(ChatMessage, (id, message_id))
+                if row is not None:
+                    return row.data or {}
 
-    def upsert_message_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, message: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+            return chat.get("history", {}).get("messages", {}).get(message_id, {})
 
+    def upsert_message_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, message: dict, db: Optional[Session] = None
+    ) -> Optional[dict]:
+        """
+        Merge `message` into the message `message_id` of a chat and make it the
+        current one. Returns the stored message, or None if the write failed.
+        """
         # Sanitize message content for null characters before upserting
         if isinstance(message.get("content"), str):
             message["content"] = sanitize_text_for_db(message["content"])
 
+        if ENABLE_CHAT_MESSAGE_TABLE:
+            return self._upsert_message_row(id, message_id, message, db=db)
+
+        with get_db_context(db) as db:
+            chat_item = db.get(Chat, id)
+            if chat_item is None:
+                return None
+            if not (chat_item.chat or {}).get(CHAT_MESSAGE_TABLE_KEY):
+                return self._upsert_message_json(chat_item, message_id, message, db)
+
+        # The messages are still in rows, the full save moves them back to the JSON
+        chat = self.get_chat_by_id(id, db=db)
+        if chat is None:
+            return None
+
         chat = chat.chat
         history = chat.get("history", {})
 
@@ -450,30 +820,161 @@ class ChatTable:
         history["currentId"] = message_id
 
         chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        chat = self.update_chat_by_id(id, chat, db=db)
+        if chat is None:
+            return None
+        return chat.chat["history"]["messages"][message_id]
+
+    def _upsert_message_json(
+        self, chat_item, message_id: str, message: dict, db: Session
+    ) -> Optional[dict]:
+        """
+        Merge a single message into the chat JSON; only the search row of that
+        message is updated.
+        """
+        try:
+            chat = chat_item.chat or {}
+            history = chat.get("history", {}) or {}
+            messages = history.get("messages", {}) or {}
+            message = self._clean_null_bytes(
+                {**messages.get(message_id, {}), **message}
+            )
+
+            chat_item.chat = {
+                **chat,
+                "history": {
+                    **history,
+                    "messages": {**messages, message_id: message},
+                    "currentId": message_id,
+                },
+            }
+            self._update_message_search_index(chat_item, message_id, message, db)
+
+            chat_item.updated_at = int(time.time())
+            db.commit()
+
+            return message
+        except Exception as e:
+            log.exception(
+                f"Error upserting message {message_id} of chat {chat_item.id}: {e}"
+            )
+            return None
+
+    def _upsert_message_row(
+        self, id: str, message_id: str, message: dict, db: Optional[Session] = None
+    ) -> Optional[dict]:
+        """
+        Upsert a single `chat_message` row; the chat JSON is only written when
+        `history.currentId` changes.
+        """
+        try:
+            with get_db_context(db) as db:
+                chat_item = db.get(Chat, id)
+                if chat_item is None:
+                    return None
+
+                now = int(time.time())
+                row = self._get_message_row(chat_item, message_id, db)
+                if row is None:
+                    row = ChatMessage(
+                        chat_id=id,
+                        id=message_id,
+                        parent_id=message.get("parentId"),
+                        role=message.get("role"),
+                        data=message,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                    db.add(row)
+                else:
+                    row.data = {**(row.data or {}), **message}
+                    row.parent_id = row.data.get("parentId")
+                    row.role = row.data.get("role")
+                    row.updated_at = now
+                self._update_message_search_index(chat_item, message_id, message, db)
+
+                history = chat_item.chat.get("history", {}) or {}
+                if history.get("currentId") != message_id:
+                    chat_item.chat = {
+                        **chat_item.chat,
+                        "history": {**history, "currentId": message_id},
+                    }
+
+                chat_item.updated_at = now
+                db.commit()
+
+                return row.data
+        except Exception as e:
+            log.exception(f"Error upserting message {message_id} of chat {id}: {e}")
+            return None
 
     def add_message_status_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, status: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
+        self, id: str, message_id: str, status: dict, db: Optional[Session] = None
+    ) -> Optional[dict]:
+        """
+        Append `status` to the `statusHistory` of a message. Returns the
+        updated message, or None if the chat or the message does not exist.
+        """
+        if ENABLE_CHAT_MESSAGE_TABLE:
+            with get_db_context(db) as db:
+                chat_item = db.get(Chat, id)
+                if chat_item is None:
+                    return None
+
+                row = self._get_message_row(chat_item, message_id, db)
+                if row is not None:
+                    row.data = {
+                        **(row.data or {}),
+                        "statusHistory": [
+                            *(row.data or {}).get("statusHistory", []),
+                            status,
+                        ],
+                    }
+                    row.updated_at = int(time.time())
+
+                db.commit()
+                return row.data if row is not None else None
+
+        chat = self.get_chat_by_id(id, db=db)
         if chat is None:
             return None
 
         chat = chat.chat
         history = chat.get("history", {})
 
-        if message_id in history.get("messages", {}):
-            status_history = history["messages"][message_id].get("statusHistory", [])
-            status_history.append(status)
-            history["messages"][message_id]["statusHistory"] = status_history
+        if message_id not in history.get("messages", {}):
+            return None
+
+        status_history = history["messages"][message_id].get("statusHistory", [])
+        status_history.append(status)
+        history["messages"][message_id]["statusHistory"] = status_history
 
         chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        chat = self.update_chat_by_id(id, chat, db=db)
+        if chat is None:
+            return None
+        return chat.chat["history"]["messages"][message_id]
 
     def add_message_files_by_id_and_message_id(
         self, id: str, message_id: str, files: list[dict]
     ) -> list[dict]:
         with get_db_context() as db:
+            if ENABLE_CHAT_MESSAGE_TABLE:
+                chat_item = db.get(Chat, id)
+                if chat_item is None:
+                    return None
+
+                message_files = []
+
+                row = self._get_message_row(chat_item, message_id, db)
+                if row is not None:
+                    message_files = (row.data or {}).get("files", []) + files
+                    row.data = {**(row.data or {}), "files": message_files}
+                    row.updated_at = int(time.time())
+
+                db.commit()
+                return message_files
+
             chat = self.get_chat_by_id(id, db=db)
             if chat is None:
                 return None
@@ -510,7 +1011,7 @@ class ChatTable:
                     "id": str(uuid.uuid4()),
                     "user_id": f"shared-{chat_id}",
                     "title": chat.title,
-                    "chat": chat.chat,
+                    "chat": self._to_chat_model(chat, db).chat,
                     "meta": chat.meta,
                     "pinned": chat.pinned,
                     "folder_id": chat.folder_id,
@@ -546,7 +1047,7 @@ class ChatTable:
                     return self.insert_shared_chat_by_chat_id(chat_id, db=db)
 
                 shared_chat.title = chat.title
-                shared_chat.chat = chat.chat
+                shared_chat.chat = self._to_chat_model(chat, db).chat
                 shared_chat.meta = chat.meta
                 shared_chat.pinned = chat.pinned
                 shared_chat.folder_id = chat.folder_id
@@ -590,7 +1091,7 @@ class ChatTable:
                 chat.share_id = share_id
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -604,7 +1105,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -619,7 +1120,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -641,10 +1142,12 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatInfoModel]:
 
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id, archived=True)
+            query = db.query(*CHAT_INFO_COLUMNS).filter_by(
+                user_id=user_id, archived=True
+            )
 
             if filter:
                 query_key = filter.get("query")
@@ -673,7 +1176,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatInfoModel.model_validate(chat) for chat in all_chats]
 
     def get_chat_list_by_user_id(
         self,
@@ -683,9 +1186,9 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatInfoModel]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = db.query(*CHAT_INFO_COLUMNS).filter_by(user_id=user_id)
             if not include_archived:
                 query = query.filter_by(archived=False)
 
@@ -713,7 +1216,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatInfoModel.model_validate(chat) for chat in all_chats]
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -776,7 +1279,7 @@ class ChatTable:
                 .order_by(Chat.updated_at.desc())
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chat_by_id(
         self, id: str, db: Optional[Session] = None
@@ -791,7 +1294,7 @@ class ChatTable:
                     db.commit()
                     db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                return self._to_chat_model(chat_item, db)
         except Exception:
             return None
 
@@ -811,13 +1314,37 @@ class ChatTable:
         except Exception:
             return None
 
+    def is_chat_owned_by_user(
+        self, id: str, user_id: str, db: Optional[Session] = None
+    ) -> bool:
+        with get_db_context(db) as db:
+            return db.query(
+                db.query(Chat).filter_by(id=id, user_id=user_id).exists()
+            ).scalar()
+
+    def get_chat_info_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[ChatInfoModel]:
+        with get_db_context(db) as db:
+            chat = db.query(*CHAT_INFO_COLUMNS).filter_by(id=id).first()
+            return ChatInfoModel.model_validate(chat) if chat else None
+
+    def get_chat_info_by_id_and_user_id(
+        self, id: str, user_id: str, db: Optional[Session] = None
+    ) -> Optional[ChatInfoModel]:
+        with get_db_context(db) as db:
+            chat = (
+                db.query(*CHAT_INFO_COLUMNS).filter_by(id=id, user_id=user_id).first()
+            )
+            return ChatInfoModel.model_validate(chat) if chat else None
+
     def get_chat_by_id_and_user_id(
         self, id: str, user_id: str, db: Optional[Session] = None
     ) -> Optional[ChatModel]:
         try:
             with get_db_context(db) as db:
                 chat = db.query(Chat).filter_by(id=id, user_id=user_id).first()
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -830,7 +1357,70 @@ class ChatTable:
                 # .limit(limit).offset(skip)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
+
+    def iter_chats(
+        self,
+        user_id: Optional[str] = None,
+        updated_at: Optional[int] = None,
+        order_by: str = "created_at",
+        direction: str = "asc",
+        batch_size: int = 100,
+        db: Optional[Session] = None,
+    ) -> Iterator[list[ChatModel]]:
+        """
+        Yield batches of chats ordered by (`order_by`, id), optionally only the
+        chats of `user_id` and only those updated after `updated_at`.
+
+        Pages are fetched by keyset instead of OFFSET so every batch costs the
+        same however deep the export is. `created_at` never changes, so that
+        order yields every chat exactly once. Ordered by `updated_at`, a chat
+        updated during the export moves past the keyset: ascending it is
+        yielded again later, descending it can be missed. Unless a shared
+        session is passed, each batch runs in its own short-lived session so
+        a long export doesn't hold SQLite locks between batches.
+        """
+        column = Chat.updated_at if order_by == "updated_at" else Chat.created_at
+        descending = direction.lower() == "desc"
+
+        last = None
+        while True:
+            with get_db_context(db) as db_session:
+                query = db_session.query(Chat)
+                if user_id is not None:
+                    query = query.filter(Chat.user_id == user_id)
+                if updated_at is not None:
+                    query = query.filter(Chat.updated_at > updated_at)
+                if last is not None:
+                    if descending:
+                        query = query.filter(
+                            or_(
+                                column < last[0],
+                                and_(column == last[0], Chat.id < last[1]),
+                            )
+                        )
+                    else:
+                        query = query.filter(
+                            or_(
+                                column > last[0],
+                                and_(column == last[0], Chat.id > last[1]),
+                            )
+                        )
+
+                if descending:
+                    query = query.order_by(column.desc(), Chat.id.desc())
+                else:
+                    query = query.order_by(column.asc(), Chat.id.asc())
+                chat_items = query.limit(batch_size).all()
+                chats = self._to_chat_models(chat_items, db_session)
+
+            if not chats:
+                return
+            yield chats
+
+            if len(chats) < batch_size:
+                return
+            last = (getattr(chats[-1], column.key), chats[-1].id)
 
     def get_chats_by_user_id(
         self,
@@ -873,21 +1463,21 @@ class ChatTable:
 
             return ChatListResponse(
                 **{
-                    "items": [ChatModel.model_validate(chat) for chat in all_chats],
+                    "items": self._to_chat_models(all_chats, db),
                     "total": total,
                 }
             )
 
     def get_pinned_chats_by_user_id(
         self, user_id: str, db: Optional[Session] = None
-    ) -> list[ChatModel]:
+    ) -> list[ChatInfoModel]:
         with get_db_context(db) as db:
             all_chats = (
-                db.query(Chat)
+                db.query(*CHAT_INFO_COLUMNS)
                 .filter_by(user_id=user_id, pinned=True, archived=False)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatInfoModel.model_validate(chat) for chat in all_chats]
 
     def get_archived_chats_by_user_id(
         self, user_id: str, db: Optional[Session] = None
@@ -898,7 +1488,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chats_by_user_id_and_search_text(
         self,
@@ -915,9 +1505,13 @@ class ChatTable:
         search_text = sanitize_text_for_db(search_text).lower().strip()
 
         if not search_text:
-            return self.get_chat_list_by_user_id(
-                user_id, include_archived, filter={}, skip=skip, limit=limit, db=db
-            )
+            # Full chats like the searches, callers read their messages
+            with get_db_context(db) as db:
+                query = db.query(Chat).filter_by(user_id=user_id)
+                if not include_archived:
+                    query = query.filter_by(archived=False)
+                query = query.order_by(Chat.updated_at.desc())
+                return self._to_chat_models(query.offset(skip).limit(limit).all(), db)
 
         search_text_words = search_text.split(" ")
 
@@ -936,6 +1530,7 @@ class ChatTable:
                 for word in search_text_words
                 if word.startswith("folder:")
             ],
+            db=db,
         )
         folder_ids = [folder.id for folder in folders]
 
@@ -996,20 +1591,21 @@ class ChatTable:
             # Check if the database dialect is either 'sqlite' or 'postgresql'
             dialect_name = db.bind.dialect.name
             if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                sqlite_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_each(Chat.chat, '$.messages') AS message "
-                    "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                sqlite_content_clause = text(sqlite_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")), sqlite_content_clause
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
+                # SQLite case: the trigram FTS5 table answers the LIKE from its index
+                if search_text:
+                    query = query.filter(
+                        Chat.id.in_(
+                            select(ChatSearch.chat_id).where(
+                                ChatSearch.user_id == user_id,
+                                text(
+                                    "chat_search.id IN ("
+                                    "    SELECT rowid FROM chat_search_fts "
+                                    "    WHERE chat_search_fts.content LIKE :content_key"
+                                    ")"
+                                ).bindparams(content_key=f"%{search_text}%"),
+                            )
+                        )
+                    )
 
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
@@ -1042,32 +1638,17 @@ class ChatTable:
                     )
 
             elif dialect_name == "postgresql":
-                # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
-                # the JSON representation for \u0000 before attempting text extraction
-
-                # Safety filter: JSON field must not contain \u0000
-                query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
-
-                # Safety filter: title must not contain actual null bytes
-                query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
-
-                postgres_content_sql = """
-                EXISTS (
-                    SELECT 1
-                    FROM json_array_elements(Chat.chat->'messages') AS message
-                    WHERE json_typeof(message->'content') = 'string'
-                    AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
-                )
-                """
-
-                postgres_content_clause = text(postgres_content_sql)
-
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")),
-                        postgres_content_clause,
+                # PostgreSQL case: the pg_trgm GIN index answers the LIKE, the
+                # indexed content is already lowercased and free of null bytes
+                if search_text:
+                    query = query.filter(
+                        Chat.id.in_(
+                            select(ChatSearch.chat_id).where(
+                                ChatSearch.user_id == user_id,
+                                ChatSearch.content.like(f"%{search_text}%"),
+                            )
+                        )
                     )
-                ).params(title_key=f"%{search_text}%", content_key=search_text.lower())
 
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
@@ -1109,7 +1690,7 @@ class ChatTable:
             log.info(f"The number of chats: {len(all_chats)}")
 
             # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chats_by_folder_id_and_user_id(
         self,
@@ -1118,9 +1699,11 @@ class ChatTable:
         skip: int = 0,
         limit: int = 60,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatInfoModel]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(folder_id=folder_id, user_id=user_id)
+            query = db.query(*CHAT_INFO_COLUMNS).filter_by(
+                folder_id=folder_id, user_id=user_id
+            )
             query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
             query = query.filter_by(archived=False)
 
@@ -1132,7 +1715,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatInfoModel.model_validate(chat) for chat in all_chats]
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str, db: Optional[Session] = None
@@ -1147,7 +1730,7 @@ class ChatTable:
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str, db: Optional[Session] = None
@@ -1160,7 +1743,7 @@ class ChatTable:
                 chat.pinned = False
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -1179,9 +1762,9 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatInfoModel]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = db.query(*CHAT_INFO_COLUMNS).filter_by(user_id=user_id)
             tag_id = tag_name.replace(" ", "_").lower()
 
             log.info(f"DB dialect name: {db.bind.dialect.name}")
@@ -1206,7 +1789,7 @@ class ChatTable:
 
             all_chats = query.all()
             log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatInfoModel.model_validate(chat) for chat in all_chats]
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str, db: Optional[Session] = None
@@ -1227,7 +1810,7 @@ class ChatTable:
 
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -1319,6 +1902,8 @@ class ChatTable:
     def delete_chat_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         try:
             with get_db_context(db) as db:
+                self._delete_messages_by_chat_ids([id], db)
+                self._delete_search_index_by_chat_ids([id], db)
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1331,6 +1916,9 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db_context(db) as db:
+                chat_ids = select(Chat.id).where(Chat.id == id, Chat.user_id == user_id)
+                self._delete_messages_by_chat_ids(chat_ids, db)
+                self._delete_search_index_by_chat_ids(chat_ids, db)
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -1345,6 +1933,9 @@ class ChatTable:
             with get_db_context(db) as db:
                 self.delete_shared_chats_by_user_id(user_id, db=db)
 
+                chat_ids = select(Chat.id).where(Chat.user_id == user_id)
+                self._delete_messages_by_chat_ids(chat_ids, db)
+                self._delete_search_index_by_chat_ids(chat_ids, db)
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1357,6 +1948,11 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db_context(db) as db:
+                chat_ids = select(Chat.id).where(
+                    Chat.user_id == user_id, Chat.folder_id == folder_id
+                )
+                self._delete_messages_by_chat_ids(chat_ids, db)
+                self._delete_search_index_by_chat_ids(chat_ids, db)
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
@@ -1492,7 +2088,7 @@ class ChatTable:
                 .all()
             )
 
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
 
 Chats = ChatTable()
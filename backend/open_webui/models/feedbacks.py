@@ -1,14 +1,23 @@
 import logging
 import time
 import uuid
-from typing import Optional
+from typing import Iterable, Optional
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.users import User
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Float,
+    Text,
+    JSON,
+    Boolean,
+    PrimaryKeyConstraint,
+)
+from sqlalchemy.exc import IntegrityError
 
 log = logging.getLogger(__name__)
 
@@ -31,6 +40,44 @@ class Feedback(Base):
     updated_at = Column(BigInteger)
 
 
+class Leaderboard(Base):
+    """Elo rating and tag counts of a model, maintained as feedbacks change."""
+
+    __tablename__ = "leaderboard"
+    model_id = Column(Text, primary_key=True, unique=True)
+    rating = Column(Float, nullable=False)
+    won = Column(BigInteger, nullable=False)
+    lost = Column(BigInteger, nullable=False)
+    tags = Column(JSON, nullable=True)  # {tag: count} of the feedbacks on the model
+    updated_at = Column(BigInteger)
+
+
+class LeaderboardState(Base):
+    """
+    The last feedback applied to the leaderboard, in (created_at, id) order.
+
+    The leaderboard is stale when a feedback can't be applied on top of it, as
+    Elo ratings depend on the order of the feedbacks, and is then rebuilt.
+    """
+
+    __tablename__ = "leaderboard_state"
+    id = Column(Text, primary_key=True, unique=True)
+    stale = Column(Boolean, nullable=False)
+    last_created_at = Column(BigInteger, nullable=True)
+    last_feedback_id = Column(Text, nullable=True)
+    updated_at = Column(BigInteger)
+
+
+class TagEmbedding(Base):
+    __tablename__ = "tag_embedding"
+    model = Column(Text, nullable=False)
+    tag = Column(Text, nullable=False)
+    embedding = Column(JSON, nullable=False)
+    created_at = Column(BigInteger)
+
+    __table_args__ = (PrimaryKeyConstraint("model", "tag", name="pk_model_tag"),)
+
+
 class FeedbackModel(BaseModel):
     id: str
     user_id: str
@@ -138,6 +185,97 @@ class ModelHistoryResponse(BaseModel):
     history: list[ModelHistoryEntry]
 
 
+class LeaderboardModel(BaseModel):
+    model_id: str
+    rating: float
+    won: int
+    lost: int
+    tags: Optional[dict] = None
+    updated_at: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
+
+
+####################
+# Leaderboard Elo Rating Computation
+####################
+
+ELO_K_FACTOR = 32  # Standard Elo K-factor for rating volatility
+ELO_INITIAL_RATING = 1000.0
+
+
+def get_leaderboard_fields(data: Optional[dict]) -> tuple:
+    """The fields of feedback data that the leaderboard is computed from."""
+    data = data or {}
+    return (
+        data.get("model_id"),
+        str(data.get("rating", "")),
+        data.get("sibling_model_ids") or [],
+        data.get("tags") or [],
+    )
+
+
+def apply_feedback_elo(model_stats: dict, data: Optional[dict], weight: float = 1.0):
+    """
+    Apply a feedback to the Elo ratings of its models, in place.
+
+    A feedback is a comparison where a user rated one model against its
+    opponents (sibling_model_ids). Rating=1 means the model won, rating=-1
+    means it lost. Upsets cause bigger swings, weighted by the optional
+    similarity of the feedback to a query.
+    """
+    winner_id, rating_value, opponent_ids, _ = get_leaderboard_fields(data)
+    if not winner_id or rating_value not in ("1", "-1"):
+        return
+
+    def get_or_create_stats(model_id):
+        if model_id not in model_stats:
+            model_stats[model_id] = {"rating": ELO_INITIAL_RATING, "won": 0, "lost": 0}
+        return model_stats[model_id]
+
+    won = rating_value == "1"
+    for opponent_id in opponent_ids:
+        winner = get_or_create_stats(winner_id)
+        opponent = get_or_create_stats(opponent_id)
+        expected = 1 / (1 + 10 ** ((opponent["rating"] - winner["rating"]) / 400))
+
+        winner["rating"] += ELO_K_FACTOR * ((1 if won else 0) - expected) * weight
+        opponent["rating"] += (
+            ELO_K_FACTOR * ((0 if won else 1) - (1 - expected)) * weight
+        )
+
+        if won:
+            winner["won"] += 1
+            opponent["lost"] += 1
+        else:
+            winner["lost"] += 1
+            opponent["won"] += 1
+
+
+def apply_feedback_tags(model_tags: dict, data: Optional[dict]):
+    """Count the tags of a feedback on its model, in place."""
+    model_id, _, _, tags = get_leaderboard_fields(data)
+    if model_id:
+        counts = model_tags.setdefault(model_id, {})
+        for tag in tags:
+            counts[tag] = counts.get(tag, 0) + 1
+
+
+def calculate_elo(
+    feedbacks: Iterable[LeaderboardFeedbackData], similarities: dict = None
+) -> dict:
+    """
+    Replay the feedbacks, in order, into Elo ratings.
+
+    Returns: {model_id: {"rating": float, "won": int, "lost": int}}
+    """
+    model_stats = {}
+    for feedback in feedbacks:
+        weight = similarities.get(feedback.id, 1.0) if similarities else 1.0
+        apply_feedback_elo(model_stats, feedback.data, weight)
+    return model_stats
+
+
 class FeedbackTable:
     def insert_new_feedback(
         self, user_id: str, form_data: FeedbackForm, db: Optional[Session] = None
@@ -160,7 +298,9 @@ class FeedbackTable:
                 db.commit()
                 db.refresh(result)
                 if result:
-                    return FeedbackModel.model_validate(result)
+                    feedback = FeedbackModel.model_validate(result)
+                    Leaderboards.apply_feedback(feedback, db=db)
+                    return feedback
                 else:
                     return None
             except Exception as e:
@@ -296,7 +436,9 @@ class FeedbackTable:
         with get_db_context(db) as db:
             return [
                 LeaderboardFeedbackData(id=row.id, data=row.data)
-                for row in db.query(Feedback.id, Feedback.data).all()
+                for row in db.query(Feedback.id, Feedback.data)
+                .order_by(Feedback.created_at, Feedback.id)
+                .all()
             ]
 
     def get_model_evaluation_history(
@@ -401,7 +543,12 @@ class FeedbackTable:
                 return None
 
             if form_data.data:
-                feedback.data = form_data.data.model_dump()
+                data = form_data.data.model_dump()
+                if get_leaderboard_fields(data) != get_leaderboard_fields(
+                    feedback.data
+                ):
+                    Leaderboards.mark_stale(db=db)
+                feedback.data = data
             if form_data.meta:
                 feedback.meta = form_data.meta
             if form_data.snapshot:
@@ -425,7 +572,12 @@ class FeedbackTable:
                 return None
 
             if form_data.data:
-                feedback.data = form_data.data.model_dump()
+                data = form_data.data.model_dump()
+                if get_leaderboard_fields(data) != get_leaderboard_fields(
+                    feedback.data
+                ):
+                    Leaderboards.mark_stale(db=db)
+                feedback.data = data
             if form_data.meta:
                 feedback.meta = form_data.meta
             if form_data.snapshot:
@@ -442,6 +594,7 @@ class FeedbackTable:
             if not feedback:
                 return False
             db.delete(feedback)
+            Leaderboards.mark_stale(db=db)
             db.commit()
             return True
 
@@ -453,6 +606,7 @@ class FeedbackTable:
             if not feedback:
                 return False
             db.delete(feedback)
+            Leaderboards.mark_stale(db=db)
             db.commit()
             return True
 
@@ -465,6 +619,7 @@ class FeedbackTable:
                 return False
             for feedback in feedbacks:
                 db.delete(feedback)
+            Leaderboards.mark_stale(db=db)
             db.commit()
             return True
 
@@ -475,8 +630,190 @@ class FeedbackTable:
                 return False
             for feedback in feedbacks:
                 db.delete(feedback)
+            Leaderboards.mark_stale(db=db)
             db.commit()
             return True
 
 
+LEADERBOARD_STATE_ID = "leaderboard"
+
+
+class LeaderboardTable:
+    def _lock_state(self, db: Session) -> Optional[LeaderboardState]:
+        # Writing the row first takes its lock (the database lock on SQLite),
+        # so the leaderboard is updated by one transaction at a time
+        db.query(LeaderboardState).filter_by(id=LEADERBOARD_STATE_ID).update(
+            {"updated_at": int(time.time())}, synchronize_session=False
+        )
+        return db.query(LeaderboardState).filter_by(id=LEADERBOARD_STATE_ID).first()
+
+    def mark_stale(self, db: Optional[Session] = None):
+        """Have the leaderboard rebuilt on its next read, committed by the caller."""
+        with get_db_context(db) as db:
+            db.query(LeaderboardState).filter_by(id=LEADERBOARD_STATE_ID).update(
+                {"stale": True, "updated_at": int(time.time())},
+                synchronize_session=False,
+            )
+
+    def apply_feedback(self, feedback: FeedbackModel, db: Optional[Session] = None):
+        """
+        Apply a new feedback on top of the leaderboard. A feedback that doesn't
+        come after the last one applied marks the leaderboard stale instead.
+        """
+        with get_db_context(db) as db:
+            try:
+                state = self._lock_state(db)
+                if state is None or state.stale:
+                    db.commit()
+                    return
+
+                if (feedback.created_at, feedback.id) <= (
+                    state.last_created_at or 0,
+                    state.last_feedback_id or "",
+                ):
+                    state.stale = True
+                    db.commit()
+                    return
+
+                model_id, _, opponent_ids, _ = get_leaderboard_fields(feedback.data)
+                rows = {
+                    row.model_id: row
+                    for row in db.query(Leaderboard)
+                    .filter(Leaderboard.model_id.in_([model_id, *opponent_ids]))
+                    .all()
+                }
+                model_stats = {
+                    row.model_id: {
+                        "rating": row.rating,
+                        "won": row.won,
+                        "lost": row.lost,
+                    }
+                    for row in rows.values()
+                }
+                model_tags = {
+                    row.model_id: dict(row.tags or {}) for row in rows.values()
+                }
+                apply_feedback_elo(model_stats, feedback.data)
+                apply_feedback_tags(model_tags, feedback.data)
+
+                now = int(time.time())
+                for id in model_stats.keys() | model_tags.keys():
+                    row = rows.get(id)
+                    if row is None:
+                        row = Leaderboard(
+                            model_id=id, rating=ELO_INITIAL_RATING, won=0, lost=0
+                        )
+                        db.add(row)
+                    if id in model_stats:
+                        row.rating = model_stats[id]["rating"]
+                        row.won = model_stats[id]["won"]
+                        row.lost = model_stats[id]["lost"]
+                    row.tags = model_tags.get(id, row.tags)
+                    row.updated_at = now
+
+                state.last_created_at = feedback.created_at
+                state.last_feedback_id = feedback.id
+                db.commit()
+            except Exception as e:
+                log.exception(f"Error updating the leaderboard: {e}")
+                db.rollback()
+                self.mark_stale(db=db)
+                db.commit()
+
+    def rebuild(self, db: Optional[Session] = None) -> list[LeaderboardModel]:
+        """Replay all feedbacks, in order, into the leaderboard."""
+        with get_db_context(db) as db:
+            state = self._lock_state(db)
+            if state is None:
+                try:
+                    db.add(LeaderboardState(id=LEADERBOARD_STATE_ID, stale=True))
+                    db.commit()
+                except IntegrityError:
+                    # Created at the same time by another worker
+                    db.rollback()
+                state = self._lock_state(db)
+
+            model_stats = {}
+            model_tags = {}
+            last = None
+            for last in db.query(
+                Feedback.id, Feedback.created_at, Feedback.data
+            ).order_by(Feedback.created_at, Feedback.id):
+                apply_feedback_elo(model_stats, last.data)
+                apply_feedback_tags(model_tags, last.data)
+
+            now = int(time.time())
+            rows = [
+                Leaderboard(
+                    model_id=id,
+                    rating=model_stats.get(id, {}).get("rating", ELO_INITIAL_RATING),
+                    won=model_stats.get(id, {}).get("won", 0),
+                    lost=model_stats.get(id, {}).get("lost", 0),
+                    tags=model_tags.get(id),
+                    updated_at=now,
+                )
+                for id in model_stats.keys() | model_tags.keys()
+            ]
+            leaderboard = [LeaderboardModel.model_validate(row) for row in rows]
+
+            db.query(Leaderboard).delete()
+            db.add_all(rows)
+            state.stale = False
+            state.last_created_at = last.created_at if last else None
+            state.last_feedback_id = last.id if last else None
+            state.updated_at = now
+            db.commit()
+            return leaderboard
+
+    def get_leaderboard(self, db: Optional[Session] = None) -> list[LeaderboardModel]:
+        """Return the leaderboard of all models, rebuilt first if it is stale."""
+        with get_db_context(db) as db:
+            state = (
+                db.query(LeaderboardState).filter_by(id=LEADERBOARD_STATE_ID).first()
+            )
+            if state is None or state.stale:
+                return self.rebuild(db=db)
+            return [
+                LeaderboardModel.model_validate(row)
+                for row in db.query(Leaderboard).all()
+            ]
+
+
+class TagEmbeddingTable:
+    def get_embeddings(
+        self, model: str, tags: list[str], db: Optional[Session] = None
+    ) -> dict[str, list[float]]:
+        with get_db_context(db) as db:
+            return {
+                row.tag: row.embedding
+                for row in db.query(TagEmbedding.tag, TagEmbedding.embedding).filter(
+                    TagEmbedding.model == model, TagEmbedding.tag.in_(tags)
+                )
+            }
+
+    def insert_embeddings(
+        self,
+        model: str,
+        embeddings: dict[str, list[float]],
+        db: Optional[Session] = None,
+    ):
+        with get_db_context(db) as db:
+            now = int(time.time())
+            db.add_all(
+                [
+                    TagEmbedding(
+                        model=model, tag=tag, embedding=embedding, created_at=now
+                    )
+                    for tag, embedding in embeddings.items()
+                ]
+            )
+            try:
+                db.commit()
+            except IntegrityError:
+                # Embedded at the same time by another request
+                db.rollback()
+
+
 Feedbacks = FeedbackTable()
+Leaderboards = LeaderboardTable()
+TagEmbeddings = TagEmbeddingTable()
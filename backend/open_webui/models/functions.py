@@ -195,6 +195,20 @@ class FunctionsTable:
         except Exception:
             return None
 
+    def get_function_versions_by_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, int]:
+        """Map function ids to their updated_at, without loading the content."""
+        if not ids:
+            return {}
+        with get_db_context(db) as db:
+            rows = (
+                db.query(Function.id, Function.updated_at)
+                .filter(Function.id.in_(ids))
+                .all()
+            )
+            return {row.id: row.updated_at for row in rows}
+
     def get_functions(
         self, active_only=False, include_valves=False, db: Optional[Session] = None
     ) -> list[FunctionModel | FunctionWithValvesModel]:
@@ -27,6 +27,14 @@ from sqlalchemy import (
 
 log = logging.getLogger(__name__)
 
+
+def _evict_permissions(user_ids: Optional[list[str]] = None):
+    # Imported here, access_control imports this module
+    from open_webui.utils.access_control import PERMISSION_CACHE
+
+    PERMISSION_CACHE.evict(user_ids)
+
+
 ####################
 # UserGroup DB Schema
 ####################
@@ -356,6 +364,7 @@ class GroupTable:
 
             db.add_all(new_members)
             db.commit()
+            _evict_permissions()
 
     def get_group_member_count_by_id(
         self, id: str, db: Optional[Session] = None
@@ -384,6 +393,7 @@ class GroupTable:
                     }
                 )
                 db.commit()
+                _evict_permissions()
                 return self.get_group_by_id(id=id, db=db)
         except Exception as e:
             log.exception(e)
@@ -394,6 +404,7 @@ class GroupTable:
             with get_db_context(db) as db:
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                _evict_permissions()
                 return True
         except Exception:
             return False
@@ -403,6 +414,7 @@ class GroupTable:
             try:
                 db.query(Group).delete()
                 db.commit()
+                _evict_permissions()
 
                 return True
             except Exception:
@@ -432,6 +444,7 @@ class GroupTable:
                     )
 
                 db.commit()
+                _evict_permissions([user_id])
                 return True
 
             except Exception:
@@ -525,6 +538,8 @@ class GroupTable:
                     )
 
                 db.commit()
+                if groups_to_add or groups_to_remove:
+                    _evict_permissions([user_id])
                 return True
 
             except Exception as e:
@@ -565,6 +580,7 @@ class GroupTable:
 
                 group.updated_at = now
                 db.commit()
+                _evict_permissions(user_ids or [])
                 db.refresh(group)
 
                 return GroupModel.model_validate(group)
@@ -598,6 +614,7 @@ class GroupTable:
                 group.updated_at = int(time.time())
 
                 db.commit()
+                _evict_permissions(user_ids)
                 db.refresh(group)
                 return GroupModel.model_validate(group)
 
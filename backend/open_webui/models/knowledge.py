@@ -1,7 +1,7 @@
 import json
 import logging
 import time
-from typing import Optional
+from typing import Iterator, Optional
 import uuid
 
 from sqlalchemy.orm import Session
@@ -26,6 +26,7 @@ from sqlalchemy import (
     Text,
     JSON,
     UniqueConstraint,
+    and_,
     or_,
 )
 
@@ -121,6 +122,55 @@ class KnowledgeFileModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class KnowledgeReindexJob(Base):
+    __tablename__ = "knowledge_reindex_job"
+
+    id = Column(Text, unique=True, primary_key=True)
+    user_id = Column(Text, nullable=False)
+
+    status = Column(Text, nullable=False)  # pending, running, completed, failed
+    # Checkpoint the job resumes from:
+    #   {
+    #      "knowledge_ids": [...],            # all knowledge bases, in order
+    #      "completed_knowledge_ids": [...],  # swapped to their new index
+    #      "knowledge_id": "...",             # being built in its shadow collection
+    #      "file_ids": [...],                 # files of it already indexed
+    #      "errors": [{"knowledge_id", "file_id", "error"}],
+    #      "run_processed_files": 0,          # processed when this run started
+    #   }
+    data = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    total_files = Column(BigInteger, nullable=False)
+    processed_files = Column(BigInteger, nullable=False)
+    failed_files = Column(BigInteger, nullable=False)
+
+    started_at = Column(BigInteger, nullable=True)  # start of the current run
+    finished_at = Column(BigInteger, nullable=True)
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)  # heartbeat of the running job
+
+
+class KnowledgeReindexJobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: str
+
+    status: str
+    data: Optional[dict] = None
+    error: Optional[str] = None
+
+    total_files: int
+    processed_files: int
+    failed_files: int
+
+    started_at: Optional[int] = None  # timestamp in epoch
+    finished_at: Optional[int] = None  # timestamp in epoch
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
 ####################
 # Forms
 ####################
@@ -156,6 +206,11 @@ class KnowledgeFileListResponse(BaseModel):
     total: int
 
 
+class KnowledgeReindexJobResponse(KnowledgeReindexJobModel):
+    files_per_second: Optional[float] = None  # throughput of the current run
+    remaining_seconds: Optional[int] = None
+
+
 class KnowledgeTable:
     def insert_new_knowledge(
         self, user_id: str, form_data: KnowledgeForm, db: Optional[Session] = None
@@ -507,6 +562,54 @@ class KnowledgeTable:
         except Exception:
             return []
 
+    def get_file_ids_by_id(
+        self, knowledge_id: str, db: Optional[Session] = None
+    ) -> list[str]:
+        with get_db_context(db) as db:
+            return [
+                file_id
+                for (file_id,) in db.query(KnowledgeFile.file_id)
+                .filter(KnowledgeFile.knowledge_id == knowledge_id)
+                .order_by(KnowledgeFile.created_at, KnowledgeFile.id)
+                .all()
+            ]
+
+    def iter_files_by_id(
+        self,
+        knowledge_id: str,
+        batch_size: int = 100,
+        db: Optional[Session] = None,
+    ) -> Iterator[list[FileModel]]:
+        """
+        Yield the files of a knowledge base in batches ordered by id.
+
+        Pages are fetched by keyset, each in its own short-lived session unless
+        a shared session is passed, so a long export doesn't hold SQLite locks.
+        """
+        last_id = None
+        while True:
+            with get_db_context(db) as db_session:
+                query = (
+                    db_session.query(File)
+                    .join(KnowledgeFile, File.id == KnowledgeFile.file_id)
+                    .filter(KnowledgeFile.knowledge_id == knowledge_id)
+                )
+                if last_id is not None:
+                    query = query.filter(File.id > last_id)
+                files = [
+                    FileModel.model_validate(file)
+                    for file in query.order_by(File.id).limit(batch_size).all()
+                ]
+
+            if not files:
+                return
+            yield files
+            last_id = files[-1].id
+
+    def get_file_count(self, db: Optional[Session] = None) -> int:
+        with get_db_context(db) as db:
+            return db.query(KnowledgeFile).count()
+
     def get_file_metadatas_by_id(
         self, knowledge_id: str, db: Optional[Session] = None
     ) -> list[FileMetadataResponse]:
@@ -644,3 +747,130 @@ class KnowledgeTable:
 
 
 Knowledges = KnowledgeTable()
+
+
+class KnowledgeReindexJobTable:
+    def insert_new_job(
+        self,
+        user_id: str,
+        knowledge_ids: list[str],
+        total_files: int,
+        db: Optional[Session] = None,
+    ) -> Optional[KnowledgeReindexJobModel]:
+        with get_db_context(db) as db:
+            job = KnowledgeReindexJobModel(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                status="pending",
+                data={
+                    "knowledge_ids": knowledge_ids,
+                    "completed_knowledge_ids": [],
+                    "knowledge_id": None,
+                    "file_ids": [],
+                    "errors": [],
+                    "run_processed_files": 0,
+                },
+                total_files=total_files,
+                processed_files=0,
+                failed_files=0,
+                created_at=int(time.time()),
+                updated_at=int(time.time()),
+            )
+
+            try:
+                result = KnowledgeReindexJob(**job.model_dump())
+                db.add(result)
+                db.commit()
+                db.refresh(result)
+                return KnowledgeReindexJobModel.model_validate(result)
+            except Exception as e:
+                log.exception(e)
+                return None
+
+    def get_job_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[KnowledgeReindexJobModel]:
+        with get_db_context(db) as db:
+            job = db.get(KnowledgeReindexJob, id)
+            return KnowledgeReindexJobModel.model_validate(job) if job else None
+
+    def get_latest_job(
+        self, db: Optional[Session] = None
+    ) -> Optional[KnowledgeReindexJobModel]:
+        with get_db_context(db) as db:
+            job = (
+                db.query(KnowledgeReindexJob)
+                .order_by(KnowledgeReindexJob.created_at.desc())
+                .first()
+            )
+            return KnowledgeReindexJobModel.model_validate(job) if job else None
+
+    def get_unfinished_job(
+        self, db: Optional[Session] = None
+    ) -> Optional[KnowledgeReindexJobModel]:
+        with get_db_context(db) as db:
+            job = (
+                db.query(KnowledgeReindexJob)
+                .filter(KnowledgeReindexJob.status.in_(["pending", "running"]))
+                .order_by(KnowledgeReindexJob.created_at)
+                .first()
+            )
+            return KnowledgeReindexJobModel.model_validate(job) if job else None
+
+    def claim_job_by_id(
+        self, id: str, stale_before: int, db: Optional[Session] = None
+    ) -> Optional[KnowledgeReindexJobModel]:
+        """
+        Mark a pending job, or a running job whose heartbeat is older than
+        `stale_before`, as running. Only one caller can claim a job.
+        """
+        with get_db_context(db) as db:
+            job = self.get_job_by_id(id, db=db)
+            if job is None:
+                return None
+
+            now = int(time.time())
+            claimed = (
+                db.query(KnowledgeReindexJob)
+                .filter(
+                    KnowledgeReindexJob.id == id,
+                    or_(
+                        KnowledgeReindexJob.status == "pending",
+                        and_(
+                            KnowledgeReindexJob.status == "running",
+                            KnowledgeReindexJob.updated_at < stale_before,
+                        ),
+                    ),
+                )
+                .update(
+                    {
+                        "status": "running",
+                        "data": {
+                            **job.data,
+                            "run_processed_files": job.processed_files,
+                        },
+                        "started_at": now,
+                        "updated_at": now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return self.get_job_by_id(id, db=db) if claimed else None
+
+    def update_job_by_id(
+        self, id: str, updated: dict, db: Optional[Session] = None
+    ) -> Optional[KnowledgeReindexJobModel]:
+        try:
+            with get_db_context(db) as db:
+                db.query(KnowledgeReindexJob).filter_by(id=id).update(
+                    {**updated, "updated_at": int(time.time())}
+                )
+                db.commit()
+                return self.get_job_by_id(id, db=db)
+        except Exception as e:
+            log.exception(e)
+            return None
+
+
+KnowledgeReindexJobs = KnowledgeReindexJobTable()
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.users import Users, User, UserNameResponse
-from open_webui.models.channels import Channels, ChannelMember
+from open_webui.models.channels import Channels, ChannelMember, ChannelWebhookModel
 
 
 from pydantic import BaseModel, ConfigDict, field_validator
@@ -136,7 +136,92 @@ class MessageResponse(MessageReplyToResponse):
     reactions: list[Reactions]
 
 
+def get_webhook_user_info(
+    message, webhooks: dict[str, ChannelWebhookModel]
+) -> Optional[dict]:
+    """The sender of a message posted by a webhook, None for user messages."""
+    webhook_info = message.meta.get("webhook") if message.meta else None
+    if not (webhook_info and webhook_info.get("id")):
+        return None
+
+    webhook = webhooks.get(webhook_info.get("id"))
+    if webhook:
+        return {"id": webhook.id, "name": webhook.name, "role": "webhook"}
+    # Webhook was deleted, use placeholder
+    return {"id": webhook_info.get("id"), "name": "Deleted Webhook", "role": "webhook"}
+
+
+def get_webhook_ids(messages) -> list[str]:
+    return list(
+        {
+            message.meta["webhook"]["id"]
+            for message in messages
+            if message.meta
+            and message.meta.get("webhook")
+            and message.meta["webhook"].get("id")
+        }
+    )
+
+
 class MessageTable:
+    def _to_reply_to_responses(
+        self, all_messages: list[Message], db: Session
+    ) -> list[MessageReplyToResponse]:
+        """
+        Build responses for a page of messages with the messages they reply to,
+        loading replied-to messages, their senders and webhooks in bulk.
+        """
+        reply_to_ids = list({m.reply_to_id for m in all_messages if m.reply_to_id})
+        reply_to_messages = (
+            {
+                m.id: m
+                for m in db.query(Message).filter(Message.id.in_(reply_to_ids)).all()
+            }
+            if reply_to_ids
+            else {}
+        )
+
+        webhooks = Channels.get_webhooks_by_ids(
+            get_webhook_ids([*all_messages, *reply_to_messages.values()]), db=db
+        )
+        reply_to_user_ids = list(
+            {
+                m.user_id
+                for m in reply_to_messages.values()
+                if get_webhook_user_info(m, webhooks) is None
+            }
+        )
+        users = (
+            {u.id: u for u in Users.get_users_by_user_ids(reply_to_user_ids, db=db)}
+            if reply_to_user_ids
+            else {}
+        )
+
+        messages = []
+        for message in all_messages:
+            reply_to_message = None
+            if message.reply_to_id in reply_to_messages:
+                reply_to = reply_to_messages[message.reply_to_id]
+                reply_to_user = get_webhook_user_info(reply_to, webhooks)
+                if reply_to_user is None and reply_to.user_id in users:
+                    reply_to_user = users[reply_to.user_id].model_dump()
+
+                reply_to_message = {
+                    **MessageModel.model_validate(reply_to).model_dump(),
+                    "user": reply_to_user,
+                }
+
+            messages.append(
+                MessageReplyToResponse.model_validate(
+                    {
+                        **MessageModel.model_validate(message).model_dump(),
+                        "user": get_webhook_user_info(message, webhooks),
+                        "reply_to_message": reply_to_message,
+                    }
+                )
+            )
+        return messages
+
     def insert_new_message(
         self,
         form_data: MessageForm,
@@ -195,9 +280,11 @@ class MessageTable:
 
             reactions = self.get_reactions_by_message_id(id, db=db)
 
-            thread_replies = []
+            thread_reply_stats = {}
             if include_thread_replies:
-                thread_replies = self.get_thread_replies_by_message_id(id, db=db)
+                thread_reply_stats = self.get_thread_reply_stats_by_message_ids(
+                    [id], db=db
+                ).get(id, {})
 
             # Check if message was sent by webhook (webhook info in meta takes precedence)
             webhook_info = message.meta.get("webhook") if message.meta else None
@@ -228,10 +315,8 @@ class MessageTable:
                     "reply_to_message": (
                         reply_to_message.model_dump() if reply_to_message else None
                     ),
-                    "latest_reply_at": (
-                        thread_replies[0].created_at if thread_replies else None
-                    ),
-                    "reply_count": len(thread_replies),
+                    "latest_reply_at": thread_reply_stats.get("latest_reply_at"),
+                    "reply_count": thread_reply_stats.get("reply_count", 0),
                     "reactions": reactions,
                 }
             )
@@ -247,47 +332,30 @@ class MessageTable:
                 .all()
             )
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
+            return self._to_reply_to_responses(all_messages, db)
 
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
+    def get_thread_reply_stats_by_message_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, dict]:
+        """Return `reply_count` and `latest_reply_at` for each message with replies."""
+        if not ids:
+            return {}
+
+        with get_db_context(db) as db:
+            rows = (
+                db.query(
+                    Message.parent_id,
+                    func.count(Message.id),
+                    func.max(Message.created_at),
                 )
-            return messages
+                .filter(Message.parent_id.in_(ids))
+                .group_by(Message.parent_id)
+                .all()
+            )
+            return {
+                parent_id: {"reply_count": count, "latest_reply_at": latest_reply_at}
+                for parent_id, count, latest_reply_at in rows
+            }
 
     def get_reply_user_ids_by_message_id(
         self, id: str, db: Optional[Session] = None
@@ -315,47 +383,7 @@ class MessageTable:
                 .all()
             )
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
-
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._to_reply_to_responses(all_messages, db)
 
     def get_messages_by_parent_id(
         self,
@@ -384,47 +412,7 @@ class MessageTable:
             if len(all_messages) < limit:
                 all_messages.append(message)
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
-
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._to_reply_to_responses(all_messages, db)
 
     def get_last_message_by_channel_id(
         self, channel_id: str, db: Optional[Session] = None
@@ -438,6 +426,21 @@ class MessageTable:
             )
             return MessageModel.model_validate(message) if message else None
 
+    def get_last_message_at_by_channel_ids(
+        self, channel_ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, int]:
+        if not channel_ids:
+            return {}
+
+        with get_db_context(db) as db:
+            rows = (
+                db.query(Message.channel_id, func.max(Message.created_at))
+                .filter(Message.channel_id.in_(channel_ids))
+                .group_by(Message.channel_id)
+                .all()
+            )
+            return {channel_id: last_message_at for channel_id, last_message_at in rows}
+
     def get_pinned_messages_by_channel_id(
         self,
         channel_id: str,
@@ -508,6 +511,37 @@ class MessageTable:
                 query = query.filter(Message.user_id != user_id)
             return query.count()
 
+    def get_unread_message_counts_by_channel_ids(
+        self, channel_ids: list[str], user_id: str, db: Optional[Session] = None
+    ) -> dict[str, int]:
+        """
+        Count the top-level messages from others after the user's `last_read_at`
+        in every channel the user is a member of.
+        """
+        if not channel_ids:
+            return {}
+
+        with get_db_context(db) as db:
+            rows = (
+                db.query(Message.channel_id, func.count(Message.id))
+                .join(
+                    ChannelMember,
+                    and_(
+                        ChannelMember.channel_id == Message.channel_id,
+                        ChannelMember.user_id == user_id,
+                    ),
+                )
+                .filter(
+                    Message.channel_id.in_(channel_ids),
+                    Message.parent_id == None,  # only count top-level messages
+                    Message.created_at > func.coalesce(ChannelMember.last_read_at, 0),
+                    Message.user_id != user_id,
+                )
+                .group_by(Message.channel_id)
+                .all()
+            )
+            return {channel_id: count for channel_id, count in rows}
+
     def add_reaction_to_message(
         self, id: str, user_id: str, name: str, db: Optional[Session] = None
     ) -> Optional[MessageReactionModel]:
@@ -538,18 +572,27 @@ class MessageTable:
     def get_reactions_by_message_id(
         self, id: str, db: Optional[Session] = None
     ) -> list[Reactions]:
+        return self.get_reactions_by_message_ids([id], db=db).get(id, [])
+
+    def get_reactions_by_message_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, list[Reactions]]:
+        if not ids:
+            return {}
+
         with get_db_context(db) as db:
             # JOIN User so all user info is fetched in one query
             results = (
-                db.query(MessageReaction, User)
+                db.query(MessageReaction, User.id, User.name)
                 .join(User, MessageReaction.user_id == User.id)
-                .filter(MessageReaction.message_id == id)
+                .filter(MessageReaction.message_id.in_(ids))
                 .all()
             )
 
-            reactions = {}
+            reactions_by_message_id = {}
 
-            for reaction, user in results:
+            for reaction, user_id, user_name in results:
+                reactions = reactions_by_message_id.setdefault(reaction.message_id, {})
                 if reaction.name not in reactions:
                     reactions[reaction.name] = {
                         "name": reaction.name,
@@ -559,13 +602,16 @@ class MessageTable:
 
                 reactions[reaction.name]["users"].append(
                     {
-                        "id": user.id,
-                        "name": user.name,
+                        "id": user_id,
+                        "name": user_name,
                     }
                 )
                 reactions[reaction.name]["count"] += 1
 
-            return [Reactions(**reaction) for reaction in reactions.values()]
+            return {
+                message_id: [Reactions(**reaction) for reaction in reactions.values()]
+                for message_id, reactions in reactions_by_message_id.items()
+            }
 
     def remove_reaction_by_id_and_user_id_and_name(
         self, id: str, user_id: str, name: str, db: Optional[Session] = None
@@ -155,6 +155,16 @@ class ToolsTable:
         except Exception:
             return None
 
+    def get_tool_versions_by_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, int]:
+        """Map tool ids to their updated_at, without loading the content."""
+        if not ids:
+            return {}
+        with get_db_context(db) as db:
+            rows = db.query(Tool.id, Tool.updated_at).filter(Tool.id.in_(ids)).all()
+            return {row.id: row.updated_at for row in rows}
+
     def get_tools(self, db: Optional[Session] = None) -> list[ToolUserModel]:
         with get_db_context(db) as db:
             all_tools = db.query(Tool).order_by(Tool.updated_at.desc()).all()
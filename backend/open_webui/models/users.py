@@ -1,17 +1,27 @@
+import asyncio
+import logging
+import threading
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import Callable, Optional
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 
 
-from open_webui.env import DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL
+from open_webui.env import (
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL,
+    DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL,
+    USER_CACHE_MAX_SIZE,
+    USER_CACHE_TTL,
+)
 
 from open_webui.models.chats import Chats
 from open_webui.models.groups import Groups, GroupMember
 from open_webui.models.channels import ChannelMember
 
 from open_webui.utils.misc import throttle
+from open_webui.utils.redis import get_redis_connection
 
 
 from pydantic import BaseModel, ConfigDict
@@ -26,12 +36,16 @@ from sqlalchemy import (
     exists,
     select,
     cast,
+    PrimaryKeyConstraint,
 )
-from sqlalchemy import or_, case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import or_, case, func
 from sqlalchemy.dialects.postgresql import JSONB
 
 import datetime
 
+log = logging.getLogger(__name__)
+
 ####################
 # User DB Schema
 ####################
@@ -76,6 +90,30 @@ class User(Base):
     created_at = Column(BigInteger)
 
 
+class ProfileImage(Base):
+    """Profile and banner images of users, stored in file storage by content hash."""
+
+    __tablename__ = "profile_image"
+
+    hash = Column(String, nullable=False)  # sha256 of the original image
+    size = Column(BigInteger, nullable=False)  # 0 for the original, else a thumbnail
+    content_type = Column(Text, nullable=False)
+    path = Column(Text, nullable=False)
+    created_at = Column(BigInteger)
+
+    __table_args__ = (PrimaryKeyConstraint("hash", "size", name="pk_hash_size"),)
+
+
+class ProfileImageModel(BaseModel):
+    hash: str
+    size: int
+    content_type: str
+    path: str
+    created_at: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class UserModel(BaseModel):
     id: str
 
@@ -235,6 +273,212 @@ class UserUpdateForm(BaseModel):
     password: Optional[str] = None
 
 
+class UserCache:
+    """
+    Short-lived cache of users for authenticating requests.
+
+    Users are kept in a per-process LRU for `ttl` seconds and, with Redis
+    connected, shared between workers under keys with the same TTL. Evicting a
+    user replaces its key with a tombstone and publishes the eviction, so the
+    other workers drop their local copy too. Users are only written to Redis
+    if the key doesn't exist, so a user read from the database before an
+    eviction can't overwrite the tombstone.
+    """
+
+    # Value of the Redis key of a user evicted in the last `ttl` seconds
+    TOMBSTONE = "__evicted__"
+
+    def __init__(self, ttl: float = 30, max_size: int = 1000):
+        self._ttl = ttl
+        self._max_size = max_size
+
+        self._users: OrderedDict[str, tuple[float, UserModel]] = OrderedDict()
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+        self._redis = None
+        self._redis_key_prefix = "open-webui"
+
+    def connect(
+        self,
+        redis_url: Optional[str] = None,
+        redis_sentinels: Optional[list] = [],
+        redis_cluster: Optional[bool] = False,
+        redis_key_prefix: str = "open-webui",
+    ):
+        if not redis_url or self._ttl <= 0 or self._redis is not None:
+            return
+
+        self._redis_key_prefix = redis_key_prefix
+        self._redis = get_redis_connection(
+            redis_url, redis_sentinels, redis_cluster, decode_responses=True
+        )
+        threading.Thread(target=self._listen, daemon=True).start()
+
+    def _get_redis_key(self, id: str) -> str:
+        return f"{self._redis_key_prefix}:users:{id}"
+
+    @property
+    def _channel(self) -> str:
+        return f"{self._redis_key_prefix}:users:__evict__"
+
+    def get(
+        self, id: str, loader: Callable[[str], Optional[UserModel]]
+    ) -> Optional[UserModel]:
+        """Return the cached user, or load it with `loader` and cache it."""
+        if self._ttl <= 0:
+            return loader(id)
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._users.get(id)
+            if entry is not None and entry[0] > now:
+                self._users.move_to_end(id)
+                return entry[1].model_copy()
+            evictions = self._evictions
+
+        user = None
+        loaded = False
+        if self._redis is not None:
+            try:
+                data = self._redis.get(self._get_redis_key(id))
+                if data and data != self.TOMBSTONE:
+                    user = UserModel.model_validate_json(data)
+            except Exception as e:
+                log.warning(f"Error reading user {id} from Redis: {e}")
+
+        if user is None:
+            user = loader(id)
+            if user is None:
+                return None
+            loaded = True
+
+        with self._lock:
+            # Don't cache a user read before it was evicted
+            if self._evictions != evictions:
+                return user.model_copy()
+
+            self._users[id] = (now + self._ttl, user)
+            self._users.move_to_end(id)
+            while len(self._users) > self._max_size:
+                self._users.popitem(last=False)
+
+        if loaded and self._redis is not None:
+            try:
+                # Not over the tombstone of an eviction by another worker
+                self._redis.set(
+                    self._get_redis_key(id),
+                    user.model_dump_json(),
+                    ex=max(int(self._ttl), 1),
+                    nx=True,
+                )
+            except Exception as e:
+                log.warning(f"Error caching user {id} in Redis: {e}")
+
+        return user.model_copy()
+
+    def _evict_local(self, id: Optional[str] = None):
+        with self._lock:
+            if id is None:
+                self._users.clear()
+            else:
+                self._users.pop(id, None)
+            self._evictions += 1
+
+    def evict(self, id: str):
+        self._evict_local(id)
+
+        if self._redis is not None:
+            try:
+                pipe = self._redis.pipeline()
+                pipe.set(
+                    self._get_redis_key(id), self.TOMBSTONE, ex=max(int(self._ttl), 1)
+                )
+                pipe.publish(self._channel, id)
+                pipe.execute()
+            except Exception as e:
+                log.error(f"Error evicting user {id} from Redis: {e}")
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+
+                # Evictions may have been missed while (re)connecting
+                self._evict_local()
+
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._evict_local(message["data"])
+            except Exception as e:
+                log.error(f"Error in user cache eviction listener: {e}")
+                time.sleep(1)
+
+
+class LastActiveWriter:
+    """
+    Write-behind buffer for the last_active_at of users.
+
+    The latest activity of each user is kept in memory and handed to
+    `write_handler` for all users at once every `interval` seconds, so a busy
+    worker issues one UPDATE per interval instead of one per request. An
+    interval of 0 writes every update through.
+    """
+
+    def __init__(
+        self,
+        write_handler: Callable[[dict[str, int]], None],
+        interval: float = 5.0,
+    ):
+        self._write_handler = write_handler
+        self._interval = interval
+
+        self._pending: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def touch(self, user_id: str):
+        now = int(time.time())
+        if self._interval <= 0:
+            self._write({user_id: now})
+            return
+
+        with self._lock:
+            self._pending[user_id] = now
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            self._write(pending)
+
+    def _write(self, pending: dict[str, int]):
+        try:
+            self._write_handler(pending)
+        except Exception as e:
+            log.exception(f"Error writing last active timestamps: {e}")
+
+    def start(self):
+        if self._interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self._interval)
+            await asyncio.to_thread(self.flush)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+
+USER_CACHE = UserCache(ttl=USER_CACHE_TTL, max_size=USER_CACHE_MAX_SIZE)
+
+
 class UsersTable:
     def insert_new_user(
         self,
@@ -246,6 +490,10 @@ class UsersTable:
         oauth: Optional[dict] = None,
         db: Optional[Session] = None,
     ) -> Optional[UserModel]:
+        profile_image_url = _store_inline_profile_images(
+            id, {"profile_image_url": profile_image_url}
+        )["profile_image_url"]
+
         with get_db_context(db) as db:
             user = UserModel(
                 **{
@@ -279,6 +527,10 @@ class UsersTable:
         except Exception:
             return None
 
+    def get_user_by_id_cached(self, id: str) -> Optional[UserModel]:
+        """get_user_by_id served from the user cache, for authenticating requests."""
+        return USER_CACHE.get(id, self.get_user_by_id)
+
     def get_user_by_api_key(
         self, api_key: str, db: Optional[Session] = None
     ) -> Optional[UserModel]:
@@ -325,69 +577,101 @@ class UsersTable:
             # You may want to log the exception here
             return None
 
-    def get_users(
-        self,
-        filter: Optional[dict] = None,
-        skip: Optional[int] = None,
-        limit: Optional[int] = None,
-        db: Optional[Session] = None,
-    ) -> dict:
-        with get_db_context(db) as db:
-            # Join GroupMember so we can order by group_id when requested
-            query = db.query(User)
+    def _get_users_query(self, db: Session, filter: Optional[dict] = None):
+        """
+        Returns the query of the users matching the filter, or None if no
+        user can match it.
+        """
+        query = db.query(User)
+        if not filter:
+            return query
+
+        query_key = filter.get("query")
+        if query_key:
+            query = query.filter(
+                or_(
+                    User.name.ilike(f"%{query_key}%"),
+                    User.email.ilike(f"%{query_key}%"),
+                )
+            )
 
-            if filter:
-                query_key = filter.get("query")
-                if query_key:
-                    query = query.filter(
-                        or_(
-                            User.name.ilike(f"%{query_key}%"),
-                            User.email.ilike(f"%{query_key}%"),
-                        )
+        channel_id = filter.get("channel_id")
+        if channel_id:
+            query = query.filter(
+                exists(
+                    select(ChannelMember.id).where(
+                        ChannelMember.user_id == User.id,
+                        ChannelMember.channel_id == channel_id,
                     )
+                )
+            )
 
-                channel_id = filter.get("channel_id")
-                if channel_id:
-                    query = query.filter(
-                        exists(
-                            select(ChannelMember.id).where(
-                                ChannelMember.user_id == User.id,
-                                ChannelMember.channel_id == channel_id,
-                            )
-                        )
-                    )
+        user_ids = filter.get("user_ids")
+        group_ids = filter.get("group_ids")
 
-                user_ids = filter.get("user_ids")
-                group_ids = filter.get("group_ids")
+        if isinstance(user_ids, list) and isinstance(group_ids, list):
+            # If both are empty lists, return no users
+            if not user_ids and not group_ids:
+                return None
 
-                if isinstance(user_ids, list) and isinstance(group_ids, list):
-                    # If both are empty lists, return no users
-                    if not user_ids and not group_ids:
-                        return {"users": [], "total": 0}
+        if user_ids:
+            query = query.filter(User.id.in_(user_ids))
 
-                if user_ids:
-                    query = query.filter(User.id.in_(user_ids))
+        if group_ids:
+            query = query.filter(
+                exists(
+                    select(GroupMember.id).where(
+                        GroupMember.user_id == User.id,
+                        GroupMember.group_id.in_(group_ids),
+                    )
+                )
+            )
 
-                if group_ids:
-                    query = query.filter(
-                        exists(
-                            select(GroupMember.id).where(
-                                GroupMember.user_id == User.id,
-                                GroupMember.group_id.in_(group_ids),
-                            )
+        # Users granted access by an access control: the listed users and the
+        # members of the listed groups
+        access = filter.get("access")
+        if access is not None:
+            conditions = []
+            if access.get("user_ids"):
+                conditions.append(User.id.in_(access["user_ids"]))
+            if access.get("group_ids"):
+                conditions.append(
+                    exists(
+                        select(GroupMember.id).where(
+                            GroupMember.user_id == User.id,
+                            GroupMember.group_id.in_(access["group_ids"]),
                         )
                     )
+                )
+            if not conditions:
+                return None
+            query = query.filter(or_(*conditions))
+
+        roles = filter.get("roles")
+        if roles:
+            include_roles = [role for role in roles if not role.startswith("!")]
+            exclude_roles = [role[1:] for role in roles if role.startswith("!")]
 
-                roles = filter.get("roles")
-                if roles:
-                    include_roles = [role for role in roles if not role.startswith("!")]
-                    exclude_roles = [role[1:] for role in roles if role.startswith("!")]
+            if include_roles:
+                query = query.filter(User.role.in_(include_roles))
+            if exclude_roles:
+                query = query.filter(~User.role.in_(exclude_roles))
 
-                    if include_roles:
-                        query = query.filter(User.role.in_(include_roles))
-                    if exclude_roles:
-                        query = query.filter(~User.role.in_(exclude_roles))
+        return query
 
+    def get_users(
+        self,
+        filter: Optional[dict] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        db: Optional[Session] = None,
+    ) -> dict:
+        with get_db_context(db) as db:
+            query = self._get_users_query(db, filter)
+            if query is None:
+                return {"users": [], "total": 0}
+
+            if filter:
                 order_by = filter.get("order_by")
                 direction = filter.get("direction")
 
@@ -463,6 +747,24 @@ class UsersTable:
                 "total": total,
             }
 
+    def get_num_users_by_filter(
+        self, filter: Optional[dict] = None, db: Optional[Session] = None
+    ) -> int:
+        with get_db_context(db) as db:
+            query = self._get_users_query(db, filter)
+            if query is None:
+                return 0
+            return query.with_entities(func.count(User.id)).scalar()
+
+    def get_user_ids_by_filter(
+        self, filter: Optional[dict] = None, db: Optional[Session] = None
+    ) -> list[str]:
+        with get_db_context(db) as db:
+            query = self._get_users_query(db, filter)
+            if query is None:
+                return []
+            return [id for (id,) in query.with_entities(User.id).all()]
+
     def get_users_by_group_id(
         self, group_id: str, db: Optional[Session] = None
     ) -> list[UserModel]:
@@ -482,6 +784,36 @@ class UsersTable:
             users = db.query(User).filter(User.id.in_(user_ids)).all()
             return [UserModel.model_validate(user) for user in users]
 
+    def get_channel_member_users(
+        self,
+        channel_id: str,
+        user_ids: Optional[set[str]] = None,
+        exclude_user_ids: Optional[list[str]] = None,
+        db: Optional[Session] = None,
+    ) -> list[UserModel]:
+        """
+        Returns the non-pending members of a channel, optionally limited to
+        `user_ids` and leaving out `exclude_user_ids`.
+        """
+        if user_ids is not None and not user_ids:
+            return []
+
+        with get_db_context(db) as db:
+            query = (
+                db.query(User)
+                .join(ChannelMember, ChannelMember.user_id == User.id)
+                .filter(
+                    ChannelMember.channel_id == channel_id,
+                    User.role != "pending",
+                )
+            )
+            if user_ids is not None:
+                query = query.filter(User.id.in_(user_ids))
+            if exclude_user_ids:
+                query = query.filter(User.id.notin_(exclude_user_ids))
+
+            return [UserModel.model_validate(user) for user in query.all()]
+
     def get_num_users(self, db: Optional[Session] = None) -> Optional[int]:
         with get_db_context(db) as db:
             return db.query(User).count()
@@ -532,6 +864,7 @@ class UsersTable:
             with get_db_context(db) as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                USER_CACHE.evict(id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -546,6 +879,7 @@ class UsersTable:
                     {**form_data.model_dump(exclude_none=True)}
                 )
                 db.commit()
+                USER_CACHE.evict(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -558,9 +892,12 @@ class UsersTable:
         try:
             with get_db_context(db) as db:
                 db.query(User).filter_by(id=id).update(
-                    {"profile_image_url": profile_image_url}
+                    _store_inline_profile_images(
+                        id, {"profile_image_url": profile_image_url}
+                    )
                 )
                 db.commit()
+                USER_CACHE.evict(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -583,6 +920,17 @@ class UsersTable:
         except Exception:
             return None
 
+    def update_last_active_by_ids(
+        self, timestamps: dict[str, int], db: Optional[Session] = None
+    ) -> None:
+        """Set the last_active_at of many users with one UPDATE."""
+        with get_db_context(db) as db:
+            db.query(User).filter(User.id.in_(list(timestamps.keys()))).update(
+                {"last_active_at": case(timestamps, value=User.id)},
+                synchronize_session=False,
+            )
+            db.commit()
+
     def update_user_oauth_by_id(
         self, id: str, provider: str, sub: str, db: Optional[Session] = None
     ) -> Optional[UserModel]:
@@ -609,6 +957,7 @@ class UsersTable:
                 # Persist updated JSON
                 db.query(User).filter_by(id=id).update({"oauth": oauth})
                 db.commit()
+                USER_CACHE.evict(id)
 
                 return UserModel.model_validate(user)
 
@@ -620,8 +969,11 @@ class UsersTable:
     ) -> Optional[UserModel]:
         try:
             with get_db_context(db) as db:
-                db.query(User).filter_by(id=id).update(updated)
+                db.query(User).filter_by(id=id).update(
+                    _store_inline_profile_images(id, updated)
+                )
                 db.commit()
+                USER_CACHE.evict(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -648,6 +1000,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                USER_CACHE.evict(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -666,6 +1019,7 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                    USER_CACHE.evict(id)
 
                 return True
             else:
@@ -673,6 +1027,44 @@ class UsersTable:
         except Exception:
             return False
 
+    def get_users_with_inline_profile_images(
+        self,
+        after_id: Optional[str] = None,
+        limit: int = 50,
+        db: Optional[Session] = None,
+    ) -> list[tuple[str, Optional[str], Optional[str]]]:
+        """
+        Return (id, profile_image_url, profile_banner_image_url) of the next users,
+        by id, that still hold a data URI image.
+        """
+        with get_db_context(db) as db:
+            query = db.query(
+                User.id, User.profile_image_url, User.profile_banner_image_url
+            ).filter(
+                or_(
+                    User.profile_image_url.like("data:image%"),
+                    User.profile_banner_image_url.like("data:image%"),
+                )
+            )
+            if after_id is not None:
+                query = query.filter(User.id > after_id)
+            return [tuple(row) for row in query.order_by(User.id).limit(limit)]
+
+    def replace_user_profile_images_by_id(
+        self, id: str, current: dict, updated: dict, db: Optional[Session] = None
+    ) -> bool:
+        """Set the image fields of a user, only if they still hold the current values."""
+        with get_db_context(db) as db:
+            result = (
+                db.query(User)
+                .filter_by(id=id, **current)
+                .update(updated, synchronize_session=False)
+            )
+            db.commit()
+            if result:
+                USER_CACHE.evict(id)
+            return bool(result)
+
     def get_user_api_key_by_id(
         self, id: str, db: Optional[Session] = None
     ) -> Optional[str]:
@@ -740,6 +1132,19 @@ class UsersTable:
             )
             return count
 
+    def get_active_user_ids(
+        self, user_ids: list[str], db: Optional[Session] = None
+    ) -> set[str]:
+        with get_db_context(db) as db:
+            # Consider user active if last_active_at within the last 3 minutes
+            three_minutes_ago = int(time.time()) - 180
+            return {
+                user_id
+                for (user_id,) in db.query(User.id).filter(
+                    User.id.in_(user_ids), User.last_active_at >= three_minutes_ago
+                )
+            }
+
     def is_user_active(self, user_id: str, db: Optional[Session] = None) -> bool:
         with get_db_context(db) as db:
             user = db.query(User).filter_by(id=user_id).first()
@@ -750,4 +1155,49 @@ class UsersTable:
             return False
 
 
+class ProfileImagesTable:
+    def get_image(
+        self, hash: str, size: int = 0, db: Optional[Session] = None
+    ) -> Optional[ProfileImageModel]:
+        with get_db_context(db) as db:
+            image = db.query(ProfileImage).filter_by(hash=hash, size=size).first()
+            return ProfileImageModel.model_validate(image) if image else None
+
+    def insert_new_image(
+        self,
+        hash: str,
+        size: int,
+        content_type: str,
+        path: str,
+        db: Optional[Session] = None,
+    ) -> ProfileImageModel:
+        image = ProfileImageModel(
+            hash=hash,
+            size=size,
+            content_type=content_type,
+            path=path,
+            created_at=int(time.time()),
+        )
+        with get_db_context(db) as db:
+            try:
+                db.add(ProfileImage(**image.model_dump()))
+                db.commit()
+            except IntegrityError:
+                # Stored at the same time by another request
+                db.rollback()
+        return image
+
+
+def _store_inline_profile_images(user_id: str, values: dict) -> dict:
+    # Imported here, file storage depends on the app config
+    from open_webui.utils.profile_images import store_inline_profile_images
+
+    return store_inline_profile_images(user_id, values)
+
+
 Users = UsersTable()
+ProfileImages = ProfileImagesTable()
+LAST_ACTIVE_WRITER = LastActiveWriter(
+    Users.update_last_active_by_ids,
+    interval=DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL,
+)
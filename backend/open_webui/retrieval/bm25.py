@@ -0,0 +1,689 @@
+"""
+Persistent BM25 indexes for hybrid search.
+
+Each collection gets an inverted index in its own SQLite file under
+RAG_BM25_INDEX_DIR. The index is created when documents are first saved to a
+new collection (or lazily on the first hybrid query), kept in step with
+inserts and deletes on the vector DB, and only the postings of the query terms
+are read to score a query. Scores match `rank_bm25.BM25Okapi` as used by
+langchain's `BM25Retriever`.
+
+Index files are local to each instance. With Redis, every write to a
+collection stores a new version of it in Redis and indexes built for another
+version are rebuilt, so replicas see the writes made through each other.
+"""
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Union
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from open_webui.config import (
+    ENABLE_RAG_HYBRID_SEARCH,
+    ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS,
+    RAG_BM25_INDEX_DIR,
+)
+from open_webui.utils.redis import get_redis_connection
+from open_webui.retrieval.vector.main import (
+    GetResult,
+    SearchResult,
+    VectorDBBase,
+    VectorItem,
+)
+
+log = logging.getLogger(__name__)
+
+# BM25Okapi parameters used by BM25Retriever
+K1 = 1.5
+B = 0.75
+EPSILON = 0.25
+
+# Memory-map up to this many bytes of an index file
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+def get_enriched_text(text: str, metadata: dict) -> str:
+    metadata_parts = [text]
+
+    # Add filename (repeat twice for extra weight in BM25 scoring)
+    if metadata.get("name"):
+        filename = metadata["name"]
+        filename_tokens = filename.replace("_", " ").replace("-", " ").replace(".", " ")
+        metadata_parts.append(
+            f"Filename: {filename} {filename_tokens} {filename_tokens}"
+        )
+
+    # Add title if available
+    if metadata.get("title"):
+        metadata_parts.append(f"Title: {metadata['title']}")
+
+    # Add document section headings if available (from markdown splitter)
+    if metadata.get("headings") and isinstance(metadata["headings"], list):
+        headings = " > ".join(str(h) for h in metadata["headings"])
+        metadata_parts.append(f"Section: {headings}")
+
+    # Add source URL/path if available
+    if metadata.get("source"):
+        metadata_parts.append(f"Source: {metadata['source']}")
+
+    # Add snippet for web search results
+    if metadata.get("snippet"):
+        metadata_parts.append(f"Snippet: {metadata['snippet']}")
+
+    return " ".join(metadata_parts)
+
+
+def tokenize(text: str) -> list[str]:
+    # Same as the default preprocessing of BM25Retriever
+    return text.split()
+
+
+class BM25Index:
+    def __init__(self, collection_name: str, index_dir: str = RAG_BM25_INDEX_DIR):
+        self.collection_name = collection_name
+        self.index_dir = index_dir
+        self.path = os.path.join(
+            index_dir, f"{re.sub(r'[^A-Za-z0-9_-]', '_', collection_name)}.sqlite3"
+        )
+
+    @contextmanager
+    def _connect(self, path: Optional[str] = None):
+        """Open the index file and run the block in a single transaction."""
+        conn = sqlite3.connect(path or self.path, timeout=30)
+        try:
+            conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def is_enriched(self) -> bool:
+        return bool(self._get_meta("enriched"))
+
+    def get_version(self) -> Optional[str]:
+        """Version of the collection the index was last brought up to date with."""
+        return self._get_meta("version")
+
+    def set_version(self, version: Optional[str]):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (json.dumps(version),),
+            )
+
+    def _get_meta(self, key: str):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM doc").fetchone()[0]
+
+    def build(
+        self,
+        ids: list[str],
+        texts: list[str],
+        metadatas: list[dict],
+        enriched: bool = False,
+        version: Optional[str] = None,
+    ):
+        """Write a new index for the given documents, replacing any existing one."""
+        os.makedirs(self.index_dir, exist_ok=True)
+        tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+
+        try:
+            with self._connect(tmp_path) as conn:
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.executescript(
+                    """
+                    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+                    CREATE TABLE doc (
+                        rowid INTEGER PRIMARY KEY,
+                        id TEXT UNIQUE NOT NULL,
+                        length INTEGER NOT NULL,
+                        text TEXT,
+                        metadata TEXT
+                    );
+                    CREATE TABLE term (
+                        term TEXT PRIMARY KEY, df INTEGER NOT NULL
+                    ) WITHOUT ROWID;
+                    CREATE TABLE posting (
+                        term TEXT NOT NULL,
+                        doc INTEGER NOT NULL,
+                        tf INTEGER NOT NULL,
+                        PRIMARY KEY (term, doc)
+                    ) WITHOUT ROWID;
+                    CREATE INDEX posting_doc_idx ON posting (doc);
+                    """
+                )
+                conn.executemany(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)",
+                    [
+                        ("enriched", json.dumps(enriched)),
+                        ("version", json.dumps(version)),
+                    ],
+                )
+                self._add(conn, ids, texts, metadatas, enriched)
+
+            os.replace(tmp_path, self.path)
+        finally:
+            for path in (tmp_path, f"{tmp_path}-wal", f"{tmp_path}-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def upsert(self, ids: list[str], texts: list[str], metadatas: list[dict]):
+        with self._connect() as conn:
+            enriched = json.loads(
+                conn.execute(
+                    "SELECT value FROM meta WHERE key = 'enriched'"
+                ).fetchone()[0]
+            )
+            self._remove(conn, self._get_rowids(conn, ids))
+            self._add(conn, ids, texts, metadatas, enriched)
+
+    def delete(
+        self, ids: Optional[list[str]] = None, filter: Optional[dict] = None
+    ) -> bool:
+        """
+        Remove documents by id or metadata filter.
+
+        Returns False when the filter cannot be evaluated against the stored
+        metadata, in which case the caller should drop the index.
+        """
+        if filter and any(
+            isinstance(value, (dict, list)) or key.startswith("$")
+            for key, value in filter.items()
+        ):
+            return False
+
+        with self._connect() as conn:
+            rowids = self._get_rowids(conn, ids) if ids else []
+            if filter:
+                for rowid, metadata in conn.execute("SELECT rowid, metadata FROM doc"):
+                    metadata = json.loads(metadata) if metadata else {}
+                    if all(metadata.get(key) == value for key, value in filter.items()):
+                        rowids.append(rowid)
+            self._remove(conn, rowids)
+        return True
+
+    def drop(self):
+        for path in (self.path, f"{self.path}-wal", f"{self.path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def search(self, query: str, k: int) -> list[Document]:
+        query_terms = Counter(tokenize(query))
+
+        with self._connect() as conn:
+            doc_count, total_length = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM doc"
+            ).fetchone()
+            if not doc_count or not query_terms:
+                return []
+            avgdl = total_length / doc_count
+
+            placeholders = ",".join("?" * len(query_terms))
+            idf = {
+                term: math.log(doc_count - df + 0.5) - math.log(df + 0.5)
+                for term, df in conn.execute(
+                    f"SELECT term, df FROM term WHERE term IN ({placeholders})",
+                    list(query_terms),
+                )
+            }
+            if any(value < 0 for value in idf.values()):
+                eps = EPSILON * self._get_average_idf(conn, doc_count)
+                idf = {
+                    term: value if value >= 0 else eps for term, value in idf.items()
+                }
+
+            scores = defaultdict(float)
+            for term, term_idf in idf.items():
+                weight = term_idf * query_terms[term]
+                for rowid, tf, length in conn.execute(
+                    "SELECT posting.doc, posting.tf, doc.length FROM posting "
+                    "JOIN doc ON doc.rowid = posting.doc WHERE posting.term = ?",
+                    (term,),
+                ):
+                    scores[rowid] += (
+                        weight
+                        * tf
+                        * (K1 + 1)
+                        / (tf + K1 * (1 - B + B * length / avgdl))
+                    )
+
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            if not top:
+                return []
+
+            docs = {
+                rowid: (text, metadata)
+                for rowid, text, metadata in conn.execute(
+                    f"SELECT rowid, text, metadata FROM doc "
+                    f"WHERE rowid IN ({','.join('?' * len(top))})",
+                    [rowid for rowid, _ in top],
+                )
+            }
+
+        return [
+            Document(
+                page_content=docs[rowid][0] or "",
+                metadata=json.loads(docs[rowid][1]) if docs[rowid][1] else {},
+            )
+            for rowid, _ in top
+        ]
+
+    def _get_rowids(self, conn: sqlite3.Connection, ids: list[str]) -> list[int]:
+        rowids = []
+        for i in range(0, len(ids), 500):
+            batch = ids[i : i + 500]
+            rowids.extend(
+                row[0]
+                for row in conn.execute(
+                    f"SELECT rowid FROM doc WHERE id IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+            )
+        return rowids
+
+    def _add(
+        self,
+        conn: sqlite3.Connection,
+        ids: list[str],
+        texts: list[str],
+        metadatas: list[dict],
+        enriched: bool,
+    ):
+        for id, text, metadata in zip(ids, texts, metadatas):
+            metadata = metadata or {}
+            tokens = tokenize(get_enriched_text(text, metadata) if enriched else text)
+            term_counts = Counter(tokens)
+
+            rowid = conn.execute(
+                "INSERT INTO doc (id, length, text, metadata) VALUES (?, ?, ?, ?)",
+                (id, len(tokens), text, json.dumps(metadata, default=str)),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO posting (term, doc, tf) VALUES (?, ?, ?)",
+                [(term, rowid, tf) for term, tf in term_counts.items()],
+            )
+            conn.executemany(
+                "INSERT INTO term (term, df) VALUES (?, 1) "
+                "ON CONFLICT (term) DO UPDATE SET df = df + 1",
+                [(term,) for term in term_counts],
+            )
+
+        conn.execute("DELETE FROM meta WHERE key = 'average_idf'")
+
+    def _remove(self, conn: sqlite3.Connection, rowids: list[int]):
+        if not rowids:
+            return
+
+        for rowid in rowids:
+            conn.execute(
+                "UPDATE term SET df = df - 1 "
+                "WHERE term IN (SELECT term FROM posting WHERE doc = ?)",
+                (rowid,),
+            )
+            conn.execute("DELETE FROM posting WHERE doc = ?", (rowid,))
+            conn.execute("DELETE FROM doc WHERE rowid = ?", (rowid,))
+
+        conn.execute("DELETE FROM term WHERE df <= 0")
+        conn.execute("DELETE FROM meta WHERE key = 'average_idf'")
+
+    def _get_average_idf(self, conn: sqlite3.Connection, doc_count: int) -> float:
+        # Only needed when a query term appears in more than half of the documents;
+        # cached until the next write since it covers the whole vocabulary
+        row = conn.execute(
+            "SELECT value FROM meta WHERE key = 'average_idf'"
+        ).fetchone()
+        if row:
+            return json.loads(row[0])
+
+        idf_sum = 0.0
+        term_count = 0
+        for (df,) in conn.execute("SELECT df FROM term"):
+            idf_sum += math.log(doc_count - df + 0.5) - math.log(df + 0.5)
+            term_count += 1
+        average_idf = idf_sum / term_count if term_count else 0.0
+
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('average_idf', ?)",
+            (json.dumps(average_idf),),
+        )
+        return average_idf
+
+
+class BM25IndexRetriever(BaseRetriever):
+    index: Any
+    k: int = 4
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return self.index.search(query, self.k)
+
+
+class BM25IndexedVectorDB(VectorDBBase):
+    """
+    Vector DB client that keeps the BM25 index of each collection in step with
+    writes to the wrapped client.
+
+    Index maintenance never fails a write: on error the index is dropped and
+    rebuilt from the vector DB on its next use.
+    """
+
+    def __init__(self, client: VectorDBBase, index_dir: str = RAG_BM25_INDEX_DIR):
+        self.client = client
+        self.index_dir = index_dir
+        self._locks = defaultdict(threading.Lock)
+        self._locks_lock = threading.Lock()
+        self._redis = None
+        self._redis_key_prefix = "open-webui"
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def connect(
+        self,
+        redis_url: Optional[str] = None,
+        redis_sentinels: Optional[list] = [],
+        redis_cluster: Optional[bool] = False,
+        redis_key_prefix: str = "open-webui",
+    ):
+        """Share collection versions with other instances through Redis."""
+        if not redis_url or self._redis is not None:
+            return
+
+        self._redis_key_prefix = redis_key_prefix
+        self._redis = get_redis_connection(
+            redis_url, redis_sentinels, redis_cluster, decode_responses=True
+        )
+
+    def _get_redis_key(self, collection_name: str) -> str:
+        return f"{self._redis_key_prefix}:bm25:version:{collection_name}"
+
+    def _get_version(self, collection_name: str) -> Optional[str]:
+        if self._redis is None:
+            return None
+        try:
+            return self._redis.get(self._get_redis_key(collection_name))
+        except Exception as e:
+            log.warning(f"Failed to read the version of {collection_name}: {e}")
+            return None
+
+    def _bump_version(self, collection_name: str) -> tuple[Optional[str], str]:
+        """Store a new version of a collection, returns the previous and new one."""
+        version = uuid.uuid4().hex
+        if self._redis is None:
+            return None, version
+        try:
+            return (
+                self._redis.getset(self._get_redis_key(collection_name), version),
+                version,
+            )
+        except Exception as e:
+            log.warning(f"Failed to store the version of {collection_name}: {e}")
+            return None, version
+
+    def _lock(self, collection_name: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks[collection_name]
+
+    def _index(self, collection_name: str) -> BM25Index:
+        return BM25Index(collection_name, index_dir=self.index_dir)
+
+    def _update_index(self, index: BM25Index, update):
+        try:
+            if update(index) is False:
+                index.drop()
+        except Exception as e:
+            log.warning(f"Dropping BM25 index of {index.collection_name}: {e}")
+            index.drop()
+
+    def _update_written_index(self, collection_name: str, update):
+        """
+        Apply a write to the index of a collection and move the index to the new
+        version. An index that missed writes of other instances is dropped
+        instead, to be rebuilt on its next use.
+        """
+        index = self._index(collection_name)
+        previous, version = self._bump_version(collection_name)
+        if not index.exists():
+            return
+        if previous is not None and index.get_version() != previous:
+            log.info(f"BM25 index of collection {collection_name} is out of date")
+            index.drop()
+            return
+
+        def update_and_set_version(index):
+            if update(index) is False:
+                return False
+            index.set_version(version)
+
+        self._update_index(index, update_and_set_version)
+
+    def get_bm25_index(
+        self, collection_name: str, enriched: Optional[bool] = None
+    ) -> BM25Index:
+        """
+        Return the BM25 index of a collection, building it if needed.
+
+        Blocks on reading the collection when the index is built, call it from
+        a worker thread in async code.
+        """
+        if enriched is None:
+            enriched = ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS.value
+
+        with self._lock(collection_name):
+            index = self._index(collection_name)
+            # Read before the collection, a write in between rebuilds again
+            version = self._get_version(collection_name)
+            if index.exists() and index.is_enriched() == enriched:
+                if version is None or version == index.get_version():
+                    return index
+                log.info(f"BM25 index of collection {collection_name} is out of date")
+
+            log.info(f"Building BM25 index for collection {collection_name}")
+            result = self.client.get(collection_name=collection_name)
+            if result and result.documents and result.documents[0]:
+                index.build(
+                    result.ids[0],
+                    result.documents[0],
+                    result.metadatas[0],
+                    enriched=enriched,
+                    version=version,
+                )
+            else:
+                index.build([], [], [], enriched=enriched, version=version)
+            return index
+
+    def _add_to_index(
+        self,
+        collection_name: str,
+        create: bool,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[dict],
+    ):
+        # The index may have been built from the collection since `create`
+        # was decided
+        if not create or self._index(collection_name).exists():
+            self._update_written_index(
+                collection_name, lambda index: index.upsert(ids, texts, metadatas)
+            )
+            return
+
+        _, version = self._bump_version(collection_name)
+        self._update_index(
+            self._index(collection_name),
+            lambda index: index.build(
+                ids,
+                texts,
+                metadatas,
+                enriched=ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS.value,
+                version=version,
+            ),
+        )
+
+    def _should_create_index(self, collection_name: str) -> bool:
+        # Collections created while hybrid search is enabled get their index
+        # right away, from the items being saved
+        return (
+            ENABLE_RAG_HYBRID_SEARCH.value
+            and not self._index(collection_name).exists()
+            and not self.client.has_collection(collection_name=collection_name)
+        )
+
+    def _write(self, write, collection_name: str, items: List[VectorItem]):
+        create = self._should_create_index(collection_name)
+
+        # The index lock is only taken for the index update, so queries of
+        # the collection don't wait on the vector DB write
+        write(collection_name=collection_name, items=items)
+
+        with self._lock(collection_name):
+            self._add_to_index(
+                collection_name,
+                create,
+                [item["id"] for item in items],
+                [item["text"] for item in items],
+                [item.get("metadata") or {} for item in items],
+            )
+
+    def has_collection(self, collection_name: str) -> bool:
+        return self.client.has_collection(collection_name=collection_name)
+
+    def delete_collection(self, collection_name: str) -> None:
+        self.client.delete_collection(collection_name=collection_name)
+
+        with self._lock(collection_name):
+            self._bump_version(collection_name)
+            self._index(collection_name).drop()
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self._write(self.client.insert, collection_name, items)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self._write(self.client.upsert, collection_name, items)
+
+    def copy_items(
+        self,
+        src_collection_name: str,
+        dst_collection_name: str,
+        filter: Optional[Dict] = None,
+    ) -> Optional[GetResult]:
+        create = self._should_create_index(dst_collection_name)
+
+        result = self.client.copy_items(
+            src_collection_name, dst_collection_name, filter=filter
+        )
+
+        if result:
+            with self._lock(dst_collection_name):
+                self._add_to_index(
+                    dst_collection_name,
+                    create,
+                    result.ids[0],
+                    result.documents[0],
+                    [metadata or {} for metadata in result.metadatas[0]],
+                )
+        return result
+
+    def replace_collection(
+        self, src_collection_name: str, dst_collection_name: str
+    ) -> None:
+        with self._lock(src_collection_name), self._lock(dst_collection_name):
+            if not self.client.has_collection(collection_name=src_collection_name):
+                return
+
+            self.client.replace_collection(src_collection_name, dst_collection_name)
+
+            # The source index describes the renamed items, move it along
+            src_index = self._index(src_collection_name)
+            dst_index = self._index(dst_collection_name)
+            previous, _ = self._bump_version(src_collection_name)
+            _, version = self._bump_version(dst_collection_name)
+            dst_index.drop()
+            if src_index.exists():
+                try:
+                    if previous is not None and src_index.get_version() != previous:
+                        raise Exception("index is out of date")
+                    src_index.set_version(version)
+                    for suffix in ("", "-wal", "-shm"):
+                        if os.path.exists(f"{src_index.path}{suffix}"):
+                            os.replace(
+                                f"{src_index.path}{suffix}",
+                                f"{dst_index.path}{suffix}",
+                            )
+                except Exception as e:
+                    log.warning(f"Dropping BM25 index of {dst_collection_name}: {e}")
+                    src_index.drop()
+                    dst_index.drop()
+
+    def search(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+        include_vectors: bool = False,
+    ) -> Optional[SearchResult]:
+        return self.client.search(
+            collection_name=collection_name,
+            vectors=vectors,
+            filter=filter,
+            limit=limit,
+            include_vectors=include_vectors,
+        )
+
+    def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return self.client.query(
+            collection_name=collection_name, filter=filter, limit=limit
+        )
+
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
+        return self.client.get(
+            collection_name=collection_name, include_vectors=include_vectors
+        )
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        self.client.delete(collection_name=collection_name, ids=ids, filter=filter)
+
+        with self._lock(collection_name):
+            self._update_written_index(
+                collection_name, lambda index: index.delete(ids, filter)
+            )
+
+    def reset(self) -> None:
+        self.client.reset()
+
+        if os.path.isdir(self.index_dir):
+            for name in os.listdir(self.index_dir):
+                os.remove(os.path.join(self.index_dir, name))
@@ -0,0 +1,284 @@
+"""
+Content-addressed cache of chunk embeddings.
+
+Embeddings are keyed by (engine, model, prefix, sha256(text)), so the same
+chunk saved to another file or knowledge base, or re-embedded by a reindex, is
+not sent to the embedding model again. Entries live in a SQL table (SQLite by
+default, any SQLAlchemy URL such as Postgres works) as float32 blobs and the
+least recently used entries are evicted once RAG_EMBEDDING_CACHE_MAX_ENTRIES or
+RAG_EMBEDDING_CACHE_MAX_SIZE_MB is exceeded.
+
+The size of the cache is tracked in memory from the entries written, and only
+counted again in the database once that estimate reaches a limit or
+EVICT_INTERVAL has passed, which catches the writes of other workers. Reads
+only update `last_used_at` when it is older than `touch_interval`, so hot
+entries aren't written on every hit.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    delete,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+
+from open_webui.config import (
+    ENABLE_RAG_EMBEDDING_CACHE,
+    RAG_EMBEDDING_CACHE_DATABASE_URL,
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+    RAG_EMBEDDING_CACHE_MAX_SIZE_MB,
+)
+
+log = logging.getLogger(__name__)
+
+# Maximum number of keys per IN (...) clause
+BATCH_SIZE = 500
+
+# Seconds after which the size of the cache is counted again in the database
+EVICT_INTERVAL = 60
+
+metadata = MetaData()
+
+embedding_cache_table = Table(
+    "embedding_cache",
+    metadata,
+    Column("key", String(64), primary_key=True),
+    Column("vector", LargeBinary, nullable=False),
+    Column("size", Integer, nullable=False),
+    Column("last_used_at", BigInteger, nullable=False, index=True),
+)
+
+
+def get_cache_key(engine: str, model: str, prefix: Optional[str], text: str) -> str:
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return hashlib.sha256(
+        f"{engine}\x00{model}\x00{prefix or ''}\x00{text_hash}".encode("utf-8")
+    ).hexdigest()
+
+
+def _batches(keys: List[str]) -> Iterable[List[str]]:
+    for i in range(0, len(keys), BATCH_SIZE):
+        yield keys[i : i + BATCH_SIZE]
+
+
+def _insert_ignore(conn, table: Table):
+    """INSERT that skips keys already written, e.g. by another worker."""
+    match conn.dialect.name:
+        case "sqlite":
+            return sqlite.insert(table).on_conflict_do_nothing()
+        case "postgresql":
+            return postgresql.insert(table).on_conflict_do_nothing()
+        case _:
+            return table.insert().prefix_with("IGNORE", dialect="mysql")
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        url: str = RAG_EMBEDDING_CACHE_DATABASE_URL,
+        max_entries: int = RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+        max_size_mb: int = RAG_EMBEDDING_CACHE_MAX_SIZE_MB,
+        touch_interval: float = 60,
+    ):
+        self.url = url
+        self.max_entries = max_entries
+        self.max_size = max_size_mb * 1024 * 1024
+        self.touch_interval = touch_interval
+
+        self.hits = 0
+        self.misses = 0
+
+        self._engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+
+        # Estimated size of the cache, None until counted
+        self._count: Optional[int] = None
+        self._size = 0
+        self._counted_at = 0.0
+
+    @property
+    def engine(self) -> Engine:
+        # Created on first use so that a disabled or unused cache never touches the disk
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    url = make_url(self.url)
+                    if url.get_backend_name() == "sqlite":
+                        if url.database and url.database != ":memory:":
+                            os.makedirs(
+                                os.path.dirname(os.path.abspath(url.database)),
+                                exist_ok=True,
+                            )
+                        engine = create_engine(
+                            url, connect_args={"check_same_thread": False}
+                        )
+                    else:
+                        engine = create_engine(url, pool_pre_ping=True)
+                    metadata.create_all(engine)
+                    self._engine = engine
+        return self._engine
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Return the cached vectors of the given keys and mark them as used."""
+        table = embedding_cache_table
+        vectors = {}
+        now = time.time_ns() // 1000
+        touched_before = now - int(self.touch_interval * 1_000_000)
+
+        with self.engine.begin() as conn:
+            stale = []
+            for batch in _batches(list(keys)):
+                for key, vector, last_used_at in conn.execute(
+                    select(table.c.key, table.c.vector, table.c.last_used_at).where(
+                        table.c.key.in_(batch)
+                    )
+                ):
+                    vectors[key] = np.frombuffer(vector, dtype=np.float32).tolist()
+                    if last_used_at < touched_before:
+                        stale.append(key)
+
+            for batch in _batches(stale):
+                conn.execute(
+                    update(table).where(table.c.key.in_(batch)).values(last_used_at=now)
+                )
+
+        return vectors
+
+    def set_many(self, vectors: Dict[str, List[float]]):
+        """Store vectors that are not cached yet and evict the least recently used entries."""
+        table = embedding_cache_table
+        now = time.time_ns() // 1000
+
+        with self.engine.begin() as conn:
+            for batch in _batches(list(vectors.keys())):
+                existing = set(
+                    conn.scalars(select(table.c.key).where(table.c.key.in_(batch)))
+                )
+                rows = []
+                for key in batch:
+                    if key in existing:
+                        continue
+                    blob = np.asarray(vectors[key], dtype=np.float32).tobytes()
+                    rows.append(
+                        {
+                            "key": key,
+                            "vector": blob,
+                            "size": len(blob),
+                            "last_used_at": now,
+                        }
+                    )
+                if rows:
+                    conn.execute(_insert_ignore(conn, table), rows)
+                    if self._count is not None:
+                        self._count += len(rows)
+                        self._size += sum(row["size"] for row in rows)
+
+            if (
+                self._count is None
+                or self._count > self.max_entries
+                or self._size > self.max_size
+                or time.monotonic() - self._counted_at > EVICT_INTERVAL
+            ):
+                self._evict(conn)
+
+    def _evict(self, conn):
+        table = embedding_cache_table
+        count, size = conn.execute(
+            select(func.count(), func.coalesce(func.sum(table.c.size), 0))
+        ).one()
+        self._count, self._size = count, size
+        self._counted_at = time.monotonic()
+        if count <= self.max_entries and size <= self.max_size:
+            return
+
+        # Evict down to 90% of the limits so that eviction does not run on every write
+        target_count = self.max_entries - self.max_entries // 10
+        target_size = self.max_size - self.max_size // 10
+
+        evicted = []
+        result = conn.execute(
+            select(table.c.key, table.c.size).order_by(table.c.last_used_at)
+        )
+        for key, entry_size in result:
+            if count <= target_count and size <= target_size:
+                break
+            evicted.append(key)
+            count -= 1
+            size -= entry_size
+        result.close()
+
+        for batch in _batches(evicted):
+            conn.execute(delete(table).where(table.c.key.in_(batch)))
+        self._count, self._size = count, size
+        log.debug(f"Evicted {len(evicted)} entries from the embedding cache")
+
+    def clear(self):
+        with self.engine.begin() as conn:
+            conn.execute(delete(embedding_cache_table))
+        self._count = None
+
+    def wrap(self, embedding_function, engine: str, model: str):
+        """
+        Wrap an async embedding function so that lists of texts are only
+        embedded for the texts that are not cached yet.
+        """
+
+        async def cached_embedding_function(query, prefix=None, user=None):
+            if not isinstance(query, list) or not query:
+                return await embedding_function(query, prefix=prefix, user=user)
+
+            keys = [get_cache_key(engine, model, prefix, text) for text in query]
+            try:
+                vectors = await asyncio.to_thread(self.get_many, set(keys))
+            except Exception as e:
+                log.exception(f"Error reading from the embedding cache: {e}")
+                return await embedding_function(query, prefix=prefix, user=user)
+
+            missing = {}
+            for key, text in zip(keys, query):
+                if key in vectors:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                    missing.setdefault(key, text)
+
+            if missing:
+                embeddings = await embedding_function(
+                    list(missing.values()), prefix=prefix, user=user
+                )
+                if not isinstance(embeddings, list) or len(embeddings) != len(missing):
+                    # Leave a failed or partial response for the caller to handle
+                    return embeddings
+
+                new_vectors = dict(zip(missing.keys(), embeddings))
+                vectors.update(new_vectors)
+                try:
+                    await asyncio.to_thread(self.set_many, new_vectors)
+                except Exception as e:
+                    log.exception(f"Error writing to the embedding cache: {e}")
+
+            return [vectors[key] for key in keys]
+
+        return cached_embedding_function
+
+
+EMBEDDING_CACHE = EmbeddingCache() if ENABLE_RAG_EMBEDDING_CACHE else None
@@ -0,0 +1,349 @@
+"""
+Background reindexing of all knowledge bases.
+
+Each knowledge base is rebuilt in a shadow collection while its live collection
+keeps serving queries, and swapped in with `replace_collection` once all of its
+files are indexed. Files are indexed in batches whose chunks are embedded and
+inserted together, with a bounded number of batches in flight. Progress is
+checkpointed to the knowledge_reindex_job table, so an interrupted job resumes
+where it stopped, after a restart or on another worker.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from langchain_core.documents import Document
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import (
+    KNOWLEDGE_REINDEX_BATCH_SIZE,
+    KNOWLEDGE_REINDEX_CHECKPOINT_INTERVAL,
+    KNOWLEDGE_REINDEX_CONCURRENCY,
+)
+from open_webui.models.files import FileModel, Files
+from open_webui.models.knowledge import (
+    KnowledgeReindexJobModel,
+    KnowledgeReindexJobs,
+    Knowledges,
+)
+from open_webui.models.users import Users
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.routers.retrieval import (
+    copy_file_to_collection,
+    get_processed_file_docs,
+    save_docs_to_vector_db,
+)
+from open_webui.utils.misc import calculate_sha256_string
+
+log = logging.getLogger(__name__)
+
+# Number of file errors kept in the job checkpoint
+MAX_JOB_ERRORS = 100
+
+
+def get_shadow_collection_name(knowledge_id: str) -> str:
+    return f"{knowledge_id}-reindex"
+
+
+def index_files(
+    request: Request,
+    files: list[FileModel],
+    collection_name: str,
+    user=None,
+    resumed: bool = False,
+) -> dict[str, Optional[str]]:
+    """
+    Index already processed files into the collection, embedding the chunks of
+    all files at once. Returns the error of each file, None if it was indexed.
+    """
+    errors = {}
+    file_docs = {}
+    for file in files:
+        try:
+            if resumed:
+                # Drop what an interrupted run indexed after its last checkpoint
+                VECTOR_DB_CLIENT.delete(
+                    collection_name=collection_name, filter={"file_id": file.id}
+                )
+
+            docs, file_result = get_processed_file_docs(file)
+            hash = calculate_sha256_string(file.data.get("content", ""))
+
+            # Chunks embedded with the current model are copied as they are
+            if file_result is not None and copy_file_to_collection(
+                request,
+                file_result,
+                file_id=file.id,
+                collection_name=collection_name,
+                hash=hash,
+            ):
+                errors[file.id] = None
+                continue
+
+            if not any(doc.page_content.strip() for doc in docs):
+                raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+
+            file_docs[file.id] = [
+                Document(
+                    page_content=doc.page_content,
+                    metadata={
+                        **doc.metadata,
+                        "file_id": file.id,
+                        "name": file.filename,
+                        "hash": hash,
+                    },
+                )
+                for doc in docs
+            ]
+        except Exception as e:
+            log.error(f"Error reindexing file {file.filename} (ID: {file.id}): {e}")
+            errors[file.id] = str(e)
+
+    def save(file_ids):
+        save_docs_to_vector_db(
+            request,
+            [doc for file_id in file_ids for doc in file_docs[file_id]],
+            collection_name,
+            add=True,
+            user=user,
+        )
+        errors.update({file_id: None for file_id in file_ids})
+
+    try:
+        if file_docs:
+            save(list(file_docs.keys()))
+    except Exception as e:
+        if len(file_docs) == 1:
+            errors.update({file_id: str(e) for file_id in file_docs})
+        else:
+            # Find the files that failed the batch, the others are saved on their own
+            for file_id in file_docs:
+                try:
+                    save([file_id])
+                except Exception as e:
+                    errors[file_id] = str(e)
+
+    return errors
+
+
+class KnowledgeReindexer:
+    """
+    Runs the knowledge reindex job of this worker.
+
+    A worker claims the unfinished job when it is pending, or when the worker
+    running it stopped checkpointing, so a job runs on one worker at a time.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        batch_size: int = 16,
+        checkpoint_interval: float = 10,
+    ):
+        self._concurrency = concurrency
+        self._batch_size = batch_size
+        self._checkpoint_interval = checkpoint_interval
+
+        self._task: Optional[asyncio.Task] = None
+        self._job: Optional[KnowledgeReindexJobModel] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, request: Request, user) -> Optional[KnowledgeReindexJobModel]:
+        """
+        Start reindexing all knowledge bases, or return the unfinished job.
+        """
+        job = KnowledgeReindexJobs.get_unfinished_job()
+        if job is None:
+            job = KnowledgeReindexJobs.insert_new_job(
+                user.id,
+                [knowledge.id for knowledge in Knowledges.get_knowledge_bases()],
+                Knowledges.get_file_count(),
+            )
+        self.schedule(request)
+        return job
+
+    def schedule(self, request: Request):
+        """Resume the unfinished job, if any, in the background."""
+        if not self.running:
+            self._task = asyncio.create_task(self.resume(request))
+
+    async def resume(self, request: Request):
+        while True:
+            job = KnowledgeReindexJobs.get_unfinished_job()
+            if job is None:
+                return
+
+            stale_before = int(time.time() - 3 * self._checkpoint_interval)
+            claimed = KnowledgeReindexJobs.claim_job_by_id(job.id, stale_before)
+            if claimed is not None:
+                await self.run(request, claimed)
+            else:
+                # Another worker is running it, take over if it stops
+                await asyncio.sleep(self._checkpoint_interval)
+
+    def get_job(self, id: Optional[str] = None) -> Optional[KnowledgeReindexJobModel]:
+        """
+        Return the job, by default the latest one, with the progress of this
+        worker since its last checkpoint when it is running here.
+        """
+        job = self._job
+        if job is not None and id in (None, job.id):
+            return job.model_copy(update={"updated_at": int(time.time())}, deep=True)
+        if id is not None:
+            return KnowledgeReindexJobs.get_job_by_id(id)
+        return KnowledgeReindexJobs.get_latest_job()
+
+    def checkpoint(self, **updated) -> Optional[KnowledgeReindexJobModel]:
+        job = self._job
+        return KnowledgeReindexJobs.update_job_by_id(
+            job.id,
+            {
+                "data": job.data,
+                "processed_files": job.processed_files,
+                "failed_files": job.failed_files,
+                "total_files": job.total_files,
+                **updated,
+            },
+        )
+
+    async def _checkpoint_periodically(self):
+        while True:
+            await asyncio.sleep(self._checkpoint_interval)
+            self.checkpoint()
+
+    async def run(self, request: Request, job: KnowledgeReindexJobModel):
+        log.info(
+            f"Reindexing {len(job.data['knowledge_ids'])} knowledge bases "
+            f"({job.processed_files}/{job.total_files} files done)"
+        )
+        self._job = job
+        checkpoints = asyncio.create_task(self._checkpoint_periodically())
+        try:
+            user = Users.get_user_by_id(job.user_id)
+            for knowledge_id in job.data["knowledge_ids"]:
+                if knowledge_id not in job.data["completed_knowledge_ids"]:
+                    await self.reindex_knowledge_base(request, knowledge_id, user)
+
+            self.checkpoint(status="completed", finished_at=int(time.time()))
+            log.info(
+                f"Reindexing completed, {job.failed_files}/{job.processed_files} files failed"
+            )
+        except asyncio.CancelledError:
+            # Shut down: leave the job to be claimed right away on the next start
+            self.checkpoint(status="pending")
+            raise
+        except Exception as e:
+            log.exception(f"Reindexing failed: {e}")
+            self.checkpoint(status="failed", error=str(e), finished_at=int(time.time()))
+        finally:
+            checkpoints.cancel()
+            self._job = None
+
+    async def reindex_knowledge_base(self, request: Request, knowledge_id: str, user):
+        job = self._job
+        collection_name = get_shadow_collection_name(knowledge_id)
+
+        resumed = job.data["knowledge_id"] == knowledge_id
+        if resumed:
+            done = set(job.data["file_ids"])
+        else:
+            done = set()
+            job.data.update({"knowledge_id": knowledge_id, "file_ids": []})
+            if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+                VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+            self.checkpoint()
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def reindex_batch(batch):
+            async with semaphore:
+                files = await run_in_threadpool(Files.get_files_by_ids, batch)
+                errors = await run_in_threadpool(
+                    index_files, request, files, collection_name, user, resumed
+                )
+
+            for file_id in batch:
+                job.data["file_ids"].append(file_id)
+                job.processed_files += 1
+                if errors.get(file_id):
+                    job.failed_files += 1
+                    if len(job.data["errors"]) < MAX_JOB_ERRORS:
+                        job.data["errors"].append(
+                            {
+                                "knowledge_id": knowledge_id,
+                                "file_id": file_id,
+                                "error": errors[file_id],
+                            }
+                        )
+
+        # Files can be added to or removed from the knowledge base while its
+        # shadow collection is built, so the file list is read again until it
+        # matches what was indexed
+        first = True
+        while True:
+            file_ids = await run_in_threadpool(
+                Knowledges.get_file_ids_by_id, knowledge_id
+            )
+            removed = done - set(file_ids)
+            for file_id in removed:
+                await run_in_threadpool(
+                    VECTOR_DB_CLIENT.delete,
+                    collection_name=collection_name,
+                    filter={"file_id": file_id},
+                )
+            if removed:
+                job.data["file_ids"] = [
+                    file_id
+                    for file_id in job.data["file_ids"]
+                    if file_id not in removed
+                ]
+                done -= removed
+
+            pending = [file_id for file_id in file_ids if file_id not in done]
+            if not pending:
+                break
+            if not first:
+                job.total_files += len(pending)
+
+            async with asyncio.TaskGroup() as tg:
+                for i in range(0, len(pending), self._batch_size):
+                    tg.create_task(reindex_batch(pending[i : i + self._batch_size]))
+            done.update(pending)
+            first = False
+
+        if not file_ids:
+            if VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_id):
+                VECTOR_DB_CLIENT.delete_collection(collection_name=knowledge_id)
+        elif VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+            # All files must be recorded first, a resumed run would otherwise
+            # swap in a shadow collection with just the files left over
+            self.checkpoint()
+            await run_in_threadpool(
+                VECTOR_DB_CLIENT.replace_collection, collection_name, knowledge_id
+            )
+        else:
+            # Nothing could be indexed, or it was swapped in before an interruption
+            log.warning(f"Keeping the current index of knowledge base {knowledge_id}")
+
+        job.data["completed_knowledge_ids"].append(knowledge_id)
+        job.data.update({"knowledge_id": None, "file_ids": []})
+        self.checkpoint()
+
+    async def close(self):
+        if self.running:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+KNOWLEDGE_REINDEXER = KnowledgeReindexer(
+    concurrency=KNOWLEDGE_REINDEX_CONCURRENCY,
+    batch_size=KNOWLEDGE_REINDEX_BATCH_SIZE,
+    checkpoint_interval=KNOWLEDGE_REINDEX_CHECKPOINT_INTERVAL,
+)
@@ -19,7 +19,13 @@ from langchain_classic.retrievers import (
 from langchain_community.retrievers import BM25Retriever
 from langchain_core.documents import Document
 
-from open_webui.config import VECTOR_DB
+from open_webui.config import VECTOR_DB, ENABLE_RAG_BM25_INDEX
+from open_webui.retrieval.bm25 import (
+    BM25Index,
+    BM25IndexRetriever,
+    get_enriched_text,
+)
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 
 
@@ -92,6 +98,10 @@ class VectorSearchRetriever(BaseRetriever):
     collection_name: Any
     embedding_function: Any
     top_k: int
+    # When set, filled with the query embeddings and the stored vectors of the
+    # results so that RerankCompressor can score them without re-embedding
+    query_vectors: Optional[dict] = None
+    document_vectors: Optional[dict] = None
 
     def _get_relevant_documents(
         self, query: str, *, run_manager: CallbackManagerForRetrieverRun
@@ -118,12 +128,20 @@ class VectorSearchRetriever(BaseRetriever):
             collection_name=self.collection_name,
             vectors=[embedding],
             limit=self.top_k,
+            include_vectors=self.document_vectors is not None,
         )
 
         ids = result.ids[0]
         metadatas = result.metadatas[0]
         documents = result.documents[0]
 
+        if self.query_vectors is not None:
+            self.query_vectors[query] = embedding
+        if self.document_vectors is not None and result.vectors:
+            for document, vector in zip(documents, result.vectors[0]):
+                if vector is not None:
+                    self.document_vectors[document] = vector
+
         results = []
         for idx in range(len(ids)):
             results.append(
@@ -170,46 +188,29 @@ def get_doc(collection_name: str, user: UserModel = None):
 
 
 def get_enriched_texts(collection_result: GetResult) -> list[str]:
-    enriched_texts = []
-    for idx, text in enumerate(collection_result.documents[0]):
-        metadata = collection_result.metadatas[0][idx]
-        metadata_parts = [text]
-
-        # Add filename (repeat twice for extra weight in BM25 scoring)
-        if metadata.get("name"):
-            filename = metadata["name"]
-            filename_tokens = (
-                filename.replace("_", " ").replace("-", " ").replace(".", " ")
-            )
-            metadata_parts.append(
-                f"Filename: {filename} {filename_tokens} {filename_tokens}"
-            )
-
-        # Add title if available
-        if metadata.get("title"):
-            metadata_parts.append(f"Title: {metadata['title']}")
-
-        # Add document section headings if available (from markdown splitter)
-        if metadata.get("headings") and isinstance(metadata["headings"], list):
-            headings = " > ".join(str(h) for h in metadata["headings"])
-            metadata_parts.append(f"Section: {headings}")
-
-        # Add source URL/path if available
-        if metadata.get("source"):
-            metadata_parts.append(f"Source: {metadata['source']}")
+    return [
+        get_enriched_text(text, collection_result.metadatas[0][idx])
+        for idx, text in enumerate(collection_result.documents[0])
+    ]
 
-        # Add snippet for web search results
-        if metadata.get("snippet"):
-            metadata_parts.append(f"Snippet: {metadata['snippet']}")
 
-        enriched_texts.append(" ".join(metadata_parts))
+def get_hybrid_search_collection(
+    collection_name: str, enable_enriched_texts: Optional[bool] = None
+) -> Union[BM25Index, GetResult]:
+    """Get what BM25 scoring of a collection needs: its persistent index, or all of its documents."""
+    if ENABLE_RAG_BM25_INDEX:
+        log.debug(f"get_hybrid_search_collection:get_bm25_index {collection_name}")
+        return VECTOR_DB_CLIENT.get_bm25_index(
+            collection_name, enriched=enable_enriched_texts
+        )
 
-    return enriched_texts
+    log.debug(f"get_hybrid_search_collection:VECTOR_DB_CLIENT.get {collection_name}")
+    return VECTOR_DB_CLIENT.get(collection_name=collection_name)
 
 
 async def query_doc_with_hybrid_search(
     collection_name: str,
-    collection_result: GetResult,
+    collection_result: Union[BM25Index, GetResult],
     query: str,
     embedding_function,
     k: int,
@@ -220,8 +221,10 @@ async def query_doc_with_hybrid_search(
     enable_enriched_texts: bool = False,
 ) -> dict:
     try:
+        if isinstance(collection_result, BM25Index):
+            bm25_retriever = BM25IndexRetriever(index=collection_result, k=k)
         # First check if collection_result has the required attributes
-        if (
+        elif (
             not collection_result
             or not hasattr(collection_result, "documents")
             or not hasattr(collection_result, "metadatas")
@@ -230,7 +233,7 @@ async def query_doc_with_hybrid_search(
             return {"documents": [], "metadatas": [], "distances": []}
 
         # Now safely check the documents content after confirming attributes exist
-        if (
+        elif (
             not collection_result.documents
             or len(collection_result.documents) == 0
             or not collection_result.documents[0]
@@ -238,24 +241,31 @@ async def query_doc_with_hybrid_search(
             log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
             return {"documents": [], "metadatas": [], "distances": []}
 
-        log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
+        else:
+            bm25_texts = (
+                get_enriched_texts(collection_result)
+                if enable_enriched_texts
+                else collection_result.documents[0]
+            )
 
-        bm25_texts = (
-            get_enriched_texts(collection_result)
-            if enable_enriched_texts
-            else collection_result.documents[0]
-        )
+            bm25_retriever = BM25Retriever.from_texts(
+                texts=bm25_texts,
+                metadatas=collection_result.metadatas[0],
+            )
+            bm25_retriever.k = k
 
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=bm25_texts,
-            metadatas=collection_result.metadatas[0],
-        )
-        bm25_retriever.k = k
+        log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
+
+        # Without a reranker, candidates are scored against their stored vectors
+        query_vectors = {} if reranking_function is None else None
+        document_vectors = {} if reranking_function is None else None
 
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
             embedding_function=embedding_function,
             top_k=k,
+            query_vectors=query_vectors,
+            document_vectors=document_vectors,
         )
 
         if hybrid_bm25_weight <= 0:
@@ -277,6 +287,8 @@ async def query_doc_with_hybrid_search(
             top_n=k_reranker,
             reranking_function=reranking_function,
             r_score=r,
+            query_vectors=query_vectors,
+            document_vectors=document_vectors,
         )
 
         compression_retriever = ContextualCompressionRetriever(
@@ -474,11 +486,10 @@ async def query_collection_with_hybrid_search(
     collection_results = {}
     for collection_name in collection_names:
         try:
-            log.debug(
-                f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
-            )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=collection_name
+            collection_results[collection_name] = await asyncio.to_thread(
+                get_hybrid_search_collection,
+                collection_name,
+                enable_enriched_texts=enable_enriched_texts,
             )
         except Exception as e:
             log.exception(f"Failed to fetch collection {collection_name}: {e}")
@@ -811,7 +822,6 @@ def get_embedding_function(
                 prefix,
             )
 
-        return async_embedding_function
     elif embedding_engine in ["ollama", "openai", "azure_openai"]:
         embedding_function = lambda query, prefix=None, user=None: generate_embeddings(
             engine=embedding_engine,
@@ -865,10 +875,15 @@ def get_embedding_function(
             else:
                 return await embedding_function(query, prefix, user)
 
-        return async_embedding_function
     else:
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
 
+    if EMBEDDING_CACHE is not None:
+        return EMBEDDING_CACHE.wrap(
+            async_embedding_function, embedding_engine, embedding_model
+        )
+    return async_embedding_function
+
 
 async def generate_embeddings(
     engine: str,
@@ -1252,15 +1267,41 @@ def get_model_path(model: str, update_model: bool = False):
 import operator
 from typing import Optional, Sequence
 
+import numpy as np
+
 from langchain_core.callbacks import Callbacks
 from langchain_core.documents import BaseDocumentCompressor, Document
 
 
+def get_stored_vector(
+    vectors: dict, text: str, dimension: int
+) -> Optional[list[float]]:
+    vector = vectors.get(text)
+    if vector is None:
+        return None
+
+    # Some backends (e.g. pgvector) zero-pad vectors to a fixed length
+    if len(vector) > dimension and not any(vector[dimension:]):
+        vector = vector[:dimension]
+    return vector if len(vector) == dimension else None
+
+
+def cosine_similarity(query_embedding, document_embeddings) -> list[float]:
+    query = np.asarray(query_embedding, dtype=np.float32)
+    documents = np.asarray(document_embeddings, dtype=np.float32)
+
+    norms = np.linalg.norm(documents, axis=1) * np.linalg.norm(query)
+    return (documents @ query / np.where(norms == 0, 1, norms)).tolist()
+
+
 class RerankCompressor(BaseDocumentCompressor):
     embedding_function: Any
     top_n: int
     reranking_function: Any
     r_score: float
+    # Embeddings already computed or stored in the vector DB, keyed by text
+    query_vectors: Optional[dict] = None
+    document_vectors: Optional[dict] = None
 
     class Config:
         extra = "forbid"
@@ -1297,15 +1338,32 @@ class RerankCompressor(BaseDocumentCompressor):
         if reranking:
             scores = await asyncio.to_thread(self.reranking_function, query, documents)
         else:
-            from sentence_transformers import util
+            query_embedding = (self.query_vectors or {}).get(query)
+            if query_embedding is None:
+                query_embedding = await self.embedding_function(
+                    query, RAG_EMBEDDING_QUERY_PREFIX
+                )
 
-            query_embedding = await self.embedding_function(
-                query, RAG_EMBEDDING_QUERY_PREFIX
-            )
-            document_embedding = await self.embedding_function(
-                [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
+            # Only embed the documents whose vectors were not returned by the search
+            document_vectors = {
+                doc.page_content: get_stored_vector(
+                    self.document_vectors or {}, doc.page_content, len(query_embedding)
+                )
+                for doc in documents
+            }
+            missing = [
+                text for text, vector in document_vectors.items() if vector is None
+            ]
+            if missing:
+                embeddings = await self.embedding_function(
+                    missing, RAG_EMBEDDING_CONTENT_PREFIX
+                )
+                document_vectors.update(zip(missing, embeddings))
+
+            scores = cosine_similarity(
+                query_embedding,
+                [document_vectors[doc.page_content] for doc in documents],
             )
-            scores = util.cos_sim(query_embedding, document_embedding)[0]
 
         if scores is not None:
             docs_with_scores = list(
@@ -1,5 +1,6 @@
 import chromadb
 import logging
+import uuid
 from chromadb import Settings
 from chromadb.utils.batch_utils import create_batches
 
@@ -61,7 +62,11 @@ class ChromaClient(VectorDBBase):
 
     def has_collection(self, collection_name: str) -> bool:
         # Check if the collection exists based on the collection name.
-        collection_names = self.client.list_collections()
+        # Depending on the chromadb version list_collections returns names or Collection objects
+        collection_names = [
+            getattr(collection, "name", collection)
+            for collection in self.client.list_collections()
+        ]
         return collection_name in collection_names
 
     def delete_collection(self, collection_name: str):
@@ -74,6 +79,7 @@ class ChromaClient(VectorDBBase):
         vectors: list[list[float | int]],
         filter: Optional[dict] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         # Search for the nearest neighbor items based on the vectors and return 'limit' number of results.
         try:
@@ -83,6 +89,12 @@ class ChromaClient(VectorDBBase):
                     query_embeddings=vectors,
                     n_results=limit,
                     where=filter,
+                    include=[
+                        "documents",
+                        "metadatas",
+                        "distances",
+                        *(["embeddings"] if include_vectors else []),
+                    ],
                 )
 
                 # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
@@ -97,6 +109,14 @@ class ChromaClient(VectorDBBase):
                         "distances": distances,
                         "documents": result["documents"],
                         "metadatas": result["metadatas"],
+                        "vectors": (
+                            [
+                                [list(map(float, vector)) for vector in vectors]
+                                for vectors in result["embeddings"]
+                            ]
+                            if include_vectors
+                            else None
+                        ),
                     }
                 )
             return None
@@ -126,16 +146,29 @@ class ChromaClient(VectorDBBase):
         except:
             return None
 
-    def get(self, collection_name: str) -> Optional[GetResult]:
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
         # Get all the items in the collection.
         collection = self.client.get_collection(name=collection_name)
         if collection:
-            result = collection.get()
+            result = collection.get(
+                include=[
+                    "documents",
+                    "metadatas",
+                    *(["embeddings"] if include_vectors else []),
+                ]
+            )
             return GetResult(
                 **{
                     "ids": [result["ids"]],
                     "documents": [result["documents"]],
                     "metadatas": [result["metadatas"]],
+                    "vectors": (
+                        [[list(map(float, vector)) for vector in result["embeddings"]]]
+                        if include_vectors
+                        else None
+                    ),
                 }
             )
         return None
@@ -175,6 +208,55 @@ class ChromaClient(VectorDBBase):
             ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas
         )
 
+    def copy_items(
+        self,
+        src_collection_name: str,
+        dst_collection_name: str,
+        filter: Optional[dict] = None,
+    ) -> Optional[GetResult]:
+        # Copy the stored embeddings of the matching items instead of embedding them again.
+        try:
+            src_collection = self.client.get_collection(name=src_collection_name)
+        except Exception:
+            return None
+
+        result = src_collection.get(
+            where=filter or None,
+            include=["documents", "metadatas", "embeddings"],
+        )
+        if not result["ids"]:
+            return None
+
+        dst_collection = self.client.get_or_create_collection(
+            name=dst_collection_name, metadata={"hnsw:space": "cosine"}
+        )
+        ids = [str(uuid.uuid4()) for _ in result["ids"]]
+        for batch in create_batches(
+            api=self.client,
+            documents=result["documents"],
+            embeddings=result["embeddings"],
+            ids=ids,
+            metadatas=result["metadatas"],
+        ):
+            dst_collection.add(*batch)
+
+        return GetResult(
+            ids=[ids],
+            documents=[result["documents"]],
+            metadatas=[result["metadatas"]],
+        )
+
+    def replace_collection(self, src_collection_name: str, dst_collection_name: str):
+        # Rename the source collection, the stored items are not copied.
+        try:
+            src_collection = self.client.get_collection(name=src_collection_name)
+        except Exception:
+            return
+
+        if self.has_collection(dst_collection_name):
+            self.client.delete_collection(name=dst_collection_name)
+        src_collection.modify(name=dst_collection_name)
+
     def delete(
         self,
         collection_name: str,
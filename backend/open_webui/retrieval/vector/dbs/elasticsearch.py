@@ -1,6 +1,7 @@
 from elasticsearch import Elasticsearch, BadRequestError
 from typing import Optional
 import ssl
+import uuid
 from elasticsearch.helpers import bulk, scan
 
 from open_webui.retrieval.vector.utils import process_metadata
@@ -50,19 +51,26 @@ class ElasticsearchClient(VectorDBBase):
         return f"{self.index_prefix}_d{str(dimension)}"
 
     # Status: works
-    def _scan_result_to_get_result(self, result) -> GetResult:
+    def _scan_result_to_get_result(self, result, include_vectors=False) -> GetResult:
         if not result:
             return None
         ids = []
         documents = []
         metadatas = []
+        vectors = []
 
         for hit in result:
             ids.append(hit["_id"])
             documents.append(hit["_source"].get("text"))
             metadatas.append(hit["_source"].get("metadata"))
+            vectors.append(hit["_source"].get("vector"))
 
-        return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
+        return GetResult(
+            ids=[ids],
+            documents=[documents],
+            metadatas=[metadatas],
+            vectors=[vectors] if include_vectors else None,
+        )
 
     # Status: works
     def _result_to_get_result(self, result) -> GetResult:
@@ -80,23 +88,26 @@ class ElasticsearchClient(VectorDBBase):
         return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
 
     # Status: works
-    def _result_to_search_result(self, result) -> SearchResult:
+    def _result_to_search_result(self, result, include_vectors=False) -> SearchResult:
         ids = []
         distances = []
         documents = []
         metadatas = []
+        vectors = []
 
         for hit in result["hits"]["hits"]:
             ids.append(hit["_id"])
             distances.append(hit["_score"])
             documents.append(hit["_source"].get("text"))
             metadatas.append(hit["_source"].get("metadata"))
+            vectors.append(hit["_source"].get("vector"))
 
         return SearchResult(
             ids=[ids],
             distances=[distances],
             documents=[documents],
             metadatas=[metadatas],
+            vectors=[vectors] if include_vectors else None,
         )
 
     # Status: works
@@ -158,10 +169,11 @@ class ElasticsearchClient(VectorDBBase):
         vectors: list[list[float]],
         filter: Optional[dict] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         query = {
             "size": limit,
-            "_source": ["text", "metadata"],
+            "_source": ["text", "metadata", *(["vector"] if include_vectors else [])],
             "query": {
                 "script_score": {
                     "query": {
@@ -181,7 +193,7 @@ class ElasticsearchClient(VectorDBBase):
             index=self._get_index_name(len(vectors[0])), body=query
         )
 
-        return self._result_to_search_result(result)
+        return self._result_to_search_result(result, include_vectors=include_vectors)
 
     # Status: only tested halfwat
     def query(
@@ -225,15 +237,17 @@ class ElasticsearchClient(VectorDBBase):
             self._create_index(dimension=dimension)
 
     # Status: works
-    def get(self, collection_name: str) -> Optional[GetResult]:
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
         # Get all the items in the collection.
         query = {
             "query": {"bool": {"filter": [{"term": {"collection": collection_name}}]}},
-            "_source": ["text", "metadata"],
+            "_source": ["text", "metadata", *(["vector"] if include_vectors else [])],
         }
         results = list(scan(self.client, index=f"{self.index_prefix}*", query=query))
 
-        return self._scan_result_to_get_result(results)
+        return self._scan_result_to_get_result(results, include_vectors=include_vectors)
 
     # Status: works
     def insert(self, collection_name: str, items: list[VectorItem]):
@@ -278,6 +292,51 @@ class ElasticsearchClient(VectorDBBase):
             ]
             bulk(self.client, actions)
 
+    # Copy the stored vectors with scroll and bulk requests instead of embedding them again.
+    def copy_items(
+        self,
+        src_collection_name: str,
+        dst_collection_name: str,
+        filter: Optional[dict] = None,
+    ) -> Optional[GetResult]:
+        query = {
+            "query": {
+                "bool": {"filter": [{"term": {"collection": src_collection_name}}]}
+            },
+            "_source": ["text", "metadata", "vector"],
+        }
+        for field, value in (filter or {}).items():
+            query["query"]["bool"]["filter"].append(
+                {"term": {f"metadata.{field}": value}}
+            )
+
+        ids = []
+        documents = []
+        metadatas = []
+        hits = list(scan(self.client, index=f"{self.index_prefix}*", query=query))
+        for batch in self._create_batches(hits):
+            actions = []
+            for hit in batch:
+                # Items of one collection share an index, as they share a dimension
+                actions.append(
+                    {
+                        "_index": hit["_index"],
+                        "_id": str(uuid.uuid4()),
+                        "_source": {
+                            **hit["_source"],
+                            "collection": dst_collection_name,
+                        },
+                    }
+                )
+                documents.append(hit["_source"].get("text"))
+                metadatas.append(hit["_source"].get("metadata"))
+            bulk(self.client, actions)
+            ids.extend(action["_id"] for action in actions)
+
+        if not ids:
+            return None
+        return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
+
     # Delete specific documents from a collection by filtering on both collection and document IDs.
     def delete(
         self,
@@ -4,6 +4,7 @@ from pymilvus import connections, Collection
 
 import json
 import logging
+import uuid
 from typing import Optional
 
 from open_webui.retrieval.vector.utils import process_metadata
@@ -37,39 +38,46 @@ class MilvusClient(VectorDBBase):
         else:
             self.client = Client(uri=MILVUS_URI, db_name=MILVUS_DB, token=MILVUS_TOKEN)
 
-    def _result_to_get_result(self, result) -> GetResult:
+    def _result_to_get_result(self, result, include_vectors=False) -> GetResult:
         ids = []
         documents = []
         metadatas = []
+        vectors = []
         for match in result:
             _ids = []
             _documents = []
             _metadatas = []
+            _vectors = []
             for item in match:
                 _ids.append(item.get("id"))
                 _documents.append(item.get("data", {}).get("text"))
                 _metadatas.append(item.get("metadata"))
+                _vectors.append(item.get("vector"))
             ids.append(_ids)
             documents.append(_documents)
             metadatas.append(_metadatas)
+            vectors.append(_vectors)
         return GetResult(
             **{
                 "ids": ids,
                 "documents": documents,
                 "metadatas": metadatas,
+                "vectors": vectors if include_vectors else None,
             }
         )
 
-    def _result_to_search_result(self, result) -> SearchResult:
+    def _result_to_search_result(self, result, include_vectors=False) -> SearchResult:
         ids = []
         distances = []
         documents = []
         metadatas = []
+        vectors = []
         for match in result:
             _ids = []
             _distances = []
             _documents = []
             _metadatas = []
+            _vectors = []
             for item in match:
                 _ids.append(item.get("id"))
                 # normalize milvus score from [-1, 1] to [0, 1] range
@@ -78,16 +86,19 @@ class MilvusClient(VectorDBBase):
                 _distances.append(_dist)
                 _documents.append(item.get("entity", {}).get("data", {}).get("text"))
                 _metadatas.append(item.get("entity", {}).get("metadata"))
+                _vectors.append(item.get("entity", {}).get("vector"))
             ids.append(_ids)
             distances.append(_distances)
             documents.append(_documents)
             metadatas.append(_metadatas)
+            vectors.append(_vectors)
         return SearchResult(
             **{
                 "ids": ids,
                 "distances": distances,
                 "documents": documents,
                 "metadatas": metadatas,
+                "vectors": vectors if include_vectors else None,
             }
         )
 
@@ -178,12 +189,27 @@ class MilvusClient(VectorDBBase):
             collection_name=f"{self.collection_prefix}_{collection_name}"
         )
 
+    def replace_collection(self, src_collection_name: str, dst_collection_name: str):
+        # Rename the source collection, the stored items are not copied.
+        src_collection_name = src_collection_name.replace("-", "_")
+        dst_collection_name = dst_collection_name.replace("-", "_")
+        if not self.has_collection(src_collection_name):
+            return
+
+        if self.has_collection(dst_collection_name):
+            self.delete_collection(dst_collection_name)
+        self.client.rename_collection(
+            old_name=f"{self.collection_prefix}_{src_collection_name}",
+            new_name=f"{self.collection_prefix}_{dst_collection_name}",
+        )
+
     def search(
         self,
         collection_name: str,
         vectors: list[list[float | int]],
         filter: Optional[dict] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         # Search for the nearest neighbor items based on the vectors and return 'limit' number of results.
         collection_name = collection_name.replace("-", "_")
@@ -194,12 +220,22 @@ class MilvusClient(VectorDBBase):
             collection_name=f"{self.collection_prefix}_{collection_name}",
             data=vectors,
             limit=limit,
-            output_fields=["data", "metadata"],
+            output_fields=[
+                "data",
+                "metadata",
+                *(["vector"] if include_vectors else []),
+            ],
             # search_params=search_params # Potentially add later if needed
         )
-        return self._result_to_search_result(result)
+        return self._result_to_search_result(result, include_vectors=include_vectors)
 
-    def query(self, collection_name: str, filter: dict, limit: int = -1):
+    def query(
+        self,
+        collection_name: str,
+        filter: dict,
+        limit: int = -1,
+        include_vectors: bool = False,
+    ):
         connections.connect(uri=MILVUS_URI, token=MILVUS_TOKEN, db_name=MILVUS_DB)
 
         collection_name = collection_name.replace("-", "_")
@@ -232,6 +268,7 @@ class MilvusClient(VectorDBBase):
                     "id",
                     "data",
                     "metadata",
+                    *(["vector"] if include_vectors else []),
                 ],
                 limit=limit if limit > 0 else -1,
             )
@@ -245,7 +282,10 @@ class MilvusClient(VectorDBBase):
                 all_results.extend(batch)
 
             log.debug(f"Total results from query: {len(all_results)}")
-            return self._result_to_get_result([all_results] if all_results else [[]])
+            return self._result_to_get_result(
+                [all_results] if all_results else [[]],
+                include_vectors=include_vectors,
+            )
 
         except Exception as e:
             log.exception(
@@ -253,7 +293,9 @@ class MilvusClient(VectorDBBase):
             )
             return None
 
-    def get(self, collection_name: str) -> Optional[GetResult]:
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
         # Get all the items in the collection. This can be very resource-intensive for large collections.
         collection_name = collection_name.replace("-", "_")
         log.warning(
@@ -261,7 +303,12 @@ class MilvusClient(VectorDBBase):
         )
         # Using query with a trivial filter to get all items.
         # This will use the paginated query logic.
-        return self.query(collection_name=collection_name, filter={}, limit=-1)
+        return self.query(
+            collection_name=collection_name,
+            filter={},
+            limit=-1,
+            include_vectors=include_vectors,
+        )
 
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
@@ -335,6 +382,70 @@ class MilvusClient(VectorDBBase):
             ],
         )
 
+    def copy_items(
+        self,
+        src_collection_name: str,
+        dst_collection_name: str,
+        filter: Optional[dict] = None,
+    ) -> Optional[GetResult]:
+        # Copy the stored vectors batch by batch instead of embedding the items again.
+        connections.connect(uri=MILVUS_URI, token=MILVUS_TOKEN, db_name=MILVUS_DB)
+
+        src_collection_name = src_collection_name.replace("-", "_")
+        dst_collection_name = dst_collection_name.replace("-", "_")
+        if not self.has_collection(src_collection_name):
+            return None
+
+        filter_string = " && ".join(
+            [
+                f'metadata["{key}"] == {json.dumps(value)}'
+                for key, value in (filter or {}).items()
+            ]
+        )
+
+        collection = Collection(f"{self.collection_prefix}_{src_collection_name}")
+        collection.load()
+        iterator = collection.query_iterator(
+            expr=filter_string,
+            output_fields=["data", "metadata", "vector"],
+        )
+
+        copied = []
+        try:
+            while True:
+                batch = iterator.next()
+                if not batch:
+                    break
+
+                if not copied and not self.has_collection(dst_collection_name):
+                    self._create_collection(
+                        collection_name=dst_collection_name,
+                        dimension=len(batch[0]["vector"]),
+                    )
+                data = [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "vector": item["vector"],
+                        "data": item["data"],
+                        "metadata": item["metadata"],
+                    }
+                    for item in batch
+                ]
+                self.client.insert(
+                    collection_name=f"{self.collection_prefix}_{dst_collection_name}",
+                    data=data,
+                )
+                copied.extend(data)
+        finally:
+            iterator.close()
+
+        log.info(
+            f"Copied {len(copied)} items from {self.collection_prefix}_{src_collection_name} to {self.collection_prefix}_{dst_collection_name}."
+        )
+        if not copied:
+            return None
+        return self._result_to_get_result([copied])
+
     def delete(
         self,
         collection_name: str,
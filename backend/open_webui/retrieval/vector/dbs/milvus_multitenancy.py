@@ -162,6 +162,7 @@ class MilvusClient(VectorDBBase):
         vectors: List[List[float]],
         filter: Optional[Dict] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         if not vectors:
             return None
@@ -182,24 +183,36 @@ class MilvusClient(VectorDBBase):
             param=search_params,
             limit=limit,
             expr=f"{RESOURCE_ID_FIELD} == '{resource_id}'",
-            output_fields=["id", "text", "metadata"],
+            output_fields=[
+                "id",
+                "text",
+                "metadata",
+                *(["vector"] if include_vectors else []),
+            ],
         )
 
-        ids, documents, metadatas, distances = [], [], [], []
+        ids, documents, metadatas, distances, vectors = [], [], [], [], []
         for hits in results:
             batch_ids, batch_docs, batch_metadatas, batch_dists = [], [], [], []
+            batch_vectors = []
             for hit in hits:
                 batch_ids.append(hit.entity.get("id"))
                 batch_docs.append(hit.entity.get("text"))
                 batch_metadatas.append(hit.entity.get("metadata"))
                 batch_dists.append(hit.distance)
+                batch_vectors.append(hit.entity.get("vector"))
             ids.append(batch_ids)
             documents.append(batch_docs)
             metadatas.append(batch_metadatas)
             distances.append(batch_dists)
+            vectors.append(batch_vectors)
 
         return SearchResult(
-            ids=ids, documents=documents, metadatas=metadatas, distances=distances
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+            distances=distances,
+            vectors=vectors if include_vectors else None,
         )
 
     def delete(
@@ -245,7 +258,11 @@ class MilvusClient(VectorDBBase):
         collection.delete(f"{RESOURCE_ID_FIELD} == '{resource_id}'")
 
     def query(
-        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+        self,
+        collection_name: str,
+        filter: Dict[str, Any],
+        limit: Optional[int] = None,
+        include_vectors: bool = False,
     ) -> Optional[GetResult]:
         mt_collection, resource_id = self._get_collection_and_resource_id(
             collection_name
@@ -266,7 +283,12 @@ class MilvusClient(VectorDBBase):
 
         iterator = collection.query_iterator(
             expr=" and ".join(expr),
-            output_fields=["id", "text", "metadata"],
+            output_fields=[
+                "id",
+                "text",
+                "metadata",
+                *(["vector"] if include_vectors else []),
+            ],
             limit=limit if limit else -1,
         )
 
@@ -281,11 +303,21 @@ class MilvusClient(VectorDBBase):
         ids = [res["id"] for res in all_results]
         documents = [res["text"] for res in all_results]
         metadatas = [res["metadata"] for res in all_results]
+        vectors = [res["vector"] for res in all_results] if include_vectors else None
 
-        return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
+        return GetResult(
+            ids=[ids],
+            documents=[documents],
+            metadatas=[metadatas],
+            vectors=[vectors] if include_vectors else None,
+        )
 
-    def get(self, collection_name: str) -> Optional[GetResult]:
-        return self.query(collection_name, filter={}, limit=None)
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
+        return self.query(
+            collection_name, filter={}, limit=None, include_vectors=include_vectors
+        )
 
     def insert(self, collection_name: str, items: List[VectorItem]):
         return self.upsert(collection_name, items)
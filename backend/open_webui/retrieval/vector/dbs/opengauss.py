@@ -235,6 +235,7 @@ class OpenGaussClient(VectorDBBase):
         vectors: List[List[float]],
         filter: Optional[Dict[str, Any]] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         try:
             if not vectors:
@@ -263,6 +264,7 @@ class OpenGaussClient(VectorDBBase):
                 (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label(
                     "distance"
                 ),
+                *([DocumentChunk.vector] if include_vectors else []),
             ]
 
             subq = (
@@ -283,6 +285,7 @@ class OpenGaussClient(VectorDBBase):
                     subq.c.text,
                     subq.c.vmetadata,
                     subq.c.distance,
+                    *([subq.c.vector] if include_vectors else []),
                 )
                 .select_from(query_vectors)
                 .join(subq, true())
@@ -296,6 +299,7 @@ class OpenGaussClient(VectorDBBase):
             distances = [[] for _ in range(num_queries)]
             documents = [[] for _ in range(num_queries)]
             metadatas = [[] for _ in range(num_queries)]
+            result_vectors = [[] for _ in range(num_queries)]
 
             for row in results:
                 qid = int(row.qid)
@@ -303,10 +307,16 @@ class OpenGaussClient(VectorDBBase):
                 distances[qid].append((2.0 - row.distance) / 2.0)
                 documents[qid].append(row.text)
                 metadatas[qid].append(row.vmetadata)
+                if include_vectors:
+                    result_vectors[qid].append([float(v) for v in row.vector])
 
             self.session.rollback()
             return SearchResult(
-                ids=ids, distances=distances, documents=documents, metadatas=metadatas
+                ids=ids,
+                distances=distances,
+                documents=documents,
+                metadatas=metadatas,
+                vectors=result_vectors if include_vectors else None,
             )
         except Exception as e:
             self.session.rollback()
@@ -344,7 +354,10 @@ class OpenGaussClient(VectorDBBase):
             return None
 
     def get(
-        self, collection_name: str, limit: Optional[int] = None
+        self,
+        collection_name: str,
+        limit: Optional[int] = None,
+        include_vectors: bool = False,
     ) -> Optional[GetResult]:
         try:
             query = self.session.query(DocumentChunk).filter(
@@ -361,9 +374,16 @@ class OpenGaussClient(VectorDBBase):
             ids = [[result.id for result in results]]
             documents = [[result.text for result in results]]
             metadatas = [[result.vmetadata for result in results]]
+            vectors = (
+                [[[float(v) for v in result.vector] for result in results]]
+                if include_vectors
+                else None
+            )
 
             self.session.rollback()
-            return GetResult(ids=ids, documents=documents, metadatas=metadatas)
+            return GetResult(
+                ids=ids, documents=documents, metadatas=metadatas, vectors=vectors
+            )
         except Exception as e:
             self.session.rollback()
             log.exception(f"Failed to retrieve data: {e}")
@@ -1,5 +1,7 @@
+import uuid
+
 from opensearchpy import OpenSearch
-from opensearchpy.helpers import bulk
+from opensearchpy.helpers import bulk, scan
 from typing import Optional
 
 from open_webui.retrieval.vector.utils import process_metadata
@@ -31,22 +33,29 @@ class OpenSearchClient(VectorDBBase):
     def _get_index_name(self, collection_name: str) -> str:
         return f"{self.index_prefix}_{collection_name}"
 
-    def _result_to_get_result(self, result) -> GetResult:
+    def _result_to_get_result(self, result, include_vectors=False) -> GetResult:
         if not result["hits"]["hits"]:
             return None
 
         ids = []
         documents = []
         metadatas = []
+        vectors = []
 
         for hit in result["hits"]["hits"]:
             ids.append(hit["_id"])
             documents.append(hit["_source"].get("text"))
             metadatas.append(hit["_source"].get("metadata"))
+            vectors.append(hit["_source"].get("vector"))
 
-        return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
+        return GetResult(
+            ids=[ids],
+            documents=[documents],
+            metadatas=[metadatas],
+            vectors=[vectors] if include_vectors else None,
+        )
 
-    def _result_to_search_result(self, result) -> SearchResult:
+    def _result_to_search_result(self, result, include_vectors=False) -> SearchResult:
         if not result["hits"]["hits"]:
             return None
 
@@ -54,18 +63,21 @@ class OpenSearchClient(VectorDBBase):
         distances = []
         documents = []
         metadatas = []
+        vectors = []
 
         for hit in result["hits"]["hits"]:
             ids.append(hit["_id"])
             distances.append(hit["_score"])
             documents.append(hit["_source"].get("text"))
             metadatas.append(hit["_source"].get("metadata"))
+            vectors.append(hit["_source"].get("vector"))
 
         return SearchResult(
             ids=[ids],
             distances=[distances],
             documents=[documents],
             metadatas=[metadatas],
+            vectors=[vectors] if include_vectors else None,
         )
 
     def _create_index(self, collection_name: str, dimension: int):
@@ -118,6 +130,7 @@ class OpenSearchClient(VectorDBBase):
         vectors: list[list[float | int]],
         filter: Optional[dict] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         try:
             if not self.has_collection(collection_name):
@@ -125,7 +138,11 @@ class OpenSearchClient(VectorDBBase):
 
             query = {
                 "size": limit,
-                "_source": ["text", "metadata"],
+                "_source": [
+                    "text",
+                    "metadata",
+                    *(["vector"] if include_vectors else []),
+                ],
                 "query": {
                     "script_score": {
                         "query": {"match_all": {}},
@@ -144,7 +161,9 @@ class OpenSearchClient(VectorDBBase):
                 index=self._get_index_name(collection_name), body=query
             )
 
-            return self._result_to_search_result(result)
+            return self._result_to_search_result(
+                result, include_vectors=include_vectors
+            )
 
         except Exception as e:
             return None
@@ -183,13 +202,18 @@ class OpenSearchClient(VectorDBBase):
         if not self.has_collection(collection_name):
             self._create_index(collection_name, dimension)
 
-    def get(self, collection_name: str) -> Optional[GetResult]:
-        query = {"query": {"match_all": {}}, "_source": ["text", "metadata"]}
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
+        query = {
+            "query": {"match_all": {}},
+            "_source": ["text", "metadata", *(["vector"] if include_vectors else [])],
+        }
 
         result = self.client.search(
             index=self._get_index_name(collection_name), body=query
         )
-        return self._result_to_get_result(result)
+        return self._result_to_get_result(result, include_vectors=include_vectors)
 
     def insert(self, collection_name: str, items: list[VectorItem]):
         self._create_index_if_not_exists(
@@ -236,6 +260,60 @@ class OpenSearchClient(VectorDBBase):
             bulk(self.client, actions)
         self.client.indices.refresh(self._get_index_name(collection_name))
 
+    def copy_items(
+        self,
+        src_collection_name: str,
+        dst_collection_name: str,
+        filter: Optional[dict] = None,
+    ) -> Optional[GetResult]:
+        # Copy the stored vectors with scroll and bulk requests instead of embedding them again.
+        if not self.has_collection(src_collection_name):
+            return None
+
+        query_body = {
+            "query": {"bool": {"filter": []}},
+            "_source": ["text", "metadata", "vector"],
+        }
+        for field, value in (filter or {}).items():
+            query_body["query"]["bool"]["filter"].append(
+                {"term": {"metadata." + str(field) + ".keyword": value}}
+            )
+
+        ids = []
+        documents = []
+        metadatas = []
+        hits = scan(
+            self.client,
+            index=self._get_index_name(src_collection_name),
+            query=query_body,
+        )
+        for batch in self._create_batches(list(hits)):
+            if not ids:
+                self._create_index_if_not_exists(
+                    collection_name=dst_collection_name,
+                    dimension=len(batch[0]["_source"]["vector"]),
+                )
+
+            actions = []
+            for hit in batch:
+                actions.append(
+                    {
+                        "_op_type": "index",
+                        "_index": self._get_index_name(dst_collection_name),
+                        "_id": str(uuid.uuid4()),
+                        "_source": hit["_source"],
+                    }
+                )
+                documents.append(hit["_source"].get("text"))
+                metadatas.append(hit["_source"].get("metadata"))
+            bulk(self.client, actions)
+            ids.extend(action["_id"] for action in actions)
+
+        if not ids:
+            return None
+        self.client.indices.refresh(self._get_index_name(dst_collection_name))
+        return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
+
     def delete(
         self,
         collection_name: str,
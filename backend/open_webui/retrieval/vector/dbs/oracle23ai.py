@@ -526,6 +526,7 @@ class Oracle23aiClient(VectorDBBase):
         vectors: List[List[Union[float, int]]],
         filter: Optional[dict] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         """
         Search for similar vectors in the database.
@@ -536,6 +537,7 @@ class Oracle23aiClient(VectorDBBase):
             collection_name (str): Name of the collection to search
             vectors (List[List[Union[float, int]]]): Query vectors to find similar items for
             limit (int): Maximum number of results to return per query
+            include_vectors (bool): Also return the stored vector of each match
 
         Returns:
             Optional[SearchResult]: Search results containing ids, distances, documents, and metadata
@@ -564,6 +566,7 @@ class Oracle23aiClient(VectorDBBase):
             distances = [[] for _ in range(num_queries)]
             documents = [[] for _ in range(num_queries)]
             metadatas = [[] for _ in range(num_queries)]
+            result_vectors = [[] for _ in range(num_queries)]
 
             with self.get_connection() as connection:
                 with connection.cursor() as cursor:
@@ -571,10 +574,11 @@ class Oracle23aiClient(VectorDBBase):
                         vector_blob = self._vector_to_blob(vector)
 
                         cursor.execute(
-                            """
+                            f"""
                             SELECT dc.id, dc.text, 
                                 JSON_SERIALIZE(dc.vmetadata RETURNING VARCHAR2(4096)) as vmetadata,
                                 VECTOR_DISTANCE(dc.vector, :query_vector, COSINE) as distance
+                                {", dc.vector" if include_vectors else ""}
                             FROM document_chunk dc
                             WHERE dc.collection_name = :collection_name
                             ORDER BY VECTOR_DISTANCE(dc.vector, :query_vector, COSINE)
@@ -604,13 +608,19 @@ class Oracle23aiClient(VectorDBBase):
                             )
                             metadatas[qid].append(self._json_to_metadata(metadata_str))
                             distances[qid].append(float(row[3]))
+                            if include_vectors:
+                                result_vectors[qid].append(list(row[4]))
 
             log.info(
                 f"Search completed. Found {sum(len(ids[i]) for i in range(num_queries))} total results."
             )
 
             return SearchResult(
-                ids=ids, distances=distances, documents=documents, metadatas=metadatas
+                ids=ids,
+                distances=distances,
+                documents=documents,
+                metadatas=metadatas,
+                vectors=result_vectors if include_vectors else None,
             )
 
         except Exception as e:
@@ -695,7 +705,9 @@ class Oracle23aiClient(VectorDBBase):
             log.exception(f"Error during query: {e}")
             return None
 
-    def get(self, collection_name: str) -> Optional[GetResult]:
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
         """
         Get all items in a collection.
 
@@ -704,6 +716,7 @@ class Oracle23aiClient(VectorDBBase):
         Args:
             collection_name (str): Name of the collection to retrieve
             limit (Optional[int]): Maximum number of items to retrieve
+            include_vectors (bool): Also return the stored vector of each item
 
         Returns:
             Optional[GetResult]: Result containing ids, documents, and metadata
@@ -724,8 +737,9 @@ class Oracle23aiClient(VectorDBBase):
             with self.get_connection() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
-                        """
+                        f"""
                         SELECT /*+ MONITOR */ id, text, JSON_SERIALIZE(vmetadata RETURNING VARCHAR2(4096)) as vmetadata
+                            {", vector" if include_vectors else ""}
                         FROM document_chunk
                         WHERE collection_name = :collection_name
                         FETCH FIRST :limit ROWS ONLY
@@ -755,8 +769,11 @@ class Oracle23aiClient(VectorDBBase):
                     for row in results
                 ]
             ]
+            vectors = [[list(row[3]) for row in results]] if include_vectors else None
 
-            return GetResult(ids=ids, documents=documents, metadatas=metadatas)
+            return GetResult(
+                ids=ids, documents=documents, metadatas=metadatas, vectors=vectors
+            )
 
         except Exception as e:
             log.exception(f"Error during get: {e}")
@@ -7,6 +7,7 @@ from sqlalchemy import (
     cast,
     column,
     create_engine,
+    insert,
     Column,
     Integer,
     MetaData,
@@ -70,6 +71,15 @@ def pgcrypto_decrypt(col, key, outtype="text"):
     return func.cast(func.pgp_sym_decrypt(col, literal(key)), outtype)
 
 
+def vector_to_list(vector) -> Optional[List[float]]:
+    # Vector and halfvec columns come back as numpy arrays or HalfVector objects
+    if vector is None:
+        return None
+    if hasattr(vector, "to_list"):
+        return vector.to_list()
+    return [float(value) for value in vector]
+
+
 class DocumentChunk(Base):
     __tablename__ = "document_chunk"
 
@@ -429,6 +439,7 @@ class PgvectorClient(VectorDBBase):
         vectors: List[List[float]],
         filter: Optional[Dict[str, Any]] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         try:
             if not vectors:
@@ -474,6 +485,8 @@ class PgvectorClient(VectorDBBase):
                     "distance"
                 )
             )
+            if include_vectors:
+                result_fields.append(DocumentChunk.vector)
 
             # Build the lateral subquery for each query vector
             where_clauses = [DocumentChunk.collection_name == collection_name]
@@ -533,6 +546,7 @@ class PgvectorClient(VectorDBBase):
                     subq.c.text,
                     subq.c.vmetadata,
                     subq.c.distance,
+                    *([subq.c.vector] if include_vectors else []),
                 )
                 .select_from(query_vectors)
                 .join(subq, true())
@@ -546,6 +560,7 @@ class PgvectorClient(VectorDBBase):
             distances = [[] for _ in range(num_queries)]
             documents = [[] for _ in range(num_queries)]
             metadatas = [[] for _ in range(num_queries)]
+            result_vectors = [[] for _ in range(num_queries)]
 
             if not results:
                 return SearchResult(
@@ -553,6 +568,7 @@ class PgvectorClient(VectorDBBase):
                     distances=distances,
                     documents=documents,
                     metadatas=metadatas,
+                    vectors=result_vectors if include_vectors else None,
                 )
 
             for row in results:
@@ -563,10 +579,16 @@ class PgvectorClient(VectorDBBase):
                 distances[qid].append((2.0 - row.distance) / 2.0)
                 documents[qid].append(row.text)
                 metadatas[qid].append(row.vmetadata)
+                if include_vectors:
+                    result_vectors[qid].append(vector_to_list(row.vector))
 
             self.session.rollback()  # read-only transaction
             return SearchResult(
-                ids=ids, distances=distances, documents=documents, metadatas=metadatas
+                ids=ids,
+                distances=distances,
+                documents=documents,
+                metadatas=metadatas,
+                vectors=result_vectors if include_vectors else None,
             )
         except Exception as e:
             self.session.rollback()
@@ -634,9 +656,13 @@ class PgvectorClient(VectorDBBase):
             return None
 
     def get(
-        self, collection_name: str, limit: Optional[int] = None
+        self,
+        collection_name: str,
+        limit: Optional[int] = None,
+        include_vectors: bool = False,
     ) -> Optional[GetResult]:
         try:
+            vectors = None
             if PGVECTOR_PGCRYPTO:
                 stmt = select(
                     DocumentChunk.id,
@@ -646,6 +672,7 @@ class PgvectorClient(VectorDBBase):
                     pgcrypto_decrypt(
                         DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
                     ).label("vmetadata"),
+                    *([DocumentChunk.vector] if include_vectors else []),
                 ).where(DocumentChunk.collection_name == collection_name)
                 if limit is not None:
                     stmt = stmt.limit(limit)
@@ -653,6 +680,8 @@ class PgvectorClient(VectorDBBase):
                 ids = [[row.id for row in results]]
                 documents = [[row.text for row in results]]
                 metadatas = [[row.vmetadata for row in results]]
+                if include_vectors:
+                    vectors = [[vector_to_list(row.vector) for row in results]]
             else:
 
                 query = self.session.query(DocumentChunk).filter(
@@ -669,14 +698,84 @@ class PgvectorClient(VectorDBBase):
                 ids = [[result.id for result in results]]
                 documents = [[result.text for result in results]]
                 metadatas = [[result.vmetadata for result in results]]
+                if include_vectors:
+                    vectors = [[vector_to_list(result.vector) for result in results]]
 
             self.session.rollback()  # read-only transaction
-            return GetResult(ids=ids, documents=documents, metadatas=metadatas)
+            return GetResult(
+                ids=ids, documents=documents, metadatas=metadatas, vectors=vectors
+            )
         except Exception as e:
             self.session.rollback()
             log.exception(f"Error during get: {e}")
             return None
 
+    def copy_items(
+        self,
+        src_collection_name: str,
+        dst_collection_name: str,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> Optional[GetResult]:
+        try:
+            if PGVECTOR_PGCRYPTO:
+                vmetadata = pgcrypto_decrypt(
+                    DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                )
+            else:
+                vmetadata = DocumentChunk.vmetadata
+
+            wheres = [DocumentChunk.collection_name == src_collection_name]
+            for key, value in (filter or {}).items():
+                wheres.append(vmetadata[key].astext == str(value))
+
+            # Copy the rows inside the database, encrypted text and metadata as they are
+            table = DocumentChunk.__table__
+            stmt = (
+                insert(table)
+                .from_select(
+                    ["id", "vector", "collection_name", "text", "vmetadata"],
+                    select(
+                        cast(func.gen_random_uuid(), Text),
+                        DocumentChunk.vector,
+                        literal(dst_collection_name, Text),
+                        DocumentChunk.text,
+                        DocumentChunk.vmetadata,
+                    ).where(*wheres),
+                )
+                .returning(
+                    table.c.id,
+                    (
+                        pgcrypto_decrypt(table.c.text, PGVECTOR_PGCRYPTO_KEY, Text)
+                        if PGVECTOR_PGCRYPTO
+                        else table.c.text
+                    ).label("text"),
+                    (
+                        pgcrypto_decrypt(
+                            table.c.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                        )
+                        if PGVECTOR_PGCRYPTO
+                        else table.c.vmetadata
+                    ).label("vmetadata"),
+                )
+            )
+            results = self.session.execute(stmt).all()
+            self.session.commit()
+            log.info(
+                f"Copied {len(results)} items from collection '{src_collection_name}' to '{dst_collection_name}'."
+            )
+
+            if not results:
+                return None
+            return GetResult(
+                ids=[[row.id for row in results]],
+                documents=[[row.text for row in results]],
+                metadatas=[[row.vmetadata for row in results]],
+            )
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during copy: {e}")
+            raise
+
     def delete(
         self,
         collection_name: str,
@@ -751,3 +850,32 @@ class PgvectorClient(VectorDBBase):
     def delete_collection(self, collection_name: str) -> None:
         self.delete(collection_name)
         log.info(f"Collection '{collection_name}' deleted.")
+
+    def replace_collection(
+        self, src_collection_name: str, dst_collection_name: str
+    ) -> None:
+        try:
+            # Both statements run in one transaction, readers see either collection
+            self.session.query(DocumentChunk).filter(
+                DocumentChunk.collection_name == dst_collection_name
+            ).delete(synchronize_session=False)
+            moved = (
+                self.session.query(DocumentChunk)
+                .filter(DocumentChunk.collection_name == src_collection_name)
+                .update(
+                    {"collection_name": dst_collection_name},
+                    synchronize_session=False,
+                )
+            )
+            if not moved:
+                # Keep the destination when there is nothing to replace it with
+                self.session.rollback()
+                return
+            self.session.commit()
+            log.info(
+                f"Replaced collection '{dst_collection_name}' with {moved} items from '{src_collection_name}'."
+            )
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during replace: {e}")
+            raise
@@ -204,23 +204,28 @@ class PineconeClient(VectorDBBase):
             # For other metrics, use as is
             return score
 
-    def _result_to_get_result(self, matches: list) -> GetResult:
+    def _result_to_get_result(
+        self, matches: list, include_vectors: bool = False
+    ) -> GetResult:
         """Convert Pinecone matches to GetResult format."""
         ids = []
         documents = []
         metadatas = []
+        vectors = []
 
         for match in matches:
             metadata = getattr(match, "metadata", {}) or {}
             ids.append(match.id if hasattr(match, "id") else match["id"])
             documents.append(metadata.get("text", ""))
             metadatas.append(metadata)
+            vectors.append(getattr(match, "values", None) or None)
 
         return GetResult(
             **{
                 "ids": [ids],
                 "documents": [documents],
                 "metadatas": [metadatas],
+                "vectors": [vectors] if include_vectors else None,
             }
         )
 
@@ -396,6 +401,7 @@ class PineconeClient(VectorDBBase):
         vectors: List[List[Union[float, int]]],
         filter: Optional[dict] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         """Search for similar vectors in a collection."""
         if not vectors or not vectors[0]:
@@ -418,6 +424,7 @@ class PineconeClient(VectorDBBase):
                 vector=query_vector,
                 top_k=limit,
                 include_metadata=True,
+                include_values=include_vectors,
                 filter={"collection_name": collection_name_with_prefix},
             )
 
@@ -432,7 +439,9 @@ class PineconeClient(VectorDBBase):
                 )
 
             # Convert to GetResult format
-            get_result = self._result_to_get_result(matches)
+            get_result = self._result_to_get_result(
+                matches, include_vectors=include_vectors
+            )
 
             # Calculate normalized distances based on metric
             distances = [
@@ -446,6 +455,7 @@ class PineconeClient(VectorDBBase):
                 ids=get_result.ids,
                 documents=get_result.documents,
                 metadatas=get_result.metadatas,
+                vectors=get_result.vectors,
                 distances=distances,
             )
         except Exception as e:
@@ -487,7 +497,9 @@ class PineconeClient(VectorDBBase):
             log.error(f"Error querying collection '{collection_name}': {e}")
             return None
 
-    def get(self, collection_name: str) -> Optional[GetResult]:
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
         """Get all vectors in a collection."""
         collection_name_with_prefix = self._get_collection_name_with_prefix(
             collection_name
@@ -502,11 +514,12 @@ class PineconeClient(VectorDBBase):
                 vector=zero_vector,
                 top_k=NO_LIMIT,
                 include_metadata=True,
+                include_values=include_vectors,
                 filter={"collection_name": collection_name_with_prefix},
             )
 
             matches = getattr(query_response, "matches", []) or []
-            return self._result_to_get_result(matches)
+            return self._result_to_get_result(matches, include_vectors=include_vectors)
 
         except Exception as e:
             log.error(f"Error getting collection '{collection_name}': {e}")
@@ -1,5 +1,6 @@
 from typing import Optional
 import logging
+import uuid
 from urllib.parse import urlparse
 
 from qdrant_client import QdrantClient as Qclient
@@ -24,6 +25,7 @@ from open_webui.config import (
 )
 
 NO_LIMIT = 999999999
+COPY_BATCH_SIZE = 256
 
 log = logging.getLogger(__name__)
 
@@ -64,7 +66,7 @@ class QdrantClient(VectorDBBase):
                 timeout=QDRANT_TIMEOUT,
             )
 
-    def _result_to_get_result(self, points) -> GetResult:
+    def _result_to_get_result(self, points, include_vectors=False) -> GetResult:
         ids = []
         documents = []
         metadatas = []
@@ -80,6 +82,9 @@ class QdrantClient(VectorDBBase):
                 "ids": [ids],
                 "documents": [documents],
                 "metadatas": [metadatas],
+                "vectors": (
+                    [[point.vector for point in points]] if include_vectors else None
+                ),
             }
         )
 
@@ -150,6 +155,7 @@ class QdrantClient(VectorDBBase):
         vectors: list[list[float | int]],
         filter: Optional[dict] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         # Search for the nearest neighbor items based on the vectors and return 'limit' number of results.
         if limit is None:
@@ -159,12 +165,16 @@ class QdrantClient(VectorDBBase):
             collection_name=f"{self.collection_prefix}_{collection_name}",
             query=vectors[0],
             limit=limit,
+            with_vectors=include_vectors,
+        )
+        get_result = self._result_to_get_result(
+            query_response.points, include_vectors=include_vectors
         )
-        get_result = self._result_to_get_result(query_response.points)
         return SearchResult(
             ids=get_result.ids,
             documents=get_result.documents,
             metadatas=get_result.metadatas,
+            vectors=get_result.vectors,
             # qdrant distance is [-1, 1], normalize to [0, 1]
             distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
         )
@@ -195,13 +205,16 @@ class QdrantClient(VectorDBBase):
             log.exception(f"Error querying a collection '{collection_name}': {e}")
             return None
 
-    def get(self, collection_name: str) -> Optional[GetResult]:
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
         # Get all the items in the collection.
         points = self.client.scroll(
             collection_name=f"{self.collection_prefix}_{collection_name}",
             limit=NO_LIMIT,  # otherwise qdrant would set limit to 10!
+            with_vectors=include_vectors,
         )
-        return self._result_to_get_result(points[0])
+        return self._result_to_get_result(points[0], include_vectors=include_vectors)
 
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
@@ -215,6 +228,59 @@ class QdrantClient(VectorDBBase):
         points = self._create_points(items)
         return self.client.upsert(f"{self.collection_prefix}_{collection_name}", points)
 
+    def copy_items(
+        self,
+        src_collection_name: str,
+        dst_collection_name: str,
+        filter: Optional[dict] = None,
+    ) -> Optional[GetResult]:
+        # Copy the stored points page by page instead of embedding them again.
+        if not self.has_collection(src_collection_name):
+            return None
+
+        scroll_filter = None
+        if filter:
+            scroll_filter = models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key=f"metadata.{key}", match=models.MatchValue(value=value)
+                    )
+                    for key, value in filter.items()
+                ]
+            )
+
+        copied = []
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=f"{self.collection_prefix}_{src_collection_name}",
+                scroll_filter=scroll_filter,
+                limit=COPY_BATCH_SIZE,
+                offset=offset,
+                with_vectors=True,
+            )
+            if points:
+                if not copied:
+                    self._create_collection_if_not_exists(
+                        dst_collection_name, len(points[0].vector)
+                    )
+                points = [
+                    PointStruct(
+                        id=str(uuid.uuid4()), vector=point.vector, payload=point.payload
+                    )
+                    for point in points
+                ]
+                self.client.upsert(
+                    f"{self.collection_prefix}_{dst_collection_name}", points
+                )
+                copied.extend(points)
+            if offset is None:
+                break
+
+        if not copied:
+            return None
+        return self._result_to_get_result(copied)
+
     def delete(
         self,
         collection_name: str,
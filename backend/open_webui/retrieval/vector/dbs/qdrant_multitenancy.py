@@ -88,14 +88,19 @@ class QdrantClient(VectorDBBase):
         self.WEB_SEARCH_COLLECTION = f"{self.collection_prefix}_web-search"
         self.HASH_BASED_COLLECTION = f"{self.collection_prefix}_hash-based"
 
-    def _result_to_get_result(self, points) -> GetResult:
+    def _result_to_get_result(self, points, include_vectors=False) -> GetResult:
         ids, documents, metadatas = [], [], []
         for point in points:
             payload = point.payload
             ids.append(point.id)
             documents.append(payload["text"])
             metadatas.append(payload["metadata"])
-        return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
+        return GetResult(
+            ids=[ids],
+            documents=[documents],
+            metadatas=[metadatas],
+            vectors=[[point.vector for point in points]] if include_vectors else None,
+        )
 
     def _get_collection_and_tenant_id(self, collection_name: str) -> Tuple[str, str]:
         """
@@ -259,6 +264,7 @@ class QdrantClient(VectorDBBase):
         vectors: List[List[float | int]],
         filter: Optional[Dict] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         """
         Search for the nearest neighbor items based on the vectors with tenant isolation.
@@ -276,12 +282,16 @@ class QdrantClient(VectorDBBase):
             query=vectors[0],
             limit=limit,
             query_filter=models.Filter(must=[tenant_filter]),
+            with_vectors=include_vectors,
+        )
+        get_result = self._result_to_get_result(
+            query_response.points, include_vectors=include_vectors
         )
-        get_result = self._result_to_get_result(query_response.points)
         return SearchResult(
             ids=get_result.ids,
             documents=get_result.documents,
             metadatas=get_result.metadatas,
+            vectors=get_result.vectors,
             distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
         )
 
@@ -309,7 +319,9 @@ class QdrantClient(VectorDBBase):
         )
         return self._result_to_get_result(points[0])
 
-    def get(self, collection_name: str) -> Optional[GetResult]:
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
         """
         Get all items in a collection with tenant isolation.
         """
@@ -324,8 +336,9 @@ class QdrantClient(VectorDBBase):
             collection_name=mt_collection,
             scroll_filter=models.Filter(must=[tenant_filter]),
             limit=NO_LIMIT,
+            with_vectors=include_vectors,
         )
-        return self._result_to_get_result(points[0])
+        return self._result_to_get_result(points[0], include_vectors=include_vectors)
 
     def upsert(self, collection_name: str, items: List[VectorItem]):
         """
@@ -300,9 +300,12 @@ class S3VectorClient(VectorDBBase):
         vectors: List[List[Union[float, int]]],
         filter: Optional[dict] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         """
         Search for similar vectors in a collection using multiple query vectors.
+
+        QueryVectors cannot return vector data, so `include_vectors` is ignored.
         """
 
         if not self.has_collection(collection_name):
@@ -492,7 +495,9 @@ class S3VectorClient(VectorDBBase):
                     return GetResult(ids=[[]], documents=[[]], metadatas=[[]])
             raise
 
-    def get(self, collection_name: str) -> Optional[GetResult]:
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
         """
         Retrieve all vectors from a collection.
         """
@@ -508,6 +513,7 @@ class S3VectorClient(VectorDBBase):
             all_ids = []
             all_documents = []
             all_metadatas = []
+            all_vectors = []
 
             # Handle pagination
             next_token = None
@@ -517,7 +523,7 @@ class S3VectorClient(VectorDBBase):
                 request_params = {
                     "vectorBucketName": self.bucket_name,
                     "indexName": collection_name,
-                    "returnData": False,  # Don't include vector data (not needed for get)
+                    "returnData": include_vectors,
                     "returnMetadata": True,  # Include metadata
                     "maxResults": 500,  # Use reasonable page size
                 }
@@ -562,6 +568,7 @@ class S3VectorClient(VectorDBBase):
                     all_ids.append(vector_id)
                     all_documents.append(document_text)
                     all_metadatas.append(vector_metadata)
+                    all_vectors.append(vector_array)
 
                 # Check if there are more pages
                 next_token = response.get("nextToken")
@@ -576,7 +583,10 @@ class S3VectorClient(VectorDBBase):
             # The Open WebUI GetResult expects lists of lists, so we wrap each list
             if all_ids:
                 return GetResult(
-                    ids=[all_ids], documents=[all_documents], metadatas=[all_metadatas]
+                    ids=[all_ids],
+                    documents=[all_documents],
+                    metadatas=[all_metadatas],
+                    vectors=[all_vectors] if include_vectors else None,
                 )
             else:
                 return GetResult(ids=[[]], documents=[[]], metadatas=[[]])
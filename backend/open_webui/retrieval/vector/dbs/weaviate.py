@@ -46,6 +46,14 @@ def _convert_uuids_to_strings(obj: Any) -> Any:
         return obj
 
 
+def _get_default_vector(obj: Any) -> Optional[List[float]]:
+    """Return the unnamed vector of an object fetched with include_vector."""
+    vector = getattr(obj, "vector", None)
+    if isinstance(vector, dict):
+        return vector.get("default")
+    return vector or None
+
+
 class WeaviateClient(VectorDBBase):
     def __init__(self):
         self.url = WEAVIATE_HTTP_HOST
@@ -164,6 +172,7 @@ class WeaviateClient(VectorDBBase):
         vectors: List[List[Union[float, int]]],
         filter: Optional[dict] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
         sane_collection_name = self._sanitize_collection_name(collection_name)
         if not self.client.collections.exists(sane_collection_name):
@@ -177,6 +186,7 @@ class WeaviateClient(VectorDBBase):
             [],
             [],
         )
+        result_vectors = []
 
         for vector_embedding in vectors:
             try:
@@ -184,6 +194,7 @@ class WeaviateClient(VectorDBBase):
                     near_vector=vector_embedding,
                     limit=limit,
                     return_metadata=weaviate.classes.query.MetadataQuery(distance=True),
+                    include_vector=include_vectors,
                 )
 
                 ids = [str(obj.uuid) for obj in response.objects]
@@ -211,11 +222,15 @@ class WeaviateClient(VectorDBBase):
                 result_documents.append(documents)
                 result_metadatas.append(metadatas)
                 result_distances.append(distances)
+                result_vectors.append(
+                    [_get_default_vector(obj) for obj in response.objects]
+                )
             except Exception:
                 result_ids.append([])
                 result_documents.append([])
                 result_metadatas.append([])
                 result_distances.append([])
+                result_vectors.append([])
 
         return SearchResult(
             **{
@@ -223,6 +238,7 @@ class WeaviateClient(VectorDBBase):
                 "documents": result_documents,
                 "metadatas": result_metadatas,
                 "distances": result_distances,
+                "vectors": result_vectors if include_vectors else None,
             }
         )
 
@@ -273,20 +289,23 @@ class WeaviateClient(VectorDBBase):
         except Exception:
             return None
 
-    def get(self, collection_name: str) -> Optional[GetResult]:
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
         sane_collection_name = self._sanitize_collection_name(collection_name)
         if not self.client.collections.exists(sane_collection_name):
             return None
 
         collection = self.client.collections.get(sane_collection_name)
-        ids, documents, metadatas = [], [], []
+        ids, documents, metadatas, vectors = [], [], [], []
 
         try:
-            for item in collection.iterator():
+            for item in collection.iterator(include_vector=include_vectors):
                 ids.append(str(item.uuid))
                 properties = dict(item.properties) if item.properties else {}
                 documents.append(properties.pop("text", ""))
                 metadatas.append(_convert_uuids_to_strings(properties))
+                vectors.append(_get_default_vector(item))
 
             if not ids:
                 return None
@@ -296,6 +315,7 @@ class WeaviateClient(VectorDBBase):
                     "ids": [ids],
                     "documents": [documents],
                     "metadatas": [metadatas],
+                    "vectors": [vectors] if include_vectors else None,
                 }
             )
         except Exception:
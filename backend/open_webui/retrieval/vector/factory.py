@@ -1,7 +1,9 @@
 from open_webui.retrieval.vector.main import VectorDBBase
+from open_webui.retrieval.bm25 import BM25IndexedVectorDB
 from open_webui.retrieval.vector.type import VectorType
 from open_webui.config import (
     VECTOR_DB,
+    ENABLE_RAG_BM25_INDEX,
     ENABLE_QDRANT_MULTITENANCY_MODE,
     ENABLE_MILVUS_MULTITENANCY_MODE,
 )
@@ -80,3 +82,6 @@ class Vector:
 
 
 VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
+
+if ENABLE_RAG_BM25_INDEX:
+    VECTOR_DB_CLIENT = BM25IndexedVectorDB(VECTOR_DB_CLIENT)
@@ -1,3 +1,4 @@
+import uuid
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
@@ -14,6 +15,8 @@ class GetResult(BaseModel):
     ids: Optional[List[List[str]]]
     documents: Optional[List[List[str]]]
     metadatas: Optional[List[List[Any]]]
+    # Only set when requested with include_vectors
+    vectors: Optional[List[List[List[float | int]]]] = None
 
 
 class SearchResult(GetResult):
@@ -58,8 +61,9 @@ class VectorDBBase(ABC):
         vectors: List[List[Union[float, int]]],
         filter: Optional[Dict] = None,
         limit: int = 10,
+        include_vectors: bool = False,
     ) -> Optional[SearchResult]:
-        """Search for similar vectors in a collection."""
+        """Search for similar vectors in a collection, optionally returning the stored vectors."""
         pass
 
     @abstractmethod
@@ -70,10 +74,76 @@ class VectorDBBase(ABC):
         pass
 
     @abstractmethod
-    def get(self, collection_name: str) -> Optional[GetResult]:
-        """Retrieve all vectors from a collection."""
+    def get(
+        self, collection_name: str, include_vectors: bool = False
+    ) -> Optional[GetResult]:
+        """Retrieve all items from a collection, optionally with their vectors."""
         pass
 
+    def copy_items(
+        self,
+        src_collection_name: str,
+        dst_collection_name: str,
+        filter: Optional[Dict] = None,
+    ) -> Optional[GetResult]:
+        """
+        Copy items with their stored vectors and metadata into another collection.
+
+        Returns the copied items as stored in the destination collection, or None
+        if nothing was copied. Backends override this with a server-side or bulk
+        copy; this fallback reads the whole source collection.
+        """
+        if not self.has_collection(src_collection_name):
+            return None
+
+        result = self.get(src_collection_name, include_vectors=True)
+        if not result or not result.ids or not result.ids[0] or not result.vectors:
+            return None
+
+        items = [
+            {
+                "id": str(uuid.uuid4()),
+                "text": text,
+                "vector": vector,
+                "metadata": metadata,
+            }
+            for text, vector, metadata in zip(
+                result.documents[0], result.vectors[0], result.metadatas[0]
+            )
+            if all(
+                (metadata or {}).get(key) == value
+                for key, value in (filter or {}).items()
+            )
+        ]
+        if not items:
+            return None
+
+        self.insert(dst_collection_name, items)
+        return GetResult(
+            ids=[[item["id"] for item in items]],
+            documents=[[item["text"] for item in items]],
+            metadatas=[[item["metadata"] for item in items]],
+        )
+
+    def replace_collection(
+        self, src_collection_name: str, dst_collection_name: str
+    ) -> None:
+        """
+        Replace the destination collection with the source collection, which
+        is removed.
+
+        Backends override this with a rename so the destination is swapped at
+        once; this fallback copies the stored vectors, during which the
+        destination is briefly incomplete.
+        """
+        if not self.has_collection(src_collection_name):
+            return
+
+        if self.has_collection(dst_collection_name):
+            self.delete_collection(dst_collection_name)
+        self.copy_items(src_collection_name, dst_collection_name)
+        self.delete_collection(src_collection_name)
+
     @abstractmethod
     def delete(
         self,
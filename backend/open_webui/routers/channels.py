@@ -61,11 +61,12 @@ from open_webui.utils.chat import generate_chat_completion
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import (
     has_access,
-    get_users_with_access,
-    get_permitted_group_and_user_ids,
+    get_access_filter,
+    get_user_count_with_access,
+    get_user_ids_with_access,
     has_permission,
 )
-from open_webui.utils.webhook import post_webhook
+from open_webui.utils.webhook import WEBHOOK_DISPATCHER
 from open_webui.utils.channels import extract_mentions, replace_mentions
 from open_webui.internal.db import get_session
 from sqlalchemy.orm import Session
@@ -118,46 +119,50 @@ async def get_channels(
         )
 
     channels = Channels.get_channels_by_user_id(user.id, db=db)
-    channel_list = []
-    for channel in channels:
-        last_message = Messages.get_last_message_by_channel_id(channel.id, db=db)
-        last_message_at = last_message.created_at if last_message else None
+    channel_ids = [channel.id for channel in channels]
 
-        channel_member = Channels.get_member_by_channel_and_user_id(
-            channel.id, user.id, db=db
-        )
-        unread_count = (
-            Messages.get_unread_message_count(
-                channel.id, user.id, channel_member.last_read_at, db=db
+    # Aggregate per-channel state in a constant number of queries
+    last_message_at_by_channel_id = Messages.get_last_message_at_by_channel_ids(
+        channel_ids, db=db
+    )
+    unread_count_by_channel_id = Messages.get_unread_message_counts_by_channel_ids(
+        channel_ids, user.id, db=db
+    )
+
+    dm_members = Channels.get_members_by_channel_ids(
+        [channel.id for channel in channels if channel.type == "dm"], db=db
+    )
+    dm_user_ids = list(
+        {member.user_id for members in dm_members.values() for member in members}
+    )
+    dm_users = {}
+    if dm_user_ids:
+        active_user_ids = Users.get_active_user_ids(dm_user_ids, db=db)
+        dm_users = {
+            dm_user.id: UserIdNameStatusResponse(
+                **{
+                    **dm_user.model_dump(),
+                    "is_active": dm_user.id in active_user_ids,
+                }
             )
-            if channel_member
-            else 0
-        )
+            for dm_user in Users.get_users_by_user_ids(dm_user_ids, db=db)
+        }
 
+    channel_list = []
+    for channel in channels:
         user_ids = None
         users = None
         if channel.type == "dm":
-            user_ids = [
-                member.user_id
-                for member in Channels.get_members_by_channel_id(channel.id, db=db)
-            ]
-            users = [
-                UserIdNameStatusResponse(
-                    **{
-                        **user.model_dump(),
-                        "is_active": Users.is_user_active(user.id, db=db),
-                    }
-                )
-                for user in Users.get_users_by_user_ids(user_ids, db=db)
-            ]
+            user_ids = [member.user_id for member in dm_members.get(channel.id, [])]
+            users = [dm_users[user_id] for user_id in user_ids if user_id in dm_users]
 
         channel_list.append(
             ChannelListItemResponse(
                 **channel.model_dump(),
                 user_ids=user_ids,
                 users=users,
-                last_message_at=last_message_at,
-                unread_count=unread_count,
+                last_message_at=last_message_at_by_channel_id.get(channel.id),
+                unread_count=unread_count_by_channel_id.get(channel.id, 0),
             )
         )
 
@@ -376,11 +381,12 @@ async def get_channel_by_id(
             for member in Channels.get_members_by_channel_id(channel.id, db=db)
         ]
 
+        active_user_ids = Users.get_active_user_ids(user_ids, db=db)
         users = [
             UserIdNameStatusResponse(
                 **{
                     **user.model_dump(),
-                    "is_active": Users.is_user_active(user.id, db=db),
+                    "is_active": user.id in active_user_ids,
                 }
             )
             for user in Users.get_users_by_user_ids(user_ids, db=db)
@@ -423,7 +429,7 @@ async def get_channel_by_id(
             db=db,
         )
 
-        user_count = len(get_users_with_access("read", channel.access_control))
+        user_count = get_user_count_with_access("read", channel.access_control, db=db)
 
         channel_member = Channels.get_member_by_channel_and_user_id(
             channel.id, user.id, db=db
@@ -494,10 +500,11 @@ async def get_channel_members_by_id(
         users = Users.get_users_by_user_ids(user_ids, db=db)
         total = len(users)
 
+        active_user_ids = Users.get_active_user_ids(user_ids, db=db)
         return {
             "users": [
                 UserModelResponse(
-                    **user.model_dump(), is_active=Users.is_user_active(user.id, db=db)
+                    **user.model_dump(), is_active=user.id in active_user_ids
                 )
                 for user in users
             ],
@@ -516,23 +523,18 @@ async def get_channel_members_by_id(
         if channel.type == "group":
             filter["channel_id"] = channel.id
         else:
-            filter["roles"] = ["!pending"]
-            permitted_ids = get_permitted_group_and_user_ids(
-                "read", channel.access_control
-            )
-            if permitted_ids:
-                filter["user_ids"] = permitted_ids.get("user_ids")
-                filter["group_ids"] = permitted_ids.get("group_ids")
+            filter.update(get_access_filter("read", channel.access_control))
 
         result = Users.get_users(filter=filter, skip=skip, limit=limit, db=db)
 
         users = result["users"]
         total = result["total"]
 
+        active_user_ids = Users.get_active_user_ids([u.id for u in users], db=db)
         return {
             "users": [
                 UserModelResponse(
-                    **user.model_dump(), is_active=Users.is_user_active(user.id, db=db)
+                    **user.model_dump(), is_active=user.id in active_user_ids
                 )
                 for user in users
             ],
@@ -821,13 +823,15 @@ async def get_channel_messages(
     user_ids = list(set(m.user_id for m in message_list))
     users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
 
+    # Batch fetch thread reply counts and reactions for the whole page
+    message_ids = [m.id for m in message_list]
+    thread_reply_stats = Messages.get_thread_reply_stats_by_message_ids(
+        message_ids, db=db
+    )
+    reactions = Messages.get_reactions_by_message_ids(message_ids, db=db)
+
     messages = []
     for message in message_list:
-        thread_replies = Messages.get_thread_replies_by_message_id(message.id, db=db)
-        latest_thread_reply_at = (
-            thread_replies[0].created_at if thread_replies else None
-        )
-
         # Use message.user if present (for webhooks), otherwise look up by user_id
         user_info = message.user
         if user_info is None and message.user_id in users:
@@ -837,11 +841,10 @@ async def get_channel_messages(
             MessageUserResponse(
                 **{
                     **message.model_dump(),
-                    "reply_count": len(thread_replies),
-                    "latest_reply_at": latest_thread_reply_at,
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
+                    "reply_count": 0,
+                    "latest_reply_at": None,
+                    **thread_reply_stats.get(message.id, {}),
+                    "reactions": reactions.get(message.id, []),
                     "user": user_info,
                 }
             )
@@ -897,6 +900,9 @@ async def get_pinned_channel_messages(
     # Batch fetch all users in a single query (fixes N+1 problem)
     user_ids = list(set(m.user_id for m in message_list))
     users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
+    reactions = Messages.get_reactions_by_message_ids(
+        [m.id for m in message_list], db=db
+    )
 
     messages = []
     for message in message_list:
@@ -917,9 +923,7 @@ async def get_pinned_channel_messages(
             MessageWithReactionsResponse(
                 **{
                     **message.model_dump(),
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
+                    "reactions": reactions.get(message.id, []),
                     "user": user_info,
                 }
             )
@@ -936,29 +940,36 @@ async def get_pinned_channel_messages(
 async def send_notification(
     name, webui_url, channel, message, active_user_ids, db=None
 ):
-    users = get_users_with_access("read", channel.access_control)
+    users = Users.get_channel_member_users(
+        channel.id,
+        user_ids=get_user_ids_with_access("read", channel.access_control, db=db),
+        exclude_user_ids=active_user_ids,
+        db=db,
+    )
 
+    jobs = []
     for user in users:
-        if (user.id not in active_user_ids) and Channels.is_user_channel_member(
-            channel.id, user.id, db=db
-        ):
-            if user.settings:
-                webhook_url = user.settings.ui.get("notifications", {}).get(
-                    "webhook_url", None
-                )
-                if webhook_url:
-                    await post_webhook(
-                        name,
-                        webhook_url,
-                        f"#{channel.name} - {webui_url}/channels/{channel.id}\n\n{message.content}",
-                        {
+        if user.settings:
+            webhook_url = user.settings.ui.get("notifications", {}).get(
+                "webhook_url", None
+            )
+            if webhook_url:
+                jobs.append(
+                    {
+                        "name": name,
+                        "url": webhook_url,
+                        "message": f"#{channel.name} - {webui_url}/channels/{channel.id}\n\n{message.content}",
+                        "event_data": {
                             "action": "channel",
                             "message": message.content,
                             "title": channel.name,
                             "url": f"{webui_url}/channels/{channel.id}",
                         },
-                    )
+                    }
+                )
 
+    # Delivered in the background so slow endpoints don't hold up the channel
+    await WEBHOOK_DISPATCHER.submit(jobs)
     return True
 
 
@@ -1254,7 +1265,7 @@ async def post_new_message(
         except Exception as e:
             log.debug(e)
 
-        active_user_ids = get_user_ids_from_room(f"channel:{channel.id}")
+        active_user_ids = await get_user_ids_from_room(f"channel:{channel.id}")
 
         # NOTE: We intentionally do NOT pass db to background_handler.
         # Background tasks should manage their own short-lived sessions to avoid
@@ -1499,6 +1510,9 @@ async def get_channel_thread_messages(
     # Batch fetch all users in a single query (fixes N+1 problem)
     user_ids = list(set(m.user_id for m in message_list))
     users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
+    reactions = Messages.get_reactions_by_message_ids(
+        [m.id for m in message_list], db=db
+    )
 
     messages = []
     for message in message_list:
@@ -1513,9 +1527,7 @@ async def get_channel_thread_messages(
                     **message.model_dump(),
                     "reply_count": 0,
                     "latest_reply_at": None,
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
+                    "reactions": reactions.get(message.id, []),
                     "user": user_info,
                 }
             )
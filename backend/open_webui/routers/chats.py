@@ -1,6 +1,7 @@
 import json
 import logging
-from typing import Optional
+import zlib
+from typing import Iterable, Iterator, Optional
 from sqlalchemy.orm import Session
 import asyncio
 from fastapi.responses import StreamingResponse
@@ -13,6 +14,7 @@ from open_webui.models.chats import (
     ChatImportForm,
     ChatUsageStatsListResponse,
     ChatsImportForm,
+    ChatModel,
     ChatResponse,
     Chats,
     ChatTitleIdResponse,
@@ -213,6 +215,7 @@ def get_session_user_chat_usage_stats(
 
 
 CHAT_EXPORT_PAGE_ITEM_COUNT = 10
+CHAT_EXPORT_STREAM_BATCH_SIZE = 100
 
 
 class ChatStatsExportList(BaseModel):
@@ -391,22 +394,15 @@ def generate_chat_stats_jsonl_generator(user_id, filter):
     2. Holding a session open for the entire streaming duration blocks other requests
     3. Short-lived sessions release locks between batches, allowing other operations
     """
-    skip = 0
-    limit = CHAT_EXPORT_PAGE_ITEM_COUNT
-
-    while True:
-        # Each batch gets its own session that closes after the query
-        result = Chats.get_chats_by_user_id(
-            user_id,
-            filter=filter,
-            skip=skip,
-            limit=limit,
-            db=None,  # Let get_db_context create a fresh session per batch
-        )
-        if not result.items:
-            break
-
-        for chat in result.items:
+    for chats in Chats.iter_chats(
+        user_id=user_id,
+        updated_at=filter.get("updated_at"),
+        order_by=filter.get("order_by", "created_at"),
+        direction=filter.get("direction", "asc"),
+        batch_size=CHAT_EXPORT_STREAM_BATCH_SIZE,
+        db=None,  # Let get_db_context create a fresh session per batch
+    ):
+        for chat in chats:
             try:
                 chat_stat = _process_chat_for_export(chat)
                 if chat_stat:
@@ -414,7 +410,48 @@ def generate_chat_stats_jsonl_generator(user_id, filter):
             except Exception as e:
                 log.exception(f"Error processing chat {chat.id}: {e}")
 
-        skip += limit
+
+def generate_chats_json_generator(
+    chats: Iterable[ChatModel], format: str = "json"
+) -> Iterator[str]:
+    """
+    Encode chats one at a time, either as a JSON array or as NDJSON, so the
+    export never holds more than one encoded chat in memory.
+    """
+    if format == "ndjson":
+        for chat in chats:
+            yield ChatResponse(**chat.model_dump()).model_dump_json() + "\n"
+        return
+
+    yield "["
+    for i, chat in enumerate(chats):
+        yield ("," if i else "") + ChatResponse(**chat.model_dump()).model_dump_json()
+    yield "]"
+
+
+def gzip_generator(chunks: Iterable[str]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def get_export_streaming_response(
+    chunks: Iterator[str], filename: str, media_type: str, compress: bool = False
+) -> StreamingResponse:
+    if compress:
+        return StreamingResponse(
+            gzip_generator(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f"attachment; filename={filename}.gz"},
+        )
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
 
 @router.get("/stats/export", response_model=ChatStatsExportList)
@@ -423,6 +460,7 @@ async def export_chat_stats(
     updated_at: Optional[int] = None,
     page: Optional[int] = 1,
     stream: bool = False,
+    compress: bool = False,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
@@ -443,12 +481,11 @@ async def export_chat_stats(
             filter["updated_at"] = updated_at
 
         if stream:
-            return StreamingResponse(
+            return get_export_streaming_response(
                 generate_chat_stats_jsonl_generator(user.id, filter),
+                filename=f"chat-stats-export-{user.id}.jsonl",
                 media_type="application/x-ndjson",
-                headers={
-                    "Content-Disposition": f"attachment; filename=chat-stats-export-{user.id}.jsonl"
-                },
+                compress=compress,
             )
         else:
             limit = CHAT_EXPORT_PAGE_ITEM_COUNT
@@ -784,16 +821,43 @@ async def get_all_user_tags(
 ############################
 
 
-@router.get("/all/db", response_model=list[ChatResponse])
+@router.get("/all/db")
 async def get_all_user_chats_in_db(
-    user=Depends(get_admin_user), db: Session = Depends(get_session)
+    format: str = "json",
+    compress: bool = False,
+    user=Depends(get_admin_user),
 ):
     if not ENABLE_ADMIN_EXPORT:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
-    return [ChatResponse(**chat.model_dump()) for chat in Chats.get_chats(db=db)]
+    if format not in ("json", "ndjson"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Unsupported export format"),
+        )
+
+    # Stream in keyset-paginated batches, each with its own short-lived session
+    # (see generate_chat_stats_jsonl_generator)
+    chats = (
+        chat
+        for chats in Chats.iter_chats(batch_size=CHAT_EXPORT_STREAM_BATCH_SIZE)
+        for chat in chats
+    )
+    if format == "ndjson":
+        return get_export_streaming_response(
+            generate_chats_json_generator(chats, format="ndjson"),
+            filename="chats-export.jsonl",
+            media_type="application/x-ndjson",
+            compress=compress,
+        )
+    return get_export_streaming_response(
+        generate_chats_json_generator(chats),
+        filename="chats-export.json",
+        media_type="application/json",
+        compress=compress,
+    )
 
 
 ############################
@@ -992,7 +1056,7 @@ async def update_chat_message_by_id(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    chat = Chats.upsert_message_to_chat_by_id_and_message_id(
+    message = Chats.upsert_message_to_chat_by_id_and_message_id(
         id,
         message_id,
         {
@@ -1000,6 +1064,10 @@ async def update_chat_message_by_id(
         },
         db=db,
     )
+    if message is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT()
+        )
 
     event_emitter = get_event_emitter(
         {
@@ -1022,6 +1090,7 @@ async def update_chat_message_by_id(
             }
         )
 
+    chat = Chats.get_chat_by_id(id, db=db)
     return ChatResponse(**chat.model_dump())
 
 
@@ -1131,7 +1200,7 @@ async def delete_chat_by_id(
 async def get_pinned_status_by_id(
     id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
+    chat = Chats.get_chat_info_by_id_and_user_id(id, user.id, db=db)
     if chat:
         return chat.pinned
     else:
@@ -1149,8 +1218,7 @@ async def get_pinned_status_by_id(
 async def pin_chat_by_id(
     id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
-    if chat:
+    if Chats.is_chat_owned_by_user(id, user.id, db=db):
         chat = Chats.toggle_chat_pinned_by_id(id, db=db)
         return chat
     else:
@@ -1274,8 +1342,7 @@ async def clone_shared_chat_by_id(
 async def archive_chat_by_id(
     id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
-    if chat:
+    if Chats.is_chat_owned_by_user(id, user.id, db=db):
         chat = Chats.toggle_chat_archive_by_id(id, db=db)
 
         # Delete tags if chat is archived
@@ -1323,7 +1390,7 @@ async def share_chat_by_id(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
+    chat = Chats.get_chat_info_by_id_and_user_id(id, user.id, db=db)
 
     if chat:
         if chat.share_id:
@@ -1354,7 +1421,7 @@ async def share_chat_by_id(
 async def delete_shared_chat_by_id(
     id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
+    chat = Chats.get_chat_info_by_id_and_user_id(id, user.id, db=db)
     if chat:
         if not chat.share_id:
             return False
@@ -1386,8 +1453,7 @@ async def update_chat_folder_id_by_id(
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
-    if chat:
+    if Chats.is_chat_owned_by_user(id, user.id, db=db):
         chat = Chats.update_chat_folder_id_by_id_and_user_id(
             id, user.id, form_data.folder_id, db=db
         )
@@ -1407,7 +1473,7 @@ async def update_chat_folder_id_by_id(
 async def get_chat_tags_by_id(
     id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
+    chat = Chats.get_chat_info_by_id_and_user_id(id, user.id, db=db)
     if chat:
         tags = chat.meta.get("tags", [])
         return Tags.get_tags_by_ids_and_user_id(tags, user.id, db=db)
@@ -1429,7 +1495,7 @@ async def add_tag_by_id_and_tag_name(
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
+    chat = Chats.get_chat_info_by_id_and_user_id(id, user.id, db=db)
     if chat:
         tags = chat.meta.get("tags", [])
         tag_id = form_data.name.replace(" ", "_").lower()
@@ -1445,7 +1511,7 @@ async def add_tag_by_id_and_tag_name(
                 id, user.id, form_data.name, db=db
             )
 
-        chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
+        chat = Chats.get_chat_info_by_id_and_user_id(id, user.id, db=db)
         tags = chat.meta.get("tags", [])
         return Tags.get_tags_by_ids_and_user_id(tags, user.id, db=db)
     else:
@@ -1466,7 +1532,7 @@ async def delete_tag_by_id_and_tag_name(
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
+    chat = Chats.get_chat_info_by_id_and_user_id(id, user.id, db=db)
     if chat:
         Chats.delete_tag_by_id_and_user_id_and_tag_name(
             id, user.id, form_data.name, db=db
@@ -1478,7 +1544,7 @@ async def delete_tag_by_id_and_tag_name(
         ):
             Tags.delete_tag_by_name_and_user_id(form_data.name, user.id, db=db)
 
-        chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
+        chat = Chats.get_chat_info_by_id_and_user_id(id, user.id, db=db)
         tags = chat.meta.get("tags", [])
         return Tags.get_tags_by_ids_and_user_id(tags, user.id, db=db)
     else:
@@ -1496,7 +1562,7 @@ async def delete_tag_by_id_and_tag_name(
 async def delete_all_tags_by_id(
     id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
+    chat = Chats.get_chat_info_by_id_and_user_id(id, user.id, db=db)
     if chat:
         Chats.delete_all_tags_by_id_and_user_id(id, user.id, db=db)
 
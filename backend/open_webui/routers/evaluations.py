@@ -16,6 +16,9 @@ from open_webui.models.feedbacks import (
     ModelHistoryEntry,
     ModelHistoryResponse,
     Feedbacks,
+    Leaderboards,
+    TagEmbeddings,
+    calculate_elo,
 )
 
 from open_webui.constants import ERROR_MESSAGES
@@ -39,6 +42,9 @@ router = APIRouter()
 # 3. The Elo formula: new_rating = old_rating + K * (actual - expected)
 #    - K=32 controls how much ratings can change per match
 #    - expected = probability of winning based on current ratings
+# 4. Ratings and tag counts are kept in the leaderboard table: new feedbacks
+#    are applied on top of it, edited or deleted ones have it rebuilt by
+#    replaying all feedbacks in order (see models/feedbacks.py)
 #
 # Query-based re-ranking (optional):
 #    When a user searches for a topic (e.g., "coding"), we want to show
@@ -48,6 +54,8 @@ router = APIRouter()
 #    3. Feedbacks about "coding" contribute more to the final ranking
 #    4. Feedbacks about unrelated topics (e.g., "cooking") contribute less
 #    This gives topic-specific leaderboards without needing separate data.
+#    Tag embeddings are cached in the tag_embedding table, so only the query
+#    and new tags are embedded.
 
 import os
 
@@ -69,90 +77,6 @@ def _get_embedding_model():
     return _embedding_model
 
 
-def _calculate_elo(
-    feedbacks: list[LeaderboardFeedbackData], similarities: dict = None
-) -> dict:
-    """
-    Calculate Elo ratings for models based on user feedback.
-
-    Each feedback represents a comparison where a user rated one model
-    against its opponents (sibling_model_ids). Rating=1 means the model won,
-    rating=-1 means it lost.
-
-    The Elo system adjusts ratings based on:
-    - Current rating difference (upsets cause bigger swings)
-    - Optional similarity weights (for query-based filtering)
-
-    Returns: {model_id: {"rating": float, "won": int, "lost": int}}
-    """
-    K_FACTOR = 32  # Standard Elo K-factor for rating volatility
-    model_stats = {}
-
-    def get_or_create_stats(model_id):
-        if model_id not in model_stats:
-            model_stats[model_id] = {"rating": 1000.0, "won": 0, "lost": 0}
-        return model_stats[model_id]
-
-    for feedback in feedbacks:
-        data = feedback.data or {}
-        winner_id = data.get("model_id")
-        rating_value = str(data.get("rating", ""))
-        if not winner_id or rating_value not in ("1", "-1"):
-            continue
-
-        won = rating_value == "1"
-        weight = similarities.get(feedback.id, 1.0) if similarities else 1.0
-
-        for opponent_id in data.get("sibling_model_ids") or []:
-            winner = get_or_create_stats(winner_id)
-            opponent = get_or_create_stats(opponent_id)
-            expected = 1 / (1 + 10 ** ((opponent["rating"] - winner["rating"]) / 400))
-
-            winner["rating"] += K_FACTOR * ((1 if won else 0) - expected) * weight
-            opponent["rating"] += (
-                K_FACTOR * ((0 if won else 1) - (1 - expected)) * weight
-            )
-
-            if won:
-                winner["won"] += 1
-                opponent["lost"] += 1
-            else:
-                winner["lost"] += 1
-                opponent["won"] += 1
-
-    return model_stats
-
-
-def _get_top_tags(feedbacks: list[LeaderboardFeedbackData], limit: int = 5) -> dict:
-    """
-    Count tag occurrences per model and return the most frequent ones.
-
-    Each feedback can have tags describing the conversation topic.
-    This aggregates those tags per model to show what topics each model
-    is commonly used for.
-
-    Returns: {model_id: [{"tag": str, "count": int}, ...]}
-    """
-    from collections import defaultdict
-
-    tag_counts = defaultdict(lambda: defaultdict(int))
-
-    for feedback in feedbacks:
-        data = feedback.data or {}
-        model_id = data.get("model_id")
-        if model_id:
-            for tag in data.get("tags", []):
-                tag_counts[model_id][tag] += 1
-
-    return {
-        model_id: [
-            {"tag": tag, "count": count}
-            for tag, count in sorted(tags.items(), key=lambda x: -x[1])[:limit]
-        ]
-        for model_id, tags in tag_counts.items()
-    }
-
-
 def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str) -> dict:
     """
     Compute how relevant each feedback is to a search query.
@@ -184,7 +108,16 @@ def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str)
         return {}
 
     try:
-        tag_embeddings = embedding_model.encode(all_tags)
+        embeddings = TagEmbeddings.get_embeddings(EMBEDDING_MODEL_NAME, all_tags)
+        missing_tags = [tag for tag in all_tags if tag not in embeddings]
+        if missing_tags:
+            missing_embeddings = dict(
+                zip(missing_tags, embedding_model.encode(missing_tags).tolist())
+            )
+            TagEmbeddings.insert_embeddings(EMBEDDING_MODEL_NAME, missing_embeddings)
+            embeddings.update(missing_embeddings)
+
+        tag_embeddings = np.array([embeddings[tag] for tag in all_tags])
         query_embedding = embedding_model.encode([query])[0]
     except Exception as e:
         log.error(f"Embedding error: {e}")
@@ -230,16 +163,29 @@ async def get_leaderboard(
     db: Session = Depends(get_session),
 ):
     """Get model leaderboard with Elo ratings. Query filters by tag similarity."""
-    feedbacks = Feedbacks.get_feedbacks_for_leaderboard(db=db)
+    leaderboard = Leaderboards.get_leaderboard(db=db)
+    elo_stats = {
+        entry.model_id: {"rating": entry.rating, "won": entry.won, "lost": entry.lost}
+        for entry in leaderboard
+        if entry.won + entry.lost
+    }
 
-    similarities = None
     if query and query.strip():
+        feedbacks = Feedbacks.get_feedbacks_for_leaderboard(db=db)
         similarities = await run_in_threadpool(
             _compute_similarities, feedbacks, query.strip()
         )
+        elo_stats = calculate_elo(feedbacks, similarities)
 
-    elo_stats = _calculate_elo(feedbacks, similarities)
-    tags_by_model = _get_top_tags(feedbacks)
+    tags_by_model = {
+        entry.model_id: [
+            {"tag": tag, "count": count}
+            for tag, count in sorted((entry.tags or {}).items(), key=lambda x: -x[1])[
+                :5
+            ]
+        ]
+        for entry in leaderboard
+    }
 
     entries = sorted(
         [
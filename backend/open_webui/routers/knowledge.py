@@ -1,11 +1,9 @@
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 from pydantic import BaseModel
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
 from fastapi.responses import StreamingResponse
-from fastapi.concurrency import run_in_threadpool
 import logging
-import io
-import zipfile
+import os
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import get_session
@@ -14,10 +12,13 @@ from open_webui.models.knowledge import (
     KnowledgeFileListResponse,
     Knowledges,
     KnowledgeForm,
+    KnowledgeReindexJobModel,
+    KnowledgeReindexJobResponse,
     KnowledgeResponse,
     KnowledgeUserResponse,
 )
 from open_webui.models.files import Files, FileModel, FileMetadataResponse
+from open_webui.retrieval.reindex import KNOWLEDGE_REINDEXER
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 from open_webui.routers.retrieval import (
     process_file,
@@ -30,6 +31,7 @@ from open_webui.storage.provider import Storage
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.utils.auth import get_verified_user, get_admin_user
 from open_webui.utils.access_control import has_access, has_permission
+from open_webui.utils.misc import stream_zip
 
 
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL
@@ -46,6 +48,9 @@ router = APIRouter()
 
 PAGE_ITEM_COUNT = 30
 
+KNOWLEDGE_EXPORT_STREAM_BATCH_SIZE = 50
+EXPORT_FILE_CHUNK_SIZE = 1024 * 1024  # 1MB
+
 ############################
 # Knowledge Base Embedding
 ############################
@@ -273,67 +278,66 @@ async def create_new_knowledge(
 ############################
 
 
-@router.post("/reindex", response_model=bool)
+@router.post("/reindex", response_model=KnowledgeReindexJobResponse)
 async def reindex_knowledge_files(
     request: Request,
     user=Depends(get_verified_user),
-    db: Session = Depends(get_session),
 ):
+    """
+    Start reindexing the files of all knowledge bases in the background, or
+    return the reindex job already in progress.
+    """
     if user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.UNAUTHORIZED,
         )
 
-    knowledge_bases = Knowledges.get_knowledge_bases(db=db)
-
-    log.info(f"Starting reindexing for {len(knowledge_bases)} knowledge bases")
-
-    for knowledge_base in knowledge_bases:
-        try:
-            files = Knowledges.get_files_by_id(knowledge_base.id, db=db)
-            try:
-                if VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_base.id):
-                    VECTOR_DB_CLIENT.delete_collection(
-                        collection_name=knowledge_base.id
-                    )
-            except Exception as e:
-                log.error(f"Error deleting collection {knowledge_base.id}: {str(e)}")
-                continue  # Skip, don't raise
+    job = KNOWLEDGE_REINDEXER.start(request, user)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Error starting the reindex job"),
+        )
+    return get_reindex_job_response(job)
+
+
+def get_reindex_job_response(
+    job: KnowledgeReindexJobModel,
+) -> KnowledgeReindexJobResponse:
+    files_per_second = None
+    remaining_seconds = None
+    if job.status == "running" and job.started_at:
+        processed = job.processed_files - job.data.get("run_processed_files", 0)
+        elapsed = max(job.updated_at - job.started_at, 1)
+        files_per_second = processed / elapsed
+        if files_per_second > 0:
+            remaining_seconds = int(
+                max(job.total_files - job.processed_files, 0) / files_per_second
+            )
 
-            failed_files = []
-            for file in files:
-                try:
-                    await run_in_threadpool(
-                        process_file,
-                        request,
-                        ProcessFileForm(
-                            file_id=file.id, collection_name=knowledge_base.id
-                        ),
-                        user=user,
-                        db=db,
-                    )
-                except Exception as e:
-                    log.error(
-                        f"Error processing file {file.filename} (ID: {file.id}): {str(e)}"
-                    )
-                    failed_files.append({"file_id": file.id, "error": str(e)})
-                    continue
+    return KnowledgeReindexJobResponse(
+        **job.model_dump(),
+        files_per_second=files_per_second,
+        remaining_seconds=remaining_seconds,
+    )
 
-        except Exception as e:
-            log.error(f"Error processing knowledge base {knowledge_base.id}: {str(e)}")
-            # Don't raise, just continue
-            continue
 
-        if failed_files:
-            log.warning(
-                f"Failed to process {len(failed_files)} files in knowledge base {knowledge_base.id}"
+@router.get("/reindex/status", response_model=Optional[KnowledgeReindexJobResponse])
+async def get_reindex_knowledge_files_status(
+    id: Optional[str] = None,
+    user=Depends(get_admin_user),
+):
+    """Get the progress of a reindex job, by default of the latest one."""
+    job = KNOWLEDGE_REINDEXER.get_job(id)
+    if job is None:
+        if id is not None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=ERROR_MESSAGES.NOT_FOUND,
             )
-            for failed in failed_files:
-                log.warning(f"File ID: {failed['file_id']}, Error: {failed['error']}")
-
-    log.info(f"Reindexing completed.")
-    return True
+        return None
+    return get_reindex_job_response(job)
 
 
 ############################
@@ -937,12 +941,52 @@ async def add_files_to_knowledge_batch(
 ############################
 
 
+def generate_knowledge_export_entries(
+    knowledge_id: str, include_files: bool = False
+) -> Iterator[tuple[str, Iterable[bytes]]]:
+    """
+    Yield the ZIP entries of a knowledge base: the extracted text of each file
+    and, with `include_files`, the original file under files/.
+    """
+    for files in Knowledges.iter_files_by_id(
+        knowledge_id, batch_size=KNOWLEDGE_EXPORT_STREAM_BATCH_SIZE
+    ):
+        for file in files:
+            content = file.data.get("content", "") if file.data else ""
+            if content:
+                # Use original filename with .txt extension
+                filename = file.filename
+                if not filename.endswith(".txt"):
+                    filename = f"{filename}.txt"
+                yield filename, [content.encode("utf-8")]
+
+            if include_files and file.path:
+                try:
+                    file_path = Storage.get_file(file.path)
+                except Exception as e:
+                    log.warning(f"Skipping file {file.id} in export: {e}")
+                    continue
+                if os.path.isfile(file_path):
+                    yield f"files/{file.filename}", read_file_chunks(file_path)
+
+
+def read_file_chunks(file_path: str) -> Iterator[bytes]:
+    with open(file_path, "rb") as f:
+        while chunk := f.read(EXPORT_FILE_CHUNK_SIZE):
+            yield chunk
+
+
 @router.get("/{id}/export")
 async def export_knowledge_by_id(
-    id: str, user=Depends(get_admin_user), db: Session = Depends(get_session)
+    id: str,
+    include_files: bool = False,
+    user=Depends(get_admin_user),
+    db: Session = Depends(get_session),
 ):
     """
-    Export a knowledge base as a zip file containing .txt files.
+    Export a knowledge base as a zip file containing .txt files, and the
+    original files when `include_files` is set. The archive is written while
+    it is being sent, the files are read in batches.
     Admin only.
     """
 
@@ -953,28 +997,12 @@ async def export_knowledge_by_id(
             detail=ERROR_MESSAGES.NOT_FOUND,
         )
 
-    files = Knowledges.get_files_by_id(id, db=db)
-
-    # Create zip file in memory
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-        for file in files:
-            content = file.data.get("content", "") if file.data else ""
-            if content:
-                # Use original filename with .txt extension
-                filename = file.filename
-                if not filename.endswith(".txt"):
-                    filename = f"{filename}.txt"
-                zf.writestr(filename, content)
-
-    zip_buffer.seek(0)
-
     # Sanitize knowledge name for filename
     safe_name = "".join(c if c.isalnum() or c in " -_" else "_" for c in knowledge.name)
     zip_filename = f"{safe_name}.zip"
 
     return StreamingResponse(
-        zip_buffer,
+        stream_zip(generate_knowledge_export_entries(knowledge.id, include_files)),
         media_type="application/zip",
         headers={"Content-Disposition": f"attachment; filename={zip_filename}"},
     )
@@ -3,6 +3,7 @@
 # least connections, or least response time for better resource utilization and performance optimization.
 
 import asyncio
+import copy
 import json
 import logging
 import os
@@ -54,6 +55,7 @@ from open_webui.utils.payload import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.upstream_cache import MODEL_LIST_CACHE, get_upstream_cache_key
 
 
 from open_webui.config import (
@@ -103,6 +105,16 @@ async def send_get_request(url, key=None, user: UserModel = None):
         return None
 
 
+async def get_model_list(url, key=None, user: UserModel = None):
+    """Return the model list of a connection, cached for all users."""
+    response = await MODEL_LIST_CACHE.get(
+        get_upstream_cache_key(url, key, user),
+        lambda: send_get_request(url, key, user=user),
+    )
+    # Copy, the cached response is shared and model lists are changed in place
+    return copy.deepcopy(response)
+
+
 async def cleanup_response(
     response: Optional[aiohttp.ClientResponse],
     session: Optional[aiohttp.ClientSession],
@@ -325,7 +337,12 @@ def merge_ollama_models_lists(model_lists):
 
 @cached(
     ttl=MODELS_CACHE_TTL,
-    key=lambda _, user: f"ollama_all_models_{user.id}" if user else "ollama_all_models",
+    # Per user only if the upstream is told who asks, access is filtered after
+    key=lambda _, user: (
+        f"ollama_all_models_{user.id}"
+        if user and ENABLE_FORWARD_USER_INFO_HEADERS
+        else "ollama_all_models"
+    ),
 )
 async def get_all_models(request: Request, user: UserModel = None):
     log.info("get_all_models()")
@@ -335,7 +352,7 @@ async def get_all_models(request: Request, user: UserModel = None):
             if (str(idx) not in request.app.state.config.OLLAMA_API_CONFIGS) and (
                 url not in request.app.state.config.OLLAMA_API_CONFIGS  # Legacy support
             ):
-                request_tasks.append(send_get_request(f"{url}/api/tags", user=user))
+                request_tasks.append(get_model_list(f"{url}/api/tags", user=user))
             else:
                 api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
                     str(idx),
@@ -349,7 +366,7 @@ async def get_all_models(request: Request, user: UserModel = None):
 
                 if enable:
                     request_tasks.append(
-                        send_get_request(f"{url}/api/tags", key, user=user)
+                        get_model_list(f"{url}/api/tags", key, user=user)
                     )
                 else:
                     request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
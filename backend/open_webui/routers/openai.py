@@ -1,4 +1,5 @@
 import asyncio
+import copy
 import hashlib
 import json
 import logging
@@ -51,6 +52,7 @@ from open_webui.utils.misc import (
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.upstream_cache import MODEL_LIST_CACHE, get_upstream_cache_key
 from open_webui.utils.headers import include_user_info_headers
 
 
@@ -87,6 +89,16 @@ async def send_get_request(url, key=None, user: UserModel = None):
         return None
 
 
+async def get_model_list(url, key=None, user: UserModel = None):
+    """Return the model list of a connection, cached for all users."""
+    response = await MODEL_LIST_CACHE.get(
+        get_upstream_cache_key(url, key, user),
+        lambda: send_get_request(url, key, user=user),
+    )
+    # Copy, the cached response is shared and model lists are changed in place
+    return copy.deepcopy(response)
+
+
 async def cleanup_response(
     response: Optional[aiohttp.ClientResponse],
     session: Optional[aiohttp.ClientSession],
@@ -366,7 +378,7 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             url not in request.app.state.config.OPENAI_API_CONFIGS  # Legacy support
         ):
             request_tasks.append(
-                send_get_request(
+                get_model_list(
                     f"{url}/models",
                     request.app.state.config.OPENAI_API_KEYS[idx],
                     user=user,
@@ -386,7 +398,7 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             if enable:
                 if len(model_ids) == 0:
                     request_tasks.append(
-                        send_get_request(
+                        get_model_list(
                             f"{url}/models",
                             request.app.state.config.OPENAI_API_KEYS[idx],
                             user=user,
@@ -471,7 +483,12 @@ async def get_filtered_models(models, user, db=None):
 
 @cached(
     ttl=MODELS_CACHE_TTL,
-    key=lambda _, user: f"openai_all_models_{user.id}" if user else "openai_all_models",
+    # Per user only if the upstream is told who asks, access is filtered after
+    key=lambda _, user: (
+        f"openai_all_models_{user.id}"
+        if user and ENABLE_FORWARD_USER_INFO_HEADERS
+        else "openai_all_models"
+    ),
 )
 async def get_all_models(request: Request, user: UserModel) -> dict[str, list]:
     log.info("get_all_models()")
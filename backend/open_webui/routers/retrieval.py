@@ -44,6 +44,7 @@ from sqlalchemy.orm import Session
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.main import GetResult
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
@@ -86,6 +87,7 @@ from open_webui.retrieval.utils import (
     query_collection_with_hybrid_search,
     query_doc,
     query_doc_with_hybrid_search,
+    get_hybrid_search_collection,
 )
 from open_webui.retrieval.vector.utils import filter_metadata
 from open_webui.utils.misc import (
@@ -1571,6 +1573,93 @@ def save_docs_to_vector_db(
         raise e
 
 
+def copy_file_to_collection(
+    request: Request,
+    file_result: GetResult,
+    file_id: str,
+    collection_name: str,
+    hash: str,
+) -> bool:
+    """
+    Copy the stored chunks of an already processed file into another collection
+    instead of splitting and embedding its content again.
+
+    Returns False if the chunks cannot be reused, e.g. because they were
+    embedded with another embedding model.
+    """
+    embedding_config = {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+    for metadata in file_result.metadatas[0]:
+        metadata = metadata or {}
+        if metadata.get("hash") != hash or metadata.get("embedding_config") not in (
+            embedding_config,
+            str(embedding_config),
+        ):
+            return False
+
+    result = VECTOR_DB_CLIENT.query(
+        collection_name=collection_name,
+        filter={"hash": hash},
+    )
+    if result is not None and result.ids and result.ids[0]:
+        log.info(f"Document with hash {hash} already exists")
+        raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
+
+    try:
+        result = VECTOR_DB_CLIENT.copy_items(
+            f"file-{file_id}", collection_name, filter={"file_id": file_id}
+        )
+    except Exception as e:
+        log.warning(f"Error copying file {file_id} to {collection_name}: {e}")
+        # Remove a partial copy so that the file can be embedded again instead
+        VECTOR_DB_CLIENT.delete(collection_name=collection_name, filter={"hash": hash})
+        return False
+
+    if not result:
+        return False
+
+    log.info(f"copied {len(result.ids[0])} items to collection {collection_name}")
+    return True
+
+
+def get_processed_file_docs(
+    file: FileModel,
+) -> tuple[list[Document], Optional[GetResult]]:
+    """
+    Return the documents of an already processed file, read from its own
+    collection when it has one, and the stored chunks they were read from.
+    """
+    result = VECTOR_DB_CLIENT.query(
+        collection_name=f"file-{file.id}", filter={"file_id": file.id}
+    )
+
+    if result is not None and len(result.ids[0]) > 0:
+        docs = [
+            Document(
+                page_content=result.documents[0][idx],
+                metadata=result.metadatas[0][idx],
+            )
+            for idx, id in enumerate(result.ids[0])
+        ]
+        return docs, result
+
+    docs = [
+        Document(
+            page_content=file.data.get("content", ""),
+            metadata={
+                **file.meta,
+                "name": file.filename,
+                "created_by": file.user_id,
+                "file_id": file.id,
+                "source": file.filename,
+            },
+        )
+    ]
+    return docs, None
+
+
 class ProcessFileForm(BaseModel):
     file_id: str
     content: Optional[str] = None
@@ -1596,6 +1685,7 @@ def process_file(
         try:
 
             collection_name = form_data.collection_name
+            file_result = None
 
             if collection_name is None:
                 collection_name = f"file-{file.id}"
@@ -1630,33 +1720,7 @@ def process_file(
             elif form_data.collection_name:
                 # Check if the file has already been processed and save the content
                 # Usage: /knowledge/{id}/file/add, /knowledge/{id}/file/update
-
-                result = VECTOR_DB_CLIENT.query(
-                    collection_name=f"file-{file.id}", filter={"file_id": file.id}
-                )
-
-                if result is not None and len(result.ids[0]) > 0:
-                    docs = [
-                        Document(
-                            page_content=result.documents[0][idx],
-                            metadata=result.metadatas[0][idx],
-                        )
-                        for idx, id in enumerate(result.ids[0])
-                    ]
-                else:
-                    docs = [
-                        Document(
-                            page_content=file.data.get("content", ""),
-                            metadata={
-                                **file.meta,
-                                "name": file.filename,
-                                "created_by": file.user_id,
-                                "file_id": file.id,
-                                "source": file.filename,
-                            },
-                        )
-                    ]
-
+                docs, file_result = get_processed_file_docs(file)
                 text_content = file.data.get("content", "")
             else:
                 # Process the file and save the content
@@ -1747,18 +1811,26 @@ def process_file(
                 }
             else:
                 try:
-                    result = save_docs_to_vector_db(
+                    result = file_result is not None and copy_file_to_collection(
                         request,
-                        docs=docs,
+                        file_result,
+                        file_id=file.id,
                         collection_name=collection_name,
-                        metadata={
-                            "file_id": file.id,
-                            "name": file.filename,
-                            "hash": hash,
-                        },
-                        add=(True if form_data.collection_name else False),
-                        user=user,
+                        hash=hash,
                     )
+                    if not result:
+                        result = save_docs_to_vector_db(
+                            request,
+                            docs=docs,
+                            collection_name=collection_name,
+                            metadata={
+                                "file_id": file.id,
+                                "name": file.filename,
+                                "hash": hash,
+                            },
+                            add=(True if form_data.collection_name else False),
+                            user=user,
+                        )
                     log.info(f"added {len(docs)} items to collection {collection_name}")
 
                     if result:
@@ -2399,9 +2471,14 @@ async def query_doc_handler(
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH and (
             form_data.hybrid is None or form_data.hybrid
         ):
+            enable_enriched_texts = (
+                request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS
+            )
             collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=form_data.collection_name
+            collection_results[form_data.collection_name] = await asyncio.to_thread(
+                get_hybrid_search_collection,
+                form_data.collection_name,
+                enable_enriched_texts=enable_enriched_texts,
             )
             return await query_doc_with_hybrid_search(
                 collection_name=form_data.collection_name,
@@ -2432,6 +2509,7 @@ async def query_doc_handler(
                     if form_data.hybrid_bm25_weight
                     else request.app.state.config.HYBRID_BM25_WEIGHT
                 ),
+                enable_enriched_texts=enable_enriched_texts,
                 user=user,
             )
         else:
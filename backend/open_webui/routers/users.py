@@ -1,12 +1,9 @@
 import logging
 from typing import Optional
 from sqlalchemy.orm import Session
-import base64
-import io
 
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import Response, StreamingResponse, FileResponse
 from pydantic import BaseModel, ConfigDict
 
 
@@ -29,7 +26,6 @@ from open_webui.models.users import (
 )
 
 from open_webui.constants import ERROR_MESSAGES
-from open_webui.env import STATIC_DIR
 from open_webui.internal.db import get_session
 
 
@@ -40,6 +36,7 @@ from open_webui.utils.auth import (
     validate_password,
 )
 from open_webui.utils.access_control import get_permissions, has_permission
+from open_webui.utils.profile_images import get_profile_image_response
 
 
 log = logging.getLogger(__name__)
@@ -452,7 +449,7 @@ async def get_user_by_id(
     # If it is, get the user_id from the chat
     if user_id.startswith("shared-"):
         chat_id = user_id.replace("shared-", "")
-        chat = Chats.get_chat_by_id(chat_id)
+        chat = Chats.get_chat_info_by_id(chat_id)
         if chat:
             user_id = chat.user_id
         else:
@@ -498,33 +495,36 @@ async def get_user_oauth_sessions_by_id(
 
 
 @router.get("/{user_id}/profile/image")
-async def get_user_profile_image_by_id(
-    user_id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
+def get_user_profile_image_by_id(
+    request: Request,
+    user_id: str,
+    v: Optional[str] = None,
+    size: Optional[int] = None,
+    user=Depends(get_verified_user),
 ):
-    user = Users.get_user_by_id(user_id, db=db)
+    user = Users.get_user_by_id_cached(user_id)
     if user:
-        if user.profile_image_url:
-            # check if it's url or base64
-            if user.profile_image_url.startswith("http"):
-                return Response(
-                    status_code=status.HTTP_302_FOUND,
-                    headers={"Location": user.profile_image_url},
-                )
-            elif user.profile_image_url.startswith("data:image"):
-                try:
-                    header, base64_data = user.profile_image_url.split(",", 1)
-                    image_data = base64.b64decode(base64_data)
-                    image_buffer = io.BytesIO(image_data)
-                    media_type = header.split(";")[0].lstrip("data:")
-
-                    return StreamingResponse(
-                        image_buffer,
-                        media_type=media_type,
-                        headers={"Content-Disposition": "inline"},
-                    )
-                except Exception as e:
-                    pass
-        return FileResponse(f"{STATIC_DIR}/user.png")
+        return get_profile_image_response(request, user.profile_image_url, v, size)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.USER_NOT_FOUND,
+        )
+
+
+@router.get("/{user_id}/profile/banner")
+def get_user_profile_banner_image_by_id(
+    request: Request,
+    user_id: str,
+    v: Optional[str] = None,
+    size: Optional[int] = None,
+    user=Depends(get_verified_user),
+):
+    user = Users.get_user_by_id_cached(user_id)
+    if user:
+        return get_profile_image_response(
+            request, user.profile_banner_image_url, v, size, default=None
+        )
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
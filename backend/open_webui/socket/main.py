@@ -1,5 +1,4 @@
 import asyncio
-import random
 
 import socketio
 import logging
@@ -9,7 +8,7 @@ from typing import Dict, Set
 from redis import asyncio as aioredis
 import pycrdt as Y
 
-from open_webui.models.users import Users, UserNameResponse
+from open_webui.models.users import LAST_ACTIVE_WRITER, Users, UserNameResponse
 from open_webui.models.channels import Channels
 from open_webui.models.chats import Chats
 from open_webui.models.notes import Notes, NoteUpdateForm
@@ -28,7 +27,6 @@ from open_webui.env import (
     WEBSOCKET_MANAGER,
     WEBSOCKET_REDIS_URL,
     WEBSOCKET_REDIS_CLUSTER,
-    WEBSOCKET_REDIS_LOCK_TIMEOUT,
     WEBSOCKET_SENTINEL_PORT,
     WEBSOCKET_SENTINEL_HOSTS,
     REDIS_KEY_PREFIX,
@@ -37,9 +35,16 @@ from open_webui.env import (
     WEBSOCKET_SERVER_PING_INTERVAL,
     WEBSOCKET_SERVER_LOGGING,
     WEBSOCKET_SERVER_ENGINEIO_LOGGING,
+    CHAT_MESSAGE_WRITE_BUFFER_INTERVAL,
+    CHAT_MESSAGE_WRITE_BUFFER_MAX_EVENTS,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
+from open_webui.socket.utils import (
+    AsyncRedisDict,
+    MessageWriteBuffer,
+    RedisDict,
+    YdocManager,
+)
 from open_webui.tasks import create_task, stop_item_tasks
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_access, get_users_with_access
@@ -124,36 +129,13 @@ if WEBSOCKET_MANAGER == "redis":
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
     )
 
-    SESSION_POOL = RedisDict(
-        f"{REDIS_KEY_PREFIX}:session_pool",
-        redis_url=WEBSOCKET_REDIS_URL,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
-    )
-    USAGE_POOL = RedisDict(
-        f"{REDIS_KEY_PREFIX}:usage_pool",
-        redis_url=WEBSOCKET_REDIS_URL,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
-    )
-
-    clean_up_lock = RedisLock(
-        redis_url=WEBSOCKET_REDIS_URL,
-        lock_name=f"{REDIS_KEY_PREFIX}:usage_cleanup_lock",
-        timeout_secs=WEBSOCKET_REDIS_LOCK_TIMEOUT,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
-    )
-    aquire_func = clean_up_lock.aquire_lock
-    renew_func = clean_up_lock.renew_lock
-    release_func = clean_up_lock.release_lock
 else:
     MODELS = {}
 
-    SESSION_POOL = {}
-    USAGE_POOL = {}
-
-    aquire_func = release_func = renew_func = lambda: True
+# Sessions by sid, and model usage by "{sid}:{model_id}" expiring after TIMEOUT_DURATION
+SESSION_POOL = AsyncRedisDict(f"{REDIS_KEY_PREFIX}:session_pool", redis=REDIS)
+# Not the "usage_pool" hash of earlier versions, whose entries are keyed by model
+USAGE_POOL = AsyncRedisDict(f"{REDIS_KEY_PREFIX}:model_usage_pool", redis=REDIS)
 
 
 YDOC_MANAGER = YdocManager(
@@ -162,56 +144,76 @@ YDOC_MANAGER = YdocManager(
 )
 
 
-async def periodic_usage_pool_cleanup():
-    max_retries = 2
-    retry_delay = random.uniform(
-        WEBSOCKET_REDIS_LOCK_TIMEOUT / 2, WEBSOCKET_REDIS_LOCK_TIMEOUT
-    )
-    for attempt in range(max_retries + 1):
-        if aquire_func():
-            break
-        else:
-            if attempt < max_retries:
-                log.debug(
-                    f"Cleanup lock already exists. Retry {attempt + 1} after {retry_delay}s..."
-                )
-                await asyncio.sleep(retry_delay)
-            else:
-                log.warning(
-                    "Failed to acquire cleanup lock after retries. Skipping cleanup."
-                )
-                return
+def write_message_events(chat_id: str, message_id: str, events: list[dict]):
+    """Apply a batch of buffered message events with a single message upsert."""
+    message = Chats.get_message_by_id_and_message_id(chat_id, message_id) or {}
+    message_exists = bool(message)
 
-    log.debug("Running periodic_cleanup")
-    try:
-        while True:
-            if not renew_func():
-                log.error(f"Unable to renew cleanup lock. Exiting usage pool cleanup.")
-                raise Exception("Unable to renew usage pool cleanup lock.")
-
-            now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
-                # Creating a list of sids to remove if they have timed out
-                expired_sids = [
-                    sid
-                    for sid, details in connections.items()
-                    if now - details["updated_at"] > TIMEOUT_DURATION
+    update = {}
+    for event in events:
+        event_type = event.get("type")
+        data = event.get("data", {})
+
+        if event_type == "status":
+            if message_exists:
+                update["statusHistory"] = [
+                    *update.get("statusHistory", message.get("statusHistory", [])),
+                    data,
                 ]
 
-                for sid in expired_sids:
-                    del connections[sid]
+        elif event_type == "message":
+            if message_exists:
+                update["content"] = update.get(
+                    "content", message.get("content", "")
+                ) + data.get("content", "")
+
+        elif event_type == "replace":
+            update["content"] = data.get("content", "")
+            message_exists = True
 
-                if not connections:
-                    log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
+        elif event_type == "embeds":
+            update["embeds"] = [
+                *data.get("embeds", []),
+                *update.get("embeds", message.get("embeds", [])),
+            ]
+            message_exists = True
 
-                send_usage = True
-            await asyncio.sleep(TIMEOUT_DURATION)
-    finally:
-        release_func()
+        elif event_type == "files":
+            update["files"] = [
+                *data.get("files", []),
+                *update.get("files", message.get("files", [])),
+            ]
+            message_exists = True
+
+        elif event_type in ["source", "citation"]:
+            if data.get("type") == None:
+                update["sources"] = [
+                    *update.get("sources", message.get("sources", [])),
+                    data,
+                ]
+                message_exists = True
+
+    if update:
+        written = Chats.upsert_message_to_chat_by_id_and_message_id(
+            chat_id, message_id, update
+        )
+        if written is None:
+            # Raised so the buffer keeps the events and retries the write
+            raise Exception(f"Failed to write events of message {message_id}")
+
+
+MESSAGE_WRITE_BUFFER = MessageWriteBuffer(
+    write_message_events,
+    interval=CHAT_MESSAGE_WRITE_BUFFER_INTERVAL,
+    max_events=CHAT_MESSAGE_WRITE_BUFFER_MAX_EVENTS,
+    redis=REDIS,
+    redis_key_prefix=f"{REDIS_KEY_PREFIX}:message_buffer",
+)
+
+
+async def flush_message_events(chat_id: str, message_id: str):
+    """Write any buffered events of a message before writing to it directly."""
+    await MESSAGE_WRITE_BUFFER.flush(chat_id, message_id)
 
 
 app = socketio.ASGIApp(
@@ -220,14 +222,20 @@ app = socketio.ASGIApp(
 )
 
 
-def get_models_in_use():
+async def get_models_in_use():
     # List models that are currently in use
-    models_in_use = list(USAGE_POOL.keys())
+    models_in_use = list(
+        dict.fromkeys(
+            usage["model_id"]
+            for usage in await USAGE_POOL.values()
+            if isinstance(usage, dict) and "model_id" in usage
+        )
+    )
     return models_in_use
 
 
-def get_user_id_from_session_pool(sid):
-    user = SESSION_POOL.get(sid)
+async def get_user_id_from_session_pool(sid):
+    user = await SESSION_POOL.get(sid)
     if user:
         return user["id"]
     return None
@@ -242,15 +250,15 @@ def get_session_ids_from_room(room):
     return [session_id[0] for session_id in active_session_ids]
 
 
-def get_user_ids_from_room(room):
+async def get_user_ids_from_room(room):
     active_session_ids = get_session_ids_from_room(room)
 
     active_user_ids = list(
         set(
             [
-                SESSION_POOL.get(session_id)["id"]
-                for session_id in active_session_ids
-                if SESSION_POOL.get(session_id) is not None
+                user["id"]
+                for user in await SESSION_POOL.mget(active_session_ids)
+                if user is not None
             ]
         )
     )
@@ -291,16 +299,17 @@ async def enter_room_for_users(room: str, user_ids: list[str]):
 
 @sio.on("usage")
 async def usage(sid, data):
-    if sid in SESSION_POOL:
+    if await SESSION_POOL.contains(sid):
         model_id = data["model"]
         # Record the timestamp for the last update
         current_time = int(time.time())
 
-        # Store the new usage data and task
-        USAGE_POOL[model_id] = {
-            **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-            sid: {"updated_at": current_time},
-        }
+        # Store the new usage data, expiring unless refreshed
+        await USAGE_POOL.set(
+            f"{sid}:{model_id}",
+            {"model_id": model_id, "updated_at": current_time},
+            ttl=TIMEOUT_DURATION,
+        )
 
 
 @sio.event
@@ -313,8 +322,8 @@ async def connect(sid, environ, auth):
             user = Users.get_user_by_id(data["id"])
 
         if user:
-            SESSION_POOL[sid] = user.model_dump(
-                exclude=["date_of_birth", "bio", "gender"]
+            await SESSION_POOL.set(
+                sid, user.model_dump(exclude=["date_of_birth", "bio", "gender"])
             )
             await sio.enter_room(sid, f"user:{user.id}")
 
@@ -334,14 +343,17 @@ async def user_join(sid, data):
     if not user:
         return
 
-    SESSION_POOL[sid] = user.model_dump(
-        exclude=[
-            "profile_image_url",
-            "profile_banner_image_url",
-            "date_of_birth",
-            "bio",
-            "gender",
-        ]
+    await SESSION_POOL.set(
+        sid,
+        user.model_dump(
+            exclude=[
+                "profile_image_url",
+                "profile_banner_image_url",
+                "date_of_birth",
+                "bio",
+                "gender",
+            ]
+        ),
     )
 
     await sio.enter_room(sid, f"user:{user.id}")
@@ -357,9 +369,9 @@ async def user_join(sid, data):
 
 @sio.on("heartbeat")
 async def heartbeat(sid, data):
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
     if user:
-        Users.update_last_active_by_id(user["id"])
+        LAST_ACTIVE_WRITER.touch(user["id"])
 
 
 @sio.on("join-channels")
@@ -429,7 +441,7 @@ async def channel_events(sid, data):
     event_data = data["data"]
     event_type = event_data["type"]
 
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
 
     if not user:
         return
@@ -452,7 +464,7 @@ async def channel_events(sid, data):
 @sio.on("ydoc:document:join")
 async def ydoc_document_join(sid, data):
     """Handle user joining a document"""
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
 
     try:
         document_id = data["document_id"]
@@ -622,7 +634,7 @@ async def yjs_document_update(sid, data):
         async def debounced_save():
             await asyncio.sleep(0.5)
             await document_save_handler(
-                document_id, data.get("data", {}), SESSION_POOL.get(sid)
+                document_id, data.get("data", {}), await SESSION_POOL.get(sid)
             )
 
         if data.get("data"):
@@ -687,9 +699,7 @@ async def yjs_awareness_update(sid, data):
 
 @sio.event
 async def disconnect(sid):
-    if sid in SESSION_POOL:
-        user = SESSION_POOL[sid]
-        del SESSION_POOL[sid]
+    if await SESSION_POOL.delete(sid):
         await YDOC_MANAGER.remove_user_from_all_documents(sid)
     else:
         pass
@@ -716,95 +726,23 @@ def get_event_emitter(request_info, update_db=True):
             and message_id
             and not request_info.get("chat_id", "").startswith("local:")
         ):
-
-            if "type" in event_data and event_data["type"] == "status":
-                Chats.add_message_status_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    event_data.get("data", {}),
-                )
-
-            if "type" in event_data and event_data["type"] == "message":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
-
-                if message:
-                    content = message.get("content", "")
-                    content += event_data.get("data", {}).get("content", "")
-
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                        {
-                            "content": content,
-                        },
-                    )
-
-            if "type" in event_data and event_data["type"] == "replace":
-                content = event_data.get("data", {}).get("content", "")
-
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    {
-                        "content": content,
-                    },
-                )
-
-            if "type" in event_data and event_data["type"] == "embeds":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
-
-                embeds = event_data.get("data", {}).get("embeds", [])
-                embeds.extend(message.get("embeds", []))
-
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    {
-                        "embeds": embeds,
-                    },
-                )
-
-            if "type" in event_data and event_data["type"] == "files":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
-
-                files = event_data.get("data", {}).get("files", [])
-                files.extend(message.get("files", []))
-
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    {
-                        "files": files,
-                    },
-                )
-
-            if event_data.get("type") in ["source", "citation"]:
-                data = event_data.get("data", {})
-                if data.get("type") == None:
-                    message = Chats.get_message_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                    )
-
-                    sources = message.get("sources", [])
-                    sources.append(data)
-
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                        {
-                            "sources": sources,
-                        },
-                    )
+            event_type = event_data.get("type")
+
+            if event_type in [
+                "status",
+                "message",
+                "replace",
+                "embeds",
+                "files",
+                "source",
+                "citation",
+            ]:
+                await MESSAGE_WRITE_BUFFER.add(chat_id, message_id, event_data)
+            elif event_type == "chat:tasks:cancel" or (
+                event_type == "chat:completion"
+                and event_data.get("data", {}).get("done")
+            ):
+                await MESSAGE_WRITE_BUFFER.flush(chat_id, message_id)
 
     if (
         "user_id" in request_info
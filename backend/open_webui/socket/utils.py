@@ -1,9 +1,15 @@
+import asyncio
 import json
+import logging
+import time
 import uuid
 from open_webui.utils.redis import get_redis_connection
 from open_webui.env import REDIS_KEY_PREFIX
-from typing import Optional, List, Tuple
+from typing import Callable, Optional, List, Tuple
 import pycrdt as Y
+from redis.exceptions import WatchError
+
+log = logging.getLogger(__name__)
 
 
 class RedisLock:
@@ -117,6 +123,166 @@ class RedisDict:
         return self[key]
 
 
+class AsyncRedisDict:
+    """
+    Async dict stored in a Redis hash, or in memory when no Redis client is given.
+
+    Reads of several keys go out in a single round trip (`mget`, `items`). Entries
+    set with a `ttl` expire on their own: their expiry times are kept in a sorted
+    set next to the hash, so expired fields are skipped on read. They are dropped
+    on read, and on a write at most every `prune_interval` seconds, instead of
+    being swept by a cleanup loop. Reading expiry times needs Redis 6.2 or later
+    (ZMSCORE).
+
+    The hash and the sorted set share a hash tag, so they are in the same slot
+    of a Redis Cluster and can be changed in one transaction.
+    """
+
+    def __init__(self, name: str, redis=None, prune_interval: float = 60):
+        self.name = name
+        self._redis = redis
+        self._key = f"{{{name}}}"
+        self._expires_key = f"{{{name}}}:expires"
+        self._prune_interval = prune_interval
+        self._pruned_at = time.time()
+
+        self._data = {}
+        self._expires_at = {}
+
+    def _expire_local(self):
+        now = time.time()
+        for key, expires_at in list(self._expires_at.items()):
+            if expires_at <= now:
+                self._data.pop(key, None)
+                del self._expires_at[key]
+
+    async def get(self, key, default=None):
+        return (await self.mget([key], default))[0]
+
+    async def mget(self, keys: list, default=None) -> list:
+        if not keys:
+            return []
+
+        if not self._redis:
+            self._expire_local()
+            return [self._data.get(key, default) for key in keys]
+
+        pipe = self._redis.pipeline()
+        pipe.hmget(self._key, keys)
+        pipe.zmscore(self._expires_key, keys)
+        values, expires_at = await pipe.execute()
+
+        now = time.time()
+        return [
+            (
+                json.loads(value)
+                if value is not None and (score is None or score > now)
+                else default
+            )
+            for value, score in zip(values, expires_at)
+        ]
+
+    async def set(self, key, value, ttl: Optional[float] = None):
+        if not self._redis:
+            self._data[key] = value
+            if ttl:
+                self._expires_at[key] = time.time() + ttl
+            else:
+                self._expires_at.pop(key, None)
+        else:
+            pipe = self._redis.pipeline()
+            pipe.hset(self._key, key, json.dumps(value))
+            if ttl:
+                pipe.zadd(self._expires_key, {key: time.time() + ttl})
+            else:
+                pipe.zrem(self._expires_key, key)
+            await pipe.execute()
+
+        if ttl and time.time() - self._pruned_at >= self._prune_interval:
+            await self.prune()
+
+    async def prune(self):
+        """Drop the expired entries, which are otherwise only dropped on read."""
+        self._pruned_at = time.time()
+        if not self._redis:
+            self._expire_local()
+            return
+
+        expired = await self._redis.zrangebyscore(
+            self._expires_key, "-inf", time.time()
+        )
+        if expired:
+            await self._delete_expired(expired)
+
+    async def delete(self, key) -> bool:
+        if not self._redis:
+            self._expires_at.pop(key, None)
+            return self._data.pop(key, None) is not None
+
+        pipe = self._redis.pipeline()
+        pipe.hdel(self._key, key)
+        pipe.zrem(self._expires_key, key)
+        deleted, _ = await pipe.execute()
+        return deleted > 0
+
+    async def contains(self, key) -> bool:
+        return await self.get(key) is not None
+
+    async def items(self) -> List[Tuple[str, object]]:
+        if not self._redis:
+            self._expire_local()
+            return list(self._data.items())
+
+        pipe = self._redis.pipeline()
+        pipe.zrangebyscore(self._expires_key, "-inf", time.time())
+        pipe.hgetall(self._key)
+        expired, values = await pipe.execute()
+
+        if expired:
+            await self._delete_expired(expired)
+
+        expired = set(expired)
+        return [
+            (key, json.loads(value))
+            for key, value in values.items()
+            if key not in expired
+        ]
+
+    async def _delete_expired(self, keys: list):
+        """Delete the entries that are still expired, in one transaction."""
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                # Aborted if an entry is refreshed before the delete
+                await pipe.watch(self._expires_key)
+                scores = await pipe.zmscore(self._expires_key, keys)
+
+                now = time.time()
+                expired = [
+                    key
+                    for key, score in zip(keys, scores)
+                    if score is not None and score <= now
+                ]
+                if not expired:
+                    await pipe.unwatch()
+                    return
+
+                pipe.multi()
+                pipe.hdel(self._key, *expired)
+                pipe.zrem(self._expires_key, *expired)
+                await pipe.execute()
+        except WatchError:
+            # Expired entries are skipped on read and deleted on the next one
+            pass
+        except Exception as e:
+            log.debug(f"Error deleting expired entries of {self.name}: {e}")
+
+    async def keys(self) -> list:
+        return [key for key, _ in await self.items()]
+
+    async def values(self) -> list:
+        return [value for _, value in await self.items()]
+
+
 class YdocManager:
     def __init__(
         self,
@@ -225,3 +391,184 @@ class YdocManager:
                 del self._updates[document_id]
             if document_id in self._users:
                 del self._users[document_id]
+
+
+class MessageWriteBuffer:
+    """
+    Write-behind buffer for chat message events.
+
+    Events are queued per (chat_id, message_id) and handed to `write_handler`
+    as one batch once `interval` seconds have passed since the first queued
+    event, once `max_events` are queued, or on an explicit `flush`. With a
+    Redis connection the queue lives in Redis, so events of a crashed worker
+    can be replayed by `recover`; batches are only removed after they were
+    written (at-least-once). A failed write is retried after `interval`, up to
+    `max_retries` times; in memory the events are then dropped, in Redis they
+    are left to `recover` until the key expires.
+    """
+
+    def __init__(
+        self,
+        write_handler: Callable[[str, str, list[dict]], None],
+        interval: float = 1.0,
+        max_events: int = 100,
+        max_retries: int = 3,
+        redis=None,
+        redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:message_buffer",
+        redis_key_ttl: int = 60 * 60 * 24,
+    ):
+        self._write_handler = write_handler
+        self._interval = interval
+        self._max_events = max_events
+        self._max_retries = max_retries
+        self._redis = redis
+        self._redis_key_prefix = redis_key_prefix
+        self._redis_key_ttl = redis_key_ttl
+
+        self._events: dict[tuple[str, str], list[dict]] = {}
+        self._flush_tasks: dict[tuple[str, str], asyncio.Task] = {}
+        self._retries: dict[tuple[str, str], int] = {}
+        # Flushes of the same message are serialized, other messages are
+        # written concurrently. Locks are dropped once no flush uses them
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self._lock_users: dict[tuple[str, str], int] = {}
+
+        # Counters for metrics
+        self.event_count = 0
+        self.write_count = 0
+
+    @property
+    def coalesced_count(self) -> int:
+        """Number of database writes saved by batching events."""
+        return self.event_count - self.write_count
+
+    def _get_redis_key(self, chat_id: str, message_id: str) -> str:
+        return f"{self._redis_key_prefix}:{chat_id}:{message_id}"
+
+    async def add(self, chat_id: str, message_id: str, event: dict):
+        self.event_count += 1
+
+        if self._interval <= 0:
+            await self._write(chat_id, message_id, [event])
+            return
+
+        key = (chat_id, message_id)
+        if self._redis:
+            redis_key = self._get_redis_key(chat_id, message_id)
+            pipe = self._redis.pipeline()
+            pipe.rpush(redis_key, json.dumps(event))
+            pipe.expire(redis_key, self._redis_key_ttl)
+            count, _ = await pipe.execute()
+        else:
+            self._events.setdefault(key, []).append(event)
+            count = len(self._events[key])
+
+        if count >= self._max_events:
+            await self.flush(chat_id, message_id)
+        elif key not in self._flush_tasks:
+            self._flush_tasks[key] = asyncio.create_task(
+                self._flush_later(chat_id, message_id)
+            )
+
+    async def _flush_later(self, chat_id: str, message_id: str):
+        await asyncio.sleep(self._interval)
+        await self.flush(chat_id, message_id)
+
+    async def flush(self, chat_id: str, message_id: str):
+        key = (chat_id, message_id)
+
+        task = self._flush_tasks.pop(key, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+        # Events are only dropped once written. If the write fails they stay
+        # queued, for the retry, the next flush of the message or recover()
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                written = await self._flush_events(chat_id, message_id)
+        finally:
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+
+        if written:
+            self._retries.pop(key, None)
+            return
+
+        retries = self._retries[key] = self._retries.get(key, 0) + 1
+        if retries <= self._max_retries:
+            if key not in self._flush_tasks:
+                self._flush_tasks[key] = asyncio.create_task(
+                    self._flush_later(chat_id, message_id)
+                )
+        else:
+            log.error(
+                f"Giving up writing buffered events of message {message_id} "
+                f"after {self._max_retries} retries"
+            )
+            self._retries.pop(key, None)
+            self._events.pop(key, None)
+
+    async def _flush_events(self, chat_id: str, message_id: str) -> bool:
+        """Write the queued events of a message, returns False if the write failed."""
+        key = (chat_id, message_id)
+        if self._redis:
+            redis_key = self._get_redis_key(chat_id, message_id)
+            events = [
+                json.loads(event)
+                for event in await self._redis.lrange(redis_key, 0, -1)
+            ]
+            if not events:
+                return True
+            if not await self._write(chat_id, message_id, events):
+                return False
+            await self._redis.ltrim(redis_key, len(events), -1)
+        else:
+            events = list(self._events.get(key, []))
+            if not events:
+                return True
+            if not await self._write(chat_id, message_id, events):
+                return False
+            # Keep the events added while writing
+            remaining = self._events.get(key, [])[len(events) :]
+            if remaining:
+                self._events[key] = remaining
+            else:
+                self._events.pop(key, None)
+        return True
+
+    async def flush_all(self):
+        keys = set(self._events.keys()) | set(self._flush_tasks.keys())
+        for chat_id, message_id in keys:
+            await self.flush(chat_id, message_id)
+
+    async def recover(self, min_idle_secs: int = 60):
+        """Flush events left behind in Redis by workers that stopped mid-stream."""
+        if not self._redis:
+            return
+
+        async for redis_key in self._redis.scan_iter(
+            match=f"{self._redis_key_prefix}:*", count=100
+        ):
+            # Skip queues that are still being written to by a live worker
+            idle_secs = await self._redis.object("idletime", redis_key)
+            if idle_secs is not None and idle_secs < min_idle_secs:
+                continue
+
+            chat_id, _, message_id = redis_key[
+                len(self._redis_key_prefix) + 1 :
+            ].partition(":")
+            log.info(f"Recovering buffered events for message {message_id}")
+            await self.flush(chat_id, message_id)
+
+    async def _write(self, chat_id: str, message_id: str, events: list[dict]) -> bool:
+        """Write the events, returns whether they were written."""
+        try:
+            await asyncio.to_thread(self._write_handler, chat_id, message_id, events)
+            self.write_count += 1
+            return True
+        except Exception as e:
+            log.exception(f"Error writing buffered message events: {e}")
+            return False
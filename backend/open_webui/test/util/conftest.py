@@ -0,0 +1,35 @@
+import importlib
+import pkgutil
+from contextlib import nullcontext
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from open_webui import models
+from open_webui.internal import db as internal_db
+
+# Register every table, foreign keys may point to the tables of other models
+for module in pkgutil.iter_modules(models.__path__):
+    importlib.import_module(f"{models.__name__}.{module.name}")
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    internal_db.Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine, monkeypatch):
+    """
+    A session on an in-memory database, used by the queries whether they are
+    passed a session or open their own.
+    """
+    session = sessionmaker(bind=engine)()
+    monkeypatch.setattr(internal_db, "DATABASE_ENABLE_SESSION_SHARING", True)
+    monkeypatch.setattr(internal_db, "get_db", lambda: nullcontext(session))
+    yield session
+    session.close()
@@ -0,0 +1,47 @@
+import time
+
+from sqlalchemy import event
+
+from open_webui.models.users import User, UserModel
+
+
+class QueryCounter:
+    """Counts the statements run on an engine within the block"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *args):
+        event.remove(self.engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def add_user(db, id, last_active_at=0):
+    user = User(
+        id=id,
+        name=id,
+        email=f"{id}@example.com",
+        role="admin",
+        profile_image_url="",
+        last_active_at=last_active_at,
+        created_at=0,
+        updated_at=0,
+    )
+    db.add(user)
+    return UserModel.model_validate(user)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
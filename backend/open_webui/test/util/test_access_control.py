@@ -0,0 +1,68 @@
+import time
+
+from open_webui.models.groups import Group, GroupMember
+from open_webui.models.users import User
+from open_webui.test.util.helpers import QueryCounter, add_user
+from open_webui.utils.access_control import (
+    get_user_count_with_access,
+    get_user_ids_with_access,
+    get_users_with_access,
+)
+
+
+def add_users(db, n):
+    for i in range(n):
+        add_user(db, f"user-{i:05d}")
+    db.add(Group(id="group-1", user_id="user-00000", name="group-1"))
+    now = int(time.time())
+    for i in range(0, n, 2):
+        db.add(
+            GroupMember(
+                id=f"member-{i}",
+                group_id="group-1",
+                user_id=f"user-{i:05d}",
+                created_at=now,
+                updated_at=now,
+            )
+        )
+    db.query(User).filter(User.id == "user-00002").update({"role": "pending"})
+    db.commit()
+
+
+class TestAccessControlQueries:
+    """Test the users with access to a resource queried in SQL"""
+
+    def test_counts_and_ids(self, db):
+        """Test that counts and ids match the users granted access"""
+        add_users(db, 10)
+        access_control = {
+            "read": {"group_ids": ["group-1"], "user_ids": ["user-00001"]},
+            "write": {"group_ids": [], "user_ids": []},
+        }
+
+        # Group members and listed users, pending users left out
+        expected = {
+            "user-00000",
+            "user-00001",
+            "user-00004",
+            "user-00006",
+            "user-00008",
+        }
+        assert get_user_ids_with_access("read", access_control) == expected
+        assert get_user_count_with_access("read", access_control) == 5
+        users = get_users_with_access("read", access_control, skip=1, limit=2)
+        assert len(users) == 2 and {u.id for u in users} <= expected
+
+        assert get_user_ids_with_access("write", access_control) == set()
+        assert get_user_count_with_access("write", access_control) == 0
+        assert get_user_ids_with_access("read", None) is None
+        assert get_user_count_with_access("read", None) == 9
+
+    def test_public_count_is_one_query(self, db):
+        """Test that counting the users of a public resource doesn't load them"""
+        add_users(db, 2000)
+
+        with QueryCounter(db.get_bind()) as counter:
+            count = get_user_count_with_access("read", None)
+        assert count == 1999
+        assert counter.count == 1
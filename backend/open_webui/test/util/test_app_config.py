@@ -0,0 +1,132 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from open_webui.config import AppConfig, AppConfigListener
+from open_webui.test.util.helpers import wait_for
+
+
+class FakePersistentConfig:
+    """Stand-in for PersistentConfig that does not write to the database"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def save(self):
+        pass
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+def make_app_config(redis_server):
+    with (
+        patch(
+            "open_webui.config.get_redis_connection",
+            side_effect=lambda *args, **kwargs: fakeredis.FakeRedis(
+                server=redis_server, decode_responses=True
+            ),
+        ),
+        patch("open_webui.config.PersistentConfig", FakePersistentConfig),
+    ):
+        config = AppConfig(redis_url="redis://localhost", redis_key_prefix="test")
+        config.ENABLE_SIGNUP = FakePersistentConfig(True)
+        config.WEBUI_NAME = FakePersistentConfig("Open WebUI")
+    return config
+
+
+class TestAppConfig:
+    """Test the local config snapshot and its Redis invalidation"""
+
+    def test_write_is_visible_on_other_instance(self, redis_server):
+        """Test that a write on one instance reaches the snapshot of another"""
+        config_a = make_app_config(redis_server)
+        config_b = make_app_config(redis_server)
+
+        config_a.ENABLE_SIGNUP = False
+        config_a.WEBUI_NAME = "Renamed"
+
+        assert config_a.ENABLE_SIGNUP is False
+        assert wait_for(lambda: config_b.ENABLE_SIGNUP is False)
+        assert wait_for(lambda: config_b.WEBUI_NAME == "Renamed")
+
+    def test_new_instance_loads_values_from_redis(self, redis_server):
+        """Test that an instance started after a write picks up the written value"""
+        config_a = make_app_config(redis_server)
+        config_a.WEBUI_NAME = "Renamed"
+
+        config_b = make_app_config(redis_server)
+        assert config_b.WEBUI_NAME == "Renamed"
+
+    def test_reads_do_not_hit_redis(self, redis_server):
+        """Benchmark attribute reads, which should be served from memory"""
+        config = make_app_config(redis_server)
+        redis_client = fakeredis.FakeRedis(server=redis_server, decode_responses=True)
+
+        reads = 10_000
+        start = time.perf_counter()
+        for _ in range(reads):
+            config.WEBUI_NAME
+        snapshot_read = (time.perf_counter() - start) / reads
+
+        start = time.perf_counter()
+        for _ in range(reads):
+            redis_client.get("test:config:WEBUI_NAME")
+        redis_read = (time.perf_counter() - start) / reads
+
+        assert snapshot_read < redis_read
+
+    def test_registration_loads_values_in_one_round_trip(self, redis_server):
+        """Test that registered keys are read from Redis together on first use"""
+        redis_client = fakeredis.FakeRedis(server=redis_server, decode_responses=True)
+        redis_client.set("test:config:WEBUI_NAME", '"Renamed"')
+
+        calls = []
+
+        class CountingRedis(fakeredis.FakeRedis):
+            def get(self, *args, **kwargs):
+                calls.append("get")
+                return super().get(*args, **kwargs)
+
+            def pipeline(self, *args, **kwargs):
+                calls.append("pipeline")
+                return super().pipeline(*args, **kwargs)
+
+        connection = CountingRedis(server=redis_server, decode_responses=True)
+        with (
+            patch("open_webui.config.get_redis_connection", return_value=connection),
+            patch("open_webui.config.PersistentConfig", FakePersistentConfig),
+            # Keep the listener from syncing while the calls are counted
+            patch.object(AppConfigListener, "_listen", lambda self: None),
+        ):
+            configs = [
+                AppConfig(redis_url="redis://localhost", redis_key_prefix="test")
+                for _ in range(2)
+            ]
+            for name in ("ENABLE_SIGNUP", "WEBUI_NAME", "ENABLE_API_KEYS"):
+                setattr(configs[0], name, FakePersistentConfig(None))
+            assert calls == []
+
+            assert configs[0].WEBUI_NAME == "Renamed"
+            assert configs[0].ENABLE_SIGNUP is None
+            assert calls == ["pipeline"]
+
+        # Configs on the same connection share a listener thread
+        listeners = [
+            listener
+            for listener in AppConfigListener._listeners.values()
+            if listener._redis is connection
+        ]
+        assert len(listeners) == 1
+        assert set(listeners[0]._get_configs()) == set(configs)
+
+    def test_missing_key_raises_attribute_error(self, redis_server):
+        config = make_app_config(redis_server)
+
+        with pytest.raises(AttributeError):
+            config.DOES_NOT_EXIST
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from open_webui.socket.utils import AsyncRedisDict
+
+
+@pytest.fixture(params=["local", "redis"])
+def redis(request):
+    if request.param == "local":
+        return None
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+class TestAsyncRedisDict:
+    """Test the async session and usage pool store"""
+
+    @pytest.mark.asyncio
+    async def test_get_set_delete(self, redis):
+        """Test basic reads and writes"""
+        pool = AsyncRedisDict("test:pool", redis=redis)
+
+        await pool.set("a", {"id": "user-a"})
+        await pool.set("b", {"id": "user-b"})
+
+        assert await pool.get("a") == {"id": "user-a"}
+        assert await pool.get("missing") is None
+        assert await pool.contains("b")
+        assert await pool.mget(["a", "missing", "b"]) == [
+            {"id": "user-a"},
+            None,
+            {"id": "user-b"},
+        ]
+        assert sorted(await pool.keys()) == ["a", "b"]
+
+        assert await pool.delete("a")
+        assert not await pool.delete("a")
+        assert await pool.items() == [("b", {"id": "user-b"})]
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self, redis):
+        """Test that entries set with a ttl expire unless refreshed"""
+        pool = AsyncRedisDict("test:usage", redis=redis)
+
+        await pool.set("expiring", {"model_id": "m1"}, ttl=0.05)
+        await pool.set("refreshed", {"model_id": "m2"}, ttl=0.05)
+        await pool.set("kept", {"model_id": "m3"})
+
+        await asyncio.sleep(0.03)
+        await pool.set("refreshed", {"model_id": "m2"}, ttl=0.05)
+        await asyncio.sleep(0.03)
+
+        assert await pool.get("expiring") is None
+        assert sorted(await pool.keys()) == ["kept", "refreshed"]
+
+        if redis is not None:
+            assert await redis.hkeys("{test:usage}") == ["refreshed", "kept"]
+
+    @pytest.mark.asyncio
+    async def test_entries_refreshed_while_expiring_are_kept(self):
+        """Test that an entry refreshed during a read isn't deleted as expired"""
+        fakeredis = pytest.importorskip("fakeredis")
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        pool = AsyncRedisDict("test:usage", redis=redis)
+
+        await pool.set("a", {"model_id": "m1"}, ttl=0.01)
+        await pool.set("b", {"model_id": "m2"}, ttl=0.01)
+        await asyncio.sleep(0.02)
+
+        delete_expired = pool._delete_expired
+
+        async def refresh_then_delete(keys):
+            # Another worker refreshes "a" between the read and the delete
+            await pool.set("a", {"model_id": "m1"}, ttl=60)
+            await delete_expired(keys)
+
+        pool._delete_expired = refresh_then_delete
+        assert await pool.items() == []
+        assert await pool.get("a") == {"model_id": "m1"}
+
+        pool._delete_expired = delete_expired
+        assert await pool.items() == [("a", {"model_id": "m1"})]
+        assert await redis.hkeys("{test:usage}") == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_pruned_on_write(self, redis):
+        """Test that entries nobody reads don't pile up"""
+        pool = AsyncRedisDict("test:usage", redis=redis, prune_interval=0.05)
+
+        for i in range(10):
+            await pool.set(f"sid-{i}:model", {"model_id": "model"}, ttl=0.01)
+        await asyncio.sleep(0.06)
+        await pool.set("sid-10:model", {"model_id": "model"}, ttl=60)
+
+        if redis is not None:
+            assert await redis.hkeys("{test:usage}") == ["sid-10:model"]
+            assert await redis.zrange("{test:usage}:expires", 0, -1) == ["sid-10:model"]
+        else:
+            assert list(pool._data) == ["sid-10:model"]
@@ -0,0 +1,179 @@
+import random
+import time
+
+import pytest
+
+from open_webui.retrieval.bm25 import BM25Index, BM25IndexedVectorDB
+from open_webui.retrieval.vector.main import GetResult
+
+rank_bm25 = pytest.importorskip("rank_bm25")
+
+WORDS = [f"word{i}" for i in range(300)]
+
+
+def make_corpus(n, seed=0):
+    rng = random.Random(seed)
+    ids = [f"doc-{i}" for i in range(n)]
+    # "the" appears in most documents, which gives it a negative raw idf
+    texts = [
+        " ".join(
+            ["the"] * rng.randint(0, 3)
+            + rng.choices(WORDS[: 30 + i % 270], k=rng.randint(5, 40))
+        )
+        for i in range(n)
+    ]
+    metadatas = [{"file_id": f"file-{i % 5}"} for i in range(n)]
+    return ids, texts, metadatas
+
+
+class FakeVectorDB:
+    """A collection of items read by id, counting reads of the whole collection"""
+
+    def __init__(self, texts):
+        self.items = {f"doc-{i}": text for i, text in enumerate(texts)}
+        self.reads = 0
+
+    def has_collection(self, collection_name):
+        return True
+
+    def upsert(self, collection_name, items):
+        self.items.update({item["id"]: item["text"] for item in items})
+
+    def get(self, collection_name, include_vectors=False):
+        self.reads += 1
+        return GetResult(
+            ids=[list(self.items)],
+            documents=[list(self.items.values())],
+            metadatas=[[{} for _ in self.items]],
+        )
+
+
+class TestBM25Index:
+    """Test the persistent BM25 index against rank_bm25"""
+
+    def test_scores_match_rank_bm25(self, tmp_path):
+        """Test that the index ranks documents like BM25Okapi"""
+        ids, texts, metadatas = make_corpus(200)
+        index = BM25Index("collection", index_dir=str(tmp_path))
+        index.build(ids, texts, metadatas)
+
+        bm25 = rank_bm25.BM25Okapi([text.split() for text in texts])
+
+        for query in ["the word1 word7", "word42 word42 word3", "missing"]:
+            scores = bm25.get_scores(query.split())
+            expected = sorted(
+                (i for i in range(len(texts)) if scores[i] != 0),
+                key=lambda i: -scores[i],
+            )[:10]
+
+            result = index.search(query, 10)
+            assert [doc.page_content for doc in result] == [texts[i] for i in expected]
+            assert all(doc.metadata == metadatas[i] for doc, i in zip(result, expected))
+
+    def test_incremental_updates_match_rebuild(self, tmp_path):
+        """Test that upserts and deletes leave the same index as a rebuild"""
+        ids, texts, metadatas = make_corpus(120, seed=1)
+
+        index = BM25Index("incremental", index_dir=str(tmp_path))
+        index.build(ids[:60], texts[:60], metadatas[:60])
+        index.upsert(ids[40:], texts[40:], metadatas[40:])
+        assert index.delete(filter={"file_id": "file-2"})
+        assert index.delete(ids=["doc-7", "doc-8"])
+        assert not index.delete(filter={"file_id": {"$in": ["file-3"]}})
+
+        keep = [
+            i
+            for i in range(len(ids))
+            if metadatas[i]["file_id"] != "file-2" and ids[i] not in ("doc-7", "doc-8")
+        ]
+        rebuilt = BM25Index("rebuilt", index_dir=str(tmp_path))
+        rebuilt.build(
+            [ids[i] for i in keep],
+            [texts[i] for i in keep],
+            [metadatas[i] for i in keep],
+        )
+
+        for query in ["the word5", "word12 word99", "word250"]:
+            assert [doc.page_content for doc in index.search(query, 8)] == [
+                doc.page_content for doc in rebuilt.search(query, 8)
+            ]
+
+        index.drop()
+        assert not index.exists()
+
+    def test_index_is_reused_until_out_of_date(self, tmp_path):
+        """Test that the index is only rebuilt when the collection changed elsewhere"""
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        client = FakeVectorDB(["the word1", "the word2"])
+
+        # Two instances with their own index files and a shared Redis
+        replicas = []
+        for name in ("a", "b"):
+            vector_db = BM25IndexedVectorDB(client, index_dir=str(tmp_path / name))
+            vector_db._redis = fakeredis.FakeRedis(server=server, decode_responses=True)
+            replicas.append(vector_db)
+        a, b = replicas
+
+        for enriched in (None, False, None):
+            index = a.get_bm25_index("collection", enriched=enriched)
+        b.get_bm25_index("collection")
+        assert client.reads == 2 and index.count() == 2
+
+        # Writes through an instance update its own index in place, even when
+        # the number of documents stays the same
+        a.upsert("collection", [{"id": "doc-1", "text": "the word3"}])
+        index = a.get_bm25_index("collection")
+        assert client.reads == 2
+        assert [doc.page_content for doc in index.search("word3", 5)] == ["the word3"]
+
+        # and make the other instance rebuild its index
+        index = b.get_bm25_index("collection")
+        assert client.reads == 3
+        assert [doc.page_content for doc in index.search("word3", 5)] == ["the word3"]
+        b.get_bm25_index("collection")
+        assert client.reads == 3
+
+        # A write to an index that missed another instance's write drops it
+        b.upsert("collection", [{"id": "doc-2", "text": "the word4"}])
+        a.upsert("collection", [{"id": "doc-3", "text": "the word5"}])
+        assert not a._index("collection").exists()
+        index = a.get_bm25_index("collection")
+        assert client.reads == 4 and index.count() == 4
+
+    def test_vector_db_writes_do_not_hold_the_index_lock(self, tmp_path):
+        """Test that queries of a collection don't wait on its vector DB writes"""
+        client = FakeVectorDB([])
+        vector_db = BM25IndexedVectorDB(client, index_dir=str(tmp_path))
+        vector_db.get_bm25_index("collection")
+
+        locked = []
+        upsert = client.upsert
+        client.upsert = lambda collection_name, items: (
+            locked.append(vector_db._lock(collection_name).locked()),
+            upsert(collection_name, items),
+        )
+        vector_db.upsert("collection", [{"id": "doc-0", "text": "the word1"}])
+
+        assert locked == [False]
+        assert vector_db.get_bm25_index("collection").count() == 1
+
+    def test_query_throughput(self, tmp_path):
+        """Micro-benchmark: per-query BM25 cost of rebuilding vs the persistent index"""
+        ids, texts, metadatas = make_corpus(20_000, seed=2)
+        queries = ["the word1 word17", "word120 word33", "word250 word2 word9"]
+
+        start = time.perf_counter()
+        for query in queries:
+            bm25 = rank_bm25.BM25Okapi([text.split() for text in texts])
+            bm25.get_top_n(query.split(), texts, n=10)
+        rebuild = (time.perf_counter() - start) / len(queries)
+
+        index = BM25Index("benchmark", index_dir=str(tmp_path))
+        index.build(ids, texts, metadatas)
+        start = time.perf_counter()
+        for query in queries:
+            index.search(query, 10)
+        indexed = (time.perf_counter() - start) / len(queries)
+
+        assert indexed < rebuild
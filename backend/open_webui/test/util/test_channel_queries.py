@@ -0,0 +1,142 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.models.channels import Channel, ChannelMember
+from open_webui.models.messages import Message, MessageReaction
+from open_webui.routers.channels import get_channel_messages, get_channels
+from open_webui.test.util.helpers import QueryCounter, add_user
+
+
+@pytest.fixture
+def request_():
+    config = SimpleNamespace(ENABLE_CHANNELS=True)
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(config=config)))
+
+
+def add_channel(db, id, type, member_ids, last_read_at=None):
+    db.add(
+        Channel(
+            id=id, user_id=member_ids[0], type=type, name=id, created_at=0, updated_at=0
+        )
+    )
+    for member_id in member_ids:
+        db.add(
+            ChannelMember(
+                id=f"{id}-{member_id}",
+                channel_id=id,
+                user_id=member_id,
+                is_active=True,
+                last_read_at=last_read_at if member_id == "me" else None,
+                created_at=0,
+                updated_at=0,
+            )
+        )
+
+
+def add_message(db, id, channel_id, user_id, created_at, **kwargs):
+    db.add(
+        Message(
+            id=id,
+            channel_id=channel_id,
+            user_id=user_id,
+            content=id,
+            created_at=created_at,
+            updated_at=created_at,
+            **kwargs,
+        )
+    )
+
+
+def add_channels(db, start, n):
+    for i in range(start, start + n):
+        other = f"user-{i}"
+        add_user(db, other, last_active_at=int(time.time()) if i % 2 else 0)
+        add_channel(db, f"dm-{i}", "dm", ["me", other], last_read_at=10)
+        add_channel(db, f"group-{i}", "group", ["me", other], last_read_at=10)
+        for j in range(3):
+            add_message(db, f"dm-{i}-{j}", f"dm-{i}", other, 5 + 5 * j)
+    db.commit()
+
+
+def add_messages(db, start, n):
+    for i in range(start, start + n):
+        add_message(
+            db,
+            f"m-{i}",
+            "group-0",
+            "user-0",
+            1000 + i,
+            reply_to_id=f"m-{i - 1}" if i else None,
+        )
+        add_message(db, f"r-{i}", "group-0", "me", 5000 + i, parent_id=f"m-{i}")
+        db.add(
+            MessageReaction(
+                id=f"reaction-{i}",
+                user_id="me",
+                message_id=f"m-{i}",
+                name="thumbsup",
+                created_at=0,
+            )
+        )
+    db.commit()
+
+
+class TestChannelQueries:
+    """Test that channel endpoints run a constant number of queries"""
+
+    @pytest.mark.asyncio
+    async def test_channel_list(self, engine, db, request_):
+        """Test the sidebar channel list values and query count"""
+        me = add_user(db, "me")
+        add_channels(db, 0, 5)
+
+        with QueryCounter(engine) as small:
+            channels = await get_channels(request_, user=me, db=db)
+
+        dm = next(channel for channel in channels if channel.id == "dm-1")
+        assert dm.last_message_at == 15
+        assert dm.unread_count == 1
+        assert sorted(dm.user_ids) == ["me", "user-1"]
+        assert {user.id: user.is_active for user in dm.users} == {
+            "me": False,
+            "user-1": True,
+        }
+        group = next(channel for channel in channels if channel.id == "group-1")
+        assert (group.last_message_at, group.unread_count, group.users) == (
+            None,
+            0,
+            None,
+        )
+
+        add_channels(db, 5, 150)
+        with QueryCounter(engine) as large:
+            channels = await get_channels(request_, user=me, db=db)
+
+        assert len(channels) == 310
+        assert large.count == small.count
+
+    @pytest.mark.asyncio
+    async def test_channel_messages(self, engine, db, request_):
+        """Test the channel message page values and query count"""
+        me = add_user(db, "me")
+        add_channels(db, 0, 1)
+        add_messages(db, 0, 3)
+
+        with QueryCounter(engine) as small:
+            messages = await get_channel_messages(request_, "group-0", user=me, db=db)
+
+        message = next(message for message in messages if message.id == "m-1")
+        assert (message.reply_count, message.latest_reply_at) == (1, 5001)
+        assert [(r.name, r.count) for r in message.reactions] == [("thumbsup", 1)]
+        assert message.user.id == "user-0"
+        assert message.reply_to_message.id == "m-0"
+        assert message.reply_to_message.user.id == "user-0"
+
+        add_messages(db, 3, 40)
+        with QueryCounter(engine) as large:
+            messages = await get_channel_messages(request_, "group-0", user=me, db=db)
+
+        assert len(messages) == 43
+        assert large.count == small.count
@@ -0,0 +1,171 @@
+import gzip
+import json
+import os
+import tracemalloc
+
+from sqlalchemy import insert
+
+from open_webui.models.chats import Chat, ChatForm, Chats
+from open_webui.routers.chats import (
+    generate_chat_stats_jsonl_generator,
+    generate_chats_json_generator,
+    gzip_generator,
+)
+
+# Run e.g. CHAT_EXPORT_BENCHMARK_SIZES=10000,100000,1000000 pytest to export larger instances
+BENCHMARK_SIZES = [
+    int(size)
+    for size in os.environ.get("CHAT_EXPORT_BENCHMARK_SIZES", "1000,4000").split(",")
+]
+
+
+def insert_chats(
+    db, n, user_id="user-1", created_at=lambda i: i, updated_at=lambda i: i
+):
+    rows = [
+        {
+            "id": f"chat-{i:08d}",
+            "user_id": user_id,
+            "title": f"Chat {i}",
+            "chat": {
+                "title": f"Chat {i}",
+                "history": {
+                    "messages": {
+                        "m0": {"id": "m0", "role": "user", "content": "x" * 200}
+                    },
+                    "currentId": "m0",
+                },
+            },
+            "created_at": created_at(i),
+            "updated_at": updated_at(i),
+            "archived": False,
+            "pinned": False,
+            "meta": {},
+        }
+        for i in range(n)
+    ]
+    for start in range(0, n, 10_000):
+        db.execute(insert(Chat), rows[start : start + 10_000])
+    db.commit()
+
+
+class TestChatExport:
+    """Test the streaming, keyset-paginated chat export"""
+
+    def test_iter_chats_pages_by_created_at_and_id(self, db):
+        """Test that batches cover every chat once, including ties on created_at"""
+        insert_chats(db, 25, created_at=lambda i: i // 4, updated_at=lambda i: -i)
+        Chats.insert_new_chat("user-2", ChatForm(chat={}), db=db)
+
+        batches = list(Chats.iter_chats(user_id="user-1", batch_size=4, db=db))
+        ids = [chat.id for batch in batches for chat in batch]
+
+        assert all(len(batch) <= 4 for batch in batches)
+        assert ids == [f"chat-{i:08d}" for i in range(25)]
+        assert len([c for b in Chats.iter_chats(batch_size=7, db=db) for c in b]) == 26
+
+        after = [
+            c.id for b in Chats.iter_chats("user-1", -3, batch_size=3, db=db) for c in b
+        ]
+        assert after == [f"chat-{i:08d}" for i in range(3)]
+
+        by_updated_at = [
+            c.id
+            for b in Chats.iter_chats(
+                "user-1", order_by="updated_at", direction="desc", batch_size=4, db=db
+            )
+            for c in b
+        ]
+        assert by_updated_at == ids
+
+    def test_chats_updated_during_the_export_are_exported_once(self, db):
+        """Test that the default order isn't moved by updates between batches"""
+        insert_chats(db, 10)
+
+        exported = []
+        for batch in Chats.iter_chats(batch_size=3, db=db):
+            exported += [chat.id for chat in batch]
+            # Touch a chat that was not exported yet and one that was
+            Chats.update_chat_by_id(batch[0].id, batch[0].chat, db=db)
+            if len(exported) < 10:
+                Chats.update_chat_by_id(f"chat-{len(exported):08d}", {}, db=db)
+
+        assert exported == [f"chat-{i:08d}" for i in range(10)]
+
+    def test_iter_chats_merges_message_table(self, db):
+        """Test that messages stored in the chat_message table are exported"""
+        chat = Chats.insert_new_chat(
+            "user-1",
+            ChatForm(chat={"history": {"messages": {"m0": {"id": "m0"}}}}),
+            db=db,
+        )
+        chat_item = db.get(Chat, chat.id)
+        chat_item.chat = Chats._store_messages(chat.id, chat_item.chat, db)
+        db.commit()
+
+        [[exported]] = list(Chats.iter_chats(db=db))
+        assert exported.chat["history"]["messages"] == {"m0": {"id": "m0"}}
+
+    def test_encodings(self, db, monkeypatch):
+        """Test the JSON array, NDJSON, gzip and stats encodings"""
+        insert_chats(db, 3)
+        chats = [chat for batch in Chats.iter_chats(db=db) for chat in batch]
+
+        array = "".join(generate_chats_json_generator(chats))
+        assert [chat["id"] for chat in json.loads(array)] == [c.id for c in chats]
+        assert json.loads("".join(generate_chats_json_generator([]))) == []
+
+        lines = "".join(generate_chats_json_generator(chats, format="ndjson"))
+        assert [json.loads(line)["id"] for line in lines.splitlines()] == [
+            c.id for c in chats
+        ]
+
+        compressed = b"".join(gzip_generator(generate_chats_json_generator(chats)))
+        assert gzip.decompress(compressed).decode() == array
+
+        # The stats export opens its own sessions; point it at the test session
+        calls = []
+
+        def iter_chats(*args, db=None, **kwargs):
+            calls.append(kwargs)
+            return iter([chats[1:]])
+
+        monkeypatch.setattr(Chats, "iter_chats", iter_chats)
+        stats = "".join(
+            generate_chat_stats_jsonl_generator(
+                "user-1", {"order_by": "updated_at", "direction": "desc"}
+            )
+        )
+        assert [json.loads(line)["id"] for line in stats.splitlines()] == [
+            c.id for c in chats[1:]
+        ]
+        assert calls[0]["order_by"] == "updated_at"
+        assert calls[0]["direction"] == "desc"
+
+    def test_export_benchmark(self, db):
+        """Benchmark: export time and peak memory at increasing chat counts"""
+        results = []
+        for size in BENCHMARK_SIZES:
+            db.execute(Chat.__table__.delete())
+            db.commit()
+            insert_chats(db, size)
+
+            chats = (
+                chat
+                for batch in Chats.iter_chats(batch_size=100, db=db)
+                for chat in batch
+            )
+            tracemalloc.start()
+            exported = sum(
+                len(chunk)
+                for chunk in gzip_generator(generate_chats_json_generator(chats))
+            )
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            assert exported > 0
+            results.append((size, peak))
+
+        # Memory stays bounded by the batch size, not the number of chats
+        (_, small_peak), (_, large_peak) = results[0], results[-1]
+        assert large_peak < small_peak * 2 + 1e6
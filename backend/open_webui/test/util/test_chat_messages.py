@@ -0,0 +1,181 @@
+import pytest
+
+from open_webui.models import chats as chats_module
+from open_webui.models.chats import (
+    CHAT_MESSAGE_TABLE_KEY,
+    Chat,
+    ChatForm,
+    ChatMessage,
+    Chats,
+)
+
+
+@pytest.fixture
+def message_table(monkeypatch):
+    monkeypatch.setattr(chats_module, "ENABLE_CHAT_MESSAGE_TABLE", True)
+
+
+def make_chat(*contents):
+    messages = {}
+    for i, content in enumerate(contents):
+        messages[f"m{i}"] = {
+            "id": f"m{i}",
+            "parentId": f"m{i - 1}" if i else None,
+            "role": "assistant" if i % 2 else "user",
+            "content": content,
+        }
+    return {
+        "title": "Chat",
+        "history": {"messages": messages, "currentId": f"m{len(contents) - 1}"},
+    }
+
+
+def get_rows(db, chat_id):
+    return {
+        row.id: row for row in db.query(ChatMessage).filter_by(chat_id=chat_id).all()
+    }
+
+
+class TestChatMessageTable:
+    """Test chat history messages stored as chat_message rows"""
+
+    def test_messages_are_stored_in_rows_and_merged(self, db, message_table):
+        """Test that rows hold the messages and chats are read with them merged"""
+        chat = Chats.insert_new_chat(
+            "user-1", ChatForm(chat=make_chat("Hello", "Hi there")), db=db
+        )
+        assert chat.chat == make_chat("Hello", "Hi there")
+
+        stored = db.get(Chat, chat.id).chat
+        assert stored[CHAT_MESSAGE_TABLE_KEY]
+        assert stored["history"] == {"messages": {}, "currentId": "m1"}
+
+        rows = get_rows(db, chat.id)
+        assert {id: (row.parent_id, row.role) for id, row in rows.items()} == {
+            "m0": (None, "user"),
+            "m1": ("m0", "assistant"),
+        }
+
+        assert Chats.get_chat_by_id(chat.id, db=db).chat == make_chat(
+            "Hello", "Hi there"
+        )
+        assert Chats.get_messages_map_by_chat_id(chat.id, db=db) == (
+            make_chat("Hello", "Hi there")["history"]["messages"]
+        )
+        message = Chats.get_message_by_id_and_message_id(chat.id, "m1", db=db)
+        assert message["content"] == "Hi there"
+
+    def test_updates_upsert_rows(self, db, message_table):
+        """Test that message upserts and chat updates only write the changed rows"""
+        chat = Chats.insert_new_chat(
+            "user-1", ChatForm(chat=make_chat("Hello", "Hi")), db=db
+        )
+
+        # Streaming into an existing message merges it
+        Chats.upsert_message_to_chat_by_id_and_message_id(
+            chat.id, "m1", {"content": "Hi there", "done": True}, db=db
+        )
+        rows = get_rows(db, chat.id)
+        assert rows["m1"].data == {
+            "id": "m1",
+            "parentId": "m0",
+            "role": "assistant",
+            "content": "Hi there",
+            "done": True,
+        }
+
+        # A new message gets its row and becomes the current one
+        message = Chats.upsert_message_to_chat_by_id_and_message_id(
+            chat.id,
+            "m2",
+            {"id": "m2", "parentId": "m1", "role": "user", "content": "Thanks"},
+            db=db,
+        )
+        assert message == {
+            "id": "m2",
+            "parentId": "m1",
+            "role": "user",
+            "content": "Thanks",
+        }
+        chat = Chats.get_chat_by_id(chat.id, db=db)
+        assert chat.chat["history"]["currentId"] == "m2"
+        assert list(chat.chat["history"]["messages"]) == ["m0", "m1", "m2"]
+        assert get_rows(db, chat.id)["m2"].parent_id == "m1"
+
+        # Saving the whole chat keeps untouched rows and drops removed messages
+        updated_at = get_rows(db, chat.id)["m0"].updated_at
+        Chats.update_chat_by_id(chat.id, make_chat("Hello", "Edited"), db=db)
+        rows = get_rows(db, chat.id)
+        assert sorted(rows) == ["m0", "m1"]
+        assert rows["m0"].updated_at == updated_at
+        assert rows["m1"].data["content"] == "Edited"
+
+        message = Chats.add_message_status_to_chat_by_id_and_message_id(
+            chat.id, "m1", {"action": "web_search", "done": True}, db=db
+        )
+        assert message["statusHistory"] == [{"action": "web_search", "done": True}]
+        assert get_rows(db, chat.id)["m1"].data == message
+
+    def test_message_writes_do_not_build_the_chat(self, db, monkeypatch):
+        """Test that message writes return the message without loading the chat"""
+        chat = Chats.insert_new_chat(
+            "user-1", ChatForm(chat=make_chat("Hello", "Hi")), db=db
+        )
+
+        def to_chat_model(*args, **kwargs):
+            raise AssertionError("the full chat was built")
+
+        monkeypatch.setattr(Chats, "_to_chat_model", to_chat_model)
+        for enabled in (False, True):
+            monkeypatch.setattr(chats_module, "ENABLE_CHAT_MESSAGE_TABLE", enabled)
+            message = Chats.upsert_message_to_chat_by_id_and_message_id(
+                chat.id, "m1", {"content": f"Hi {enabled}"}, db=db
+            )
+            assert message["content"] == f"Hi {enabled}"
+            assert message["parentId"] == "m0"
+
+        message = Chats.add_message_status_to_chat_by_id_and_message_id(
+            chat.id, "m1", {"action": "web_search", "done": True}, db=db
+        )
+        assert message["statusHistory"] == [{"action": "web_search", "done": True}]
+
+    def test_existing_chats_are_migrated_lazily(self, db, monkeypatch):
+        """Test that chats saved in JSON move to rows on their first message write"""
+        chat = Chats.insert_new_chat(
+            "user-1", ChatForm(chat=make_chat("Hello", "Hi")), db=db
+        )
+        assert not get_rows(db, chat.id)
+
+        monkeypatch.setattr(chats_module, "ENABLE_CHAT_MESSAGE_TABLE", True)
+        # Chats saved before are read from their JSON until a message is written
+        assert Chats.get_chat_by_id(chat.id, db=db).chat == make_chat("Hello", "Hi")
+
+        Chats.upsert_message_to_chat_by_id_and_message_id(
+            chat.id, "m1", {"content": "Hi there"}, db=db
+        )
+        assert sorted(get_rows(db, chat.id)) == ["m0", "m1"]
+        assert db.get(Chat, chat.id).chat["history"]["messages"] == {}
+        assert Chats.get_chat_by_id(chat.id, db=db).chat == make_chat(
+            "Hello", "Hi there"
+        )
+
+        # Turned off again, the next save writes the full JSON and drops the rows
+        monkeypatch.setattr(chats_module, "ENABLE_CHAT_MESSAGE_TABLE", False)
+        chat = Chats.get_chat_by_id(chat.id, db=db)
+        Chats.update_chat_by_id(chat.id, chat.chat, db=db)
+        assert not get_rows(db, chat.id)
+        assert db.get(Chat, chat.id).chat == make_chat("Hello", "Hi there")
+
+    def test_deleting_chats_deletes_their_messages(self, db, message_table):
+        """Test that the rows of deleted chats are deleted with them"""
+        chat_ids = [
+            Chats.insert_new_chat(user_id, ChatForm(chat=make_chat("Hello")), db=db).id
+            for user_id in ("user-1", "user-1", "user-2")
+        ]
+
+        assert Chats.delete_chat_by_id(chat_ids[0], db=db)
+        assert not get_rows(db, chat_ids[0])
+
+        assert Chats.delete_chats_by_user_id("user-1", db=db)
+        assert not get_rows(db, chat_ids[1])
+        assert sorted(get_rows(db, chat_ids[2])) == ["m0"]
@@ -0,0 +1,87 @@
+import time
+import tracemalloc
+
+from open_webui.models.chats import Chat, ChatForm, Chats
+
+
+def make_chat(n_messages, content_size):
+    messages = {
+        f"m{i}": {
+            "id": f"m{i}",
+            "parentId": f"m{i - 1}" if i else None,
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": "x" * content_size,
+        }
+        for i in range(n_messages)
+    }
+    return {
+        "title": "Big chat",
+        "history": {"messages": messages, "currentId": f"m{n_messages - 1}"},
+    }
+
+
+def measure(fn, repeat=20):
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+class TestChatProjections:
+    """Test chat queries that do not load the chat JSON"""
+
+    def test_projections_match_full_chat(self, db):
+        """Test that projections return the same values as the full chat"""
+        chat = Chats.insert_new_chat("user-1", ChatForm(chat=make_chat(4, 10)), db=db)
+        full = Chats.get_chat_by_id(chat.id, db=db)
+
+        assert Chats.is_chat_owned_by_user(chat.id, "user-1", db=db)
+        assert not Chats.is_chat_owned_by_user(chat.id, "user-2", db=db)
+        assert Chats.get_chat_info_by_id_and_user_id(chat.id, "user-2", db=db) is None
+
+        info = Chats.get_chat_info_by_id_and_user_id(chat.id, "user-1", db=db)
+        assert info.model_dump() == full.model_dump(exclude={"chat"})
+        assert Chats.get_chat_title_by_id(chat.id, db=db) == "Big chat"
+        assert (
+            Chats.get_messages_map_by_chat_id(chat.id, db=db)
+            == full.chat["history"]["messages"]
+        )
+        assert [c.id for c in Chats.get_pinned_chats_by_user_id("user-1", db=db)] == []
+        assert [c.id for c in Chats.get_chat_list_by_user_id("user-1", db=db)] == [
+            chat.id
+        ]
+
+        assert Chats.get_chat_info_by_id("missing", db=db) is None
+        assert Chats.get_messages_map_by_chat_id("missing", db=db) is None
+
+    def test_messages_map_from_message_table(self, db):
+        """Test that messages stored in the chat_message table are returned"""
+        chat = Chats.insert_new_chat("user-1", ChatForm(chat=make_chat(3, 10)), db=db)
+        chat_item = db.get(Chat, chat.id)
+        chat_item.chat = Chats._store_messages(chat.id, chat_item.chat, db)
+        db.commit()
+
+        messages_map = Chats.get_messages_map_by_chat_id(chat.id, db=db)
+        assert sorted(messages_map) == ["m0", "m1", "m2"]
+        assert messages_map["m1"]["parentId"] == "m0"
+
+    def test_request_cost_with_large_chat(self, db):
+        """Micro-benchmark: per-request latency and peak memory for a 5 MB chat"""
+        chat = Chats.insert_new_chat(
+            "user-1", ChatForm(chat=make_chat(100, 50_000)), db=db
+        )
+
+        full = measure(
+            lambda: Chats.get_chat_by_id_and_user_id(chat.id, "user-1", db=db)
+        )
+        owned = measure(lambda: Chats.is_chat_owned_by_user(chat.id, "user-1", db=db))
+        info = measure(
+            lambda: Chats.get_chat_info_by_id_and_user_id(chat.id, "user-1", db=db)
+        )
+
+        assert owned[0] < full[0] and info[0] < full[0]
+        assert owned[1] < full[1] and info[1] < full[1]
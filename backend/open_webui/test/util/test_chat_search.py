@@ -0,0 +1,162 @@
+import json
+import time
+
+import pytest
+from sqlalchemy import text
+
+from open_webui.models import chats as chats_module
+from open_webui.models.chats import ChatForm, Chats, ChatSearch
+
+
+def make_chat(title, *contents):
+    messages = {
+        f"m{i}": {"id": f"m{i}", "role": "user", "content": content}
+        for i, content in enumerate(contents)
+    }
+    return {
+        "title": title,
+        "history": {"messages": messages, "currentId": f"m{len(contents) - 1}"},
+        "messages": list(messages.values()),
+    }
+
+
+def search(query, db, user_id="user-1"):
+    return sorted(
+        chat.title
+        for chat in Chats.get_chats_by_user_id_and_search_text(user_id, query, db=db)
+    )
+
+
+class TestChatSearch:
+    """Test the chat full-text search index"""
+
+    def test_search_title_and_messages(self, db):
+        """Test substring search over titles and message contents"""
+        Chats.insert_new_chat(
+            "user-1", ChatForm(chat=make_chat("Travel plans", "Trip to Kyoto")), db=db
+        )
+        Chats.insert_new_chat(
+            "user-1", ChatForm(chat=make_chat("Recipes", "Ramen broth")), db=db
+        )
+        Chats.insert_new_chat(
+            "user-2", ChatForm(chat=make_chat("Travel", "Kyoto again")), db=db
+        )
+
+        assert search("kyoto", db) == ["Travel plans"]
+        assert search("TRAVEL", db) == ["Travel plans"]
+        assert search("men br", db) == ["Recipes"]
+        assert search("ra", db) == ["Recipes", "Travel plans"]
+        assert search("", db) == ["Recipes", "Travel plans"]
+        assert search("missing", db) == []
+
+    @pytest.mark.asyncio
+    async def test_empty_query_returns_full_chats(self, db):
+        """Test that the chat search tool reads the messages of an empty query's chats"""
+        from open_webui.tools.builtin import search_chats
+
+        Chats.insert_new_chat(
+            "user-1", ChatForm(chat=make_chat("Travel plans", "Trip to Kyoto")), db=db
+        )
+
+        chats = Chats.get_chats_by_user_id_and_search_text("user-1", " ", db=db)
+        assert [chat.chat["title"] for chat in chats] == ["Travel plans"]
+
+        results = json.loads(
+            await search_chats("", __request__=object(), __user__={"id": "user-1"})
+        )
+        assert [result["title"] for result in results] == ["Travel plans"]
+
+    def test_index_follows_updates_and_deletes(self, db, monkeypatch):
+        """Test that chat updates, message upserts and deletes keep the index in sync"""
+        chat = Chats.insert_new_chat(
+            "user-1", ChatForm(chat=make_chat("Notes", "first draft")), db=db
+        )
+
+        Chats.update_chat_by_id(chat.id, make_chat("Notes", "second draft"), db=db)
+        assert search("first", db) == []
+        assert search("second", db) == ["Notes"]
+
+        monkeypatch.setattr(chats_module, "ENABLE_CHAT_MESSAGE_TABLE", True)
+        Chats.upsert_message_to_chat_by_id_and_message_id(
+            chat.id, "m1", {"id": "m1", "role": "assistant", "content": "Final"}, db=db
+        )
+        assert search("final", db) == ["Notes"]
+        assert search("second", db) == ["Notes"]
+
+        Chats.delete_chat_by_id_and_user_id(chat.id, "user-1", db=db)
+        assert search("final", db) == []
+        assert db.query(ChatSearch).count() == 0
+        assert db.execute(text("SELECT count(*) FROM chat_search_fts")).scalar() == 0
+
+    def test_message_upserts_skip_the_full_resync(self, db, monkeypatch):
+        """Test that streamed message upserts only write the upserted message's row"""
+        chat = Chats.insert_new_chat(
+            "user-1", ChatForm(chat=make_chat("Notes", "first draft")), db=db
+        )
+
+        def resync(*args, **kwargs):
+            raise AssertionError("the whole chat was re-indexed")
+
+        monkeypatch.setattr(Chats, "_update_search_index", resync)
+        for content in ("Final", "Final answer"):
+            message = Chats.upsert_message_to_chat_by_id_and_message_id(
+                chat.id,
+                "m1",
+                {"id": "m1", "role": "assistant", "content": content},
+                db=db,
+            )
+        assert message["content"] == "Final answer"
+        assert search("final answer", db) == ["Notes"]
+        assert search("first draft", db) == ["Notes"]
+
+    def test_filters_combine_with_text(self, db):
+        """Test the pinned:, archived: and tag: filters together with a search term"""
+        pinned = Chats.insert_new_chat(
+            "user-1", ChatForm(chat=make_chat("Pinned report", "q3 numbers")), db=db
+        )
+        Chats.insert_new_chat(
+            "user-1", ChatForm(chat=make_chat("Other report", "q3 numbers")), db=db
+        )
+        Chats.toggle_chat_pinned_by_id(pinned.id, db=db)
+
+        assert search("pinned:true numbers", db) == ["Pinned report"]
+        assert search("pinned:false numbers", db) == ["Other report"]
+        assert search("tag:none report", db) == ["Other report", "Pinned report"]
+
+    def test_search_uses_the_fts_index(self, db):
+        """Benchmark: search is an FTS index lookup, not a scan of chat JSON"""
+        for i in range(2_000):
+            Chats.insert_new_chat(
+                "user-1",
+                ChatForm(chat=make_chat(f"Chat {i}", f"message {i} " + "x" * 500)),
+                db=db,
+            )
+
+        plan = " ".join(
+            str(row)
+            for row in db.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT rowid FROM chat_search_fts "
+                    "WHERE chat_search_fts.content LIKE '%message 1234%'"
+                )
+            )
+        )
+        # The LIKE constraint is handed to the trigram index
+        assert "VIRTUAL TABLE INDEX 0:L" in plan
+
+        start = time.perf_counter()
+        assert search("message 1234", db) == ["Chat 1234"]
+        indexed = time.perf_counter() - start
+
+        # The previous implementation parsed the JSON of every chat
+        start = time.perf_counter()
+        db.execute(
+            text(
+                "SELECT id FROM chat WHERE user_id = 'user-1' AND EXISTS ("
+                "SELECT 1 FROM json_each(chat.chat, '$.messages') AS message "
+                "WHERE LOWER(message.value->>'content') LIKE '%message 1234%')"
+            )
+        ).all()
+        scanned = time.perf_counter() - start
+
+        assert indexed < scanned
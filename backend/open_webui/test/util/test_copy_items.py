@@ -0,0 +1,117 @@
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+from open_webui.retrieval.bm25 import BM25IndexedVectorDB
+from open_webui.retrieval.vector.dbs.chroma import ChromaClient
+from open_webui.retrieval.vector.main import VectorDBBase
+
+
+@pytest.fixture
+def chroma(tmp_path):
+    client = ChromaClient.__new__(ChromaClient)
+    client.client = chromadb.PersistentClient(
+        path=str(tmp_path / "chroma"),
+        settings=chromadb.Settings(allow_reset=True, anonymized_telemetry=False),
+    )
+    return client
+
+
+def make_items(file_id, n):
+    return [
+        {
+            "id": f"{file_id}-{i}",
+            "text": f"chunk {i} of {file_id}",
+            "vector": [float(i), 1.0, 0.5],
+            "metadata": {"file_id": file_id, "hash": f"hash-{file_id}"},
+        }
+        for i in range(n)
+    ]
+
+
+class TestCopyItems:
+    """Test copying stored vectors between collections"""
+
+    @pytest.mark.parametrize("generic", [False, True])
+    def test_copies_vectors_and_metadata(self, chroma, generic):
+        """Test the chroma copy and the generic fallback"""
+        chroma.insert("file-a", make_items("a", 3))
+        chroma.insert("knowledge", make_items("b", 2))
+
+        copy_items = VectorDBBase.copy_items if generic else ChromaClient.copy_items
+        result = copy_items(chroma, "file-a", "knowledge", filter={"file_id": "a"})
+
+        assert sorted(result.documents[0]) == [f"chunk {i} of a" for i in range(3)]
+        assert not set(result.ids[0]) & {f"a-{i}" for i in range(3)}
+
+        copied = chroma.client.get_collection("knowledge").get(
+            where={"file_id": "a"}, include=["documents", "embeddings"]
+        )
+        vectors = {
+            text: list(vector)
+            for text, vector in zip(copied["documents"], copied["embeddings"])
+        }
+        assert vectors == {f"chunk {i} of a": [float(i), 1.0, 0.5] for i in range(3)}
+        assert len(chroma.get("knowledge").ids[0]) == 5
+
+        assert (
+            copy_items(chroma, "file-a", "knowledge", filter={"file_id": "c"}) is None
+        )
+        assert copy_items(chroma, "missing", "knowledge") is None
+
+    def test_copy_updates_bm25_index(self, chroma, tmp_path):
+        """Test that copied items are added to an existing BM25 index"""
+        client = BM25IndexedVectorDB(chroma, index_dir=str(tmp_path / "bm25"))
+        client.insert("file-a", make_items("a", 2))
+        client.insert("knowledge", make_items("b", 2))
+        index = client.get_bm25_index("knowledge")
+
+        client.copy_items("file-a", "knowledge", filter={"file_id": "a"})
+
+        assert sorted(doc.page_content for doc in index.search("a", 10)) == [
+            "chunk 0 of a",
+            "chunk 1 of a",
+        ]
+
+
+class TestReplaceCollection:
+    """Test swapping a rebuilt collection in for the live one"""
+
+    @pytest.mark.parametrize("generic", [False, True])
+    def test_replaces_destination(self, chroma, generic):
+        """Test the chroma rename and the generic copy"""
+        chroma.insert("knowledge-new", make_items("a", 2))
+        chroma.insert("knowledge", make_items("b", 3))
+
+        replace_collection = (
+            VectorDBBase.replace_collection
+            if generic
+            else ChromaClient.replace_collection
+        )
+        replace_collection(chroma, "knowledge-new", "knowledge")
+
+        assert sorted(chroma.get("knowledge").documents[0]) == [
+            "chunk 0 of a",
+            "chunk 1 of a",
+        ]
+        assert not chroma.has_collection("knowledge-new")
+
+        # Nothing to replace it with, the destination is kept
+        replace_collection(chroma, "missing", "knowledge")
+        assert len(chroma.get("knowledge").ids[0]) == 2
+
+    def test_replace_moves_bm25_index(self, chroma, tmp_path):
+        """Test that the index of the source collection serves the destination"""
+        client = BM25IndexedVectorDB(chroma, index_dir=str(tmp_path / "bm25"))
+        client.insert("knowledge-new", make_items("a", 2))
+        client.insert("knowledge", make_items("b", 2))
+        client.get_bm25_index("knowledge-new")
+        client.get_bm25_index("knowledge")
+
+        client.replace_collection("knowledge-new", "knowledge")
+
+        assert not client._index("knowledge-new").exists()
+        assert sorted(
+            doc.page_content
+            for doc in client.get_bm25_index("knowledge").search("a", 10)
+        ) == ["chunk 0 of a", "chunk 1 of a"]
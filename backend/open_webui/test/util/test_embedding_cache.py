@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy import event
+
+from open_webui.retrieval.embedding_cache import (
+    EmbeddingCache,
+    _insert_ignore,
+    embedding_cache_table,
+)
+
+
+def make_embedding_function(calls):
+    async def embedding_function(query, prefix=None, user=None):
+        calls.append(query)
+        return [[float(len(text)), 1.0] for text in query]
+
+    return embedding_function
+
+
+class TestEmbeddingCache:
+    """Test the content-addressed embedding cache"""
+
+    @pytest.mark.asyncio
+    async def test_only_missing_chunks_are_embedded(self, tmp_path):
+        """Test that known chunks are served from the cache"""
+        cache = EmbeddingCache(url=f"sqlite:///{tmp_path}/cache.db")
+        calls = []
+        embedding_function = cache.wrap(
+            make_embedding_function(calls), "openai", "model"
+        )
+
+        assert await embedding_function(["a", "bb", "a"], prefix="p") == [
+            [1.0, 1.0],
+            [2.0, 1.0],
+            [1.0, 1.0],
+        ]
+        assert await embedding_function(["ccc", "bb"], prefix="p") == [
+            [3.0, 1.0],
+            [2.0, 1.0],
+        ]
+        # A different prefix or model is a different cache entry
+        await embedding_function(["bb"], prefix="q")
+        await cache.wrap(make_embedding_function(calls), "openai", "other")(
+            ["bb"], prefix="p"
+        )
+
+        assert calls == [["a", "bb"], ["ccc"], ["bb"], ["bb"]]
+        assert (cache.hits, cache.misses) == (1, 6)
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """Test eviction by entry count and by size"""
+        cache = EmbeddingCache(
+            url=f"sqlite:///{tmp_path}/cache.db", max_entries=2, touch_interval=0
+        )
+        cache.set_many({"a": [1.0], "b": [2.0]})
+        cache.get_many(["a"])
+        cache.set_many({"c": [3.0]})
+
+        assert cache.get_many(["a", "b", "c"]) == {"a": [1.0], "c": [3.0]}
+
+        cache.max_entries = 100
+        cache.max_size = 36
+        cache.set_many({"d": [4.0] * 4, "e": [5.0] * 4})
+
+        assert sorted(cache.get_many(["a", "c", "d", "e"])) == ["d", "e"]
+
+    def test_writes_and_hits_skip_bookkeeping_queries(self, tmp_path):
+        """Test that the cache isn't counted on every write nor touched on every hit"""
+        cache = EmbeddingCache(url=f"sqlite:///{tmp_path}/cache.db")
+        cache.set_many({"a": [1.0]})
+
+        statements = []
+        event.listen(
+            cache.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        cache.set_many({"b": [2.0], "c": [3.0]})
+        for _ in range(3):
+            assert cache.get_many(["a", "b"]) == {"a": [1.0], "b": [2.0]}
+
+        assert not [s for s in statements if "count(" in s.lower()]
+        assert not [s for s in statements if s.startswith("UPDATE")]
+
+    def test_existing_keys_are_ignored_on_insert(self, tmp_path):
+        """Test that entries written concurrently by another worker don't fail the write"""
+        cache = EmbeddingCache(url=f"sqlite:///{tmp_path}/cache.db")
+        cache.set_many({"a": [1.0]})
+
+        row = {"key": "a", "vector": b"\0\0\0\0", "size": 4, "last_used_at": 0}
+        with cache.engine.begin() as conn:
+            conn.execute(_insert_ignore(conn, embedding_cache_table), [row])
+
+        assert cache.get_many(["a"]) == {"a": [1.0]}
@@ -0,0 +1,118 @@
+import io
+import os
+import time
+import tracemalloc
+import zipfile
+
+from sqlalchemy import insert
+
+from open_webui.models.files import File
+from open_webui.models.knowledge import KnowledgeFile
+from open_webui.routers import knowledge as knowledge_router
+from open_webui.routers.knowledge import generate_knowledge_export_entries
+from open_webui.utils.misc import stream_zip
+
+
+def insert_files(db, n, content=lambda i: f"content {i}", path=None, filename=None):
+    now = int(time.time())
+    db.execute(
+        insert(File),
+        [
+            {
+                "id": f"file-{i:06d}",
+                "user_id": "admin",
+                "filename": filename(i) if filename else f"doc-{i}.pdf",
+                "path": path(i) if path else None,
+                "data": {"content": content(i)},
+                "meta": {},
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(n)
+        ],
+    )
+    db.execute(
+        insert(KnowledgeFile),
+        [
+            {
+                "id": f"kf-{i:06d}",
+                "knowledge_id": "kb",
+                "file_id": f"file-{i:06d}",
+                "user_id": "admin",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(n)
+        ],
+    )
+    db.commit()
+
+
+def export(include_files=False) -> zipfile.ZipFile:
+    data = b"".join(stream_zip(generate_knowledge_export_entries("kb", include_files)))
+    return zipfile.ZipFile(io.BytesIO(data))
+
+
+class TestKnowledgeExport:
+    """Test the streaming ZIP export of knowledge bases"""
+
+    def test_exports_text_and_original_files(self, db, tmp_path):
+        """Test the archive entries, with and without the original files"""
+        for i in range(3):
+            (tmp_path / f"doc-{i}.pdf").write_bytes(b"%PDF" + bytes([i]) * 3_000_000)
+        insert_files(
+            db,
+            3,
+            content=lambda i: "" if i == 2 else f"content {i}",
+            path=lambda i: str(tmp_path / f"doc-{i}.pdf"),
+            filename=lambda i: "same.pdf" if i < 2 else f"doc-{i}.pdf",
+        )
+
+        archive = export()
+        assert archive.testzip() is None
+        assert sorted(archive.namelist()) == ["same.pdf (1).txt", "same.pdf.txt"]
+        assert archive.read("same.pdf.txt") == b"content 0"
+
+        archive = export(include_files=True)
+        assert sorted(archive.namelist()) == [
+            "files/doc-2.pdf",
+            "files/same (1).pdf",
+            "files/same.pdf",
+            "same.pdf (1).txt",
+            "same.pdf.txt",
+        ]
+        assert archive.read("files/doc-2.pdf") == (tmp_path / "doc-2.pdf").read_bytes()
+
+    def test_missing_original_files_are_skipped(self, db, tmp_path):
+        """Test that a file gone from storage doesn't break the archive"""
+        insert_files(db, 2, path=lambda i: str(tmp_path / f"missing-{i}.pdf"))
+
+        archive = export(include_files=True)
+        assert sorted(archive.namelist()) == ["doc-0.pdf.txt", "doc-1.pdf.txt"]
+
+    def test_memory_is_bounded_by_the_batch_size(self, db, monkeypatch):
+        """Benchmark: peak memory of exports of growing knowledge bases"""
+        monkeypatch.setattr(knowledge_router, "KNOWLEDGE_EXPORT_STREAM_BATCH_SIZE", 20)
+        results = []
+        for size in (100, 400):
+            db.query(File).delete()
+            db.query(KnowledgeFile).delete()
+            db.commit()
+            insert_files(db, size, content=lambda i: os.urandom(25_000).hex())
+            db.expunge_all()
+
+            tracemalloc.start()
+            exported = sum(
+                len(chunk)
+                for chunk in stream_zip(generate_knowledge_export_entries("kb"))
+            )
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            assert exported > size * 20_000
+            results.append((size, peak))
+
+        # Memory stays bounded by the batch size, not the size of the knowledge base
+        (_, small_peak), (large_size, large_peak) = results
+        assert large_peak < small_peak * 1.5 + 1e6
+        assert large_peak < large_size * 50_000 / 4
@@ -0,0 +1,290 @@
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from open_webui.internal import db as internal_db
+from open_webui.models.files import File
+from open_webui.models.knowledge import (
+    Knowledge,
+    KnowledgeFile,
+    KnowledgeReindexJob,
+    KnowledgeReindexJobs,
+)
+from open_webui.models.users import User
+from open_webui.retrieval import reindex
+from open_webui.retrieval.reindex import KnowledgeReindexer, get_shadow_collection_name
+from open_webui.retrieval.vector.dbs.chroma import ChromaClient
+from open_webui.routers import retrieval
+from open_webui.routers.knowledge import get_reindex_job_response
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    # A file database, the job reads files from several threads at once
+    engine = create_engine(f"sqlite:///{tmp_path / 'webui.db'}")
+    for model in (User, Knowledge, File, KnowledgeFile, KnowledgeReindexJob):
+        model.__table__.create(engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    @contextmanager
+    def get_db():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setattr(internal_db, "get_db", get_db)
+    return SessionLocal
+
+
+@pytest.fixture
+def chroma(tmp_path, monkeypatch):
+    client = ChromaClient.__new__(ChromaClient)
+    client.client = chromadb.PersistentClient(
+        path=str(tmp_path / "chroma"),
+        settings=chromadb.Settings(allow_reset=True, anonymized_telemetry=False),
+    )
+    monkeypatch.setattr(reindex, "VECTOR_DB_CLIENT", client)
+    monkeypatch.setattr(retrieval, "VECTOR_DB_CLIENT", client)
+    return client
+
+
+@pytest.fixture
+def embeddings(chroma, monkeypatch):
+    calls = []
+
+    def get_embedding_function(*args, **kwargs):
+        async def embedding_function(texts, prefix=None, user=None):
+            # The live collection still serves the old index while building
+            live = chroma.get("kb-1") if chroma.has_collection("kb-1") else None
+            calls.append((texts, live.documents[0] if live else None))
+            return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+        return embedding_function
+
+    monkeypatch.setattr(retrieval, "get_embedding_function", get_embedding_function)
+    return calls
+
+
+@pytest.fixture
+def request_():
+    config = SimpleNamespace(
+        ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER=False,
+        TEXT_SPLITTER="character",
+        CHUNK_SIZE=1000,
+        CHUNK_OVERLAP=0,
+        RAG_EMBEDDING_ENGINE="openai",
+        RAG_EMBEDDING_MODEL="new-model",
+        RAG_OPENAI_API_BASE_URL="",
+        RAG_OPENAI_API_KEY="",
+        RAG_EMBEDDING_BATCH_SIZE=32,
+        ENABLE_ASYNC_EMBEDDING=True,
+    )
+    return SimpleNamespace(
+        app=SimpleNamespace(state=SimpleNamespace(config=config, ef=None))
+    )
+
+
+def add_knowledge(db, id, file_contents):
+    now = int(time.time())
+    with db() as session:
+        session.add(
+            Knowledge(
+                id=id,
+                user_id="admin",
+                name=id,
+                description="",
+                created_at=now,
+                updated_at=now,
+            )
+        )
+        for i, content in enumerate(file_contents):
+            file_id = f"{id}-file-{i}"
+            session.add(
+                File(
+                    id=file_id,
+                    user_id="admin",
+                    filename=f"{file_id}.txt",
+                    data={"content": content},
+                    meta={},
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+            session.add(
+                KnowledgeFile(
+                    id=file_id,
+                    knowledge_id=id,
+                    file_id=file_id,
+                    user_id="admin",
+                    created_at=now + i,
+                    updated_at=now + i,
+                )
+            )
+        session.commit()
+
+
+def add_old_index(chroma, collection_name, texts):
+    chroma.insert(
+        collection_name,
+        [
+            {
+                "id": f"{collection_name}-{i}",
+                "text": text,
+                "vector": [0.0, 1.0, 0.5],
+                "metadata": {"file_id": "old"},
+            }
+            for i, text in enumerate(texts)
+        ],
+    )
+
+
+def get_indexed_files(chroma, collection_name):
+    result = chroma.get(collection_name)
+    return sorted(metadata["file_id"] for metadata in result.metadatas[0])
+
+
+class TestKnowledgeReindex:
+    """Test the background reindex job of all knowledge bases"""
+
+    @pytest.mark.asyncio
+    async def test_builds_shadow_collection_and_swaps(
+        self, db, chroma, embeddings, request_
+    ):
+        """Test batched embedding into a shadow collection swapped in at the end"""
+        add_knowledge(db, "kb-1", [f"content {i}" for i in range(5)])
+        add_knowledge(db, "kb-2", [])
+        add_old_index(chroma, "kb-1", ["old chunk"])
+        add_old_index(chroma, "kb-2", ["old chunk"])
+
+        reindexer = KnowledgeReindexer(concurrency=2, batch_size=2)
+        job = reindexer.start(request_, SimpleNamespace(id="admin"))
+        assert job.status == "pending" and job.total_files == 5
+        await reindexer._task
+
+        # One embedding call per batch of files, not per file
+        assert len(embeddings) == 3
+        assert all(live == ["old chunk"] for _, live in embeddings)
+
+        assert get_indexed_files(chroma, "kb-1") == [f"kb-1-file-{i}" for i in range(5)]
+        assert not chroma.has_collection(get_shadow_collection_name("kb-1"))
+        assert not chroma.has_collection("kb-2")
+
+        job = KnowledgeReindexJobs.get_job_by_id(job.id)
+        assert job.status == "completed"
+        assert (job.processed_files, job.failed_files) == (5, 0)
+        assert get_reindex_job_response(job).files_per_second is None
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_checkpoint(self, db, chroma, embeddings, request_):
+        """Test that an interrupted job only indexes the files left over"""
+        add_knowledge(db, "kb-1", [f"content {i}" for i in range(5)])
+        add_old_index(chroma, "kb-1", ["old chunk"])
+
+        job = KnowledgeReindexJobs.insert_new_job("admin", ["kb-1"], 5)
+        KnowledgeReindexJobs.update_job_by_id(
+            job.id,
+            {
+                "status": "running",
+                "data": {
+                    **job.data,
+                    "knowledge_id": "kb-1",
+                    "file_ids": ["kb-1-file-0", "kb-1-file-1"],
+                },
+                "processed_files": 2,
+            },
+        )
+
+        # The shadow collection holds the checkpointed files and a file indexed
+        # after the last checkpoint
+        shadow = get_shadow_collection_name("kb-1")
+        for i in range(3):
+            chroma.insert(
+                shadow,
+                [
+                    {
+                        "id": f"chunk-{i}",
+                        "text": f"content {i}",
+                        "vector": [9.0, 1.0, 0.5],
+                        "metadata": {"file_id": f"kb-1-file-{i}"},
+                    }
+                ],
+            )
+
+        reindexer = KnowledgeReindexer(concurrency=2, batch_size=2)
+        # The job is running elsewhere until its checkpoints are stale
+        assert (
+            KnowledgeReindexJobs.claim_job_by_id(job.id, int(time.time()) - 30) is None
+        )
+
+        stale_before = int(time.time()) + 1
+        claimed = KnowledgeReindexJobs.claim_job_by_id(job.id, stale_before)
+        assert claimed.data["run_processed_files"] == 2
+        await reindexer.run(request_, claimed)
+
+        assert sorted(text for texts, _ in embeddings for text in texts) == [
+            "content 2",
+            "content 3",
+            "content 4",
+        ]
+        assert get_indexed_files(chroma, "kb-1") == [f"kb-1-file-{i}" for i in range(5)]
+
+        job = KnowledgeReindexJobs.get_job_by_id(job.id)
+        assert job.status == "completed" and job.processed_files == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_files_are_recorded(self, db, chroma, embeddings, request_):
+        """Test that a file that can't be indexed doesn't fail its batch"""
+        add_knowledge(db, "kb-1", ["content 0", "", "content 2"])
+
+        reindexer = KnowledgeReindexer(batch_size=3)
+        job = reindexer.start(request_, SimpleNamespace(id="admin"))
+        await reindexer._task
+
+        assert get_indexed_files(chroma, "kb-1") == ["kb-1-file-0", "kb-1-file-2"]
+        job = KnowledgeReindexJobs.get_job_by_id(job.id)
+        assert (job.processed_files, job.failed_files) == (3, 1)
+        assert [error["file_id"] for error in job.data["errors"]] == ["kb-1-file-1"]
+
+    @pytest.mark.asyncio
+    async def test_files_changed_while_building_are_reconciled(
+        self, db, chroma, embeddings, request_, monkeypatch
+    ):
+        """Test that files added or removed during the build are in the swapped index"""
+        add_knowledge(db, "kb-1", [f"content {i}" for i in range(3)])
+        index_files = reindex.index_files
+
+        def index_files_while_changing(request, files, *args):
+            if not embeddings:
+                # A file is added and another removed while the batch is embedded
+                add_knowledge(db, "kb-2", ["content 3"])
+                with db() as session:
+                    session.query(KnowledgeFile).filter_by(id="kb-2-file-0").update(
+                        {"knowledge_id": "kb-1"}
+                    )
+                    session.query(KnowledgeFile).filter_by(id="kb-1-file-0").delete()
+                    session.commit()
+            return index_files(request, files, *args)
+
+        monkeypatch.setattr(reindex, "index_files", index_files_while_changing)
+
+        reindexer = KnowledgeReindexer(batch_size=10)
+        job = reindexer.start(request_, SimpleNamespace(id="admin"))
+        await reindexer._task
+
+        assert get_indexed_files(chroma, "kb-1") == [
+            "kb-1-file-1",
+            "kb-1-file-2",
+            "kb-2-file-0",
+        ]
+        job = KnowledgeReindexJobs.get_job_by_id(job.id)
+        assert job.status == "completed"
+        assert (job.processed_files, job.total_files) == (4, 4)
@@ -0,0 +1,152 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from open_webui.models import feedbacks as feedbacks_module
+from open_webui.models.feedbacks import (
+    FeedbackForm,
+    Feedbacks,
+    LeaderboardState,
+    Leaderboards,
+    calculate_elo,
+)
+from open_webui.routers import evaluations
+from open_webui.test.util.helpers import QueryCounter
+
+MODELS = ["model-a", "model-b", "model-c", "model-d"]
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    # One feedback per second, so they are applied in the order they're created
+    clock = itertools.count(1_700_000_000)
+    monkeypatch.setattr(feedbacks_module.time, "time", lambda: next(clock))
+
+
+def make_form(rng: random.Random, **data) -> FeedbackForm:
+    model_id, *siblings = rng.sample(MODELS, 3)
+    return FeedbackForm(
+        type="rating",
+        data={
+            "model_id": model_id,
+            "sibling_model_ids": siblings,
+            "rating": rng.choice([1, -1, 0]),
+            "tags": rng.sample(["coding", "math", "writing", "cooking"], 2),
+            **data,
+        },
+    )
+
+
+def replay() -> dict:
+    """The leaderboard computed from scratch, as it was before it was stored"""
+    stats = calculate_elo(Feedbacks.get_feedbacks_for_leaderboard())
+    return {id: (round(s["rating"], 6), s["won"], s["lost"]) for id, s in stats.items()}
+
+
+def stored() -> dict:
+    return {
+        entry.model_id: (round(entry.rating, 6), entry.won, entry.lost)
+        for entry in Leaderboards.get_leaderboard()
+        if entry.won + entry.lost
+    }
+
+
+def is_stale(db) -> bool:
+    state = db.query(LeaderboardState).first()
+    return state is None or state.stale
+
+
+class TestLeaderboard:
+    """Test the leaderboard maintained as feedbacks change"""
+
+    def test_new_feedbacks_are_applied_incrementally(self, db):
+        """Test that inserts update the stored ratings without a replay"""
+        rng = random.Random(0)
+        for _ in range(20):
+            Feedbacks.insert_new_feedback("user", make_form(rng))
+        assert is_stale(db)
+        assert stored() == replay()
+
+        for _ in range(30):
+            Feedbacks.insert_new_feedback("user", make_form(rng))
+        assert not is_stale(db)
+
+        # Reading the leaderboard doesn't read the feedbacks anymore
+        with QueryCounter(db.get_bind()) as counter:
+            leaderboard = stored()
+        assert counter.count == 2
+        assert leaderboard == replay()
+
+        tags = {entry.model_id: entry.tags for entry in Leaderboards.get_leaderboard()}
+        expected = {}
+        for feedback in Feedbacks.get_feedbacks_for_leaderboard():
+            counts = expected.setdefault(feedback.data["model_id"], {})
+            for tag in feedback.data["tags"]:
+                counts[tag] = counts.get(tag, 0) + 1
+        assert tags == expected
+
+    def test_edits_and_deletes_rebuild_the_leaderboard(self, db):
+        """Test that ratings stay correct when earlier feedbacks change"""
+        rng = random.Random(1)
+        feedbacks = [
+            Feedbacks.insert_new_feedback("user", make_form(rng)) for _ in range(20)
+        ]
+        stored()
+
+        # A comment doesn't change the leaderboard
+        data = {**feedbacks[3].data, "comment": "nice"}
+        Feedbacks.update_feedback_by_id(
+            feedbacks[3].id, FeedbackForm(type="rating", data=data)
+        )
+        assert not is_stale(db)
+
+        data = {**feedbacks[3].data, "rating": -int(feedbacks[3].data["rating"] or 1)}
+        Feedbacks.update_feedback_by_id(
+            feedbacks[3].id, FeedbackForm(type="rating", data=data)
+        )
+        assert is_stale(db)
+        assert stored() == replay()
+
+        Feedbacks.delete_feedback_by_id(feedbacks[5].id)
+        assert is_stale(db)
+        assert stored() == replay()
+
+        # Feedbacks are applied on top of the rebuilt leaderboard again
+        Feedbacks.insert_new_feedback("user", make_form(rng))
+        assert not is_stale(db)
+        assert stored() == replay()
+
+        Feedbacks.delete_all_feedbacks()
+        assert stored() == replay() == {}
+
+    def test_tag_embeddings_are_cached(self, db, monkeypatch):
+        """Test that query-weighted leaderboards only embed new tags and the query"""
+        encoded = []
+
+        class EmbeddingModel:
+            def encode(self, texts):
+                encoded.append(list(texts))
+                return np.array([[len(text), 1.0] for text in texts])
+
+        monkeypatch.setattr(evaluations, "_get_embedding_model", EmbeddingModel)
+
+        rng = random.Random(2)
+        for _ in range(10):
+            Feedbacks.insert_new_feedback("user", make_form(rng))
+        feedbacks = Feedbacks.get_feedbacks_for_leaderboard()
+
+        first = evaluations._compute_similarities(feedbacks, "code")
+        assert sorted(encoded[0]) == ["coding", "cooking", "math", "writing"]
+
+        encoded.clear()
+        Feedbacks.insert_new_feedback("user", make_form(rng, tags=["poetry"]))
+        feedbacks = Feedbacks.get_feedbacks_for_leaderboard()
+        second = evaluations._compute_similarities(feedbacks, "code")
+        assert encoded == [["poetry"], ["code"]]
+        assert {id: second[id] for id in first} == pytest.approx(first)
+
+        encoded.clear()
+        evaluations._compute_similarities(feedbacks, "code")
+        assert encoded == [["code"]]
@@ -0,0 +1,203 @@
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+from mcp.server.fastmcp import Context, FastMCP
+
+from open_webui.utils.mcp.client import MCPClient
+from open_webui.utils.mcp.pool import MCPSessionPool, PooledMCPClient
+
+
+@pytest.fixture(scope="module")
+def server():
+    stats = {"initialize": 0, "tools/list": 0}
+    mcp = FastMCP("test")
+
+    @mcp.tool()
+    def add(a: int, b: int) -> int:
+        """Add two numbers"""
+        return a + b
+
+    @mcp.tool()
+    async def refresh(ctx: Context) -> str:
+        """Announce a changed tool list"""
+        await ctx.session.send_tool_list_changed()
+        return "ok"
+
+    app = mcp.streamable_http_app()
+
+    async def counting_app(scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "POST":
+            body = b""
+            messages = []
+            while True:
+                message = await receive()
+                messages.append(message)
+                body += message.get("body", b"")
+                if not message.get("more_body"):
+                    break
+            for method in stats:
+                if f'"method":"{method}"' in body.decode():
+                    stats[method] += 1
+
+            async def replay():
+                return messages.pop(0) if messages else await receive()
+
+            return await app(scope, replay, send)
+        return await app(scope, receive, send)
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    config = uvicorn.Config(counting_app, log_level="error", lifespan="on")
+    uvicorn_server = uvicorn.Server(config)
+    thread = threading.Thread(
+        target=uvicorn_server.run, kwargs={"sockets": [sock]}, daemon=True
+    )
+    thread.start()
+    while not uvicorn_server.started:
+        time.sleep(0.01)
+
+    yield f"http://127.0.0.1:{port}/mcp", stats
+
+    uvicorn_server.should_exit = True
+    thread.join(5)
+
+
+class TestMCPSessionPool:
+    """Test reuse of MCP sessions across chat requests"""
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_reused_per_identity(self, server, monkeypatch):
+        """Test that one handshake and tool listing serve repeated requests"""
+        monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+        url, stats = server
+        stats.update({"initialize": 0, "tools/list": 0})
+        pool = MCPSessionPool()
+
+        client = await pool.acquire("server", url)
+        assert [spec["name"] for spec in await client.get_tool_specs()] == [
+            "add",
+            "refresh",
+        ]
+        await pool.release(client)
+
+        for _ in range(5):
+            pooled = await pool.acquire("server", url)
+            await pooled.get_tool_specs()
+            assert await pooled.call_tool("add", {"a": 1, "b": 2}) == [
+                {"type": "text", "text": "3", "annotations": None, "meta": None}
+            ]
+            await pool.release(pooled)
+
+        assert pooled is client
+        assert stats == {"initialize": 1, "tools/list": 1}
+
+        other = await pool.acquire("server", url, headers={"Authorization": "x"})
+        assert other is not client
+        assert stats["initialize"] == 2
+
+        await pool.release(other)
+        await pool.close_all()
+        assert not client.connected
+
+    @pytest.mark.asyncio
+    async def test_tool_list_changed_invalidates_specs(self, server, monkeypatch):
+        """Test that the cached tool specs are refetched after list_changed"""
+        monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+        url, stats = server
+        stats.update({"initialize": 0, "tools/list": 0})
+        pool = MCPSessionPool()
+
+        client = await pool.acquire("server", url)
+        await client.get_tool_specs()
+        assert client.tool_specs is not None
+
+        await client.call_tool("refresh", {})
+        for _ in range(100):
+            if client.tool_specs is None:
+                break
+            await asyncio.sleep(0.01)
+        assert client.tool_specs is None
+
+        await client.get_tool_specs()
+        assert stats["tools/list"] == 2
+        await pool.close_all()
+
+    @pytest.mark.asyncio
+    async def test_idle_eviction_and_reconnect(self, server, monkeypatch):
+        """Test that idle sessions are closed and reopened on the next request"""
+        monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+        url, _ = server
+        pool = MCPSessionPool(idle_timeout=0.1, keepalive_interval=0.05)
+
+        client = await pool.acquire("server", url)
+        await asyncio.sleep(0.3)
+        # Sessions in use are never evicted
+        assert client.connected
+        await pool.release(client)
+
+        for _ in range(100):
+            if not client.connected:
+                break
+            await asyncio.sleep(0.01)
+        assert not client.connected
+
+        reopened = await pool.acquire("server", url)
+        assert reopened is not client and reopened.connected
+        await pool.close_all()
+
+    @pytest.mark.asyncio
+    async def test_sweep_does_not_evict_acquired_sessions(self, monkeypatch):
+        """Test that a session acquired during its health check is not closed"""
+        pool = MCPSessionPool(keepalive_interval=0.01)
+        stale = PooledMCPClient()
+        stale.closed = False
+
+        async def close():
+            stale.closed = True
+
+        stale.close = close
+        pool._clients[pool.get_key("server", "url")] = stale
+
+        checks = []
+
+        async def is_healthy(client):
+            checks.append(client)
+            if len(checks) == 1:
+                # The sweep's ping of the stale session is slow and fails
+                await asyncio.sleep(0.1)
+                return False
+            return True
+
+        async def start(self, url, headers=None):
+            pass
+
+        monkeypatch.setattr(pool, "_is_healthy", is_healthy)
+        monkeypatch.setattr(PooledMCPClient, "start", start)
+
+        sweeper = asyncio.create_task(pool._sweep())
+        while not checks:
+            await asyncio.sleep(0.005)
+
+        client = await pool.acquire("server", "url")
+        assert stale.closed
+        assert client is not stale
+
+        sweeper.cancel()
+        pool._clients.clear()
+
+    @pytest.mark.asyncio
+    async def test_pooling_disabled(self, server, monkeypatch):
+        """Test that an idle timeout of 0 opens a session per request"""
+        monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+        url, _ = server
+        pool = MCPSessionPool(idle_timeout=0)
+
+        client = await pool.acquire("server", url)
+        assert type(client) is MCPClient
+        assert not isinstance(client, PooledMCPClient)
+        await pool.release(client)
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+
+import pytest
+
+from open_webui.socket.utils import MessageWriteBuffer
+
+
+class TestMessageWriteBuffer:
+    """Test batching of chat message events"""
+
+    @pytest.mark.asyncio
+    async def test_events_are_written_once_on_flush(self):
+        """Test that queued events are written as one batch"""
+        writes = []
+        buffer = MessageWriteBuffer(
+            lambda chat_id, message_id, events: writes.append(
+                (chat_id, message_id, events)
+            ),
+            interval=60,
+        )
+
+        for i in range(5):
+            await buffer.add("chat", "message", {"type": "message", "data": i})
+
+        assert writes == []
+
+        await buffer.flush("chat", "message")
+
+        assert len(writes) == 1
+        assert [event["data"] for event in writes[0][2]] == [0, 1, 2, 3, 4]
+        assert buffer.coalesced_count == 4
+
+    @pytest.mark.asyncio
+    async def test_flush_on_max_events(self):
+        """Test that reaching max_events flushes immediately"""
+        writes = []
+        buffer = MessageWriteBuffer(
+            lambda chat_id, message_id, events: writes.append(events),
+            interval=60,
+            max_events=3,
+        )
+
+        for i in range(7):
+            await buffer.add("chat", "message", {"type": "message", "data": i})
+
+        assert [len(events) for events in writes] == [3, 3]
+
+        await buffer.flush_all()
+        assert [len(events) for events in writes] == [3, 3, 1]
+
+    @pytest.mark.asyncio
+    async def test_flush_after_interval(self):
+        """Test that queued events are written after the interval"""
+        writes = []
+        buffer = MessageWriteBuffer(
+            lambda chat_id, message_id, events: writes.append(events),
+            interval=0.01,
+        )
+
+        await buffer.add("chat", "message", {"type": "status", "data": {}})
+        await asyncio.sleep(0.05)
+
+        assert len(writes) == 1
+
+    @pytest.mark.asyncio
+    async def test_zero_interval_writes_through(self):
+        """Test that an interval of 0 disables buffering"""
+        writes = []
+        buffer = MessageWriteBuffer(
+            lambda chat_id, message_id, events: writes.append(events),
+            interval=0,
+        )
+
+        await buffer.add("chat", "message", {"type": "message", "data": 1})
+        await buffer.add("chat", "message", {"type": "message", "data": 2})
+
+        assert len(writes) == 2
+        assert buffer.coalesced_count == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_writes_keep_the_events(self):
+        """Test that events are kept queued until they are written"""
+        fakeredis = pytest.importorskip("fakeredis")
+        fail = True
+        writes = []
+
+        def write(chat_id, message_id, events):
+            if fail:
+                raise Exception("database is locked")
+            writes.append([event["data"] for event in events])
+
+        for redis in (None, fakeredis.FakeAsyncRedis(decode_responses=True)):
+            fail = True
+            writes.clear()
+            buffer = MessageWriteBuffer(write, interval=60, redis=redis)
+
+            await buffer.add("chat", "message", {"type": "message", "data": 1})
+            await buffer.flush("chat", "message")
+            await buffer.add("chat", "message", {"type": "message", "data": 2})
+            await buffer.flush("chat", "message")
+            assert writes == []
+
+            fail = False
+            await buffer.flush("chat", "message")
+            assert writes == [[1, 2]]
+
+            await buffer.flush_all()
+            assert writes == [[1, 2]]
+
+    @pytest.mark.asyncio
+    async def test_failed_writes_are_retried(self):
+        """Test that a failed write is retried after the interval, then given up"""
+        failures = 1
+        writes = []
+
+        def write(chat_id, message_id, events):
+            nonlocal failures
+            if failures:
+                failures -= 1
+                raise Exception("database is locked")
+            writes.append([event["data"] for event in events])
+
+        buffer = MessageWriteBuffer(write, interval=0.01, max_retries=2)
+        await buffer.add("chat", "message", {"type": "message", "data": 1})
+        await asyncio.sleep(0.1)
+        assert writes == [[1]]
+
+        failures = 10
+        await buffer.add("chat", "message", {"type": "message", "data": 2})
+        await asyncio.sleep(0.1)
+        # The first attempt and two retries failed, the events were dropped
+        assert failures == 7
+        assert writes == [[1]]
+        assert not buffer._events and not buffer._flush_tasks
+
+    @pytest.mark.asyncio
+    async def test_messages_are_flushed_concurrently(self):
+        """Test that a slow write only holds back flushes of the same message"""
+        release = threading.Event()
+        writes = []
+
+        def write(chat_id, message_id, events):
+            if message_id == "slow":
+                release.wait(5)
+            writes.append(message_id)
+
+        buffer = MessageWriteBuffer(write, interval=60)
+        await buffer.add("chat", "slow", {"type": "message", "data": 1})
+        await buffer.add("chat", "fast", {"type": "message", "data": 1})
+
+        slow = asyncio.create_task(buffer.flush("chat", "slow"))
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(buffer.flush("chat", "fast"), timeout=1)
+        assert writes == ["fast"]
+
+        release.set()
+        await slow
+        assert writes == ["fast", "slow"]
+        assert not buffer._locks
+
+    def test_failed_upserts_raise(self, db):
+        """Test that the socket write handler raises when the upsert fails"""
+        from open_webui.socket.main import write_message_events
+
+        with pytest.raises(Exception):
+            write_message_events(
+                "missing", "message", [{"type": "replace", "data": {"content": "Hi"}}]
+            )
@@ -0,0 +1,135 @@
+from unittest.mock import patch
+
+import pytest
+
+from open_webui.models.groups import GroupForm, Groups
+from open_webui.test.util.helpers import QueryCounter, add_user, wait_for
+from open_webui.utils import access_control
+from open_webui.utils.access_control import (
+    PermissionCache,
+    get_permissions,
+    has_permission,
+)
+
+DEFAULT_PERMISSIONS = {
+    "features": {"web_search": False, "channels": True, "api_keys": False},
+    "chat": {"delete": True},
+}
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    monkeypatch.setattr(access_control, "PERMISSION_CACHE", PermissionCache(ttl=300))
+
+
+def add_group(db, permissions, user_ids):
+    group = Groups.insert_new_group(
+        "admin", GroupForm(name="group", description="", permissions=permissions)
+    )
+    Groups.add_users_to_group(group.id, user_ids)
+    return group
+
+
+class TestPermissions:
+    """Test the effective permissions of users compiled from their groups"""
+
+    def test_checks_are_cached_until_groups_change(self, db):
+        """Test that permission checks only read the groups once"""
+        add_user(db, "user-1")
+        add_user(db, "user-2")
+        db.commit()
+        group = add_group(db, {"features": {"web_search": True}}, ["user-1"])
+
+        with QueryCounter(db.get_bind()) as counter:
+            for _ in range(10):
+                assert has_permission(
+                    "user-1", "features.web_search", DEFAULT_PERMISSIONS
+                )
+                assert has_permission(
+                    "user-1", "features.channels", DEFAULT_PERMISSIONS
+                )
+                assert not has_permission(
+                    "user-1", "features.api_keys", DEFAULT_PERMISSIONS
+                )
+                assert not has_permission(
+                    "user-1", "features.missing", DEFAULT_PERMISSIONS
+                )
+                assert not has_permission(
+                    "user-2", "features.web_search", DEFAULT_PERMISSIONS
+                )
+        assert counter.count == 2
+
+        # Keys missing from the defaults fall back to the built-in defaults
+        permissions = get_permissions("user-1", DEFAULT_PERMISSIONS)
+        assert "workspace" in permissions
+        assert {
+            key: permissions["features"][key] for key in DEFAULT_PERMISSIONS["features"]
+        } == {"web_search": True, "channels": True, "api_keys": False}
+
+        Groups.add_users_to_group(group.id, ["user-2"])
+        assert has_permission("user-2", "features.web_search", DEFAULT_PERMISSIONS)
+
+        Groups.update_group_by_id(
+            group.id,
+            GroupForm(
+                name="group",
+                description="",
+                permissions={"features": {"api_keys": True}},
+            ),
+        )
+        assert not has_permission("user-1", "features.web_search", DEFAULT_PERMISSIONS)
+        assert has_permission("user-1", "features.api_keys", DEFAULT_PERMISSIONS)
+
+        Groups.remove_users_from_group(group.id, ["user-1"])
+        assert not has_permission("user-1", "features.api_keys", DEFAULT_PERMISSIONS)
+
+        # New defaults are applied to the cached users
+        defaults = {**DEFAULT_PERMISSIONS, "chat": {"delete": False}}
+        assert has_permission("user-1", "chat.delete", DEFAULT_PERMISSIONS)
+        assert not has_permission("user-1", "chat.delete", defaults)
+
+    def test_returned_permissions_are_copies(self, db):
+        """Test that changing the permissions returned doesn't change the cache"""
+        add_user(db, "user-1")
+        db.commit()
+
+        get_permissions("user-1", DEFAULT_PERMISSIONS)["chat"]["delete"] = False
+        assert get_permissions("user-1", DEFAULT_PERMISSIONS)["chat"]["delete"]
+        assert DEFAULT_PERMISSIONS["chat"]["delete"]
+
+    def test_evictions_reach_other_workers(self, db):
+        """Test that a group change on one worker drops the permissions cached by another"""
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        add_user(db, "user-1")
+        db.commit()
+        group = add_group(db, {}, ["user-1"])
+
+        with patch(
+            "open_webui.utils.access_control.get_redis_connection",
+            side_effect=lambda *args, **kwargs: fakeredis.FakeRedis(
+                server=server, decode_responses=True
+            ),
+        ):
+            caches = [PermissionCache(ttl=300), PermissionCache(ttl=300)]
+            for cache in caches:
+                cache.connect(redis_url="redis://localhost", redis_key_prefix="test")
+
+        def has_web_search():
+            return (
+                caches[1].get("user-1", DEFAULT_PERMISSIONS).has("features.web_search")
+            )
+
+        assert not has_web_search()
+
+        # The first worker changes the group
+        with patch.object(access_control, "PERMISSION_CACHE", caches[0]):
+            Groups.update_group_by_id(
+                group.id,
+                GroupForm(
+                    name="group",
+                    description="",
+                    permissions={"features": {"web_search": True}},
+                ),
+            )
+        assert wait_for(has_web_search)
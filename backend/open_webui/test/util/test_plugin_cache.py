@@ -0,0 +1,188 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.models.functions import Function, Functions
+from open_webui.test.util.helpers import QueryCounter
+from open_webui.utils.filter import process_filter_functions
+from open_webui.utils.plugin import (
+    apply_function_valves,
+    get_function_module_from_cache,
+    get_user_valves,
+)
+
+
+def make_content(version):
+    return f"class Filter:\n    version = {version}\n"
+
+
+FILTER_WITH_VALVES = """
+from pydantic import BaseModel
+
+class Filter:
+    class Valves(BaseModel):
+        prefix: str = ""
+
+    class UserValves(BaseModel):
+        suffix: str = ""
+
+    def __init__(self):
+        self.valves = self.Valves()
+
+    def inlet(self, body, __user__):
+        body["content"] = self.valves.prefix + body["content"] + __user__["valves"].suffix
+        return body
+"""
+
+
+@pytest.fixture
+def request_():
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+
+
+def add_function(db, id, content, updated_at, valves=None):
+    db.add(
+        Function(
+            id=id,
+            user_id="user-1",
+            name=id,
+            type="filter",
+            content=content,
+            meta={},
+            valves=valves or {},
+            is_active=True,
+            is_global=False,
+            updated_at=updated_at,
+            created_at=updated_at,
+        )
+    )
+    db.commit()
+
+
+def load(request, function_id="f", **kwargs):
+    module, _, _ = get_function_module_from_cache(request, function_id, **kwargs)
+    return module
+
+
+class TestPluginCache:
+    """Test the version check of cached function modules"""
+
+    def test_unchanged_function_is_checked_by_version(self, db, request_):
+        """Test that a cached module costs one small query, or none with a version"""
+        add_function(db, "f", make_content(1), int(time.time()) - 10)
+        module = load(request_)
+        assert module.version == 1
+
+        with QueryCounter(db.get_bind()) as counter:
+            assert load(request_) is module
+        assert counter.count == 1
+
+        version = Functions.get_function_by_id("f").updated_at
+        with QueryCounter(db.get_bind()) as counter:
+            assert load(request_, version=version) is module
+        assert counter.count == 0
+
+    def test_changed_function_is_reloaded(self, db, request_):
+        """Test that content changes are picked up, even within the same second"""
+        add_function(db, "f", make_content(1), int(time.time()) - 10)
+        assert load(request_).version == 1
+
+        Functions.update_function_by_id("f", {"content": make_content(2)})
+        assert load(request_).version == 2
+
+        # A second write in the same second leaves updated_at unchanged
+        updated_at = Functions.get_function_by_id("f").updated_at
+        db.query(Function).filter_by(id="f").update(
+            {"content": make_content(3), "updated_at": updated_at}
+        )
+        db.commit()
+        assert load(request_).version == 3
+
+        # Valve updates bump the version without rebuilding the module
+        module = load(request_)
+        Functions.update_function_valves_by_id("f", {"priority": 1})
+        assert load(request_) is module
+
+    def test_version_check_benchmark(self, db, request_):
+        """Benchmark: cached lookups against reading and comparing the content"""
+        content = make_content(1) + "#" * 50_000 + "\n"
+        add_function(db, "f", content, int(time.time()) - 10)
+        load(request_)
+
+        start = time.perf_counter()
+        for _ in range(200):
+            load(request_)
+        versioned = time.perf_counter() - start
+
+        # Reading the row and comparing the content, as every lookup used to
+        request_.app.state.FUNCTION_VERSIONS.clear()
+        start = time.perf_counter()
+        for _ in range(200):
+            load(request_)
+            request_.app.state.FUNCTION_VERSIONS.clear()
+        compared = time.perf_counter() - start
+
+        assert versioned < compared
+
+
+class TestValvesCache:
+    """Test the cached admin valves and per-request user valves"""
+
+    def test_valves_are_cached_by_version(self, db, request_):
+        """Test that valves are only read again after they were updated"""
+        add_function(
+            db, "f", FILTER_WITH_VALVES, int(time.time()) - 10, valves={"prefix": "a"}
+        )
+        module = load(request_)
+        apply_function_valves(request_, "f", module)
+        valves = module.valves
+        assert valves.prefix == "a"
+
+        version = Functions.get_function_by_id("f").updated_at
+        with QueryCounter(db.get_bind()) as counter:
+            apply_function_valves(request_, "f", module, version=version)
+            apply_function_valves(request_, "f", module, load_from_db=False)
+        assert counter.count == 0
+        assert module.valves is valves
+
+        Functions.update_function_valves_by_id("f", {"prefix": "b"})
+        apply_function_valves(request_, "f", load(request_))
+        assert load(request_).valves.prefix == "b"
+
+    def test_user_valves_come_from_the_request_user(self, db):
+        """Test that user valves are read from the user's settings"""
+        settings = {"functions": {"valves": {"f": {"suffix": "!"}}}}
+        user = {"id": "user-1", "settings": settings}
+
+        assert get_user_valves(user, "functions", "f") == {"suffix": "!"}
+        assert get_user_valves(user, "functions", "other") == {}
+        assert get_user_valves(user, "tools", "f") == {}
+        assert get_user_valves({"id": "u", "settings": None}, "tools", "f") == {}
+
+    @pytest.mark.asyncio
+    async def test_filters_run_with_snapshot_valves(self, db, request_):
+        """Test filter valves and their query count on a warm cache"""
+        for id in ("f", "g"):
+            add_function(
+                db, id, FILTER_WITH_VALVES, int(time.time()) - 10, valves={"prefix": id}
+            )
+        filters = [Functions.get_function_by_id(id) for id in ("f", "g")]
+        user = {
+            "id": "user-1",
+            "settings": {"functions": {"valves": {"g": {"suffix": "!"}}}},
+        }
+
+        async def run():
+            body, _ = await process_filter_functions(
+                request_, filters, "inlet", {"content": "x"}, {"__user__": user}
+            )
+            return body["content"]
+
+        assert await run() == "gfx!"
+        with QueryCounter(db.get_bind()) as counter:
+            assert await run() == "gfx!"
+
+        # One version query for all filters; the user dict is not modified
+        assert counter.count == 1
+        assert "valves" not in user
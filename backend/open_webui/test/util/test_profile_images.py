@@ -0,0 +1,146 @@
+import base64
+import os
+
+import pytest
+from starlette.requests import Request
+
+from open_webui.models import users as users_module
+from open_webui.models.users import ProfileImage, User, UserCache, Users
+from open_webui.storage import provider
+from open_webui.test.util.helpers import add_user
+from open_webui.utils.profile_images import (
+    get_profile_image_hash,
+    get_profile_image_response,
+    is_same_profile_image,
+    migrate_inline_profile_images,
+)
+
+
+@pytest.fixture(autouse=True)
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(provider, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(provider, "Storage", provider.LocalStorageProvider())
+    monkeypatch.setattr(
+        "open_webui.utils.profile_images.Storage", provider.LocalStorageProvider()
+    )
+    monkeypatch.setattr(users_module, "USER_CACHE", UserCache(ttl=0))
+
+
+def make_data_uri(contents: bytes, content_type="image/png") -> str:
+    return f"data:{content_type};base64,{base64.b64encode(contents).decode()}"
+
+
+def make_request(if_none_match=None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "headers": headers})
+
+
+async def read_body(response) -> bytes:
+    chunks = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await response({"type": "http", "method": "GET", "headers": []}, receive, send)
+    return b"".join(chunks)
+
+
+class TestProfileImages:
+    """Test profile images kept in file storage instead of the user row"""
+
+    @pytest.mark.asyncio
+    async def test_inline_images_are_stored_on_save(self, db, tmp_path):
+        """Test that the row only keeps a versioned URL to the stored image"""
+        image = os.urandom(200_000)
+        for id in ("user-1", "user-2"):
+            add_user(db, id)
+        db.commit()
+
+        user = Users.update_user_by_id(
+            "user-1", {"profile_image_url": make_data_uri(image)}
+        )
+        hash = get_profile_image_hash(user.profile_image_url)
+        assert user.profile_image_url == f"/api/v1/users/user-1/profile/image?v={hash}"
+
+        # A login with the same picture doesn't save it again
+        assert is_same_profile_image(make_data_uri(image), user.profile_image_url)
+        assert not is_same_profile_image(
+            make_data_uri(b"other"), user.profile_image_url
+        )
+
+        # The same image is stored once
+        Users.update_user_profile_image_url_by_id("user-2", make_data_uri(image))
+        assert db.query(ProfileImage).count() == 1
+        assert len(os.listdir(tmp_path)) == 1
+
+        response = get_profile_image_response(make_request(), user.profile_image_url)
+        assert await read_body(response) == image
+        assert response.media_type == "image/png"
+        assert response.headers["cache-control"] == "private, no-cache"
+        etag = response.headers["etag"]
+
+        # Versioned URLs are cached for good, otherwise revalidated by ETag
+        response = get_profile_image_response(
+            make_request(), user.profile_image_url, version=hash
+        )
+        assert "immutable" in response.headers["cache-control"]
+        response = get_profile_image_response(
+            make_request(if_none_match=etag), user.profile_image_url
+        )
+        assert response.status_code == 304
+
+        # URLs other than inline images are kept as they are
+        user = Users.update_user_by_id("user-1", {"profile_image_url": "/user.png"})
+        assert user.profile_image_url == "/user.png"
+
+    def test_migrates_users_saved_inline(self, db):
+        """Test the migration of images saved before they were stored"""
+        for i in range(5):
+            add_user(db, f"user-{i}")
+        db.commit()
+        for i in range(3):
+            db.query(User).filter_by(id=f"user-{i}").update(
+                {
+                    "profile_image_url": make_data_uri(os.urandom(50_000)),
+                    "profile_banner_image_url": (
+                        make_data_uri(b"banner", "image/jpeg") if i == 0 else None
+                    ),
+                }
+            )
+        db.commit()
+
+        assert migrate_inline_profile_images(batch_size=2) == 3
+        assert migrate_inline_profile_images(batch_size=2) == 0
+
+        users = {user.id: user for user in db.query(User).all()}
+        assert all(len(user.profile_image_url) < 120 for user in users.values())
+        assert users["user-0"].profile_banner_image_url.startswith(
+            "/api/v1/users/user-0/profile/banner?v="
+        )
+        assert users["user-3"].profile_image_url == ""
+
+    @pytest.mark.asyncio
+    async def test_thumbnails(self, db):
+        """Test that thumbnails are resized once and stored"""
+        Image = pytest.importorskip("PIL.Image")
+        import io
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (400, 200), "red").save(buffer, format="PNG")
+        add_user(db, "user-1")
+        db.commit()
+        user = Users.update_user_by_id(
+            "user-1", {"profile_image_url": make_data_uri(buffer.getvalue())}
+        )
+
+        for _ in range(2):
+            response = get_profile_image_response(
+                make_request(), user.profile_image_url, size=50
+            )
+            with Image.open(io.BytesIO(await read_body(response))) as thumbnail:
+                assert thumbnail.size == (64, 32)
+        assert db.query(ProfileImage).count() == 2
@@ -0,0 +1,46 @@
+import pytest
+from langchain_core.documents import Document
+
+from open_webui.retrieval.utils import RerankCompressor
+
+
+class TestRerankCompressor:
+    """Test embedding-based scoring of hybrid search candidates"""
+
+    @pytest.mark.asyncio
+    async def test_stored_vectors_are_not_re_embedded(self):
+        """Test that only candidates without a stored vector are embedded"""
+        calls = []
+
+        async def embedding_function(query, prefix=None, user=None):
+            calls.append(query)
+            if isinstance(query, list):
+                return [[0.0, 1.0] for _ in query]
+            return [1.0, 0.0]
+
+        compressor = RerankCompressor(
+            embedding_function=embedding_function,
+            top_n=3,
+            reranking_function=None,
+            r_score=0.0,
+            query_vectors={"query": [1.0, 0.0]},
+            # "padded" is zero-padded to a fixed length as pgvector stores it
+            document_vectors={"stored": [1.0, 0.0], "padded": [1.0, 1.0, 0.0, 0.0]},
+        )
+
+        result = await compressor.acompress_documents(
+            [
+                Document(page_content="missing"),
+                Document(page_content="padded"),
+                Document(page_content="stored"),
+            ],
+            "query",
+        )
+
+        assert calls == [["missing"]]
+        assert [doc.page_content for doc in result] == ["stored", "padded", "missing"]
+        assert [round(doc.metadata["score"], 4) for doc in result] == [
+            1.0,
+            0.7071,
+            0.0,
+        ]
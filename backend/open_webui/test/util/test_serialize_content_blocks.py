@@ -0,0 +1,88 @@
+from open_webui.utils import middleware
+from open_webui.utils.middleware import ContentBlocksSerializer
+
+
+def serialize_from_scratch(content_blocks, raw=False):
+    return ContentBlocksSerializer()(content_blocks, raw)
+
+
+def stream_tokens(serialize, blocks, tokens):
+    for token in tokens:
+        blocks[-1]["content"] += token
+        serialize(blocks)
+
+
+class TestContentBlocksSerializer:
+    """Test incremental serialization of streamed content blocks"""
+
+    def test_matches_full_render_while_streaming(self):
+        """Test that cached prefixes render the same as a full render"""
+        serializer = ContentBlocksSerializer()
+        blocks = [{"type": "reasoning", "content": "", "start_tag": "<think>"}]
+
+        for step in range(30):
+            if isinstance(blocks[-1]["content"], str):
+                blocks[-1]["content"] += f"line {step}\n"
+            if step == 10:
+                blocks[-1]["duration"] = 2
+                blocks.append(
+                    {
+                        "type": "tool_calls",
+                        "content": [
+                            {"id": "1", "function": {"name": "f", "arguments": "{}"}}
+                        ],
+                    }
+                )
+            if step == 15:
+                blocks[-1]["results"] = [{"tool_call_id": "1", "content": "ok"}]
+                blocks.append({"type": "text", "content": "```"})
+            if step == 20:
+                blocks.append(
+                    {
+                        "type": "code_interpreter",
+                        "content": "print(1)",
+                        "attributes": {"lang": "python"},
+                    }
+                )
+
+            for raw in (False, True):
+                assert serializer(blocks, raw) == serialize_from_scratch(blocks, raw)
+
+    def test_sub_lists_are_not_served_from_cache(self):
+        """Test that serializing a prefix of the blocks is not affected by the cache"""
+        serializer = ContentBlocksSerializer()
+        blocks = [
+            {"type": "text", "content": "first"},
+            {"type": "text", "content": "second"},
+            {"type": "text", "content": "third"},
+        ]
+
+        assert serializer(blocks) == "first\nsecond\nthird"
+        assert serializer(blocks[:1]) == "first"
+        assert serializer(blocks) == "first\nsecond\nthird"
+
+    def test_long_stream_renders_only_the_streamed_block(self, monkeypatch):
+        """Test that each token re-renders the last block, not the large tool result"""
+        rendered = []
+        serialize_content_block = middleware.serialize_content_block
+
+        def count_renders(content, block, raw):
+            rendered.append(block["type"])
+            return serialize_content_block(content, block, raw)
+
+        monkeypatch.setattr(middleware, "serialize_content_block", count_renders)
+
+        blocks = [
+            {
+                "type": "tool_calls",
+                "content": [{"id": "1", "function": {"name": "f", "arguments": "{}"}}],
+                "results": [{"tool_call_id": "1", "content": "x" * 50_000}],
+            },
+            {"type": "text", "content": ""},
+        ]
+        tokens = ["token "] * 1_000
+
+        stream_tokens(ContentBlocksSerializer(), blocks, tokens)
+
+        assert rendered.count("tool_calls") == 1
+        assert rendered.count("text") == len(tokens)
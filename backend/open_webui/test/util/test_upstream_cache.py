@@ -0,0 +1,115 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.routers import ollama, openai
+from open_webui.utils.upstream_cache import UpstreamCache
+
+
+def make_request(**config):
+    return SimpleNamespace(
+        app=SimpleNamespace(state=SimpleNamespace(config=SimpleNamespace(**config)))
+    )
+
+
+def make_upstream(responses: dict):
+    """A fake send_get_request answering from `responses`, counting requests"""
+    requests = []
+
+    async def send_get_request(url, key=None, user=None):
+        requests.append(url)
+        await asyncio.sleep(0.01)
+        response = responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return send_get_request, requests
+
+
+class TestUpstreamCache:
+    """Test the model lists of upstream connections shared by all users"""
+
+    @pytest.mark.asyncio
+    async def test_model_lists_are_fetched_once_for_all_users(self, monkeypatch):
+        """Test that a wave of users makes one request per connection"""
+        send_get_request, requests = make_upstream(
+            {
+                "http://a/v1/models": {"data": [{"id": "gpt"}]},
+                "http://b/v1/models": {"data": [{"id": "llama"}]},
+                "http://c/api/tags": {"models": [{"model": "qwen", "name": "qwen"}]},
+            }
+        )
+        cache = UpstreamCache(ttl=60)
+        for module in (openai, ollama):
+            monkeypatch.setattr(module, "send_get_request", send_get_request)
+            monkeypatch.setattr(module, "MODEL_LIST_CACHE", cache)
+
+        request = make_request(
+            ENABLE_OPENAI_API=True,
+            OPENAI_API_BASE_URLS=["http://a/v1", "http://b/v1"],
+            OPENAI_API_KEYS=["key-a", "key-b"],
+            OPENAI_API_CONFIGS={"1": {"prefix_id": "b"}},
+        )
+        users = [SimpleNamespace(id=f"user-{i}") for i in range(200)]
+        results = await asyncio.gather(
+            *(openai.get_all_models_responses(request, user) for user in users)
+        )
+        assert sorted(requests) == ["http://a/v1/models", "http://b/v1/models"]
+        # The prefix is applied to a copy, once per request
+        assert all(r[1]["data"][0]["id"] == "b.llama" for r in results)
+
+        for user in users[:10]:
+            ollama_models = await ollama.get_model_list("http://c/api/tags", user=user)
+        assert requests.count("http://c/api/tags") == 1
+        assert ollama_models["models"][0]["model"] == "qwen"
+
+    @pytest.mark.asyncio
+    async def test_stale_lists_are_served_while_refreshed(self):
+        """Test that expired and failing upstreams are served from the stale copy"""
+        responses = {"http://a/v1/models": {"data": [{"id": "gpt-1"}]}}
+        send_get_request, requests = make_upstream(responses)
+        cache = UpstreamCache(ttl=0.05, stale_ttl=60)
+
+        def get():
+            return cache.get("a", lambda: send_get_request("http://a/v1/models", "key"))
+
+        assert (await get())["data"][0]["id"] == "gpt-1"
+
+        # The upstream times out: the stale copy is served without waiting
+        responses["http://a/v1/models"] = asyncio.TimeoutError()
+        await asyncio.sleep(0.06)
+        assert (await get())["data"][0]["id"] == "gpt-1"
+        await asyncio.sleep(0.02)
+        assert (await get())["data"][0]["id"] == "gpt-1"
+        assert len(requests) == 2
+
+        # The upstream recovers and is picked up in the background
+        responses["http://a/v1/models"] = {"data": [{"id": "gpt-2"}]}
+        await asyncio.sleep(0.06)
+        assert (await get())["data"][0]["id"] == "gpt-1"
+        await asyncio.sleep(0.02)
+        assert (await get())["data"][0]["id"] == "gpt-2"
+
+    @pytest.mark.asyncio
+    async def test_lists_are_shared_between_workers(self):
+        """Test that workers read the lists fetched by another through Redis"""
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        send_get_request, requests = make_upstream(
+            {"http://a/v1/models": {"data": [{"id": "gpt"}]}}
+        )
+
+        caches = [UpstreamCache(ttl=60), UpstreamCache(ttl=60)]
+        for cache in caches:
+            cache.start(
+                redis=fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+            )
+
+        for cache in caches:
+            response = await cache.get(
+                "a", lambda: send_get_request("http://a/v1/models")
+            )
+            assert response == {"data": [{"id": "gpt"}]}
+        assert len(requests) == 1
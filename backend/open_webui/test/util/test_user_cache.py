@@ -0,0 +1,187 @@
+import base64
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import BackgroundTasks, Response
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.requests import Request
+
+from open_webui.models import users as users_module
+from open_webui.models.users import LastActiveWriter, User, UserCache, Users
+from open_webui.test.util.helpers import QueryCounter, add_user, wait_for
+from open_webui.utils.auth import create_token, get_current_user
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = UserCache(ttl=30)
+    monkeypatch.setattr(users_module, "USER_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    writer = LastActiveWriter(Users.update_last_active_by_ids, interval=5)
+    monkeypatch.setattr("open_webui.utils.auth.LAST_ACTIVE_WRITER", writer)
+    return writer
+
+
+def make_request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [],
+            "app": SimpleNamespace(state=SimpleNamespace(redis=None)),
+        }
+    )
+
+
+async def authenticate(token: str):
+    return await get_current_user(
+        make_request(),
+        Response(),
+        BackgroundTasks(),
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=token),
+    )
+
+
+def wait_for_listeners(redis, count: int):
+    # Listeners drop the local cache once subscribed, let them settle first
+    assert wait_for(lambda: redis.pubsub_numsub("test:users:__evict__")[0][1] == count)
+    time.sleep(0.05)
+
+
+class TestUserCache:
+    """Test the cache of authenticated users and the last active writer"""
+
+    @pytest.mark.asyncio
+    async def test_cached_until_updated(self, db, cache, writer):
+        """Test that users are read once, and again after an update"""
+        add_user(db, "user-1")
+        db.commit()
+        token = create_token({"id": "user-1"})
+
+        with QueryCounter(db.get_bind()) as counter:
+            for _ in range(10):
+                user = await authenticate(token)
+        assert user.role == "admin"
+        assert counter.count == 1
+
+        Users.update_user_role_by_id("user-1", "user")
+        assert (await authenticate(token)).role == "user"
+
+        Users.delete_user_by_id("user-1")
+        with pytest.raises(Exception):
+            await authenticate(token)
+
+    def test_last_active_writes_are_batched(self, db, writer):
+        """Test that activity of many users is written with one UPDATE"""
+        for i in range(5):
+            add_user(db, f"user-{i}", last_active_at=0)
+        db.commit()
+        for _ in range(3):
+            for i in range(5):
+                writer.touch(f"user-{i}")
+
+        with QueryCounter(db.get_bind()) as counter:
+            writer.flush()
+            writer.flush()
+        assert counter.count == 1
+
+        db.expire_all()
+        assert all(user.last_active_at > 0 for user in db.query(User).all())
+
+    def test_evictions_reach_other_workers(self, db):
+        """Test that an update on one worker drops the copy cached by another"""
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        add_user(db, "user-1")
+
+        with patch(
+            "open_webui.models.users.get_redis_connection",
+            side_effect=lambda *args, **kwargs: fakeredis.FakeRedis(
+                server=server, decode_responses=True
+            ),
+        ):
+            caches = [UserCache(ttl=30), UserCache(ttl=30)]
+            for cache in caches:
+                cache.connect(redis_url="redis://localhost", redis_key_prefix="test")
+        wait_for_listeners(fakeredis.FakeRedis(server=server), len(caches))
+
+        loads = []
+
+        def loader(id):
+            loads.append(id)
+            return Users.get_user_by_id(id)
+
+        assert caches[0].get("user-1", loader).name == "user-1"
+        # Shared through Redis
+        assert caches[1].get("user-1", loader).name == "user-1"
+        assert loads == ["user-1"]
+
+        Users.update_user_by_id("user-1", {"name": "renamed"})
+        caches[0].evict("user-1")
+        assert wait_for(lambda: caches[1].get("user-1", loader).name == "renamed")
+
+    def test_user_read_before_eviction_is_not_shared(self, db):
+        """Test that a stale read racing with an eviction isn't written to Redis"""
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        add_user(db, "user-1")
+        db.commit()
+
+        with patch(
+            "open_webui.models.users.get_redis_connection",
+            side_effect=lambda *args, **kwargs: fakeredis.FakeRedis(
+                server=server, decode_responses=True
+            ),
+        ):
+            caches = [UserCache(ttl=30), UserCache(ttl=30), UserCache(ttl=30)]
+            for cache in caches:
+                cache.connect(redis_url="redis://localhost", redis_key_prefix="test")
+        wait_for_listeners(fakeredis.FakeRedis(server=server), len(caches))
+
+        def stale_loader(id):
+            # Read before another worker demotes the user and evicts it
+            user = Users.get_user_by_id(id)
+            Users.update_user_by_id(id, {"role": "user"})
+            caches[1].evict(id)
+            return user
+
+        assert caches[0].get("user-1", stale_loader).role == "admin"
+        assert caches[2].get("user-1", Users.get_user_by_id).role == "user"
+        # The local copy is dropped once the eviction message arrives
+        assert wait_for(
+            lambda: caches[0].get("user-1", Users.get_user_by_id).role == "user"
+        )
+
+    @pytest.mark.asyncio
+    async def test_authentication_overhead(self, db, cache, writer):
+        """Test the per-request queries of authentication, uncached vs cached"""
+        add_user(db, "user-1")
+        image = (
+            "data:image/png;base64," + base64.b64encode(os.urandom(150_000)).decode()
+        )
+        Users.update_user_profile_image_url_by_id("user-1", image)
+        token = create_token({"id": "user-1"})
+        requests = 1000
+
+        async def uncached(token):
+            # As before: a full row read and a last active UPDATE per request
+            user = Users.get_user_by_id("user-1")
+            Users.update_last_active_by_id(user.id)
+            return user
+
+        counts = {}
+        for name, auth in (("uncached", uncached), ("cached", authenticate)):
+            with QueryCounter(db.get_bind()) as counter:
+                for _ in range(requests):
+                    await auth(token)
+                writer.flush()
+            counts[name] = counter.count
+
+        assert counts["cached"] <= 2
+        assert counts["uncached"] >= 2 * requests
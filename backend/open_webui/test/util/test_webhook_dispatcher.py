@@ -0,0 +1,205 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from open_webui.models.channels import ChannelMember
+from open_webui.models.users import User
+from open_webui.routers import channels as channels_router
+from open_webui.utils.webhook import WebhookDispatcher
+from open_webui.test.util.helpers import QueryCounter
+
+
+@pytest_asyncio.fixture
+async def server(monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    received = []
+    failures = {}
+
+    async def handle(request):
+        received.append((request.path, await request.json()))
+        await asyncio.sleep(float(request.query.get("delay", 0)))
+        if failures.get(request.path, 0) > 0:
+            failures[request.path] -= 1
+            return web.Response(status=503)
+        return web.Response(status=int(request.query.get("status", 200)))
+
+    app = web.Application()
+    app.router.add_post("/{name}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield SimpleNamespace(
+        url=f"http://127.0.0.1:{port}", received=received, failures=failures
+    )
+    await runner.cleanup()
+
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+
+    async def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    async def blpop(self, key, timeout=0):
+        for _ in range(int(timeout * 100) or 1):
+            if self.lists.get(key):
+                return key, self.lists[key].pop(0)
+            await asyncio.sleep(0.01)
+        return None
+
+
+def job(url):
+    return {"name": "Open WebUI", "url": url, "message": "hi", "event_data": {}}
+
+
+async def wait_for(condition, timeout=5):
+    start = time.perf_counter()
+    while not condition():
+        assert time.perf_counter() - start < timeout
+        await asyncio.sleep(0.01)
+
+
+class TestWebhookDispatcher:
+    """Test concurrent webhook delivery"""
+
+    @pytest.mark.asyncio
+    async def test_retries_and_failures(self, server):
+        """Test that 5xx responses are retried and 4xx responses are not"""
+        dispatcher = WebhookDispatcher(max_retries=2, retry_backoff=0.01)
+        server.failures["/flaky"] = 2
+
+        assert await dispatcher.post("Open WebUI", f"{server.url}/flaky", "hi", {})
+        assert not await dispatcher.post(
+            "Open WebUI", f"{server.url}/bad?status=400", "hi", {}
+        )
+
+        timed = WebhookDispatcher(timeout=0.05, max_retries=1, retry_backoff=0.01)
+        assert not await timed.post("Open WebUI", f"{server.url}/slow?delay=1", "", {})
+        assert (timed.failed_count, timed.retry_count) == (1, 1)
+
+        paths = [path for path, _ in server.received]
+        assert paths.count("/flaky") == 3
+        assert paths.count("/bad") == 1
+        assert (dispatcher.sent_count, dispatcher.retry_count) == (1, 2)
+        assert dispatcher.failed_count == 1
+        assert dispatcher.duration_ms > 0
+
+        await dispatcher.close()
+        await timed.close()
+
+    @pytest.mark.asyncio
+    async def test_submit_is_concurrent_and_bounded(self, server):
+        """Benchmark: submit returns at once and deliveries overlap up to the limit"""
+        dispatcher = WebhookDispatcher(max_concurrency=10)
+        jobs = [job(f"{server.url}/hook-{i}?delay=0.1") for i in range(50)]
+
+        start = time.perf_counter()
+        await dispatcher.submit(jobs)
+        assert time.perf_counter() - start < 0.1
+        assert dispatcher.pending_count == 50
+
+        await wait_for(lambda: dispatcher.sent_count == 50)
+        elapsed = time.perf_counter() - start
+
+        # 5 rounds of 10 concurrent deliveries
+        assert 0.5 <= elapsed < 2.5
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_redis_queue(self, server):
+        """Test that queued jobs are picked up by the Redis consumer"""
+        redis = FakeRedis()
+        dispatcher = WebhookDispatcher(max_concurrency=2, redis_key="webhooks")
+        dispatcher.start(redis=redis)
+
+        await dispatcher.submit([job(f"{server.url}/queued-{i}") for i in range(5)])
+        await wait_for(lambda: dispatcher.sent_count == 5)
+
+        assert redis.lists["webhooks"] == []
+        assert sorted(path for path, _ in server.received) == [
+            f"/queued-{i}" for i in range(5)
+        ]
+        await dispatcher.close()
+
+
+def add_member(db, id, channel_id, role="user", webhook_url=None):
+    db.add(
+        User(
+            id=id,
+            name=id,
+            email=f"{id}@example.com",
+            role=role,
+            profile_image_url="",
+            settings={"ui": {"notifications": {"webhook_url": webhook_url}}},
+            last_active_at=0,
+            created_at=0,
+            updated_at=0,
+        )
+    )
+    if channel_id:
+        db.add(
+            ChannelMember(
+                id=f"{channel_id}-{id}",
+                channel_id=channel_id,
+                user_id=id,
+                created_at=0,
+                updated_at=0,
+            )
+        )
+
+
+class TestSendNotification:
+    """Test the recipients of channel notifications"""
+
+    @pytest.mark.asyncio
+    async def test_recipients(self, db, monkeypatch):
+        """Test that members with access get a webhook from a single query"""
+        submitted = []
+
+        async def submit(jobs):
+            submitted.extend(jobs)
+
+        monkeypatch.setattr(channels_router.WEBHOOK_DISPATCHER, "submit", submit)
+
+        async def notify(access_control):
+            submitted.clear()
+            channel = SimpleNamespace(
+                id="c", name="general", access_control=access_control
+            )
+            message = SimpleNamespace(content="hello")
+            with QueryCounter(db.get_bind()) as counter:
+                await channels_router.send_notification(
+                    "Open WebUI", "http://webui", channel, message, ["active"], db=db
+                )
+            return sorted(job["url"] for job in submitted), counter.count
+
+        add_member(db, "active", "c", webhook_url="http://active")
+        add_member(db, "pending", "c", role="pending", webhook_url="http://pending")
+        add_member(db, "outsider", None, webhook_url="http://outsider")
+        add_member(db, "no-hook", "c")
+        for i in range(3):
+            add_member(db, f"member-{i}", "c", webhook_url=f"http://member-{i}")
+        db.commit()
+
+        urls, small = await notify(None)
+        assert urls == ["http://member-0", "http://member-1", "http://member-2"]
+        assert submitted[0]["event_data"]["url"] == "http://webui/channels/c"
+
+        urls, _ = await notify({"read": {"user_ids": ["member-1"], "group_ids": []}})
+        assert urls == ["http://member-1"]
+
+        for i in range(3, 100):
+            add_member(db, f"member-{i}", "c", webhook_url=f"http://member-{i}")
+        db.commit()
+
+        urls, large = await notify(None)
+        assert len(urls) == 100
+        assert large == small == 1
@@ -1,10 +1,19 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, Set, Union, List, Dict, Any
+
 from open_webui.models.users import Users, UserModel
 from open_webui.models.groups import Groups
 
 
 from open_webui.config import DEFAULT_USER_PERMISSIONS
-import json
+from open_webui.env import USER_CACHE_MAX_SIZE, USER_PERMISSIONS_CACHE_TTL
+from open_webui.utils.redis import get_redis_connection
+
+log = logging.getLogger(__name__)
 
 
 def fill_missing_permissions(
@@ -25,6 +34,193 @@ def fill_missing_permissions(
     return permissions
 
 
+def combine_permissions(
+    permissions: Dict[str, Any], group_permissions: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Combine permissions from multiple groups by taking the most permissive value."""
+    for key, value in group_permissions.items():
+        if isinstance(value, dict):
+            if key not in permissions:
+                permissions[key] = {}
+            permissions[key] = combine_permissions(permissions[key], value)
+        else:
+            if key not in permissions:
+                permissions[key] = value
+            else:
+                permissions[key] = (
+                    permissions[key] or value
+                )  # Use the most permissive value (True > False)
+    return permissions
+
+
+class EffectivePermissions:
+    """
+    Permissions of a user, compiled from the default permissions and the
+    permissions of all groups the user is a member of. If a permission is
+    defined in multiple places, the most permissive value is used.
+    """
+
+    def __init__(
+        self,
+        default_permissions: Dict[str, Any],
+        group_permissions: List[Dict[str, Any]],
+    ):
+        self.default_permissions = default_permissions
+
+        # Deep copy default permissions to avoid modifying the original dicts
+        permissions = json.loads(
+            json.dumps(
+                fill_missing_permissions(
+                    json.loads(json.dumps(default_permissions)),
+                    DEFAULT_USER_PERMISSIONS,
+                )
+            )
+        )
+        for permissions_ in group_permissions:
+            permissions = combine_permissions(permissions, permissions_ or {})
+        self.permissions = permissions
+
+        # Every dotted key of the tree, e.g. "features.web_search"
+        self._keys: Dict[str, bool] = {}
+        self._flatten(permissions)
+
+    def _flatten(self, permissions: Dict[str, Any], prefix: str = ""):
+        for key, value in permissions.items():
+            self._keys[f"{prefix}{key}"] = bool(value)
+            if isinstance(value, dict):
+                self._flatten(value, f"{prefix}{key}.")
+
+    def has(self, permission_key: str) -> bool:
+        return self._keys.get(permission_key, False)
+
+
+class PermissionCache:
+    """
+    Per-process cache of the effective permissions of users.
+
+    Entries are compiled with the default permissions they are requested with
+    and recompiled when those change. Groups evict the users whose memberships
+    or group permissions change; with Redis connected, evictions are published
+    so the other workers drop their entries too. Entries expire after `ttl`
+    seconds regardless.
+    """
+
+    # Evicts the permissions of every user
+    ALL = "*"
+
+    def __init__(self, ttl: float = 300, max_size: int = 1000):
+        self._ttl = ttl
+        self._max_size = max_size
+
+        self._permissions: OrderedDict[str, tuple[float, EffectivePermissions]] = (
+            OrderedDict()
+        )
+        self._version = 0
+        self._lock = threading.Lock()
+
+        self._redis = None
+        self._redis_key_prefix = "open-webui"
+
+    def connect(
+        self,
+        redis_url: Optional[str] = None,
+        redis_sentinels: Optional[list] = [],
+        redis_cluster: Optional[bool] = False,
+        redis_key_prefix: str = "open-webui",
+    ):
+        if not redis_url or self._ttl <= 0 or self._redis is not None:
+            return
+
+        self._redis_key_prefix = redis_key_prefix
+        self._redis = get_redis_connection(
+            redis_url, redis_sentinels, redis_cluster, decode_responses=True
+        )
+        threading.Thread(target=self._listen, daemon=True).start()
+
+    @property
+    def _channel(self) -> str:
+        return f"{self._redis_key_prefix}:permissions:__evict__"
+
+    def get(
+        self,
+        user_id: str,
+        default_permissions: Dict[str, Any],
+        db: Optional[Any] = None,
+    ) -> EffectivePermissions:
+        """Return the permissions of the user, compiled on first use."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._permissions.get(user_id)
+            if entry is not None and entry[0] > now:
+                permissions = entry[1]
+                if (
+                    permissions.default_permissions is default_permissions
+                    or permissions.default_permissions == default_permissions
+                ):
+                    self._permissions.move_to_end(user_id)
+                    return permissions
+            version = self._version
+
+        user_groups = Groups.get_groups_by_member_id(user_id, db=db)
+        permissions = EffectivePermissions(
+            default_permissions, [group.permissions for group in user_groups]
+        )
+
+        with self._lock:
+            # Don't cache permissions compiled from groups since changed
+            if self._ttl > 0 and self._version == version:
+                self._permissions[user_id] = (now + self._ttl, permissions)
+                self._permissions.move_to_end(user_id)
+                while len(self._permissions) > self._max_size:
+                    self._permissions.popitem(last=False)
+
+        return permissions
+
+    def _evict_local(self, user_ids: Optional[List[str]] = None):
+        with self._lock:
+            if user_ids is None:
+                self._permissions.clear()
+            else:
+                for user_id in user_ids:
+                    self._permissions.pop(user_id, None)
+            self._version += 1
+
+    def evict(self, user_ids: Optional[List[str]] = None):
+        """Evict the permissions of the users, or of every user if None."""
+        self._evict_local(user_ids)
+
+        if self._redis is not None:
+            try:
+                pipe = self._redis.pipeline()
+                for user_id in [self.ALL] if user_ids is None else user_ids:
+                    pipe.publish(self._channel, user_id)
+                pipe.execute()
+            except Exception as e:
+                log.error(f"Error publishing permission evictions: {e}")
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+
+                # Evictions may have been missed while (re)connecting
+                self._evict_local()
+
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        user_id = message["data"]
+                        self._evict_local(None if user_id == self.ALL else [user_id])
+            except Exception as e:
+                log.error(f"Error in permission cache eviction listener: {e}")
+                time.sleep(1)
+
+
+PERMISSION_CACHE = PermissionCache(
+    ttl=USER_PERMISSIONS_CACHE_TTL, max_size=USER_CACHE_MAX_SIZE
+)
+
+
 def get_permissions(
     user_id: str,
     default_permissions: Dict[str, Any],
@@ -35,38 +231,10 @@ def get_permissions(
     If a permission is defined in multiple groups, the most permissive value is used (True > False).
     Permissions are nested in a dict with the permission key as the key and a boolean as the value.
     """
+    permissions = PERMISSION_CACHE.get(user_id, default_permissions, db=db)
 
-    def combine_permissions(
-        permissions: Dict[str, Any], group_permissions: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Combine permissions from multiple groups by taking the most permissive value."""
-        for key, value in group_permissions.items():
-            if isinstance(value, dict):
-                if key not in permissions:
-                    permissions[key] = {}
-                permissions[key] = combine_permissions(permissions[key], value)
-            else:
-                if key not in permissions:
-                    permissions[key] = value
-                else:
-                    permissions[key] = (
-                        permissions[key] or value
-                    )  # Use the most permissive value (True > False)
-        return permissions
-
-    user_groups = Groups.get_groups_by_member_id(user_id, db=db)
-
-    # Deep copy default permissions to avoid modifying the original dict
-    permissions = json.loads(json.dumps(default_permissions))
-
-    # Combine permissions from all user groups
-    for group in user_groups:
-        permissions = combine_permissions(permissions, group.permissions or {})
-
-    # Ensure all fields from default_permissions are present and filled in
-    permissions = fill_missing_permissions(permissions, default_permissions)
-
-    return permissions
+    # Copy, the compiled permissions are shared between requests
+    return json.loads(json.dumps(permissions.permissions))
 
 
 def has_permission(
@@ -81,30 +249,7 @@ def has_permission(
 
     Permission keys can be hierarchical and separated by dots ('.').
     """
-
-    def get_permission(permissions: Dict[str, Any], keys: List[str]) -> bool:
-        """Traverse permissions dict using a list of keys (from dot-split permission_key)."""
-        for key in keys:
-            if key not in permissions:
-                return False  # If any part of the hierarchy is missing, deny access
-            permissions = permissions[key]  # Traverse one level deeper
-
-        return bool(permissions)  # Return the boolean at the final level
-
-    permission_hierarchy = permission_key.split(".")
-
-    # Retrieve user group permissions
-    user_groups = Groups.get_groups_by_member_id(user_id, db=db)
-
-    for group in user_groups:
-        if get_permission(group.permissions or {}, permission_hierarchy):
-            return True
-
-    # Check default permissions afterward if the group permissions don't allow it
-    default_permissions = fill_missing_permissions(
-        default_permissions, DEFAULT_USER_PERMISSIONS
-    )
-    return get_permission(default_permissions, permission_hierarchy)
+    return PERMISSION_CACHE.get(user_id, default_permissions, db=db).has(permission_key)
 
 
 def get_permitted_group_and_user_ids(
@@ -153,25 +298,59 @@ def has_access(
     )
 
 
-# Get all users with access to a resource
-def get_users_with_access(
-    type: str = "write", access_control: Optional[dict] = None, db: Optional[Any] = None
-) -> list[UserModel]:
-    if access_control is None:
-        result = Users.get_users(filter={"roles": ["!pending"]}, db=db)
-        return result.get("users", [])
+# Users with access to a resource, queried in SQL rather than materialized
+def get_access_filter(
+    type: str = "write", access_control: Optional[dict] = None
+) -> dict:
+    """
+    Returns the Users.get_users filter matching the (non-pending) users with
+    access to a resource. Every user has access to a public resource.
+    """
+    filter = {"roles": ["!pending"]}
 
     permitted_ids = get_permitted_group_and_user_ids(type, access_control)
-    if permitted_ids is None:
-        return []
+    if permitted_ids is not None:
+        filter["access"] = permitted_ids
 
-    permitted_group_ids = permitted_ids.get("group_ids", [])
-    permitted_user_ids = permitted_ids.get("user_ids", [])
+    return filter
+
+
+def get_user_count_with_access(
+    type: str = "write", access_control: Optional[dict] = None, db: Optional[Any] = None
+) -> int:
+    return Users.get_num_users_by_filter(
+        filter=get_access_filter(type, access_control), db=db
+    )
 
-    user_ids_with_access = set(permitted_user_ids)
 
-    group_user_ids_map = Groups.get_group_user_ids_by_ids(permitted_group_ids, db=db)
-    for user_ids in group_user_ids_map.values():
-        user_ids_with_access.update(user_ids)
+def get_user_ids_with_access(
+    type: str = "write", access_control: Optional[dict] = None, db: Optional[Any] = None
+) -> Optional[set[str]]:
+    """
+    Returns the ids of the users granted access, or None if the resource is
+    public and every (non-pending) user has access.
+    """
+    if access_control is None:
+        return None
 
-    return Users.get_users_by_user_ids(list(user_ids_with_access), db=db)
+    return set(
+        Users.get_user_ids_by_filter(
+            filter=get_access_filter(type, access_control), db=db
+        )
+    )
+
+
+def get_users_with_access(
+    type: str = "write",
+    access_control: Optional[dict] = None,
+    skip: Optional[int] = None,
+    limit: Optional[int] = None,
+    db: Optional[Any] = None,
+) -> list[UserModel]:
+    result = Users.get_users(
+        filter=get_access_filter(type, access_control),
+        skip=skip,
+        limit=limit,
+        db=db,
+    )
+    return result.get("users", [])
@@ -23,7 +23,7 @@ from opentelemetry import trace
 
 
 from open_webui.utils.access_control import has_permission
-from open_webui.models.users import Users
+from open_webui.models.users import LAST_ACTIVE_WRITER, Users
 from open_webui.models.auths import Auths
 
 
@@ -324,7 +324,7 @@ async def get_current_user(
                     detail="Invalid token",
                 )
 
-            user = Users.get_user_by_id(data["id"])
+            user = Users.get_user_by_id_cached(data["id"])
             if user is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -349,10 +349,10 @@ async def get_current_user(
                     current_span.set_attribute("client.user.role", user.role)
                     current_span.set_attribute("client.auth.type", "jwt")
 
-                # Refresh the user's last active timestamp asynchronously
-                # to prevent blocking the request
+                # Refresh the user's last active timestamp, written in batches
+                # to prevent an UPDATE per request
                 if background_tasks:
-                    background_tasks.add_task(Users.update_last_active_by_id, user.id)
+                    LAST_ACTIVE_WRITER.touch(user.id)
             return user
         else:
             raise HTTPException(
@@ -404,7 +404,7 @@ def get_current_user_by_api_key(request, api_key: str):
         current_span.set_attribute("client.user.role", user.role)
         current_span.set_attribute("client.auth.type", "api_key")
 
-    Users.update_last_active_by_id(user.id)
+    LAST_ACTIVE_WRITER.touch(user.id)
     return user
 
 
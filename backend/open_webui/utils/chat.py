@@ -43,6 +43,8 @@ from open_webui.models.models import Models
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
+    apply_function_valves,
+    get_user_valves,
 )
 from open_webui.utils.models import get_all_models, check_model_access
 from open_webui.utils.payload import convert_payload_openai_to_ollama
@@ -404,11 +406,11 @@ async def chat_action(request: Request, action_id: str, form_data: dict, user: A
         }
     )
 
-    function_module, _, _ = get_function_module_from_cache(request, action_id)
-
-    if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-        valves = Functions.get_function_valves_by_id(action_id)
-        function_module.valves = function_module.Valves(**(valves if valves else {}))
+    version = Functions.get_function_versions_by_ids([action_id]).get(action_id)
+    function_module, _, _ = get_function_module_from_cache(
+        request, action_id, version=version
+    )
+    apply_function_valves(request, action_id, function_module, version=version)
 
     if hasattr(function_module, "action"):
         try:
@@ -438,9 +440,7 @@ async def chat_action(request: Request, action_id: str, form_data: dict, user: A
                 try:
                     if hasattr(function_module, "UserValves"):
                         __user__["valves"] = function_module.UserValves(
-                            **Functions.get_user_valves_by_id_and_user_id(
-                                action_id, user.id
-                            )
+                            **get_user_valves(user, "functions", action_id)
                         )
                 except Exception as e:
                     log.exception(f"Failed to get user values: {e}")
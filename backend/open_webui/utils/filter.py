@@ -4,41 +4,43 @@ import logging
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
+    apply_function_valves,
+    get_user_valves,
 )
 from open_webui.models.functions import Functions
 
 log = logging.getLogger(__name__)
 
 
-def get_function_module(request, function_id, load_from_db=True):
+def get_function_module(request, function_id, load_from_db=True, version=None):
     """
     Get the function module by its ID.
     """
     function_module, _, _ = get_function_module_from_cache(
-        request, function_id, load_from_db
+        request, function_id, load_from_db, version=version
     )
     return function_module
 
 
 def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
     def get_priority(function_id):
-        function = Functions.get_function_by_id(function_id)
-        if function is not None:
-            valves = Functions.get_function_valves_by_id(function_id)
-            return valves.get("priority", 0) if valves else 0
-        return 0
+        valves = Functions.get_function_valves_by_id(function_id)
+        return valves.get("priority", 0) if valves else 0
 
     filter_ids = [function.id for function in Functions.get_global_filter_functions()]
     if "info" in model and "meta" in model["info"]:
         filter_ids.extend(model["info"]["meta"].get("filterIds", []))
         filter_ids = list(set(filter_ids))
-    active_filter_ids = [
-        function.id
+    active_filter_versions = {
+        function.id: function.updated_at
         for function in Functions.get_functions_by_type("filter", active_only=True)
-    ]
+    }
+    active_filter_ids = list(active_filter_versions.keys())
 
     def get_active_status(filter_id):
-        function_module = get_function_module(request, filter_id)
+        function_module = get_function_module(
+            request, filter_id, version=active_filter_versions[filter_id]
+        )
 
         if getattr(function_module, "toggle", None):
             return filter_id in (enabled_filter_ids or [])
@@ -60,14 +62,28 @@ async def process_filter_functions(
 ):
     skip_files = None
 
+    # Check the versions of all filters in one query, streamed events use the
+    # cached modules as they are
+    load_from_db = filter_type != "stream"
+    versions = (
+        Functions.get_function_versions_by_ids(
+            [function.id for function in filter_functions if function]
+        )
+        if load_from_db
+        else {}
+    )
+
     for function in filter_functions:
         filter = function
-        filter_id = function.id
         if not filter:
             continue
+        filter_id = function.id
 
         function_module = get_function_module(
-            request, filter_id, load_from_db=(filter_type != "stream")
+            request,
+            filter_id,
+            load_from_db=load_from_db,
+            version=versions.get(filter_id),
         )
         # Prepare handler function
         handler = getattr(function_module, filter_type, None)
@@ -79,11 +95,13 @@ async def process_filter_functions(
             skip_files = function_module.file_handler
 
         # Apply valves to the function
-        if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-            valves = Functions.get_function_valves_by_id(filter_id)
-            function_module.valves = function_module.Valves(
-                **(valves if valves else {})
-            )
+        apply_function_valves(
+            request,
+            filter_id,
+            function_module,
+            version=versions.get(filter_id),
+            load_from_db=load_from_db,
+        )
 
         try:
             # Prepare parameters
@@ -106,11 +124,15 @@ async def process_filter_functions(
             if "__user__" in sig.parameters:
                 if hasattr(function_module, "UserValves"):
                     try:
-                        params["__user__"]["valves"] = function_module.UserValves(
-                            **Functions.get_user_valves_by_id_and_user_id(
-                                filter_id, params["__user__"]["id"]
-                            )
-                        )
+                        # Copied so each filter only sees its own user valves
+                        params["__user__"] = {
+                            **params["__user__"],
+                            "valves": function_module.UserValves(
+                                **get_user_valves(
+                                    params["__user__"], "functions", filter_id
+                                )
+                            ),
+                        }
                     except Exception as e:
                         log.exception(f"Failed to get user values: {e}")
 
@@ -5,6 +5,7 @@ from contextlib import AsyncExitStack
 import anyio
 
 from mcp import ClientSession
+from mcp.client.session import MessageHandlerFnT
 from mcp.client.auth import OAuthClientProvider, TokenStorage
 from mcp.client.streamable_http import streamablehttp_client
 from mcp.shared.auth import OAuthClientInformationFull, OAuthClientMetadata, OAuthToken
@@ -15,7 +16,12 @@ class MCPClient:
         self.session: Optional[ClientSession] = None
         self.exit_stack = None
 
-    async def connect(self, url: str, headers: Optional[dict] = None):
+    async def connect(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        message_handler: Optional[MessageHandlerFnT] = None,
+    ):
         async with AsyncExitStack() as exit_stack:
             try:
                 self._streams_context = streamablehttp_client(url, headers=headers)
@@ -24,7 +30,7 @@ class MCPClient:
                 read_stream, write_stream, _ = transport
 
                 self._session_context = ClientSession(
-                    read_stream, write_stream
+                    read_stream, write_stream, message_handler=message_handler
                 )  # pylint: disable=W0201
 
                 self.session = await exit_stack.enter_async_context(
@@ -60,6 +66,9 @@ class MCPClient:
 
         return tool_specs
 
+    async def get_tool_specs(self) -> Optional[dict]:
+        return await self.list_tool_specs()
+
     async def call_tool(
         self, function_name: str, function_args: dict
     ) -> Optional[dict]:
@@ -104,7 +113,8 @@ class MCPClient:
 
     async def disconnect(self):
         # Clean up and close the session
-        await self.exit_stack.aclose()
+        if self.exit_stack:
+            await self.exit_stack.aclose()
 
     async def __aenter__(self):
         await self.exit_stack.__aenter__()
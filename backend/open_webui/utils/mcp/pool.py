@@ -0,0 +1,230 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Optional
+
+import anyio
+from mcp import types
+
+from open_webui.env import (
+    MCP_SESSION_POOL_IDLE_TIMEOUT,
+    MCP_SESSION_POOL_KEEPALIVE_INTERVAL,
+)
+from open_webui.utils.mcp.client import MCPClient
+
+log = logging.getLogger(__name__)
+
+
+class PooledMCPClient(MCPClient):
+    """
+    MCP client whose session is owned by a background task, so it can outlive
+    the request that opened it. The tool specs are cached until the server
+    sends `notifications/tools/list_changed`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.tool_specs: Optional[list[dict]] = None
+        self.refs = 0
+        self.last_used_at = time.monotonic()
+        self.last_checked_at = time.monotonic()
+
+        self._tool_specs_version = 0
+        self._closing: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def connected(self) -> bool:
+        return (
+            self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def start(self, url: str, headers: Optional[dict] = None):
+        ready = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._run(url, headers, ready))
+        try:
+            await ready
+        except BaseException:
+            self._closing.set()
+            raise
+
+    async def _run(self, url: str, headers: Optional[dict], ready: asyncio.Future):
+        # The transport's task group has to be entered and exited by the same task
+        try:
+            await self.connect(url, headers, message_handler=self._handle_message)
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            return
+
+        if not ready.done():
+            ready.set_result(None)
+
+        try:
+            await self._closing.wait()
+        finally:
+            self.session = None
+            try:
+                await self.disconnect()
+            except BaseException as e:
+                log.debug(f"Error closing MCP session: {e}")
+
+    async def _handle_message(self, message):
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            self._tool_specs_version += 1
+            self.tool_specs = None
+
+    async def get_tool_specs(self) -> list[dict]:
+        if self.tool_specs is None:
+            version = self._tool_specs_version
+            tool_specs = await self.list_tool_specs()
+            # Don't cache a list that changed while it was being fetched
+            if version == self._tool_specs_version:
+                self.tool_specs = tool_specs
+            return tool_specs
+        return self.tool_specs
+
+    async def ping(self, timeout: float = 10) -> bool:
+        try:
+            with anyio.fail_after(timeout):
+                await self.session.send_ping()
+            self.last_checked_at = time.monotonic()
+            return True
+        except Exception as e:
+            log.debug(f"MCP session ping failed: {e}")
+            return False
+
+    async def close(self):
+        if self._closing is not None:
+            self._closing.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPSessionPool:
+    """
+    Process-wide pool of connected MCP sessions.
+
+    Sessions are keyed by the server id and a hash of the url and request
+    headers, so each auth identity gets its own session. Sessions not used by
+    any request are pinged every `keepalive_interval` seconds, closed after
+    `idle_timeout` seconds and reopened when found disconnected. An
+    `idle_timeout` of 0 disables pooling.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = 300,
+        keepalive_interval: float = 60,
+        ping_timeout: float = 10,
+    ):
+        self._idle_timeout = idle_timeout
+        self._keepalive_interval = keepalive_interval
+        self._ping_timeout = ping_timeout
+
+        self._clients: dict[tuple[str, str], PooledMCPClient] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self._sweeper_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def get_key(
+        server_id: str, url: str, headers: Optional[dict] = None
+    ) -> tuple[str, str]:
+        identity = json.dumps({"url": url, "headers": headers or {}}, sort_keys=True)
+        return server_id, hashlib.sha256(identity.encode()).hexdigest()
+
+    async def acquire(
+        self, server_id: str, url: str, headers: Optional[dict] = None
+    ) -> MCPClient:
+        """
+        Return a connected client for the server, to be handed back with
+        `release` once the request is done.
+        """
+        if self._idle_timeout <= 0:
+            client = MCPClient()
+            await client.connect(url=url, headers=headers)
+            return client
+
+        key = self.get_key(server_id, url, headers)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            client = self._clients.get(key)
+            if client is not None and not await self._is_healthy(client):
+                log.info(f"Reconnecting MCP session for server {server_id}")
+                await self._evict(key, client)
+                client = None
+
+            if client is None:
+                client = PooledMCPClient()
+                await client.start(url, headers)
+                self._clients[key] = client
+
+            client.refs += 1
+            client.last_used_at = time.monotonic()
+
+        if self._sweeper_task is None or self._sweeper_task.done():
+            self._sweeper_task = asyncio.create_task(self._sweep())
+        return client
+
+    async def release(self, client: MCPClient):
+        if isinstance(client, PooledMCPClient):
+            client.refs = max(client.refs - 1, 0)
+            client.last_used_at = time.monotonic()
+        else:
+            await client.disconnect()
+
+    async def _is_healthy(self, client: PooledMCPClient) -> bool:
+        if not client.connected:
+            return False
+        # Only ping sessions that have not been checked recently
+        if time.monotonic() - client.last_checked_at >= self._keepalive_interval:
+            return await client.ping(self._ping_timeout)
+        return True
+
+    async def _evict(self, key: tuple[str, str], client: PooledMCPClient):
+        if self._clients.get(key) is client:
+            del self._clients[key]
+        await client.close()
+
+    async def _sweep(self):
+        while self._clients:
+            await asyncio.sleep(min(self._idle_timeout, self._keepalive_interval))
+
+            for key, client in list(self._clients.items()):
+                if client.refs > 0:
+                    continue
+
+                # Under the key's lock, acquire() can't hand the client out
+                # while its health check is awaited
+                async with self._locks.setdefault(key, asyncio.Lock()):
+                    if self._clients.get(key) is not client or client.refs > 0:
+                        continue
+
+                    if time.monotonic() - client.last_used_at >= self._idle_timeout:
+                        await self._evict(key, client)
+                    elif not await self._is_healthy(client):
+                        await self._evict(key, client)
+
+            for key in list(self._locks.keys()):
+                if key not in self._clients and not self._locks[key].locked():
+                    del self._locks[key]
+
+    async def close_all(self):
+        if self._sweeper_task is not None:
+            self._sweeper_task.cancel()
+            self._sweeper_task = None
+
+        for key, client in list(self._clients.items()):
+            await self._evict(key, client)
+
+
+MCP_SESSION_POOL = MCPSessionPool(
+    idle_timeout=MCP_SESSION_POOL_IDLE_TIMEOUT,
+    keepalive_interval=MCP_SESSION_POOL_KEEPALIVE_INTERVAL,
+)
@@ -1,12 +1,14 @@
 import hashlib
+import io
 import re
 import threading
 import time
 import uuid
 import logging
+import zipfile
 from datetime import timedelta
 from pathlib import Path
-from typing import Callable, Optional, Sequence, Union
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Union
 import json
 import aiohttp
 import mimeparse
@@ -353,6 +355,59 @@ def calculate_sha256_string(string):
     return hashed_string
 
 
+class ZipStreamBuffer(io.RawIOBase):
+    """Unseekable file that keeps what zipfile wrote until it is popped."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(
+    entries: Iterable[tuple[str, Iterable[bytes]]],
+    compression: int = zipfile.ZIP_DEFLATED,
+) -> Iterator[bytes]:
+    """
+    Write a ZIP archive of (name, chunks) entries while it is being sent, so
+    no more than one chunk and its compressed output are held in memory.
+
+    Entry sizes follow their data instead of preceding it, and repeated names
+    get a " (n)" suffix.
+    """
+    buffer = ZipStreamBuffer()
+    names = set()
+    with zipfile.ZipFile(buffer, "w", compression) as zf:
+        for name, chunks in entries:
+            stem, dot, extension = name.rpartition(".")
+            if not stem:
+                stem, dot, extension = name, "", ""
+            unique_name, n = name, 1
+            while unique_name in names:
+                unique_name = f"{stem} ({n}){dot}{extension}"
+                n += 1
+            names.add(unique_name)
+
+            with zf.open(unique_name, "w", force_zip64=True) as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    if data := buffer.pop():
+                        yield data
+            if data := buffer.pop():
+                yield data
+    yield buffer.pop()
+
+
 def validate_email_format(email: str) -> bool:
     if email.endswith("@localhost"):
         return True
@@ -134,18 +134,20 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
     global_action_ids = [
         function.id for function in Functions.get_global_action_functions()
     ]
-    enabled_action_ids = [
-        function.id
+    enabled_actions = {
+        function.id: function
         for function in Functions.get_functions_by_type("action", active_only=True)
-    ]
+    }
+    enabled_action_ids = list(enabled_actions.keys())
 
     global_filter_ids = [
         function.id for function in Functions.get_global_filter_functions()
     ]
-    enabled_filter_ids = [
-        function.id
+    enabled_filters = {
+        function.id: function
         for function in Functions.get_functions_by_type("filter", active_only=True)
-    ]
+    }
+    enabled_filter_ids = list(enabled_filters.keys())
 
     custom_models = Models.get_all_models()
     for custom_model in custom_models:
@@ -286,8 +288,10 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
             }
         ]
 
-    def get_function_module_by_id(function_id):
-        function_module, _, _ = get_function_module_from_cache(request, function_id)
+    def get_function_module_by_id(function_id, version=None):
+        function_module, _, _ = get_function_module_from_cache(
+            request, function_id, version=version
+        )
         return function_module
 
     for model in models:
@@ -304,22 +308,20 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
 
         model["actions"] = []
         for action_id in action_ids:
-            action_function = Functions.get_function_by_id(action_id)
-            if action_function is None:
-                raise Exception(f"Action not found: {action_id}")
-
-            function_module = get_function_module_by_id(action_id)
+            action_function = enabled_actions[action_id]
+            function_module = get_function_module_by_id(
+                action_id, version=action_function.updated_at
+            )
             model["actions"].extend(
                 get_action_items_from_module(action_function, function_module)
             )
 
         model["filters"] = []
         for filter_id in filter_ids:
-            filter_function = Functions.get_function_by_id(filter_id)
-            if filter_function is None:
-                raise Exception(f"Filter not found: {filter_id}")
-
-            function_module = get_function_module_by_id(filter_id)
+            filter_function = enabled_filters[filter_id]
+            function_module = get_function_module_by_id(
+                filter_id, version=filter_function.updated_at
+            )
 
             if getattr(function_module, "toggle", None):
                 model["filters"].extend(
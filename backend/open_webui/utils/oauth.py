@@ -71,6 +71,7 @@ from open_webui.env import (
     OAUTH_CLIENT_INFO_ENCRYPTION_KEY,
 )
 from open_webui.utils.misc import parse_duration
+from open_webui.utils.profile_images import is_same_profile_image
 from open_webui.utils.auth import get_password_hash, create_token
 from open_webui.utils.webhook import post_webhook
 from open_webui.utils.groups import apply_default_group_assignment
@@ -1552,7 +1553,9 @@ class OAuthManager:
                         processed_picture_url = await self._process_picture_url(
                             new_picture_url, token.get("access_token")
                         )
-                        if processed_picture_url != user.profile_image_url:
+                        if not is_same_profile_image(
+                            processed_picture_url, user.profile_image_url
+                        ):
                             Users.update_user_profile_image_url_by_id(
                                 user.id, processed_picture_url, db=db
                             )
@@ -5,7 +5,9 @@ import sys
 from importlib import util
 import types
 import tempfile
+import time
 import logging
+from typing import Callable, Optional
 
 from open_webui.env import PIP_OPTIONS, PIP_PACKAGE_INDEX_OPTIONS, OFFLINE_MODE
 from open_webui.models.functions import Functions
@@ -165,9 +167,42 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         os.unlink(temp_file.name)
 
 
-def get_tool_module_from_cache(request, tool_id, load_from_db=True):
+def is_version_current(cached: Optional[tuple], updated_at: Optional[int]) -> bool:
+    """
+    Check whether a cache entry `(updated_at, checked_at)` is still valid for
+    the row version `updated_at`.
+    """
+    if cached is None or updated_at is None:
+        return False
+
+    cached_updated_at, checked_at = cached
+    # updated_at has second resolution: a write in the same second as the last
+    # check would not change it, so only trust versions older than that check
+    return updated_at == cached_updated_at and cached_updated_at < checked_at
+
+
+def get_tool_module_from_cache(request, tool_id, load_from_db=True, version=None):
+    if not hasattr(request.app.state, "TOOLS"):
+        request.app.state.TOOLS = {}
+
+    if not hasattr(request.app.state, "TOOL_CONTENTS"):
+        request.app.state.TOOL_CONTENTS = {}
+
+    if not hasattr(request.app.state, "TOOL_VERSIONS"):
+        request.app.state.TOOL_VERSIONS = {}
+
     if load_from_db:
-        # Always load from the database by default
+        # Always check the database by default, comparing the row version
+        # (updated_at) first so the content is only read when it may have changed
+        if version is None:
+            version = Tools.get_tool_versions_by_ids([tool_id]).get(tool_id)
+
+        if tool_id in request.app.state.TOOLS and is_version_current(
+            request.app.state.TOOL_VERSIONS.get(tool_id), version
+        ):
+            return request.app.state.TOOLS[tool_id], None
+
+        checked_at = int(time.time())
         tool = Tools.get_tool_by_id(tool_id)
         if not tool:
             raise Exception(f"Tool not found: {tool_id}")
@@ -180,26 +215,22 @@ def get_tool_module_from_cache(request, tool_id, load_from_db=True):
             Tools.update_tool_by_id(tool_id, {"content": content})
 
         if (
-            hasattr(request.app.state, "TOOL_CONTENTS")
-            and tool_id in request.app.state.TOOL_CONTENTS
-        ) and (
-            hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS
+            tool_id in request.app.state.TOOL_CONTENTS
+            and tool_id in request.app.state.TOOLS
         ):
             if request.app.state.TOOL_CONTENTS[tool_id] == content:
+                request.app.state.TOOL_VERSIONS[tool_id] = (tool.updated_at, checked_at)
                 return request.app.state.TOOLS[tool_id], None
 
         tool_module, frontmatter = load_tool_module_by_id(tool_id, content)
+        request.app.state.TOOL_VERSIONS[tool_id] = (tool.updated_at, checked_at)
     else:
-        if hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS:
+        if tool_id in request.app.state.TOOLS:
             return request.app.state.TOOLS[tool_id], None
 
+        content = None
         tool_module, frontmatter = load_tool_module_by_id(tool_id)
-
-    if not hasattr(request.app.state, "TOOLS"):
-        request.app.state.TOOLS = {}
-
-    if not hasattr(request.app.state, "TOOL_CONTENTS"):
-        request.app.state.TOOL_CONTENTS = {}
+        request.app.state.TOOL_VERSIONS.pop(tool_id, None)
 
     request.app.state.TOOLS[tool_id] = tool_module
     request.app.state.TOOL_CONTENTS[tool_id] = content
@@ -207,12 +238,36 @@ def get_tool_module_from_cache(request, tool_id, load_from_db=True):
     return tool_module, frontmatter
 
 
-def get_function_module_from_cache(request, function_id, load_from_db=True):
+def get_function_module_from_cache(
+    request, function_id, load_from_db=True, version=None
+):
+    if not hasattr(request.app.state, "FUNCTIONS"):
+        request.app.state.FUNCTIONS = {}
+
+    if not hasattr(request.app.state, "FUNCTION_CONTENTS"):
+        request.app.state.FUNCTION_CONTENTS = {}
+
+    if not hasattr(request.app.state, "FUNCTION_VERSIONS"):
+        request.app.state.FUNCTION_VERSIONS = {}
+
     if load_from_db:
-        # Always load from the database by default
+        # Always check the database by default
         # This is useful for hooks like "inlet" or "outlet" where the content might change
         # and we want to ensure the latest content is used.
+        # The row version (updated_at) is compared first, callers that already
+        # fetched the row can pass it as `version` to skip that query, and the
+        # content is only read when it may have changed.
+        if version is None:
+            version = Functions.get_function_versions_by_ids([function_id]).get(
+                function_id
+            )
 
+        if function_id in request.app.state.FUNCTIONS and is_version_current(
+            request.app.state.FUNCTION_VERSIONS.get(function_id), version
+        ):
+            return request.app.state.FUNCTIONS[function_id], None, None
+
+        checked_at = int(time.time())
         function = Functions.get_function_by_id(function_id)
         if not function:
             raise Exception(f"Function not found: {function_id}")
@@ -225,37 +280,35 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
             Functions.update_function_by_id(function_id, {"content": content})
 
         if (
-            hasattr(request.app.state, "FUNCTION_CONTENTS")
-            and function_id in request.app.state.FUNCTION_CONTENTS
-        ) and (
-            hasattr(request.app.state, "FUNCTIONS")
+            function_id in request.app.state.FUNCTION_CONTENTS
             and function_id in request.app.state.FUNCTIONS
         ):
             if request.app.state.FUNCTION_CONTENTS[function_id] == content:
+                request.app.state.FUNCTION_VERSIONS[function_id] = (
+                    function.updated_at,
+                    checked_at,
+                )
                 return request.app.state.FUNCTIONS[function_id], None, None
 
         function_module, function_type, frontmatter = load_function_module_by_id(
             function_id, content
         )
+        request.app.state.FUNCTION_VERSIONS[function_id] = (
+            function.updated_at,
+            checked_at,
+        )
     else:
         # Load from cache (e.g. "stream" hook)
         # This is useful for performance reasons
 
-        if (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
+        if function_id in request.app.state.FUNCTIONS:
             return request.app.state.FUNCTIONS[function_id], None, None
 
+        content = None
         function_module, function_type, frontmatter = load_function_module_by_id(
             function_id
         )
-
-    if not hasattr(request.app.state, "FUNCTIONS"):
-        request.app.state.FUNCTIONS = {}
-
-    if not hasattr(request.app.state, "FUNCTION_CONTENTS"):
-        request.app.state.FUNCTION_CONTENTS = {}
+        request.app.state.FUNCTION_VERSIONS.pop(function_id, None)
 
     request.app.state.FUNCTIONS[function_id] = function_module
     request.app.state.FUNCTION_CONTENTS[function_id] = content
@@ -263,6 +316,96 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
     return function_module, function_type, frontmatter
 
 
+def apply_valves_from_cache(
+    cache: dict,
+    id: str,
+    module,
+    get_version: Callable[[str], Optional[int]],
+    get_valves: Callable[[str], Optional[dict]],
+    version: Optional[int] = None,
+    load_from_db: bool = True,
+):
+    if not (hasattr(module, "valves") and hasattr(module, "Valves")):
+        return
+
+    cached = cache.get(id)
+    if cached is not None and cached[2] is module:
+        if not load_from_db:
+            module.valves = cached[3]
+            return
+
+        if version is None:
+            version = get_version(id)
+        if is_version_current(cached[:2], version):
+            module.valves = cached[3]
+            return
+    elif load_from_db and version is None:
+        version = get_version(id)
+
+    checked_at = int(time.time())
+    valves = get_valves(id) or {}
+    module.valves = module.Valves(**{k: v for k, v in valves.items() if v is not None})
+    cache[id] = (version, checked_at, module, module.valves)
+
+
+def apply_function_valves(
+    request, function_id, function_module, version=None, load_from_db=True
+):
+    """
+    Set the admin valves on a cached function module. Valve updates bump the
+    function's updated_at, so the parsed valves are kept per row version and
+    only read and rebuilt when it changes; `version` skips the version query.
+    """
+    if not hasattr(request.app.state, "FUNCTION_VALVES"):
+        request.app.state.FUNCTION_VALVES = {}
+
+    apply_valves_from_cache(
+        request.app.state.FUNCTION_VALVES,
+        function_id,
+        function_module,
+        lambda id: Functions.get_function_versions_by_ids([id]).get(id),
+        Functions.get_function_valves_by_id,
+        version=version,
+        load_from_db=load_from_db,
+    )
+
+
+def apply_tool_valves(request, tool_id, tool_module, version=None, load_from_db=True):
+    """
+    Set the admin valves on a cached tool module, see `apply_function_valves`.
+    """
+    if not hasattr(request.app.state, "TOOL_VALVES"):
+        request.app.state.TOOL_VALVES = {}
+
+    apply_valves_from_cache(
+        request.app.state.TOOL_VALVES,
+        tool_id,
+        tool_module,
+        lambda id: Tools.get_tool_versions_by_ids([id]).get(id),
+        Tools.get_tool_valves_by_id,
+        version=version,
+        load_from_db=load_from_db,
+    )
+
+
+def get_user_valves(user, type: str, id: str) -> dict:
+    """
+    Get a user's valves for a function (type "functions") or tool (type
+    "tools") from the settings loaded with the request's user, instead of
+    reading the user row again.
+    """
+    if isinstance(user, dict):
+        if "settings" not in user:
+            if type == "tools":
+                return Tools.get_user_valves_by_id_and_user_id(id, user["id"]) or {}
+            return Functions.get_user_valves_by_id_and_user_id(id, user["id"]) or {}
+        settings = user.get("settings") or {}
+    else:
+        settings = user.settings.model_dump() if user.settings else {}
+
+    return ((settings.get(type) or {}).get("valves") or {}).get(id) or {}
+
+
 def install_frontmatter_requirements(requirements: str):
     if OFFLINE_MODE:
         log.info("Offline mode enabled, skipping installation of requirements.")
@@ -0,0 +1,237 @@
+"""
+Profile and banner images of users, kept in file storage by content hash.
+
+A user row only holds the URL its image is served from, versioned by the
+hash of the image: /api/v1/users/{id}/profile/image?v={sha256}. Inline data
+URI images are moved to storage when a user is saved, and by
+migrate_inline_profile_images for the rows saved before.
+"""
+
+import base64
+import hashlib
+import io
+import logging
+import mimetypes
+import re
+from typing import Optional
+
+from fastapi import Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from open_webui.env import STATIC_DIR
+from open_webui.models.users import ProfileImageModel, ProfileImages, Users
+from open_webui.storage.provider import Storage
+
+log = logging.getLogger(__name__)
+
+# User fields holding images, and the path they are served from
+PROFILE_IMAGE_FIELDS = {
+    "profile_image_url": "image",
+    "profile_banner_image_url": "banner",
+}
+
+PROFILE_IMAGE_URL_PATTERN = re.compile(
+    r"^/api/v1/users/[^/?]+/profile/(?:image|banner)\?v=([0-9a-f]{64})$"
+)
+
+# Thumbnail sizes served, a requested size is rounded up to the next one
+THUMBNAIL_SIZES = (32, 64, 128, 256)
+
+
+def get_profile_image_url(user_id: str, field: str, hash: str) -> str:
+    return f"/api/v1/users/{user_id}/profile/{PROFILE_IMAGE_FIELDS[field]}?v={hash}"
+
+
+def get_profile_image_hash(url: Optional[str]) -> Optional[str]:
+    match = PROFILE_IMAGE_URL_PATTERN.match(url or "")
+    return match.group(1) if match else None
+
+
+def get_data_uri_hash(data_uri: str) -> str:
+    return hashlib.sha256(base64.b64decode(data_uri.split(",", 1)[1])).hexdigest()
+
+
+def is_same_profile_image(url: Optional[str], current_url: Optional[str]) -> bool:
+    """
+    Whether an image URL, before it is stored, is the image of a user field.
+    Stored images are compared by the hash of their data URI.
+    """
+    if url == current_url:
+        return True
+    hash = get_profile_image_hash(current_url)
+    if hash and isinstance(url, str) and url.startswith("data:image"):
+        try:
+            return get_data_uri_hash(url) == hash
+        except Exception:
+            return False
+    return False
+
+
+def store_profile_image(data_uri: str) -> str:
+    """Store a data URI image, once per content, and return its hash."""
+    header, data = data_uri.split(",", 1)
+    content_type = header[len("data:") :].split(";")[0]
+    contents = base64.b64decode(data)
+    hash = hashlib.sha256(contents).hexdigest()
+
+    if ProfileImages.get_image(hash) is None:
+        extension = mimetypes.guess_extension(content_type) or ""
+        _, path = Storage.upload_file(
+            io.BytesIO(contents),
+            f"profile-{hash}{extension}",
+            {"OpenWebUI-Profile-Image": hash},
+        )
+        ProfileImages.insert_new_image(hash, 0, content_type, path)
+    return hash
+
+
+def store_inline_profile_images(user_id: str, values: dict) -> dict:
+    """Return the user values with their data URI images moved to storage."""
+    values = dict(values)
+    for field in PROFILE_IMAGE_FIELDS:
+        value = values.get(field)
+        if isinstance(value, str) and value.startswith("data:image"):
+            try:
+                hash = store_profile_image(value)
+                values[field] = get_profile_image_url(user_id, field, hash)
+            except Exception as e:
+                # Keep the image inline rather than losing it
+                log.warning(f"Error storing {field} of user {user_id}: {e}")
+    return values
+
+
+def get_thumbnail_size(size: Optional[int]) -> int:
+    if not size:
+        return 0
+    return next((s for s in THUMBNAIL_SIZES if s >= size), 0)
+
+
+def get_profile_image(hash: str, size: int = 0) -> Optional[ProfileImageModel]:
+    """Return the image, or its thumbnail of the size, created on first use."""
+    original = ProfileImages.get_image(hash)
+    if original is None or not size:
+        return original
+
+    thumbnail = ProfileImages.get_image(hash, size)
+    if thumbnail is not None:
+        return thumbnail
+
+    try:
+        from PIL import Image
+
+        with Image.open(Storage.get_file(original.path)) as image:
+            if max(image.size) <= size:
+                # Already small, the thumbnail is the original
+                return ProfileImages.insert_new_image(
+                    hash, size, original.content_type, original.path
+                )
+
+            image.thumbnail((size, size))
+            if original.content_type == "image/jpeg":
+                format, content_type = "JPEG", "image/jpeg"
+                image = image.convert("RGB")
+            else:
+                format, content_type = "PNG", "image/png"
+
+            buffer = io.BytesIO()
+            image.save(buffer, format=format)
+            buffer.seek(0)
+
+        _, path = Storage.upload_file(
+            buffer,
+            f"profile-{hash}-{size}{mimetypes.guess_extension(content_type)}",
+            {"OpenWebUI-Profile-Image": hash},
+        )
+        return ProfileImages.insert_new_image(hash, size, content_type, path)
+    except Exception as e:
+        log.debug(f"Serving profile image {hash} without a thumbnail: {e}")
+        return original
+
+
+def get_profile_image_response(
+    request: Request,
+    url: Optional[str],
+    version: Optional[str] = None,
+    size: Optional[int] = None,
+    default: Optional[str] = f"{STATIC_DIR}/user.png",
+) -> Response:
+    """
+    Serve an image field of a user. Stored images are served with their hash
+    as ETag, and cached for good when requested by their versioned URL.
+    """
+    hash = get_profile_image_hash(url)
+    if hash:
+        size = get_thumbnail_size(size)
+        etag = f'"{hash}-{size}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": (
+                "private, max-age=31536000, immutable"
+                if version == hash
+                else "private, no-cache"
+            ),
+        }
+        if etag in request.headers.get("if-none-match", "").split(", "):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        image = get_profile_image(hash, size)
+        if image is not None:
+            try:
+                return FileResponse(
+                    Storage.get_file(image.path),
+                    media_type=image.content_type,
+                    headers={**headers, "Content-Disposition": "inline"},
+                )
+            except Exception as e:
+                log.warning(f"Error reading profile image {hash}: {e}")
+    elif url and url.startswith("http"):
+        return Response(
+            status_code=status.HTTP_302_FOUND,
+            headers={"Location": url},
+        )
+    elif url and url.startswith("data:image"):
+        try:
+            header, base64_data = url.split(",", 1)
+            image_data = base64.b64decode(base64_data)
+            image_buffer = io.BytesIO(image_data)
+            media_type = header.split(";")[0].lstrip("data:")
+
+            return StreamingResponse(
+                image_buffer,
+                media_type=media_type,
+                headers={"Content-Disposition": "inline"},
+            )
+        except Exception as e:
+            pass
+
+    if default is None:
+        return Response(status_code=status.HTTP_404_NOT_FOUND)
+    return FileResponse(default)
+
+
+def migrate_inline_profile_images(batch_size: int = 50) -> int:
+    """Move the data URI images of all users to storage. Returns the users migrated."""
+    migrated = 0
+    after_id = None
+    while True:
+        try:
+            rows = Users.get_users_with_inline_profile_images(after_id, batch_size)
+        except Exception as e:
+            log.exception(f"Error migrating inline profile images: {e}")
+            return migrated
+        if not rows:
+            if migrated:
+                log.info(f"Moved the profile images of {migrated} users to storage")
+            return migrated
+
+        for id, profile_image_url, profile_banner_image_url in rows:
+            current = {
+                "profile_image_url": profile_image_url,
+                "profile_banner_image_url": profile_banner_image_url,
+            }
+            updated = store_inline_profile_images(id, current)
+            if updated != current:
+                # Skipped if the user changed its images in the meantime
+                if Users.replace_user_profile_images_by_id(id, current, updated):
+                    migrated += 1
+            after_id = id
@@ -8,6 +8,14 @@ Metrics collected:
 
 * http.server.requests (counter)
 * http.server.duration (histogram, milliseconds)
+* webui.chat.message_writes.coalesced (observable counter)
+* webui.rag.embedding_cache.hits (observable counter)
+* webui.rag.embedding_cache.misses (observable counter)
+* webui.webhooks.sent (observable counter)
+* webui.webhooks.failed (observable counter)
+* webui.webhooks.retries (observable counter)
+* webui.webhooks.duration (observable counter, milliseconds)
+* webui.webhooks.pending (observable gauge)
 
 Attributes used: http.method, http.route, http.status_code
 
@@ -46,6 +54,9 @@ from open_webui.env import (
     OTEL_METRICS_EXPORTER_OTLP_INSECURE,
 )
 from open_webui.models.users import Users
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
+from open_webui.socket.main import MESSAGE_WRITE_BUFFER
+from open_webui.utils.webhook import WEBHOOK_DISPATCHER
 
 _EXPORT_INTERVAL_MILLIS = 10_000  # 10 seconds
 
@@ -101,6 +112,30 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
         View(
             instrument_name="webui.users.active.today",
         ),
+        View(
+            instrument_name="webui.chat.message_writes.coalesced",
+        ),
+        View(
+            instrument_name="webui.rag.embedding_cache.hits",
+        ),
+        View(
+            instrument_name="webui.rag.embedding_cache.misses",
+        ),
+        View(
+            instrument_name="webui.webhooks.sent",
+        ),
+        View(
+            instrument_name="webui.webhooks.failed",
+        ),
+        View(
+            instrument_name="webui.webhooks.retries",
+        ),
+        View(
+            instrument_name="webui.webhooks.duration",
+        ),
+        View(
+            instrument_name="webui.webhooks.pending",
+        ),
     ]
 
     provider = MeterProvider(
@@ -176,6 +211,100 @@ def setup_metrics(app: FastAPI, resource: Resource) -> None:
         callbacks=[observe_users_active_today],
     )
 
+    def observe_coalesced_message_writes(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [metrics.Observation(value=MESSAGE_WRITE_BUFFER.coalesced_count)]
+
+    meter.create_observable_counter(
+        name="webui.chat.message_writes.coalesced",
+        description="Number of chat message database writes saved by the write-behind buffer",
+        unit="writes",
+        callbacks=[observe_coalesced_message_writes],
+    )
+
+    if EMBEDDING_CACHE is not None:
+
+        def observe_embedding_cache_hits(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [metrics.Observation(value=EMBEDDING_CACHE.hits)]
+
+        def observe_embedding_cache_misses(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [metrics.Observation(value=EMBEDDING_CACHE.misses)]
+
+        meter.create_observable_counter(
+            name="webui.rag.embedding_cache.hits",
+            description="Number of chunk embeddings served from the embedding cache",
+            unit="embeddings",
+            callbacks=[observe_embedding_cache_hits],
+        )
+        meter.create_observable_counter(
+            name="webui.rag.embedding_cache.misses",
+            description="Number of chunk embeddings that had to be generated",
+            unit="embeddings",
+            callbacks=[observe_embedding_cache_misses],
+        )
+
+    def observe_webhooks_sent(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [metrics.Observation(value=WEBHOOK_DISPATCHER.sent_count)]
+
+    def observe_webhooks_failed(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [metrics.Observation(value=WEBHOOK_DISPATCHER.failed_count)]
+
+    def observe_webhook_retries(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [metrics.Observation(value=WEBHOOK_DISPATCHER.retry_count)]
+
+    def observe_webhook_duration(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [metrics.Observation(value=WEBHOOK_DISPATCHER.duration_ms)]
+
+    def observe_webhooks_pending(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [metrics.Observation(value=WEBHOOK_DISPATCHER.pending_count)]
+
+    meter.create_observable_counter(
+        name="webui.webhooks.sent",
+        description="Number of webhooks delivered",
+        unit="webhooks",
+        callbacks=[observe_webhooks_sent],
+    )
+    meter.create_observable_counter(
+        name="webui.webhooks.failed",
+        description="Number of webhooks that could not be delivered",
+        unit="webhooks",
+        callbacks=[observe_webhooks_failed],
+    )
+    meter.create_observable_counter(
+        name="webui.webhooks.retries",
+        description="Number of retried webhook delivery attempts",
+        unit="attempts",
+        callbacks=[observe_webhook_retries],
+    )
+    # Divide by sent + failed for the average delivery latency
+    meter.create_observable_counter(
+        name="webui.webhooks.duration",
+        description="Total time spent delivering webhooks, including retries",
+        unit="ms",
+        callbacks=[observe_webhook_duration],
+    )
+    meter.create_observable_gauge(
+        name="webui.webhooks.pending",
+        description="Number of webhooks queued or in flight on this worker",
+        unit="webhooks",
+        callbacks=[observe_webhooks_pending],
+    )
+
     # FastAPI middleware
     @app.middleware("http")
     async def _metrics_middleware(request: Request, call_next):
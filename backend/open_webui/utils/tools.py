@@ -38,7 +38,11 @@ from open_webui.utils.misc import is_string_allowed
 from open_webui.models.tools import Tools
 from open_webui.models.users import UserModel
 from open_webui.models.groups import Groups
-from open_webui.utils.plugin import load_tool_module_by_id
+from open_webui.utils.plugin import (
+    apply_tool_valves,
+    get_tool_module_from_cache,
+    get_user_valves,
+)
 from open_webui.utils.access_control import has_access
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL
 from open_webui.env import (
@@ -169,22 +173,19 @@ async def get_tools(
                 log.warning(f"Access denied to tool {tool_id} for user {user.id}")
                 continue
 
-            module = request.app.state.TOOLS.get(tool_id, None)
-            if module is None:
-                module, _ = load_tool_module_by_id(tool_id)
-                request.app.state.TOOLS[tool_id] = module
+            module, _ = get_tool_module_from_cache(
+                request, tool_id, version=tool.updated_at
+            )
 
             __user__ = {
                 **extra_params["__user__"],
             }
 
             # Set valves for the tool
-            if hasattr(module, "valves") and hasattr(module, "Valves"):
-                valves = Tools.get_tool_valves_by_id(tool_id) or {}
-                module.valves = module.Valves(**valves)
+            apply_tool_valves(request, tool_id, module, version=tool.updated_at)
             if hasattr(module, "UserValves"):
                 __user__["valves"] = module.UserValves(  # type: ignore
-                    **Tools.get_user_valves_by_id_and_user_id(tool_id, user.id)
+                    **get_user_valves(user, "tools", tool_id)
                 )
 
             for spec in tool.specs:
@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.env import (
+    ENABLE_FORWARD_USER_INFO_HEADERS,
+    MODELS_CACHE_STALE_TTL,
+    MODELS_CACHE_TTL,
+    REDIS_KEY_PREFIX,
+)
+
+log = logging.getLogger(__name__)
+
+
+def get_upstream_cache_key(url: str, key: Optional[str] = None, user=None) -> str:
+    """Cache key of an upstream request, without the API key in plain text."""
+    cache_key = hashlib.sha256(f"{url}\n{key or ''}".encode()).hexdigest()
+    if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+        # The upstream is told who asks, and may answer differently per user
+        cache_key = f"{cache_key}:{user.id}"
+    return cache_key
+
+
+class UpstreamCache:
+    """
+    Stale-while-revalidate cache of upstream responses shared by all users.
+
+    A response is fresh for `ttl` seconds (forever if None). After that it is
+    still served, for up to `stale_ttl` more seconds, while a background task
+    fetches it again. A failed fetch returns None and keeps the previous
+    response, so an upstream timing out doesn't empty the model list, and
+    concurrent fetches of a key share one request.
+
+    Once `start` was called with a Redis connection, responses are shared
+    between workers under keys expiring with their stale copy.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 1,
+        stale_ttl: float = 300,
+        max_size: int = 1000,
+        redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:upstream",
+    ):
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._max_size = max_size
+        self._redis = None
+        self._redis_key_prefix = redis_key_prefix
+
+        # key -> (fetched_at, updated_at, response)
+        self._entries: dict[str, tuple[float, float, Any]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+        # Counters for metrics
+        self.hit_count = 0
+        self.stale_count = 0
+        self.fetch_count = 0
+
+    def start(self, redis=None):
+        """Share responses between workers through Redis."""
+        self._redis = redis
+
+    async def close(self):
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
+        self._redis = None
+
+    def _get_redis_key(self, key: str) -> str:
+        return f"{self._redis_key_prefix}:{key}"
+
+    def _is_fresh(self, fetched_at: float, now: float) -> bool:
+        return self._ttl is None or now - fetched_at < self._ttl
+
+    def _is_servable(self, updated_at: float, now: float) -> bool:
+        return self._ttl is None or now - updated_at < self._ttl + self._stale_ttl
+
+    async def _read_redis(self, key: str) -> Optional[tuple[float, float, Any]]:
+        try:
+            data = await self._redis.get(self._get_redis_key(key))
+            if data:
+                fetched_at, updated_at, response = json.loads(data)
+                return fetched_at, updated_at, response
+        except Exception as e:
+            log.warning(f"Error reading upstream response {key} from Redis: {e}")
+        return None
+
+    async def _write_redis(self, key: str, entry: tuple[float, float, Any]):
+        try:
+            await self._redis.set(
+                self._get_redis_key(key),
+                json.dumps(entry),
+                ex=max(int((self._ttl or 0) + self._stale_ttl), 1),
+            )
+        except Exception as e:
+            log.warning(f"Error caching upstream response {key} in Redis: {e}")
+
+    def _prune(self, now: float):
+        if len(self._entries) <= self._max_size:
+            return
+        for key, (_, updated_at, _) in list(self._entries.items()):
+            if not self._is_servable(updated_at, now):
+                del self._entries[key]
+        while len(self._entries) > self._max_size:
+            self._entries.pop(next(iter(self._entries)))
+
+    async def _fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        self.fetch_count += 1
+        try:
+            response = await fetch()
+        except Exception as e:
+            log.error(f"Error fetching upstream response {key}: {e}")
+            response = None
+
+        now = time.time()
+        previous = self._entries.get(key)
+        if (
+            response is None
+            and previous is not None
+            and previous[2] is not None
+            and self._is_servable(previous[1], now)
+        ):
+            # Keep serving the previous response until the upstream recovers
+            entry = (now, previous[1], previous[2])
+        else:
+            entry = (now, now, response)
+
+        self._entries[key] = entry
+        self._prune(now)
+
+        if self._redis is not None and response is not None:
+            await self._write_redis(key, entry)
+        return entry[2]
+
+    def _get_task(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._tasks.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._fetch(key, fetch))
+            self._tasks[key] = task
+            task.add_done_callback(
+                lambda task: (
+                    self._tasks.pop(key, None) if self._tasks.get(key) is task else None
+                )
+            )
+        return task
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the response cached under `key`, fetched with `fetch` if there
+        is none that can be served. The response is shared, don't change it.
+        """
+        now = time.time()
+        entry = self._entries.get(key)
+
+        if self._redis is not None and (
+            entry is None or not self._is_fresh(entry[0], now)
+        ):
+            # Another worker may have fetched it since
+            redis_entry = await self._read_redis(key)
+            if redis_entry is not None and (entry is None or redis_entry[0] > entry[0]):
+                entry = redis_entry
+                self._entries[key] = entry
+
+        if entry is not None:
+            fetched_at, updated_at, response = entry
+            if self._is_fresh(fetched_at, now):
+                self.hit_count += 1
+                return response
+            if response is not None and self._is_servable(updated_at, now):
+                self.stale_count += 1
+                self._get_task(key, fetch)
+                return response
+
+        # Callers going away don't cancel the fetch the others wait for
+        return await asyncio.shield(self._get_task(key, fetch))
+
+
+MODEL_LIST_CACHE = UpstreamCache(ttl=MODELS_CACHE_TTL, stale_ttl=MODELS_CACHE_STALE_TTL)
@@ -1,64 +1,261 @@
+import asyncio
 import json
 import logging
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
 import aiohttp
 
 from open_webui.config import WEBUI_FAVICON_URL
-from open_webui.env import AIOHTTP_CLIENT_TIMEOUT, VERSION
+from open_webui.env import (
+    REDIS_KEY_PREFIX,
+    VERSION,
+    WEBHOOK_MAX_CONCURRENCY,
+    WEBHOOK_MAX_RETRIES,
+    WEBHOOK_TIMEOUT,
+)
 
 log = logging.getLogger(__name__)
 
 
-async def post_webhook(name: str, url: str, message: str, event_data: dict) -> bool:
-    try:
-        log.debug(f"post_webhook: {url}, {message}, {event_data}")
-        payload = {}
-
-        # Slack and Google Chat Webhooks
-        if "https://hooks.slack.com" in url or "https://chat.googleapis.com" in url:
-            payload["text"] = message
-        # Discord Webhooks
-        elif "https://discord.com/api/webhooks" in url:
-            payload["content"] = (
-                message
-                if len(message) < 2000
-                else f"{message[: 2000 - 20]}... (truncated)"
+def get_webhook_payload(name: str, url: str, message: str, event_data: dict) -> dict:
+    payload = {}
+
+    # Slack and Google Chat Webhooks
+    if "https://hooks.slack.com" in url or "https://chat.googleapis.com" in url:
+        payload["text"] = message
+    # Discord Webhooks
+    elif "https://discord.com/api/webhooks" in url:
+        payload["content"] = (
+            message if len(message) < 2000 else f"{message[: 2000 - 20]}... (truncated)"
+        )
+    # Microsoft Teams Webhooks
+    elif "webhook.office.com" in url:
+        action = event_data.get("action", "undefined")
+        facts = [
+            {"name": name, "value": value}
+            for name, value in json.loads(event_data.get("user", {})).items()
+        ]
+        payload = {
+            "@type": "MessageCard",
+            "@context": "http://schema.org/extensions",
+            "themeColor": "0076D7",
+            "summary": message,
+            "sections": [
+                {
+                    "activityTitle": message,
+                    "activitySubtitle": f"{name} ({VERSION}) - {action}",
+                    "activityImage": WEBUI_FAVICON_URL,
+                    "facts": facts,
+                    "markdown": True,
+                }
+            ],
+        }
+    # Default Payload
+    else:
+        payload = {**event_data}
+
+    return payload
+
+
+class WebhookDispatcher:
+    """
+    Delivers webhooks over one shared HTTP session.
+
+    At most `max_concurrency` deliveries are in flight at a time. Each attempt
+    is limited to `timeout` seconds; timeouts, connection errors, 429 and 5xx
+    responses are retried up to `max_retries` times with exponential backoff.
+
+    `submit` hands jobs off and returns immediately: they are either delivered
+    by background tasks of this worker or, once `start` was called with a
+    Redis connection, pushed to a Redis list that the consumers of all workers
+    pop from (at-most-once).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 20,
+        timeout: Optional[float] = None,
+        max_retries: int = 2,
+        retry_backoff: float = 0.5,
+        redis_key: str = f"{REDIS_KEY_PREFIX}:webhook_queue",
+    ):
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._redis = None
+        self._redis_key = redis_key
+
+        self._loop = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._consumer_task: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+
+        # Counters for metrics
+        self.sent_count = 0
+        self.failed_count = 0
+        self.retry_count = 0
+        self.duration_ms = 0.0
+
+    @property
+    def pending_count(self) -> int:
+        """Number of deliveries queued or in flight on this worker."""
+        return len(self._tasks)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # The semaphore and session are bound to the event loop they were made in
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._session = None
+        return self._semaphore
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        self._get_semaphore()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                trust_env=True,
+                connector=aiohttp.TCPConnector(limit=self._max_concurrency),
             )
-        # Microsoft Teams Webhooks
-        elif "webhook.office.com" in url:
-            action = event_data.get("action", "undefined")
-            facts = [
-                {"name": name, "value": value}
-                for name, value in json.loads(event_data.get("user", {})).items()
-            ]
-            payload = {
-                "@type": "MessageCard",
-                "@context": "http://schema.org/extensions",
-                "themeColor": "0076D7",
-                "summary": message,
-                "sections": [
-                    {
-                        "activityTitle": message,
-                        "activitySubtitle": f"{name} ({VERSION}) - {action}",
-                        "activityImage": WEBUI_FAVICON_URL,
-                        "facts": facts,
-                        "markdown": True,
-                    }
-                ],
-            }
-        # Default Payload
-        else:
-            payload = {**event_data}
-
-        log.debug(f"payload: {payload}")
-        async with aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        ) as session:
-            async with session.post(url, json=payload) as r:
-                r_text = await r.text()
-                r.raise_for_status()
-                log.debug(f"r.text: {r_text}")
-
-        return True
-    except Exception as e:
-        log.exception(e)
+        return self._session
+
+    def start(self, redis=None):
+        """Deliver submitted jobs through a Redis queue consumed by this worker."""
+        if redis is None or self._consumer_task is not None:
+            return
+        self._redis = redis
+        self._consumer_task = asyncio.create_task(self._consume())
+
+    async def close(self):
+        if self._consumer_task is not None:
+            self._consumer_task.cancel()
+            self._consumer_task = None
+        self._redis = None
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def post(self, name: str, url: str, message: str, event_data: dict) -> bool:
+        async with self._get_semaphore():
+            return await self._post(name, url, message, event_data)
+
+    async def submit(self, jobs: list[dict]):
+        """
+        Queue webhook jobs for delivery without waiting for them.
+
+        Each job is a dict with the `post` arguments: name, url, message and
+        event_data.
+        """
+        if not jobs:
+            return
+
+        if self._redis is not None:
+            try:
+                await self._redis.rpush(
+                    self._redis_key, *[json.dumps(job) for job in jobs]
+                )
+                return
+            except Exception as e:
+                log.exception(f"Error queueing webhooks, delivering locally: {e}")
+
+        for job in jobs:
+            self._spawn(self.post(**job))
+
+    def _spawn(self, coroutine) -> asyncio.Task:
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _consume(self):
+        semaphore = self._get_semaphore()
+        while True:
+            # Only pop as many jobs as can be delivered right away
+            await semaphore.acquire()
+            try:
+                item = await self._redis.blpop(self._redis_key, timeout=1)
+            except asyncio.CancelledError:
+                semaphore.release()
+                raise
+            except Exception as e:
+                semaphore.release()
+                log.exception(f"Error reading the webhook queue: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if item is None:
+                semaphore.release()
+                continue
+
+            try:
+                job = json.loads(item[1])
+            except Exception as e:
+                semaphore.release()
+                log.exception(f"Invalid webhook job: {e}")
+                continue
+
+            self._spawn(self._post_and_release(job))
+
+    async def _post_and_release(self, job: dict):
+        try:
+            await self._post(**job)
+        finally:
+            self._semaphore.release()
+
+    async def _post(self, name: str, url: str, message: str, event_data: dict) -> bool:
+        start = time.perf_counter()
+        try:
+            log.debug(f"post_webhook: {url}, {message}, {event_data}")
+            payload = get_webhook_payload(name, url, message, event_data)
+            log.debug(f"payload: {payload}")
+
+            host = urlparse(url).netloc
+            for attempt in range(self._max_retries + 1):
+                if attempt:
+                    self.retry_count += 1
+                    await asyncio.sleep(self._retry_backoff * 2 ** (attempt - 1))
+
+                try:
+                    async with self._get_session().post(
+                        url,
+                        json=payload,
+                        timeout=aiohttp.ClientTimeout(total=self._timeout),
+                    ) as r:
+                        r_text = await r.text()
+                        if r.status == 429 or r.status >= 500:
+                            log.warning(f"Webhook to {host} returned {r.status}")
+                            continue
+                        r.raise_for_status()
+                        log.debug(f"r.text: {r_text}")
+
+                    self.sent_count += 1
+                    return True
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    log.warning(f"Webhook to {host} failed: {e!r}")
+
+            log.error(f"Webhook to {host} failed after {attempt + 1} attempts")
+        except Exception as e:
+            log.exception(e)
+        finally:
+            self.duration_ms += (time.perf_counter() - start) * 1000
+
+        self.failed_count += 1
         return False
+
+
+WEBHOOK_DISPATCHER = WebhookDispatcher(
+    max_concurrency=WEBHOOK_MAX_CONCURRENCY,
+    timeout=WEBHOOK_TIMEOUT,
+    max_retries=WEBHOOK_MAX_RETRIES,
+)
+
+
+async def post_webhook(name: str, url: str, message: str, event_data: dict) -> bool:
+    return await WEBHOOK_DISPATCHER.post(name, url, message, event_data)